@@ -5,14 +5,18 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
-import re
+import json
+import sqlite3
+from array import array
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, defaultdict, OrderedDict
+from tokenizer import Vocabulary, tokenize
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+CACHE_SIZE = 256
 
 CSV_CONFIG = {
     "style": {
@@ -98,65 +102,201 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search over interned token IDs"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, stem=False):
         self.k1 = k1
         self.b = b
+        self.stem = stem
+        self.vocab = Vocabulary()
         self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
         self.N = 0
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return tokenize(text, self.stem)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
+        self.corpus = [self.vocab.encode(self.tokenize(doc)) for doc in documents]
         self.N = len(self.corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = array("I", (len(doc) for doc in self.corpus))
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        # Inverted index: token ID -> (doc indices, term frequencies)
+        postings = {}
+        for idx, doc in enumerate(self.corpus):
+            for token_id, tf in Counter(doc).items():
+                entry = postings.get(token_id)
+                if entry is None:
+                    entry = postings[token_id] = (array("I"), array("I"))
+                entry[0].append(idx)
+                entry[1].append(tf)
+        self.postings = postings
+
+        for token_id, (docs, _) in postings.items():
+            self.doc_freqs[token_id] = len(docs)
+            self.idf[token_id] = log((self.N - len(docs) + 0.5) / (len(docs) + 0.5) + 1)
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        query_ids = self.vocab.lookup(self.tokenize(query))
+        scores = [0] * self.N
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        doc_lengths = self.doc_lengths
+
+        for token_id in query_ids:
+            idf = self.idf[token_id]
+            docs, tfs = self.postings[token_id]
+            for idx, tf in zip(docs, tfs):
+                numerator = tf * (k1 + 1)
+                denominator = tf + k1 * (1 - b + b * doc_lengths[idx] / avgdl)
+                scores[idx] += idf * numerator / denominator
+
+        return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+
+
+# ============ RESULT CACHE ============
+class QueryCache:
+    """Bounded LRU cache for search results, optionally backed by SQLite"""
+
+    def __init__(self, maxsize=CACHE_SIZE, db_path=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if db_path:
+            self.open_db(db_path)
+
+    def open_db(self, db_path):
+        """Persist entries and counters across processes in a small SQLite file"""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path))
+        self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, used INTEGER)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+        self.db.commit()
+
+    def get(self, key):
+        """Return cached value or None, updating recency and counters"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self._count("hits")
+            return self.entries[key]
+
+        if self.db is not None:
+            row = self.db.execute("SELECT value FROM results WHERE key = ?", (self._db_key(key),)).fetchone()
+            if row:
+                value = json.loads(row[0])
+                self._remember(key, value)
+                self._touch(key)
+                self._count("hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        self._remember(key, value)
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO results (key, value, used) VALUES (?, ?, ?)",
+                            (self._db_key(key), json.dumps(value, ensure_ascii=False), self._next_use()))
+            self.db.execute("DELETE FROM results WHERE key NOT IN "
+                            "(SELECT key FROM results ORDER BY used DESC LIMIT ?)", (self.maxsize,))
+            self.db.commit()
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self.entries.clear()
+        self.hits = self.misses = 0
+        if self.db is not None:
+            self.db.execute("DELETE FROM results")
+            self.db.execute("DELETE FROM stats")
+            self.db.commit()
+
+    def stats(self):
+        """Hit/miss counters for this process (and all processes when persistent)"""
+        lookups = self.hits + self.misses
+        result = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self.entries),
+            "maxsize": self.maxsize
+        }
+        if self.db is not None:
+            totals = dict(self.db.execute("SELECT name, value FROM stats").fetchall())
+            total_lookups = totals.get("hits", 0) + totals.get("misses", 0)
+            result["persistent"] = {
+                "hits": totals.get("hits", 0),
+                "misses": totals.get("misses", 0),
+                "hit_ratio": round(totals.get("hits", 0) / total_lookups, 3) if total_lookups else 0.0,
+                "size": self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            }
+        return result
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def _count(self, name):
+        setattr(self, name, getattr(self, name) + 1)
+        if self.db is not None:
+            self.db.execute("INSERT INTO stats (name, value) VALUES (?, 1) "
+                            "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+            self.db.commit()
+
+    def _touch(self, key):
+        self.db.execute("UPDATE results SET used = ? WHERE key = ?", (self._next_use(), self._db_key(key)))
+        self.db.commit()
+
+    def _next_use(self):
+        return self.db.execute("SELECT COALESCE(MAX(used), 0) + 1 FROM results").fetchone()[0]
+
+    @staticmethod
+    def _db_key(key):
+        return json.dumps(key)
+
+
+_cache = QueryCache()
+
+
+def configure_cache(maxsize=CACHE_SIZE, db_path=None):
+    """Replace the result cache, e.g. to persist it across processes"""
+    global _cache
+    _cache = QueryCache(maxsize, db_path)
+    return _cache
+
+
+def cache_stats():
+    """Return result cache hit/miss counters"""
+    return _cache.stats()
+
+
+def _index_version(filepath):
+    """Version of a CSV index, changes whenever the file is edited"""
+    stat = filepath.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _cached_search(scope, filepath, search_cols, output_cols, query, max_results):
+    """Run _search_csv through the result cache using normalized query tokens"""
+    key = (scope, tuple(tokenize(query)), max_results, _index_version(filepath))
+    results = _cache.get(key)
+    if results is None:
+        results = _search_csv(filepath, search_cols, output_cols, query, max_results)
+        _cache.put(key, results)
+    return [dict(row) for row in results]
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -225,7 +365,7 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _cached_search(domain, filepath, config["search_cols"], config["output_cols"], query, max_results)
 
     return {
         "domain": domain,
@@ -246,7 +386,7 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _cached_search(f"stack:{stack}", filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
 
     return {
         "domain": "stack",
@@ -5,6 +5,7 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --cache-db .cache/search.db --stats
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,10 +13,15 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Result cache:
+  --cache-db   Persist the LRU result cache in a SQLite file shared across processes
+  --stats      Print cache hit/miss counters after the search
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
+import sys
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack, configure_cache, cache_stats
 from design_system import generate_design_system, persist_design_system
 
 
@@ -45,6 +51,17 @@ def format_output(result):
     return "\n".join(output)
 
 
+def format_stats(stats):
+    """Format result cache counters"""
+    lines = [f"Cache: {stats['hits']} hits, {stats['misses']} misses "
+             f"(hit ratio {stats['hit_ratio']:.0%}, {stats['size']}/{stats['maxsize']} entries)"]
+    persistent = stats.get("persistent")
+    if persistent:
+        lines.append(f"Cache (all runs): {persistent['hits']} hits, {persistent['misses']} misses "
+                     f"(hit ratio {persistent['hit_ratio']:.0%}, {persistent['size']} entries stored)")
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
     parser.add_argument("query", help="Search query")
@@ -60,9 +77,15 @@ if __name__ == "__main__":
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Result cache
+    parser.add_argument("--cache-db", type=str, default=None, help="SQLite file to persist the result cache across runs")
+    parser.add_argument("--stats", action="store_true", help="Print result cache hit/miss counters")
 
     args = parser.parse_args()
 
+    if args.cache_db:
+        configure_cache(db_path=args.cache_db)
+
     # Design system takes priority
     if args.design_system:
         result = generate_design_system(
@@ -104,3 +127,6 @@ if __name__ == "__main__":
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
+
+    if args.stats:
+        print("\n" + format_stats(cache_stats()), file=sys.stderr)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Tokenizer - precompiled tokenization and token interning for BM25
+"""
+
+import re
+import sys
+from array import array
+
+# ============ CONFIGURATION ============
+MIN_TOKEN_LENGTH = 3
+
+# Runs of word characters are exactly what remains after replacing
+# punctuation with spaces and splitting on whitespace.
+_WORD_RE = re.compile(r"\w+")
+
+# Light stemming: (suffix, replacement, minimum stem length), first match wins
+_SUFFIX_RULES = (
+    ("ies", "y", 3),
+    ("sses", "ss", 2),
+    ("ing", "", 4),
+    ("ed", "", 4),
+    ("es", "", 4),
+    ("s", "", 3),
+)
+
+
+def light_stem(word):
+    """Strip common English plural/verb suffixes ("buttons" -> "button")"""
+    if word.endswith("ss"):
+        return word
+    for suffix, replacement, min_stem in _SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text, stem=False):
+    """Lowercase, split on punctuation/whitespace, filter short words"""
+    tokens = [w for w in _WORD_RE.findall(str(text).lower()) if len(w) >= MIN_TOKEN_LENGTH]
+    if stem:
+        tokens = [t for t in map(light_stem, tokens) if len(t) >= MIN_TOKEN_LENGTH]
+    return tokens
+
+
+class Vocabulary:
+    """Interns tokens and maps them to dense integer IDs"""
+
+    def __init__(self):
+        self.ids = {}
+        self.tokens = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        """Return the ID of token, assigning a new one if unseen"""
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            token = sys.intern(token)
+            self.ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, tokens):
+        """Encode tokens as an int array, growing the vocabulary"""
+        return array("I", map(self.add, tokens))
+
+    def lookup(self, tokens):
+        """Encode tokens as an int array, dropping tokens not in the vocabulary"""
+        ids = self.ids
+        return array("I", (ids[t] for t in tokens if t in ids))
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Audit Results Cache - Antigravity Kit
+=====================================
+
+Incremental per-file results cache shared by the skill-level audit scripts
+(security_scan, ux_audit, mobile_audit, accessibility_checker, seo_checker,
+geo_checker, i18n_checker).
+
+Findings for a file only change when the file or the checker changes, so
+results are stored in SQLite under .agent/.cache keyed on
+(checker, checker version, file path, mtime + size). Repeated checklist runs
+then only re-audit files that changed.
+
+Usage (from a checker):
+    cache = ResultsCache("ux_audit", source_version(__file__))
+    result = cache.cached(filepath, lambda: audit(filepath))
+    cache.close()
+
+    python .agent/scripts/audit_cache.py stats     # Last run hit ratio per checker
+    python .agent/scripts/audit_cache.py clear     # Drop all cached results
+
+Set AUDIT_CACHE=off to disable caching.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+CACHE_DB = CACHE_DIR / "audit_results.db"
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("AUDIT_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def source_version(*sources: Any) -> str:
+    """
+    Version hash for a checker. Pass the checker's __file__ (its patterns and
+    logic live there) plus anything else its findings depend on.
+    """
+    digest = hashlib.sha1()
+    for source in sources:
+        if isinstance(source, (str, Path)) and Path(source).is_file():
+            digest.update(Path(source).read_bytes())
+        else:
+            digest.update(repr(source).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(db_path), timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""CREATE TABLE IF NOT EXISTS results (
+        checker TEXT, path TEXT, version TEXT, mtime_ns INTEGER, size INTEGER, result TEXT,
+        PRIMARY KEY (checker, path))""")
+    db.execute("""CREATE TABLE IF NOT EXISTS runs (
+        checker TEXT PRIMARY KEY, finished REAL, hits INTEGER, misses INTEGER)""")
+    return db
+
+
+class ResultsCache:
+    """Per-file results cache for one checker"""
+
+    def __init__(self, checker: str, version: str, db_path: Optional[Path] = None):
+        self.checker = checker
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.pending = []
+        self.db = None
+        if cache_enabled():
+            try:
+                self.db = _connect(Path(db_path) if db_path else CACHE_DB)
+            except sqlite3.Error:
+                self.db = None  # Cache is an optimization, never a failure
+
+    def _signature(self, filepath) -> Optional[tuple]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return (str(Path(filepath).resolve()), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, filepath) -> Optional[Any]:
+        """Cached result for an unchanged file, or None"""
+        signature = self._signature(filepath) if self.db else None
+        if signature:
+            row = self.db.execute(
+                "SELECT result FROM results WHERE checker = ? AND path = ? AND version = ? "
+                "AND mtime_ns = ? AND size = ?",
+                (self.checker, signature[0], self.version, signature[1], signature[2])
+            ).fetchone()
+            if row:
+                self.hits += 1
+                return json.loads(row[0])
+        self.misses += 1
+        return None
+
+    def put(self, filepath, result: Any) -> None:
+        """Store the result for a file; written on close()"""
+        signature = self._signature(filepath) if self.db else None
+        if signature:
+            self.pending.append((self.checker, signature[0], self.version,
+                                 signature[1], signature[2], json.dumps(result)))
+
+    def cached(self, filepath, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for filepath, computing and storing it on a miss"""
+        result = self.get(filepath)
+        if result is None:
+            result = compute()
+            self.put(filepath, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        """Flush pending results and record this run's hit ratio"""
+        if self.db is None:
+            return
+        try:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+            self.db.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                            (self.checker, time.time(), self.hits, self.misses))
+            self.db.commit()
+        except sqlite3.Error:
+            pass
+        finally:
+            self.db.close()
+            self.db = None
+            self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def last_run_stats(checker: str, since: float = 0, db_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Hit/miss counters of the checker's runs finished after `since`. Variants
+    such as "security_scan[secrets]" are summed into "security_scan".
+    """
+    path = Path(db_path) if db_path else CACHE_DB
+    if not path.exists():
+        return None
+    try:
+        db = _connect(path)
+        try:
+            row = db.execute(
+                "SELECT COUNT(*), SUM(hits), SUM(misses) FROM runs "
+                "WHERE (checker = ? OR checker LIKE ?) AND finished >= ?",
+                (checker, checker + "[%", since)
+            ).fetchone()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return None
+    if not row or not row[0]:
+        return None
+    lookups = row[1] + row[2]
+    return {"hits": row[1], "misses": row[2], "hit_ratio": round(row[1] / lookups, 3) if lookups else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit results cache")
+    parser.add_argument("command", choices=["stats", "clear"], help="Command to run")
+    args = parser.parse_args()
+
+    if not CACHE_DB.exists():
+        print("No audit cache found")
+        return
+
+    db = _connect(CACHE_DB)
+    if args.command == "clear":
+        db.execute("DELETE FROM results")
+        db.execute("DELETE FROM runs")
+        db.commit()
+        print(f"Cleared {CACHE_DB}")
+    else:
+        rows = db.execute("SELECT checker, hits, misses FROM runs ORDER BY checker").fetchall()
+        for checker, hits, misses in rows:
+            lookups = hits + misses
+            ratio = hits / lookups if lookups else 0.0
+            print(f"{checker:<32} {hits:>6} hits {misses:>6} misses  ({ratio:.0%})")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Check Context - Antigravity Kit
+===============================
+
+In-process plugin API for the audit scripts run by checklist.py and
+verify_all.py.
+
+An audit script opts in by exposing:
+
+    def run(context: CheckContext) -> dict
+
+The returned dict is the script's JSON report and must contain a boolean
+"passed". The orchestrator imports each script once and passes the same
+context to every check, so the project tree is walked once and each file is
+read from disk at most once per run, instead of once per subprocess.
+The file listing comes from file_inventory.FileInventory (.gitignore aware),
+or only the files in scope when the context has one (checklist.py
+--changed-since).
+Findings reported through finding_stream.Findings reach the context's
+on_finding sink as they are discovered (live progress, NDJSON output).
+Scripts without run() are still executed as subprocesses.
+
+Usage (from an audit script):
+    def run(context):
+        for path in context.files(['.tsx', '.jsx'], skip_dirs={'dist'}):
+            content = context.read_text(path)
+            ...
+        return {"script": "my_checker", "passed": True}
+
+    def main():
+        report = run(CheckContext(sys.argv[1]))
+"""
+
+import json
+import time
+import threading
+import traceback
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from file_inventory import FileInventory, env_scope
+from process_supervisor import check_metrics
+
+# Larger files are read on demand but not kept in memory
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+
+class CheckContext:
+    """Project root, file inventory and file-content cache shared by in-process checks"""
+
+    def __init__(self, project_path, url: Optional[str] = None,
+                 scope: Optional[Iterable[Path]] = None):
+        self.project_path = Path(project_path).resolve()
+        self.url = url
+        # Files the checks are limited to; None audits the whole project
+        self.scope: Optional[List[Path]] = list(scope) if scope is not None else env_scope()
+        self._inventory: Optional[FileInventory] = None
+        self._contents: Dict[Path, bytes] = {}
+        self._lock = threading.Lock()
+        # Findings sink, called as on_finding(check, kind, finding) (see finding_stream)
+        self.on_finding: Optional[Callable[[str, Optional[str], Any], None]] = None
+        # False when a stream consumes the findings and reports need only counts
+        self.keep_findings = True
+
+    @property
+    def inventory(self) -> FileInventory:
+        """Project file inventory, built on first use"""
+        with self._lock:
+            if self._inventory is None:
+                self._inventory = FileInventory(self.project_path, paths=self.scope)
+            return self._inventory
+
+    def files(self, suffixes: Optional[Iterable[str]] = None,
+              skip_dirs: Iterable[str] = ()) -> List[Path]:
+        """
+        Inventory files, optionally filtered by suffix and by directory names
+        (relative to the project root) to skip. With several suffixes, files
+        are grouped in the order the suffixes are given, like successive globs.
+        """
+        return self.inventory.select(suffixes, skip_dirs)
+
+    def emit(self, check: str, kind: Optional[str], finding: Any) -> None:
+        """Pass a finding to the findings sink, if any"""
+        if self.on_finding is not None:
+            self.on_finding(check, kind, finding)
+
+    def relative(self, path: Path) -> Path:
+        return Path(path).relative_to(self.project_path)
+
+    def read_bytes(self, path: Path) -> bytes:
+        """File contents, read from disk at most once per context"""
+        path = Path(path)
+        with self._lock:
+            data = self._contents.get(path)
+        if data is None:
+            data = path.read_bytes()
+            if len(data) <= MAX_CACHED_FILE_SIZE:
+                with self._lock:
+                    self._contents[path] = data
+        return data
+
+    def read_text(self, path: Path, errors: str = 'ignore') -> str:
+        """
+        Decoded file contents with universal newlines, like open() in text
+        mode; errors is passed to bytes.decode ('strict' raises).
+        """
+        text = self.read_bytes(path).decode('utf-8', errors=errors)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+
+
+_MODULES: Dict[Path, Optional[ModuleType]] = {}
+_MODULES_LOCK = threading.Lock()
+
+
+def load_check(script_path: Path) -> Optional[ModuleType]:
+    """
+    Import an audit script once and return it if it exposes run(context),
+    otherwise None (the caller falls back to running it as a subprocess).
+    """
+    script_path = Path(script_path).resolve()
+    with _MODULES_LOCK:
+        if script_path not in _MODULES:
+            module = None
+            try:
+                spec = importlib.util.spec_from_file_location(f"check_{script_path.stem}", script_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except Exception:
+                module = None
+            _MODULES[script_path] = module if callable(getattr(module, "run", None)) else None
+        return _MODULES[script_path]
+
+
+def run_in_process(script_path: Path, context: CheckContext) -> Optional[dict]:
+    """
+    Run an audit script's run(context) and return an orchestrator result
+    (passed, output, error, report, metrics), or None if the script has no
+    run(). CPU time is that of the calling thread (worker processes a check
+    starts are not counted) and peak RSS, shared by every in-process check,
+    is not reported.
+    """
+    module = load_check(script_path)
+    if module is None:
+        return None
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    try:
+        report = module.run(context)
+    except Exception:
+        report, error = None, traceback.format_exc()
+    else:
+        error = ""
+    metrics = check_metrics(time.perf_counter() - started, time.thread_time() - cpu_started,
+                            mode="in-process")
+    if report is None:
+        return {"passed": False, "output": "", "error": error, "report": None, "metrics": metrics}
+    return {
+        "passed": bool(report.get("passed")),
+        "output": json.dumps(report, indent=2, default=str),
+        "error": "",
+        "report": report,
+        "metrics": metrics
+    }
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Check Scheduler - Antigravity Kit
+=================================
+
+Runs validation checks as a dependency DAG with priorities, used by
+checklist.py and verify_all.py.
+
+Most checks (UX audit, SEO, GEO, i18n, mobile, schema validation) are
+independent and I/O-bound, so ready checks run concurrently on a thread pool.
+A check becomes ready once all checks it depends on have finished; among
+ready checks, lower priority numbers start first.
+
+With fail_fast, the gate checks (required checks of the highest priority,
+i.e. the security scan) run alone first, and no new check is started once
+a required check fails.
+
+Usage:
+    scheduler = CheckScheduler(checks, run_check, workers=4, fail_fast=True)
+    results = scheduler.run()
+    print_critical_path(results)
+"""
+
+import time
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_WORKERS = 4
+
+
+class CheckScheduler:
+    """Dependency-aware, priority-ordered concurrent check runner"""
+
+    def __init__(self, checks: List[dict], run_check: Callable[[dict], dict],
+                 workers: int = DEFAULT_WORKERS, fail_fast: bool = False):
+        """
+        checks: dicts with "name", "priority", "required" and optional
+                "depends_on" (names of checks that must finish first).
+        run_check: runs one check and returns its result dict ("passed", "skipped").
+        """
+        self.checks = checks
+        self.run_check = run_check
+        self.workers = max(1, workers)
+        self.fail_fast = fail_fast
+        self.order = {check["name"]: i for i, check in enumerate(checks)}
+        self.depends_on = self._build_dependencies()
+
+    def _build_dependencies(self) -> Dict[str, set]:
+        names = set(self.order)
+        depends_on = {c["name"]: set(d for d in c.get("depends_on", []) if d in names) for c in self.checks}
+        if self.fail_fast and self.checks:
+            top = min(c["priority"] for c in self.checks)
+            gates = {c["name"] for c in self.checks if c["priority"] == top and c.get("required")}
+            for name in depends_on:
+                if name not in gates:
+                    depends_on[name] |= gates
+        return depends_on
+
+    def run(self) -> List[dict]:
+        """Run all checks; returns results in declaration order with timing attached."""
+        start = time.perf_counter()
+        by_name = {c["name"]: c for c in self.checks}
+        waiting = {name: set(deps) for name, deps in self.depends_on.items()}
+        ready = []
+        results: Dict[str, dict] = {}
+        stopped = False
+
+        def release(name: Optional[str] = None):
+            for other, deps in list(waiting.items()):
+                deps.discard(name)
+                if not deps:
+                    del waiting[other]
+                    check = by_name[other]
+                    heapq.heappush(ready, (check["priority"], self.order[other], other))
+
+        release()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = {}
+            while (ready and not stopped) or running:
+                while ready and not stopped and len(running) < self.workers:
+                    _, _, name = heapq.heappop(ready)
+                    started = time.perf_counter() - start
+                    future = executor.submit(self.run_check, by_name[name])
+                    running[future] = (name, started)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"name": name, "passed": False, "skipped": False, "error": str(e)}
+                    result["started"] = started
+                    result["finished"] = time.perf_counter() - start
+                    result["depends_on"] = sorted(self.depends_on[name])
+                    results[name] = result
+
+                    if (self.fail_fast and by_name[name].get("required")
+                            and not result["passed"] and not result.get("skipped")):
+                        result["stopped_run"] = True
+                        stopped = True
+                    release(name)
+
+        return sorted(results.values(), key=lambda r: self.order[r["name"]])
+
+
+def critical_path(results: List[dict]) -> List[dict]:
+    """
+    Chain of checks that determined the wall time: start from the check that
+    finished last and walk back through the dependency that finished last.
+    """
+    timed = {r["name"]: r for r in results if "finished" in r}
+    if not timed:
+        return []
+    path = [max(timed.values(), key=lambda r: r["finished"])]
+    while True:
+        deps = [timed[d] for d in path[-1].get("depends_on", []) if d in timed]
+        if not deps:
+            break
+        path.append(max(deps, key=lambda r: r["finished"]))
+    return list(reversed(path))
+
+
+def print_critical_path(results: List[dict]) -> None:
+    """Print critical-path and concurrency timing summary."""
+    path = critical_path(results)
+    if not path:
+        return
+    wall = max(r["finished"] for r in results if "finished" in r)
+    busy = sum(r["finished"] - r["started"] for r in results if "finished" in r)
+    chain = " → ".join(f"{r['name']} ({r['finished'] - r['started']:.1f}s)" for r in path)
+
+    print(f"Critical Path: {chain}")
+    print(f"Check Time: {busy:.1f}s total, {wall:.1f}s wall ({busy / wall if wall else 1:.1f}x concurrency)")
+    print()
@@ -9,6 +9,30 @@ Use this for incremental validation during development.
 Usage:
     python scripts/checklist.py .                    # Run core checks
     python scripts/checklist.py . --url <URL>        # Include performance checks
+    python scripts/checklist.py . --workers 1        # Run checks one at a time
+    python scripts/checklist.py . --isolated         # One subprocess per check
+    python scripts/checklist.py . --trend 30         # p50/p95 per check, last 30 runs
+    python scripts/checklist.py . --changed-since HEAD   # Pre-commit: changed files only
+
+Checks run concurrently (see check_scheduler.py). The security scan runs
+first and a failing required check stops the checklist, unless
+--no-fail-fast is given.
+
+Audit scripts that expose run(context) (see check_context.py) execute
+in-process and share one file inventory; --isolated runs every check as a
+subprocess instead (audit scripts then stream NDJSON findings, see
+finding_stream.py). Findings are counted as they are found and a progress
+line is printed while checks run. Subprocess checks run under
+process_supervisor.py (streamed output, SIGTERM then SIGKILL on timeout).
+Each run's results, durations, CPU time and peak RSS are stored in SQLite
+(see trend_store.py); --trend reports them and flags regressions.
+
+With --changed-since <ref>, file-level checks only see the files that
+differ from ref (committed, staged or unstaged, plus untracked files): the
+shared inventory is built from git instead of a tree walk and subprocess
+checks receive the list through CHECK_SCOPE (see file_inventory.py). The
+dependency audit (npm audit) is skipped unless a manifest or lock file
+changed.
 
 Priority Order:
     P0: Security Scan (vulnerabilities, secrets)
@@ -20,11 +44,22 @@ Priority Order:
     P6: Performance (lighthouse - requires URL)
 """
 
+import os
 import sys
-import subprocess
+import time
+import atexit
 import argparse
+import tempfile
+import subprocess
 from pathlib import Path
 from typing import List, Tuple, Optional
+from audit_cache import last_run_stats
+from check_scheduler import CheckScheduler, DEFAULT_WORKERS, print_critical_path
+from check_context import CheckContext, load_check, run_in_process
+from file_inventory import SCOPE_ENV, git_changed_files
+from finding_stream import LiveProgress, run_streaming
+from process_supervisor import supervise
+from trend_store import DEFAULT_RUNS, DEFAULT_THRESHOLD, print_trend, record_run
 
 # ANSI colors for terminal output
 class Colors:
@@ -69,11 +104,19 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
+# Checks that must not overlap with others: performance numbers are skewed
+# by concurrent load, so they wait for all core checks and for each other.
+CHECK_DEPENDENCIES = {
+    "Lighthouse Audit": [name for name, _, _ in CORE_CHECKS],
+    "Playwright E2E": [name for name, _, _ in CORE_CHECKS] + ["Lighthouse Audit"],
+}
+
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               context: Optional[CheckContext] = None, progress: Optional[LiveProgress] = None) -> dict:
     """
     Run a validation script and capture results
     
@@ -92,35 +135,46 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         cmd.append(url)
     
     # Run script
+    started = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        # Scripts exposing run(context) execute in-process on the shared context
+        result = run_in_process(script_path, context) if context is not None else None
+        if result is None and load_check(script_path) is not None:
+            # Isolated audit scripts stream their findings (--ndjson) as they run
+            result = run_streaming(cmd, progress.finding if progress else None, timeout=300)
+        if result is None:
+            proc = supervise(cmd, soft_timeout=300)  # 5 minute timeout
+            result = {"passed": proc["returncode"] == 0, "output": proc["stdout"],
+                      "error": proc["stderr"], "metrics": proc["metrics"]}
+        
+        metrics = result.get("metrics")
+        if metrics and metrics["timed_out"]:
+            print_error(f"{name}: TIMEOUT (>5 minutes, stopped by {'SIGKILL' if metrics['timed_out'] == 'hard' else 'SIGTERM'})")
+            return {"name": name, "passed": False, "output": result["output"], "error": "Timeout",
+                    "skipped": False, "metrics": metrics}
         
-        passed = result.returncode == 0
+        passed = result["passed"]
+        cache = last_run_stats(script_path.stem, since=started)
+        cache_str = f" (cache: {cache['hit_ratio']:.0%} unchanged)" if cache else ""
         
         if passed:
-            print_success(f"{name}: PASSED")
+            print_success(f"{name}: PASSED{cache_str}")
         else:
-            print_error(f"{name}: FAILED")
-            if result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+            print_error(f"{name}: FAILED{cache_str}")
+            if result["error"]:
+                print(f"  Error: {result['error'][:200]}")
         
         return {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
-            "skipped": False
+            "output": result["output"],
+            "error": result["error"],
+            "report": result.get("report"),
+            "skipped": False,
+            "cache": cache,
+            "metrics": metrics
         }
     
-    except subprocess.TimeoutExpired:
-        print_error(f"{name}: TIMEOUT (>5 minutes)")
-        return {"name": name, "passed": False, "output": "", "error": "Timeout", "skipped": False}
-    
     except Exception as e:
         print_error(f"{name}: ERROR - {str(e)}")
         return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
@@ -151,6 +205,7 @@ def print_summary(results: List[dict]):
         print(f"{status} {r['name']}")
     
     print()
+    print_critical_path(results)
     
     if failed_count > 0:
         print_error(f"{failed_count} check(s) FAILED - Please fix before proceeding")
@@ -172,6 +227,17 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run every check as a subprocess instead of in-process")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Checks run concurrently (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--trend", type=int, nargs="?", const=DEFAULT_RUNS, metavar="N",
+                        help=f"Show p50/p95 duration per check over the last N runs (default: {DEFAULT_RUNS})")
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_THRESHOLD, metavar="FRACTION",
+                        help=f"Flag checks whose duration exceeds the p50 by more than this (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--fail-fast", action=argparse.BooleanOptionalAction, default=True,
+                        help="Run the security gate first and stop when a required check fails (default: on)")
+    parser.add_argument("--changed-since", metavar="REF",
+                        help="Only audit files changed since a git ref (e.g. HEAD, origin/main)")
     
     args = parser.parse_args()
     
@@ -185,28 +251,61 @@ Examples:
     print(f"Project: {project_path}")
     print(f"URL: {args.url if args.url else 'Not provided (performance checks skipped)'}")
     
-    results = []
-    
-    # Run core checks
-    print_header("📋 CORE CHECKS")
-    for name, script_path, required in CORE_CHECKS:
-        script = project_path / script_path
-        result = run_script(name, script, str(project_path))
-        results.append(result)
-        
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
-            print_error(f"CRITICAL: {name} failed. Stopping checklist.")
-            print_summary(results)
+    scope = None
+    if args.changed_since:
+        try:
+            scope = git_changed_files(project_path, args.changed_since)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print_error(f"Cannot list changes since {args.changed_since}: {getattr(e, 'stderr', None) or e}")
             sys.exit(1)
+        print(f"Scope: {len(scope)} file(s) changed since {args.changed_since}")
+        # Subprocess checks read the scope from a file named in the environment
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", prefix="check_scope_", delete=False,
+                                         encoding="utf-8") as f:
+            f.writelines(f"{path}\n" for path in scope)
+        atexit.register(os.unlink, f.name)
+        os.environ[SCOPE_ENV] = f.name
     
-    # Run performance checks if URL provided
+    # Build the check DAG: priority follows declaration order
+    checks = []
+    selected = list(CORE_CHECKS)
     if args.url and not args.skip_performance:
-        print_header("⚡ PERFORMANCE CHECKS")
-        for name, script_path, required in PERFORMANCE_CHECKS:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            results.append(result)
+        selected += PERFORMANCE_CHECKS
+    for priority, (name, script_path, required) in enumerate(selected):
+        checks.append({
+            "name": name,
+            "script": project_path / script_path,
+            "required": required,
+            "priority": priority,
+            "depends_on": CHECK_DEPENDENCIES.get(name, []),
+        })
+    
+    # One file inventory and content cache shared by all in-process checks
+    context = None if args.isolated else CheckContext(project_path, args.url, scope)
+    # Findings are counted as checks report them, with a periodic progress line
+    progress = LiveProgress()
+    if context is not None:
+        context.on_finding = progress.finding
+    
+    def run_check(check: dict) -> dict:
+        return run_script(check["name"], check["script"], str(project_path), args.url, context, progress)
+    
+    print_header(f"📋 CHECKS ({args.workers} worker{'s' if args.workers != 1 else ''})")
+    scheduler = CheckScheduler(checks, run_check, workers=args.workers, fail_fast=args.fail_fast)
+    results = scheduler.run()
+    # Scoped runs are much cheaper, so their trend is kept apart
+    runner = "checklist" if scope is None else "checklist:changed"
+    record_run(runner, project_path, results)
+    if args.trend:
+        print_header("📈 CHECK TRENDS")
+        print_trend(runner, args.trend, args.regression_threshold)
+    
+    # If a required check failed, stop
+    for result in results:
+        if result.get("stopped_run"):
+            print_error(f"CRITICAL: {result['name']} failed. Stopping checklist.")
+            print_summary(results)
+            sys.exit(1)
     
     # Print summary
     all_passed = print_summary(results)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+File Inventory - Antigravity Kit
+================================
+
+One project file listing shared by the .agent scripts (session_manager and
+the audit scripts, through check_context.CheckContext).
+
+The tree is walked once with os.scandir. Always-ignored directories
+(.git, node_modules, __pycache__) and paths matched by .gitignore files are
+pruned before descending. Files are classified by extension during the walk,
+so each checker only filters a prepared list by suffix and by its own skip
+directories.
+
+An inventory can instead be scoped to an explicit list of files (for
+example git_changed_files(), used by checklist.py --changed-since); the
+tree is then not walked at all. The orchestrator passes the scope to check
+subprocesses through the CHECK_SCOPE environment variable.
+
+Usage:
+    inventory = get_inventory(project_path)
+    pages = inventory.select(['.html', '.tsx'], skip_dirs={'dist', 'build'})
+
+    changed = git_changed_files(project_path, "HEAD")
+    inventory = FileInventory(project_path, paths=changed)
+
+    python .agent/scripts/file_inventory.py [path]    # Files per extension
+"""
+
+import os
+import re
+import sys
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Never audited by any check; pruned during the walk
+ALWAYS_SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+# Path of a file listing the files in scope, one per line (see env_scope)
+SCOPE_ENV = 'CHECK_SCOPE'
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without leading/trailing slash) to a regex."""
+    regex = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            regex.append('/.*')
+            i += 3
+        elif pattern[i] == '*':
+            regex.append('.*' if pattern.startswith('**', i) else '[^/]*')
+            i += 2 if pattern.startswith('**', i) else 1
+        elif pattern[i] == '?':
+            regex.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                regex.append(re.escape('['))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end + 1
+        elif pattern[i] == '\\' and i + 1 < n:
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(regex)
+
+
+class GitIgnore:
+    """Rules of one .gitignore file; paths are matched relative to its directory"""
+
+    def __init__(self, lines: Iterable[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negated, dir_only)
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            # A slash anywhere but the end anchors the pattern to this directory
+            anchored = '/' in line
+            body = _translate(line.lstrip('/'))
+            regex = '^' + body + '$' if anchored else '^(?:.*/)?' + body + '$'
+            self.rules.append((re.compile(regex), negated, dir_only))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['GitIgnore']:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                ignore = cls(f)
+        except OSError:
+            return None
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no rule matches (last rule wins)"""
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
+class FileInventory:
+    """Files of a project in os.walk order, classified by extension"""
+
+    def __init__(self, root, use_gitignore: bool = True, paths: Optional[Iterable[Path]] = None):
+        self.root = Path(root).resolve()
+        self.use_gitignore = use_gitignore
+        # (path, directory names relative to root) per file
+        self.entries: List[Tuple[Path, Tuple[str, ...]]] = []
+        self.by_suffix: Dict[str, List[int]] = defaultdict(list)
+        self.scoped = paths is not None
+        if paths is None:
+            self._walk()
+        else:
+            self._add_paths(paths)
+
+    def _add_paths(self, paths: Iterable[Path]) -> None:
+        """Inventory exactly the given files (those under root that exist)"""
+        for path in paths:
+            path = Path(path).resolve()
+            try:
+                parts = path.relative_to(self.root).parts[:-1]
+            except ValueError:
+                continue
+            if ALWAYS_SKIP_DIRS.intersection(parts) or not path.is_file():
+                continue
+            self.by_suffix[path.suffix].append(len(self.entries))
+            self.entries.append((path, parts))
+
+    def _walk(self) -> None:
+        # Each stack frame: (directory, relative parts, active .gitignore files)
+        stack = [(str(self.root), (), [])]
+        while stack:
+            directory, parts, ignores = stack.pop()
+            if self.use_gitignore:
+                ignore = GitIgnore.load(Path(directory) / '.gitignore')
+                if ignore:
+                    ignores = ignores + [(len(parts), ignore)]
+
+            files, subdirs = [], []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                            # Symlinked directories are not followed, like os.walk
+                            if is_dir and entry.is_symlink():
+                                continue
+                        except OSError:
+                            continue
+                        if is_dir and entry.name in ALWAYS_SKIP_DIRS:
+                            continue
+                        if ignores and self._ignored(parts + (entry.name,), is_dir, ignores):
+                            continue
+                        (subdirs if is_dir else files).append(entry)
+            except OSError:
+                continue
+
+            for entry in files:
+                self.by_suffix[os.path.splitext(entry.name)[1]].append(len(self.entries))
+                self.entries.append((Path(entry.path), parts))
+            # Depth-first, in listing order (reversed for the stack), like os.walk
+            for entry in reversed(subdirs):
+                stack.append((entry.path, parts + (entry.name,), ignores))
+
+    @staticmethod
+    def _ignored(parts: Tuple[str, ...], is_dir: bool, ignores: list) -> bool:
+        # Deeper .gitignore files take precedence over their parents
+        for depth, ignore in reversed(ignores):
+            result = ignore.match('/'.join(parts[depth:]), is_dir)
+            if result is not None:
+                return result
+        return False
+
+    @property
+    def files(self) -> List[Path]:
+        return [path for path, _ in self.entries]
+
+    def select(self, suffixes: Optional[Iterable[str]] = None,
+               skip_dirs: Iterable[str] = ()) -> List[Path]:
+        """
+        Files with the given suffixes (grouped in the order given, like
+        successive globs), outside directories named in skip_dirs.
+        """
+        skip_dirs = set(skip_dirs)
+        if suffixes is None:
+            indices = range(len(self.entries))
+        else:
+            indices = [i for suffix in suffixes for i in self.by_suffix.get(suffix, [])]
+        entries = self.entries
+        return [entries[i][0] for i in indices if not skip_dirs.intersection(entries[i][1])]
+
+
+_INVENTORIES: Dict[Path, FileInventory] = {}
+
+
+def get_inventory(root) -> FileInventory:
+    """Inventory of root, built once per process (scoped if CHECK_SCOPE is set)"""
+    root = Path(root).resolve()
+    if root not in _INVENTORIES:
+        _INVENTORIES[root] = FileInventory(root, paths=env_scope())
+    return _INVENTORIES[root]
+
+
+def env_scope() -> Optional[List[Path]]:
+    """Files listed in the CHECK_SCOPE file, or None when no scope is set"""
+    scope_file = os.environ.get(SCOPE_ENV)
+    if not scope_file:
+        return None
+    try:
+        with open(scope_file, encoding='utf-8') as f:
+            return [Path(line.rstrip('\n')) for line in f if line.strip()]
+    except OSError:
+        return None
+
+
+def git_changed_files(root, ref: str) -> List[Path]:
+    """
+    Files under root that differ from ref (committed, staged or unstaged)
+    plus untracked, not ignored files; deleted files are left out. Raises
+    subprocess.CalledProcessError if root is not in a git work tree or ref
+    is unknown.
+    """
+    root = Path(root).resolve()
+
+    def git(*args: str) -> List[str]:
+        proc = subprocess.run(['git', '-C', str(root), *args], capture_output=True,
+                              text=True, encoding='utf-8', check=True)
+        return [name for name in proc.stdout.split('\0') if name]
+
+    toplevel = Path(git('rev-parse', '--show-toplevel')[0].strip())
+    names = git('diff', '--name-only', '-z', '--diff-filter=d', ref, '--')
+    names += git('ls-files', '--others', '--exclude-standard', '-z', '--full-name')
+    changed = []
+    for name in dict.fromkeys(names):
+        path = toplevel / name
+        if path.is_relative_to(root) and path.is_file():
+            changed.append(path)
+    return changed
+
+
+def main():
+    inventory = get_inventory(sys.argv[1] if len(sys.argv) > 1 else ".")
+    print(f"{len(inventory.entries)} files in {inventory.root}")
+    for suffix, indices in sorted(inventory.by_suffix.items(), key=lambda item: -len(item[1])):
+        print(f"  {suffix or '(none)':<12} {len(indices):>6}")
+
+
+if __name__ == "__main__":
+    main()
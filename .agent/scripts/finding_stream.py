@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Finding Stream - Antigravity Kit
+================================
+
+Streaming (NDJSON) output of audit findings, shared by the audit scripts and
+the orchestrators (checklist.py, verify_all.py).
+
+Audit scripts add each finding to a Findings collector as soon as it is
+discovered. The collector hands it to the CheckContext's on_finding sink and
+keeps it for the final JSON report only if context.keep_findings is set, so
+a streaming run holds counts, not findings, however large the project.
+
+With --ndjson, an audit script writes one JSON object per line to stdout:
+
+    {"type": "finding", "check": "seo_checker", "kind": "page", "finding": {...}}
+    {"type": "report", "check": "seo_checker", "report": {...}}
+
+The report record comes last; its findings lists are empty (the findings
+were streamed) while its counts cover every finding.
+
+Usage (audit script):
+    issues = Findings(context, "my_checker", "file")
+    issues.append({"file": "index.html", "issues": [...]})
+
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(path), "my_checker")
+"""
+
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from process_supervisor import supervise
+
+
+class Findings:
+    """Findings of one check: streamed as they are found, kept unless streaming"""
+
+    def __init__(self, context, check: str, kind: Optional[str] = None):
+        self.context = context
+        self.check = check
+        self.kind = kind
+        self.items: List[Any] = []
+        self.count = 0
+        self.by_severity: Counter = Counter()
+
+    def append(self, finding: Any) -> None:
+        self.count += 1
+        if isinstance(finding, dict) and "severity" in finding:
+            self.by_severity[finding["severity"]] += 1
+        if self.context is not None:
+            self.context.emit(self.check, self.kind, finding)
+            if not self.context.keep_findings:
+                return
+        self.items.append(finding)
+
+    def extend(self, findings: Iterable[Any]) -> None:
+        for finding in findings:
+            self.append(finding)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class NdjsonWriter:
+    """Writes finding and report records as NDJSON lines, flushed per line"""
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self._lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def finding(self, check: str, kind: Optional[str], finding: Any) -> None:
+        self.write({"type": "finding", "check": check, "kind": kind, "finding": finding})
+
+    def report(self, check: str, report: dict) -> None:
+        self.write({"type": "report", "check": check, "report": report})
+
+
+def stream_report(run: Callable[[Any], dict], context, check: str) -> dict:
+    """
+    Run a check with its findings streamed to stdout as NDJSON, followed by
+    the report record. Returns the report.
+    """
+    writer = NdjsonWriter()
+    context.on_finding = writer.finding
+    context.keep_findings = False
+    report = run(context)
+    writer.report(check, report)
+    return report
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[dict]:
+    """Records of an NDJSON stream; lines that are not JSON objects are skipped."""
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            yield record
+
+
+def run_streaming(cmd: List[str], on_finding: Optional[Callable] = None,
+                  timeout: float = 300) -> dict:
+    """
+    Run an audit script with --ndjson as a supervised subprocess, consuming
+    its findings as they arrive. Returns an orchestrator result (passed,
+    output, error, report, metrics); output is the final report as JSON.
+    A check stopped at the timeout has metrics["timed_out"] set.
+    """
+    records: Dict[str, Any] = {}
+
+    def on_line(line: str) -> None:
+        for record in read_ndjson([line]):
+            if record.get("type") == "finding" and on_finding:
+                on_finding(record.get("check"), record.get("kind"), record.get("finding"))
+            elif record.get("type") == "report":
+                records["report"] = record.get("report")
+
+    proc = supervise(cmd + ["--ndjson"], soft_timeout=timeout, on_line=on_line)
+    report = records.get("report")
+    return {
+        "passed": proc["returncode"] == 0,
+        "output": json.dumps(report, indent=2) if report is not None else "",
+        "error": proc["stderr"],
+        "report": report,
+        "metrics": proc["metrics"]
+    }
+
+
+class LiveProgress:
+    """Running finding counts per check, printed at most once per interval"""
+
+    def __init__(self, interval: float = 2.0, out=None):
+        self.interval = interval
+        self.out = out or sys.stdout
+        self.counts: Dict[str, int] = {}
+        self._last = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def finding(self, check: str, kind: Optional[str], finding: Any) -> None:
+        with self._lock:
+            self.counts[check] = self.counts.get(check, 0) + 1
+            now = time.perf_counter()
+            if now - self._last < self.interval:
+                return
+            self._last = now
+            line = self.line()
+        print(line, file=self.out, flush=True)
+
+    def line(self) -> str:
+        total = sum(self.counts.values())
+        by_check = ", ".join(f"{check} {count}" for check, count in self.counts.items())
+        return f"  … {total} findings so far ({by_check})"
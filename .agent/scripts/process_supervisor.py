@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Process Supervisor - Antigravity Kit
+====================================
+
+Runs check subprocesses for checklist.py and verify_all.py with streamed
+output, timeouts and resource accounting.
+
+Child stdout and stderr are read through non-blocking pipes as they are
+written (stdout optionally line by line to a callback), and only the last
+MAX_CAPTURE bytes of each are kept, so a chatty check can neither block on
+a full pipe nor fill the orchestrator's memory.
+
+At the soft timeout the child gets SIGTERM; if it is still running at the
+hard timeout it gets SIGKILL. Wall time, CPU time (user + system) and peak
+RSS of the child come from os.wait4; the orchestrators store them per check
+in the trend store (see trend_store.py), so checks that are getting more
+expensive stand out.
+
+Usage:
+    result = supervise(cmd, soft_timeout=300, on_line=print)
+    result["returncode"], result["stdout"], result["metrics"]["cpu_time"]
+"""
+
+import os
+import sys
+import time
+import selectors
+import subprocess
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Seconds between SIGTERM (soft timeout) and SIGKILL (hard timeout)
+KILL_GRACE = 10
+# Bytes of stdout/stderr kept per check (the tail)
+MAX_CAPTURE = 256 * 1024
+
+
+class _Tail:
+    """The last `limit` bytes written to a stream"""
+
+    def __init__(self, limit: int = MAX_CAPTURE):
+        self.limit = limit
+        self.chunks: deque = deque()
+        self.size = 0
+
+    def add(self, data: bytes) -> None:
+        self.chunks.append(data)
+        self.size += len(data)
+        while self.size > self.limit:
+            excess = self.size - self.limit
+            head = self.chunks[0]
+            if len(head) <= excess:
+                self.chunks.popleft()
+                self.size -= len(head)
+            else:
+                self.chunks[0] = head[excess:]
+                self.size -= excess
+
+    def text(self) -> str:
+        return b"".join(self.chunks).decode("utf-8", errors="replace")
+
+
+def check_metrics(wall_time: float, cpu_time: Optional[float] = None,
+                  peak_rss_kb: Optional[int] = None, timed_out: Optional[str] = None,
+                  mode: str = "subprocess") -> Dict[str, Any]:
+    """
+    Resource metrics of one check run. timed_out is None, "soft" (stopped
+    by SIGTERM) or "hard" (SIGKILL); mode is "subprocess" or "in-process".
+    """
+    return {
+        "mode": mode,
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "peak_rss_kb": peak_rss_kb,
+        "timed_out": timed_out,
+    }
+
+
+def supervise(cmd: List[str], soft_timeout: float, hard_timeout: Optional[float] = None,
+              on_line: Optional[Callable[[str], None]] = None, cwd=None) -> Dict[str, Any]:
+    """
+    Run cmd to completion under the soft/hard timeouts.
+
+    Returns returncode, stdout and stderr (tails) and metrics (see
+    check_metrics); cpu_time and peak_rss_kb are None where the platform
+    has no os.wait4.
+    """
+    if hard_timeout is None:
+        hard_timeout = soft_timeout + KILL_GRACE
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+
+    if os.name == "nt":
+        # No select() on pipes and no wait4 on Windows: buffered fallback
+        timed_out = None
+        try:
+            stdout, stderr = proc.communicate(timeout=soft_timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, stderr = proc.communicate()
+            timed_out = "hard"
+        out = stdout.decode("utf-8", errors="replace")
+        if on_line:
+            for line in out.splitlines():
+                on_line(line)
+        return {
+            "returncode": proc.returncode,
+            "stdout": out[-MAX_CAPTURE:],
+            "stderr": stderr.decode("utf-8", errors="replace")[-MAX_CAPTURE:],
+            "metrics": check_metrics(time.perf_counter() - start, timed_out=timed_out),
+        }
+
+    out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+    tails = {out_fd: _Tail(), err_fd: _Tail()}
+    partial = bytearray()  # Unterminated last stdout line, for on_line
+    selector = selectors.DefaultSelector()
+    for pipe in (proc.stdout, proc.stderr):
+        os.set_blocking(pipe.fileno(), False)
+        selector.register(pipe.fileno(), selectors.EVENT_READ)
+
+    timed_out = None
+    usage = status = None
+    while True:
+        elapsed = time.perf_counter() - start
+        if timed_out is None and elapsed >= soft_timeout:
+            proc.terminate()
+            timed_out = "soft"
+        if timed_out == "soft" and elapsed >= hard_timeout:
+            proc.kill()
+            timed_out = "hard"
+
+        if selector.get_map():
+            next_deadline = soft_timeout if timed_out is None else hard_timeout
+            wait = min(max(next_deadline - elapsed, 0.0), 0.5) if timed_out != "hard" else 0.1
+            for key, _ in selector.select(wait):
+                try:
+                    data = os.read(key.fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    selector.unregister(key.fd)
+                    continue
+                tails[key.fd].add(data)
+                if on_line and key.fd == out_fd:
+                    partial.extend(data)
+                    *lines, rest = partial.split(b"\n")
+                    partial[:] = rest
+                    for line in lines:
+                        on_line(line.decode("utf-8", errors="replace"))
+            # Killed, but a grandchild still holds the pipes open
+            if timed_out == "hard" and elapsed >= hard_timeout + KILL_GRACE:
+                break
+            continue
+
+        pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            break
+        time.sleep(0.05)
+
+    if usage is None:
+        _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    for pipe in (proc.stdout, proc.stderr):
+        pipe.close()
+    selector.close()
+    if on_line and partial:
+        on_line(partial.decode("utf-8", errors="replace"))
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {
+        "returncode": proc.returncode,
+        "stdout": tails[out_fd].text(),
+        "stderr": tails[err_fd].text(),
+        "metrics": check_metrics(time.perf_counter() - start, usage.ru_utime + usage.ru_stime,
+                                 peak_rss, timed_out),
+    }
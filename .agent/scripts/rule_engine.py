@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Rule Engine - Antigravity Kit
+=============================
+
+Declarative regex rule tables for the audit scripts (ux_audit, mobile_audit)
+and the literal prefilter shared with security_scan.
+
+A RuleSet compiles its patterns once at import. Per file, RuleSet.scan()
+returns a RuleMatches object that evaluates each rule at most once (rules
+and checks that use the same pattern share the result) and skips the regex
+entirely when a literal the pattern requires is absent from the file.
+
+Python's re cannot report which alternatives of a combined pattern match
+in a single pass, so related patterns are grouped by their required
+literals instead. For an alternation of plain words (r'step|wizard|stage'),
+search() is answered from the literal check alone.
+
+Usage:
+    RULES = RuleSet({
+        'form_fields': (r'<input|<select|<textarea', re.IGNORECASE),
+        'has_primary': (r'primary|variant=["\']primary', 0),
+    })
+
+    rules = RULES.scan(content)
+    if rules.search('has_primary'): ...
+    count = len(rules.findall('form_fields'))
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to ASCII letters
+# (dotted/dotless i, long s, Kelvin sign). str.lower() does not fold them the
+# same way, so the case-insensitive prefilter is disabled when they occur.
+_CASE_FOLD_HAZARDS = re.compile('[İıſK]')
+
+# {m}, {m,} and {m,n} repetition; any other '{' is a literal character
+_QUANTIFIER = re.compile(r'\{\d+(?:,\d*)?\}')
+
+
+def _literal_runs(pattern: str) -> Tuple[List[str], bool]:
+    """
+    Literal runs that every match of a single alternative contains, and
+    whether the alternative is nothing but one plain literal. Groups and
+    classes are skipped, so this is a cheap analysis, not a regex parser.
+    """
+    runs, run = [], []
+    pure = True
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in '([':
+            # Skip the group/class; a literal run cannot span it
+            depth, close = 0, ')' if char == '(' else ']'
+            while i < len(pattern):
+                if pattern[i] == '\\':
+                    i += 2
+                    continue
+                if char == '(' and pattern[i] == '(':
+                    depth += 1
+                elif pattern[i] == close:
+                    depth -= 1
+                    if depth <= 0:
+                        break
+                i += 1
+            runs.append(''.join(run))
+            run = []
+            pure = False
+            i += 1
+            continue
+        quantifier = _QUANTIFIER.match(pattern, i) if char == '{' else None
+        if quantifier:
+            literal, step = None, quantifier.end() - i
+        elif char == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            literal, step = pattern[i + 1], 2
+        elif char in '.^$*+?{}\\':
+            literal, step = None, 2 if char == '\\' else 1
+        else:
+            literal, step = char, 1
+        if literal is None:
+            runs.append(''.join(run))
+            run = []
+            pure = False
+        elif pattern[i + step:i + step + 1] in ('*', '?', '{'):
+            runs.append(''.join(run))  # quantified, so not guaranteed to appear
+            run = []
+            pure = False
+        else:
+            run.append(literal)
+        i += step
+    runs.append(''.join(run))
+    return runs, pure
+
+
+def split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern on its top-level '|' (not inside groups or classes)."""
+    parts, start, depth, in_class = [], 0, 0, False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal member
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def required_literal(pattern: str) -> str:
+    """
+    Longest lowercased literal run that every match of a pattern contains,
+    or '' if none can be found (including any top-level alternation).
+    """
+    if len(split_alternatives(pattern)) > 1:
+        return ''
+    runs, _ = _literal_runs(pattern)
+    return max(runs, key=len).lower()
+
+
+class Rule:
+    """One compiled pattern with its literal prefilter"""
+
+    __slots__ = ('name', 'regex', 'ignorecase', 'literals', 'pure')
+
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.regex = re.compile(pattern, flags)
+        self.ignorecase = bool(flags & re.IGNORECASE)
+
+        # One required literal per alternative; any match contains one of them
+        literals, pure = [], True
+        for alternative in split_alternatives(pattern):
+            runs, alternative_pure = _literal_runs(alternative)
+            literal = max(runs, key=len)
+            if not literal or not literal.isascii():
+                literals = None
+                break
+            literals.append(literal.lower() if self.ignorecase else literal)
+            pure = pure and alternative_pure
+        self.literals: Optional[List[str]] = literals
+        # Plain-word alternation: the literal check is the whole search
+        self.pure = literals is not None and pure and not flags & re.VERBOSE
+
+
+class RuleSet:
+    """Named rules compiled once"""
+
+    def __init__(self, rules: Dict[str, Tuple[str, int]]):
+        self.rules = {name: Rule(name, pattern, flags) for name, (pattern, flags) in rules.items()}
+
+    def scan(self, content: str) -> 'RuleMatches':
+        return RuleMatches(self, content)
+
+
+class RuleMatches:
+    """Memoized evaluation of a RuleSet over one file's content"""
+
+    def __init__(self, ruleset: RuleSet, content: str):
+        self.rules = ruleset.rules
+        self.content = content
+        self._folded: Optional[str] = None
+        self._fold_safe: Optional[bool] = None
+        self._searches: Dict[str, bool] = {}
+        self._findalls: Dict[str, list] = {}
+
+    def _possible(self, rule: Rule) -> Optional[bool]:
+        """False if the rule cannot match, True if it can, None if unknown"""
+        if rule.literals is None:
+            return None
+        if rule.ignorecase:
+            if self._fold_safe is None:
+                self._fold_safe = not _CASE_FOLD_HAZARDS.search(self.content)
+                if self._fold_safe:
+                    self._folded = self.content.lower()
+            if not self._fold_safe:
+                return None
+            text = self._folded
+        else:
+            text = self.content
+        return any(literal in text for literal in rule.literals)
+
+    def search(self, name: str) -> bool:
+        """Whether the rule matches anywhere in the content"""
+        found = self._searches.get(name)
+        if found is None:
+            if name in self._findalls:
+                found = bool(self._findalls[name])
+            else:
+                rule = self.rules[name]
+                possible = self._possible(rule)
+                if possible is False:
+                    found = False
+                elif possible and rule.pure:
+                    found = True
+                else:
+                    found = rule.regex.search(self.content) is not None
+            self._searches[name] = found
+        return found
+
+    def findall(self, name: str) -> list:
+        """re.findall of the rule over the content"""
+        matches = self._findalls.get(name)
+        if matches is None:
+            rule = self.rules[name]
+            if self._searches.get(name) is False or self._possible(rule) is False:
+                matches = []
+            else:
+                matches = rule.regex.findall(self.content)
+            self._findalls[name] = matches
+        return matches
@@ -10,11 +10,11 @@ Usage:
     python .agent/scripts/session_manager.py info [path]
 """
 
-import os
 import json
 import argparse
 from pathlib import Path
 from typing import Dict, Any, List
+from file_inventory import get_inventory
 
 def get_project_root(path: str) -> Path:
     return Path(path).resolve()
@@ -58,9 +58,7 @@ def count_files(root: Path) -> Dict[str, int]:
     # Simple count for now, comprehensive tracking would require git diff or extensive history
     exclude = {".git", "node_modules", ".next", "dist", "build", ".agent", ".gemini", "__pycache__"}
     
-    for root_dir, dirs, files in os.walk(root):
-        dirs[:] = [d for d in dirs if d not in exclude]
-        stats["total"] += len(files)
+    stats["total"] = len(get_inventory(root).select(skip_dirs=exclude))
         
     return stats
 
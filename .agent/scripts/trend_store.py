@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Check Trend Store - Antigravity Kit
+===================================
+
+Historical timing and results of checklist.py / verify_all.py runs.
+
+Every run appends one row per check (result, duration, CPU time, peak RSS,
+cache hit ratio; see process_supervisor.check_metrics) to SQLite under
+.agent/.cache. The trend report shows p50/p95 duration per check over the
+last N runs and flags a check as a regression when its latest duration
+exceeds the p50 of the runs before it by more than the threshold.
+
+Usage:
+    record_run("verify_all", project_path, results)
+
+    python .agent/scripts/trend_store.py                       # verify_all + checklist trends
+    python .agent/scripts/trend_store.py --runner verify_all --runs 50 --threshold 0.25
+    python scripts/verify_all.py . --url <URL> --trend         # Report after the run
+"""
+
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from audit_cache import CACHE_DIR
+
+TREND_DB = CACHE_DIR / "check_trends.db"
+
+DEFAULT_RUNS = 20
+# Latest duration more than 50% above the baseline p50 is a regression
+DEFAULT_THRESHOLD = 0.5
+# Earlier runs needed before a check can be flagged
+MIN_BASELINE = 3
+# Durations below this are noise, never regressions
+MIN_DURATION = 0.5
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(db_path), timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, runner TEXT, project TEXT, started REAL,
+        passed INTEGER)""")
+    db.execute("""CREATE TABLE IF NOT EXISTS results (
+        run_id INTEGER REFERENCES runs(id), check_name TEXT, passed INTEGER, skipped INTEGER,
+        timed_out TEXT, mode TEXT, duration REAL, cpu_time REAL, peak_rss_kb INTEGER,
+        cache_hit_ratio REAL)""")
+    db.execute("CREATE INDEX IF NOT EXISTS results_run ON results (run_id)")
+    return db
+
+
+def _duration(result: dict) -> Optional[float]:
+    """Wall time of a check: scheduler timestamps, else the runner's own timing"""
+    if "finished" in result and "started" in result:
+        return result["finished"] - result["started"]
+    metrics = result.get("metrics") or {}
+    return result.get("duration", metrics.get("wall_time"))
+
+
+def record_run(runner: str, project, results: List[dict],
+               db_path: Optional[Path] = None) -> Optional[int]:
+    """Store the per-check results of one run; returns the run id (None on failure)"""
+    rows = []
+    for result in results:
+        metrics = result.get("metrics") or {}
+        cache = result.get("cache") or {}
+        rows.append((
+            result["name"], bool(result.get("passed")), bool(result.get("skipped")),
+            metrics.get("timed_out"), metrics.get("mode"),
+            None if result.get("skipped") else _duration(result),
+            metrics.get("cpu_time"), metrics.get("peak_rss_kb"), cache.get("hit_ratio"),
+        ))
+    passed = all(r.get("passed") or r.get("skipped") for r in results)
+    try:
+        db = _connect(Path(db_path) if db_path else TREND_DB)
+    except sqlite3.Error:
+        return None  # History is a diagnostic, never a failure
+    try:
+        with db:
+            run_id = db.execute("INSERT INTO runs (runner, project, started, passed) VALUES (?, ?, ?, ?)",
+                                (runner, str(project), time.time(), passed)).lastrowid
+            db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           [(run_id,) + row for row in rows])
+        return run_id
+    except sqlite3.Error:
+        return None
+    finally:
+        db.close()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation between ranks"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def trend(runner: str, runs: int = DEFAULT_RUNS, threshold: float = DEFAULT_THRESHOLD,
+          db_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Per-check duration trend over the runner's last `runs` runs, in check
+    order of the latest run. "regression" is set when the latest duration
+    exceeds the p50 of the earlier runs by more than `threshold` (a fraction).
+    """
+    path = Path(db_path) if db_path else TREND_DB
+    if not path.exists():
+        return []
+    try:
+        db = _connect(path)
+        try:
+            rows = db.execute(
+                "SELECT r.run_id, r.check_name, r.duration, r.passed, r.timed_out, r.cpu_time, "
+                "r.peak_rss_kb FROM results r JOIN (SELECT id FROM runs WHERE runner = ? "
+                "ORDER BY id DESC LIMIT ?) recent ON r.run_id = recent.id "
+                "WHERE NOT r.skipped AND r.duration IS NOT NULL ORDER BY r.run_id, r.rowid",
+                (runner, runs)
+            ).fetchall()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return []
+
+    samples: Dict[str, List[tuple]] = {}
+    for run_id, check, duration, passed, timed_out, cpu_time, peak_rss_kb in rows:
+        samples.setdefault(check, []).append((run_id, duration, passed, timed_out, cpu_time, peak_rss_kb))
+    latest_run = rows[-1][0] if rows else None
+
+    report = []
+    for check, entries in samples.items():
+        durations = [entry[1] for entry in entries]
+        _, latest, passed, timed_out, cpu_time, peak_rss_kb = entries[-1]
+        baseline = durations[:-1]
+        baseline_p50 = percentile(baseline, 50) if baseline else None
+        regression = (
+            entries[-1][0] == latest_run
+            and len(baseline) >= MIN_BASELINE
+            and latest >= MIN_DURATION
+            and latest > baseline_p50 * (1 + threshold)
+        )
+        report.append({
+            "check": check,
+            "runs": len(durations),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "latest": latest,
+            "baseline_p50": baseline_p50,
+            "passed": bool(passed),
+            "timed_out": timed_out,
+            "cpu_time": cpu_time,
+            "peak_rss_kb": peak_rss_kb,
+            "regression": regression,
+        })
+    return report
+
+
+def print_trend(runner: str, runs: int = DEFAULT_RUNS, threshold: float = DEFAULT_THRESHOLD,
+                db_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Print the trend table of a runner; returns the regressed checks"""
+    report = trend(runner, runs, threshold, db_path)
+    if not report:
+        print(f"No {runner} history yet ({Path(db_path) if db_path else TREND_DB})")
+        return []
+    print(f"{runner}: duration over the last {max(r['runs'] for r in report)} runs "
+          f"(regression: latest > baseline p50 +{threshold:.0%})")
+    print(f"  {'Check':<28} {'Runs':>4} {'p50':>7} {'p95':>7} {'Latest':>7} {'CPU':>7} {'RSS':>7}")
+    for row in report:
+        cpu = f"{row['cpu_time']:.1f}s" if row["cpu_time"] is not None else "-"
+        rss = f"{row['peak_rss_kb'] / 1024:.0f}MB" if row["peak_rss_kb"] is not None else "-"
+        flag = ""
+        if row["regression"]:
+            flag = f"  ⚠ REGRESSION ({row['latest'] / row['baseline_p50']:.1f}x p50)" if row["baseline_p50"] else "  ⚠ REGRESSION"
+        elif row["timed_out"]:
+            flag = "  TIMEOUT"
+        print(f"  {row['check']:<28} {row['runs']:>4} {row['p50']:>6.1f}s {row['p95']:>6.1f}s "
+              f"{row['latest']:>6.1f}s {cpu:>7} {rss:>7}{flag}")
+    return [row for row in report if row["regression"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check duration trends")
+    parser.add_argument("--runner", choices=["verify_all", "checklist", "checklist:changed"], action="append",
+                        help="Runner to report (default: verify_all and checklist)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Runs to include (default: {DEFAULT_RUNS})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Regression threshold over the baseline p50, as a fraction (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    for runner in args.runner or ["verify_all", "checklist"]:
+        print_trend(runner, args.runs, args.threshold)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,22 @@ Use this before deployment or major releases.
 
 Usage:
     python scripts/verify_all.py . --url <URL>
+    python scripts/verify_all.py . --url <URL> --workers 8 --fail-fast
+    python scripts/verify_all.py . --url <URL> --trend 30 --regression-threshold 0.25
+
+Independent checks run concurrently (see check_scheduler.py). With
+--fail-fast the security scan runs first and a failing required check
+stops the run. Audit scripts that expose run(context) (see
+check_context.py) execute in-process on a shared file inventory unless
+--isolated is given, in which case they stream NDJSON findings (see
+finding_stream.py). Either way, findings are counted as they are found
+and a progress line is printed while checks run.
+
+Subprocess checks run under process_supervisor.py: output is streamed,
+a check past its timeout gets SIGTERM and then SIGKILL. Each run's
+results, durations, CPU time and peak RSS are stored in SQLite (see
+trend_store.py); --trend shows p50/p95 duration per check over the last
+N runs and flags regressions.
 
 Includes ALL checks:
     ✅ Security Scan (OWASP, secrets, dependencies)
@@ -23,10 +39,16 @@ Includes ALL checks:
 """
 
 import sys
-import subprocess
+import time
 import argparse
 from pathlib import Path
 from typing import List, Dict, Optional
+from audit_cache import last_run_stats
+from check_scheduler import CheckScheduler, DEFAULT_WORKERS, print_critical_path
+from check_context import CheckContext, load_check, run_in_process
+from finding_stream import LiveProgress, run_streaming
+from process_supervisor import supervise
+from trend_store import DEFAULT_RUNS, DEFAULT_THRESHOLD, print_trend, record_run
 from datetime import datetime
 
 # ANSI colors
@@ -147,7 +169,16 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+# Checks that must wait for others. Lighthouse numbers are skewed by
+# concurrent load, and E2E/bundle runs hit the same server.
+CHECK_DEPENDENCIES = {
+    "Lighthouse Audit": ["*"],
+    "Bundle Analysis": ["*", "Lighthouse Audit"],
+    "Playwright E2E": ["*", "Lighthouse Audit", "Bundle Analysis"],
+}
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               context: Optional[CheckContext] = None, progress: Optional[LiveProgress] = None) -> dict:
     """Run validation script"""
     if not script_path.exists():
         print_warning(f"{name}: Script not found, skipping")
@@ -162,43 +193,64 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         cmd.append(url)
     
     # Run
+    started = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout for slow checks
-        )
+        # Scripts exposing run(context) execute in-process on the shared context
+        result = run_in_process(script_path, context) if context is not None else None
+        if result is None and load_check(script_path) is not None:
+            # Isolated audit scripts stream their findings (--ndjson) as they run
+            result = run_streaming(cmd, progress.finding if progress else None, timeout=600)
+        if result is None:
+            proc = supervise(cmd, soft_timeout=600)  # 10 minute timeout for slow checks
+            result = {"passed": proc["returncode"] == 0, "output": proc["stdout"],
+                      "error": proc["stderr"], "metrics": proc["metrics"]}
         
         duration = (datetime.now() - start_time).total_seconds()
-        passed = result.returncode == 0
+        metrics = result.get("metrics")
+        if metrics and metrics["timed_out"]:
+            print_error(f"{name}: TIMEOUT (>{duration:.0f}s, stopped by {'SIGKILL' if metrics['timed_out'] == 'hard' else 'SIGTERM'})")
+            return {"name": name, "passed": False, "skipped": False, "duration": duration,
+                    "error": "Timeout", "metrics": metrics}
+        
+        passed = result["passed"]
+        cache = last_run_stats(script_path.stem, since=started)
+        cache_str = f", cache: {cache['hit_ratio']:.0%} unchanged" if cache else ""
         
         if passed:
-            print_success(f"{name}: PASSED ({duration:.1f}s)")
+            print_success(f"{name}: PASSED ({duration:.1f}s{cache_str})")
         else:
-            print_error(f"{name}: FAILED ({duration:.1f}s)")
-            if result.stderr:
-                print(f"  {result.stderr[:300]}")
+            print_error(f"{name}: FAILED ({duration:.1f}s{cache_str})")
+            if result["error"]:
+                print(f"  {result['error'][:300]}")
         
         return {
             "name": name,
             "passed": passed,
-            "output": result.stdout,
-            "error": result.stderr,
+            "output": result["output"],
+            "error": result["error"],
+            "report": result.get("report"),
             "skipped": False,
-            "duration": duration
+            "duration": duration,
+            "cache": cache,
+            "metrics": metrics
         }
     
-    except subprocess.TimeoutExpired:
-        duration = (datetime.now() - start_time).total_seconds()
-        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
-        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": "Timeout"}
-    
     except Exception as e:
         duration = (datetime.now() - start_time).total_seconds()
         print_error(f"{name}: ERROR - {str(e)}")
         return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
 
+def format_cost(metrics: Optional[dict]) -> str:
+    """CPU time and peak RSS of a check, where measured"""
+    if not metrics:
+        return ""
+    cost = ""
+    if metrics.get("cpu_time") is not None:
+        cost += f", cpu {metrics['cpu_time']:.1f}s"
+    if metrics.get("peak_rss_kb") is not None:
+        cost += f", rss {metrics['peak_rss_kb'] / 1024:.0f}MB"
+    return cost
+
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
@@ -235,10 +287,11 @@ def print_final_report(results: List[dict], start_time: datetime):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
+        duration_str = f"({r.get('duration', 0):.1f}s{format_cost(r.get('metrics'))})" if not r.get("skipped") else ""
         print(f"  {status} {r['name']} {duration_str}")
     
     print()
+    print_critical_path(results)
     
     # Failed checks detail
     if failed > 0:
@@ -273,7 +326,15 @@ Examples:
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
-    parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--fail-fast", "--stop-on-fail", dest="fail_fast", action="store_true",
+                        help="Run the security gate first and stop when a required check fails")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run every check as a subprocess instead of in-process")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Checks run concurrently (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--trend", type=int, nargs="?", const=DEFAULT_RUNS, metavar="N",
+                        help=f"Show p50/p95 duration per check over the last N runs (default: {DEFAULT_RUNS})")
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_THRESHOLD, metavar="FRACTION",
+                        help=f"Flag checks whose duration exceeds the p50 by more than this (default: {DEFAULT_THRESHOLD})")
     
     args = parser.parse_args()
     
@@ -289,10 +350,10 @@ Examples:
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     start_time = datetime.now()
-    results = []
     
-    # Run all verification categories
-    for suite in VERIFICATION_SUITE:
+    # Build the check DAG: priority follows category order
+    checks = []
+    for priority, suite in enumerate(VERIFICATION_SUITE):
         category = suite["category"]
         requires_url = suite.get("requires_url", False)
         
@@ -304,19 +365,47 @@ Examples:
         if args.no_e2e and category == "E2E Testing":
             continue
         
-        print_header(f"📋 {category.upper()}")
-        
         for name, script_path, required in suite["checks"]:
-            script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
-            result["category"] = category
-            results.append(result)
-            
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
-                print_error(f"CRITICAL: {name} failed. Stopping verification.")
-                print_final_report(results, start_time)
-                sys.exit(1)
+            checks.append({
+                "name": name,
+                "category": category,
+                "script": project_path / script_path,
+                "required": required,
+                "priority": priority,
+            })
+    
+    # "*" stands for every check that has no dependencies of its own
+    independent = [c["name"] for c in checks if c["name"] not in CHECK_DEPENDENCIES]
+    for check in checks:
+        deps = CHECK_DEPENDENCIES.get(check["name"], [])
+        check["depends_on"] = [d for dep in deps for d in (independent if dep == "*" else [dep])]
+    
+    # One file inventory and content cache shared by all in-process checks
+    context = None if args.isolated else CheckContext(project_path, args.url)
+    # Findings are counted as checks report them, with a periodic progress line
+    progress = LiveProgress()
+    if context is not None:
+        context.on_finding = progress.finding
+    
+    def run_check(check: dict) -> dict:
+        result = run_script(check["name"], check["script"], str(project_path), args.url, context, progress)
+        result["category"] = check["category"]
+        return result
+    
+    print_header(f"📋 RUNNING {len(checks)} CHECKS ({args.workers} worker{'s' if args.workers != 1 else ''})")
+    scheduler = CheckScheduler(checks, run_check, workers=args.workers, fail_fast=args.fail_fast)
+    results = scheduler.run()
+    record_run("verify_all", project_path, results)
+    if args.trend:
+        print_header("📈 CHECK TRENDS")
+        print_trend("verify_all", args.trend, args.regression_threshold)
+    
+    # Stop on critical failure if flag set
+    for result in results:
+        if result.get("stopped_run"):
+            print_error(f"CRITICAL: {result['name']} failed. Stopping verification.")
+            print_final_report(results, start_time)
+            sys.exit(1)
     
     # Print final report
     all_passed = print_final_report(results, start_time)
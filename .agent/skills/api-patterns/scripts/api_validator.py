@@ -2,10 +2,13 @@
 """
 API Validator - Checks API endpoints for best practices.
 Validates OpenAPI specs, response formats, and common issues.
+
+Usage: python api_validator.py <project_path> [--ndjson]
 """
 import sys
 import json
 import re
+from fnmatch import fnmatch
 from pathlib import Path
 
 # Fix Windows console encoding for Unicode output
@@ -15,32 +18,39 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def find_api_files(project_path: Path) -> list:
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+
+# (parent directory or None for any, filename glob)
+API_FILE_PATTERNS = [
+    (None, "*api*.ts"), (None, "*api*.js"), (None, "*api*.py"),
+    ("routes", "*.ts"), ("routes", "*.js"), ("routes", "*.py"),
+    ("controllers", "*.ts"), ("controllers", "*.js"),
+    ("endpoints", "*.ts"), ("endpoints", "*.py"),
+    (None, "*.openapi.json"), (None, "*.openapi.yaml"),
+    (None, "swagger.json"), (None, "swagger.yaml"),
+    (None, "openapi.json"), (None, "openapi.yaml")
+]
+
+def find_api_files(context: CheckContext) -> list:
     """Find API-related files."""
-    patterns = [
-        "**/*api*.ts", "**/*api*.js", "**/*api*.py",
-        "**/routes/*.ts", "**/routes/*.js", "**/routes/*.py",
-        "**/controllers/*.ts", "**/controllers/*.js",
-        "**/endpoints/*.ts", "**/endpoints/*.py",
-        "**/*.openapi.json", "**/*.openapi.yaml",
-        "**/swagger.json", "**/swagger.yaml",
-        "**/openapi.json", "**/openapi.yaml"
-    ]
-    
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    for parent, name in API_FILE_PATTERNS:
+        files.extend(f for f in context.files()
+                     if fnmatch(f.name, name) and (parent is None or f.parent.name == parent))
     
     # Exclude node_modules, etc.
-    return [f for f in files if not any(x in str(f) for x in ['node_modules', '.git', 'dist', 'build', '__pycache__'])]
+    return [f for f in files if not any(x in str(context.relative(f)) for x in ['node_modules', '.git', 'dist', 'build', '__pycache__'])]
 
-def check_openapi_spec(file_path: Path) -> dict:
+def check_openapi_spec(file_path: Path, context: CheckContext) -> dict:
     """Check OpenAPI/Swagger specification."""
     issues = []
     passed = []
     
     try:
-        content = file_path.read_text(encoding='utf-8')
+        content = context.read_text(file_path, errors='strict')
         
         if file_path.suffix == '.json':
             spec = json.loads(content)
@@ -59,7 +69,7 @@ def check_openapi_spec(file_path: Path) -> dict:
             if 'components:' in content or 'definitions:' in content:
                 passed.append("[OK] Schema components defined")
             
-            return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'openapi'}
+            return {'file': str(context.relative(file_path)), 'passed': passed, 'issues': issues, 'type': 'openapi'}
         
         # JSON OpenAPI checks
         if 'openapi' in spec or 'swagger' in spec:
@@ -89,15 +99,15 @@ def check_openapi_spec(file_path: Path) -> dict:
     except Exception as e:
         issues.append(f"[X] Parse error: {e}")
     
-    return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'openapi'}
+    return {'file': str(context.relative(file_path)), 'passed': passed, 'issues': issues, 'type': 'openapi'}
 
-def check_api_code(file_path: Path) -> dict:
+def check_api_code(file_path: Path, context: CheckContext) -> dict:
     """Check API code for common issues."""
     issues = []
     passed = []
     
     try:
-        content = file_path.read_text(encoding='utf-8')
+        content = context.read_text(file_path, errors='strict')
         
         # Check for error handling
         error_patterns = [
@@ -157,50 +167,65 @@ def check_api_code(file_path: Path) -> dict:
     except Exception as e:
         issues.append(f"[X] Read error: {e}")
     
-    return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'code'}
+    return {'file': str(context.relative(file_path)), 'passed': passed, 'issues': issues, 'type': 'code'}
+
+def run(context: CheckContext) -> dict:
+    """Validate API files; returns the JSON report (in-process check API)."""
+    api_files = find_api_files(context)
+    
+    results = Findings(context, "api_validator", "file")
+    total_passed = 0
+    total_issues = 0
+    for file_path in api_files:
+        if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
+            result = check_openapi_spec(file_path, context)
+        else:
+            result = check_api_code(file_path, context)
+        results.append(result)
+        total_passed += len(result['passed'])
+        total_issues += sum(1 for item in result['issues'] if item.startswith("[X]"))
+    
+    return {
+        "script": "api_validator",
+        "project": str(context.project_path),
+        "files_found": len(api_files),
+        "files": results.items,
+        "checks_passed": total_passed,
+        "critical_issues": total_issues,
+        "passed": total_issues == 0
+    }
 
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(target), "api_validator")
+        sys.exit(0 if report["passed"] else 1)
     
     print("\n" + "=" * 60)
     print("  API VALIDATOR - Endpoint Best Practices Check")
     print("=" * 60 + "\n")
     
-    api_files = find_api_files(project_path)
+    report = run(CheckContext(target))
     
-    if not api_files:
+    if not report['files_found']:
         print("[!] No API files found.")
         print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
         sys.exit(0)
     
-    results = []
-    for file_path in api_files[:15]:  # Limit
-        if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
-            result = check_openapi_spec(file_path)
-        else:
-            result = check_api_code(file_path)
-        results.append(result)
-    
     # Print results
-    total_issues = 0
-    total_passed = 0
-    
-    for result in results:
+    for result in report['files']:
         print(f"\n[FILE] {result['file']} [{result['type']}]")
         for item in result['passed']:
             print(f"   {item}")
-            total_passed += 1
         for item in result['issues']:
             print(f"   {item}")
-            if item.startswith("[X]"):
-                total_issues += 1
     
     print("\n" + "=" * 60)
-    print(f"[RESULTS] {total_passed} passed, {total_issues} critical issues")
+    print(f"[RESULTS] {report['checks_passed']} passed, {report['critical_issues']} critical issues")
     print("=" * 60)
     
-    if total_issues == 0:
+    if report['passed']:
         print("[OK] API validation passed")
         sys.exit(0)
     else:
@@ -4,7 +4,7 @@ Schema Validator - Database schema validation
 Validates Prisma schemas and checks for common issues.
 
 Usage:
-    python schema_validator.py <project_path>
+    python schema_validator.py <project_path> [--ndjson]
 
 Checks:
     - Prisma schema syntax
@@ -25,31 +25,37 @@ try:
 except:
     pass
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
 
-def find_schema_files(project_path: Path) -> list:
+
+def find_schema_files(context: CheckContext) -> list:
     """Find database schema files."""
     schemas = []
     
     # Prisma schema
-    prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
+    prisma_files = [f for f in context.files() if f.name == 'schema.prisma' and f.parent.name == 'prisma']
     schemas.extend([('prisma', f) for f in prisma_files])
     
     # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
+    ts_files = context.files(['.ts'])
+    drizzle_files = [f for f in ts_files if f.parent.name == 'drizzle']
+    drizzle_files.extend(f for f in ts_files if f.parent.name == 'schema')
     for f in drizzle_files:
         if 'schema' in f.name.lower() or 'table' in f.name.lower():
             schemas.append(('drizzle', f))
     
-    return schemas[:10]  # Limit
+    return schemas
 
 
-def validate_prisma_schema(file_path: Path) -> list:
+def validate_prisma_schema(file_path: Path, context: CheckContext) -> list:
     """Validate Prisma schema file."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = context.read_text(file_path)
         
         # Find all models
         models = re.findall(r'model\s+(\w+)\s*{([^}]+)}', content, re.DOTALL)
@@ -91,40 +97,27 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find schema files
-    schemas = find_schema_files(project_path)
-    print(f"Found {len(schemas)} schema files")
+def run(context: CheckContext) -> dict:
+    """Validate the project's schemas; returns the JSON report (in-process check API)."""
+    schemas = find_schema_files(context)
     
     if not schemas:
-        output = {
+        return {
             "script": "schema_validator",
-            "project": str(project_path),
+            "project": str(context.project_path),
             "schemas_checked": 0,
             "issues_found": 0,
             "passed": True,
             "message": "No schema files found"
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
     # Validate each schema
-    all_issues = []
+    all_issues = Findings(context, "schema_validator", "schema")
+    total_issues = 0
     
     for schema_type, file_path in schemas:
-        print(f"\nValidating: {file_path.name} ({schema_type})")
-        
         if schema_type == 'prisma':
-            issues = validate_prisma_schema(file_path)
+            issues = validate_prisma_schema(file_path, context)
         else:
             issues = []  # Drizzle validation could be added
         
@@ -134,6 +127,43 @@ def main():
                 "type": schema_type,
                 "issues": issues
             })
+            total_issues += len(issues)
+    
+    return {
+        "script": "schema_validator",
+        "project": str(context.project_path),
+        "schemas_checked": len(schemas),
+        "issues_found": total_issues,
+        "passed": True,  # Schema issues are warnings, not failures
+        "issues": all_issues.items,
+        "schemas": [{"file": str(f.name), "type": t} for t, f in schemas]
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    if "--ndjson" in sys.argv:
+        stream_report(run, CheckContext(project_path), "schema_validator")
+        sys.exit(0)
+    
+    print(f"\n{'='*60}")
+    print(f"[SCHEMA VALIDATOR] Database Schema Validation")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    report = run(CheckContext(project_path))
+    print(f"Found {report['schemas_checked']} schema files")
+    
+    if not report['schemas_checked']:
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+    
+    for schema in report.pop("schemas"):
+        print(f"\nValidating: {schema['file']} ({schema['type']})")
+    all_issues = report["issues"]
     
     # Summary
     print("\n" + "="*60)
@@ -150,20 +180,7 @@ def main():
     else:
         print("No schema issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Schema issues are warnings, not failures
-    passed = True
-    
-    output = {
-        "script": "schema_validator",
-        "project": str(project_path),
-        "schemas_checked": len(schemas),
-        "issues_found": total_issues,
-        "passed": passed,
-        "issues": all_issues
-    }
-    
-    print("\n" + json.dumps(output, indent=2))
+    print("\n" + json.dumps(report, indent=2))
     
     sys.exit(0)
 
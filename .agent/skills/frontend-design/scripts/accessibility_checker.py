@@ -4,7 +4,7 @@ Accessibility Checker - WCAG compliance audit
 Checks HTML files for accessibility issues.
 
 Usage:
-    python accessibility_checker.py <project_path>
+    python accessibility_checker.py <project_path> [--ndjson]
 
 Checks:
     - Form labels
@@ -26,27 +26,28 @@ try:
 except:
     pass
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
 
-def find_html_files(project_path: Path) -> list:
+
+def find_html_files(context: CheckContext) -> list:
     """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
+    suffixes = ['.html', '.jsx', '.tsx']
     skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
     
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
-    
-    return files[:50]
+    return context.files(suffixes, skip_dirs)
 
 
-def check_accessibility(file_path: Path) -> list:
+def check_accessibility(file_path: Path, context: CheckContext) -> list:
     """Check a single file for accessibility issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = context.read_text(file_path)
         
         # Check for form inputs without labels
         inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
@@ -108,42 +109,72 @@ def check_accessibility(file_path: Path) -> list:
     return issues
 
 
-def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
-    print(f"\n{'='*60}")
-    print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
-    print(f"{'='*60}")
-    print(f"Project: {project_path}")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-"*60)
-    
-    # Find HTML files
-    files = find_html_files(project_path)
-    print(f"Found {len(files)} HTML/JSX/TSX files")
+def run(context: CheckContext) -> dict:
+    """Audit the project; returns the JSON report (in-process check API)."""
+    files = find_html_files(context)
     
     if not files:
-        output = {
+        return {
             "script": "accessibility_checker",
-            "project": str(project_path),
+            "project": str(context.project_path),
             "files_checked": 0,
             "issues_found": 0,
             "passed": True,
             "message": "No HTML files found"
         }
-        print(json.dumps(output, indent=2))
-        sys.exit(0)
     
-    # Check each file
-    all_issues = []
+    # Check each file (unchanged files reuse cached results)
+    all_issues = Findings(context, "accessibility_checker", "file")
+    total_issues = 0
+    cache = ResultsCache("accessibility_checker", source_version(__file__, check_context.__file__))
     
     for f in files:
-        issues = check_accessibility(f)
+        issues = cache.cached(f, lambda: check_accessibility(f, context))
         if issues:
             all_issues.append({
                 "file": str(f.name),
                 "issues": issues
             })
+            total_issues += len(issues)
+    cache.close()
+    
+    # Accessibility issues are important but not blocking
+    passed = total_issues < 5  # Allow minor issues
+    
+    return {
+        "script": "accessibility_checker",
+        "project": str(context.project_path),
+        "files_checked": len(files),
+        "files_with_issues": len(all_issues),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues.items,
+        "cache": cache.stats()
+    }
+
+
+def main():
+    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(project_path), "accessibility_checker")
+        sys.exit(0 if report["passed"] else 1)
+    
+    print(f"\n{'='*60}")
+    print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
+    print(f"{'='*60}")
+    print(f"Project: {project_path}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("-"*60)
+    
+    report = run(CheckContext(project_path))
+    print(f"Found {report['files_checked']} HTML/JSX/TSX files")
+    
+    if not report['files_checked']:
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+    
+    all_issues = report.pop("issues")
     
     # Summary
     print("\n" + "="*60)
@@ -161,22 +192,9 @@ def main():
     else:
         print("No accessibility issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Accessibility issues are important but not blocking
-    passed = total_issues < 5  # Allow minor issues
-    
-    output = {
-        "script": "accessibility_checker",
-        "project": str(project_path),
-        "files_checked": len(files),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
-    
-    print("\n" + json.dumps(output, indent=2))
+    print("\n" + json.dumps(report, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if report["passed"] else 1)
 
 
 if __name__ == "__main__":
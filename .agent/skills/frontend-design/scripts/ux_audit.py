@@ -93,52 +93,189 @@ import sys
 import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+import rule_engine
+from rule_engine import RuleSet
+
+# Parallel mode (--jobs): smaller trees are audited serially, since worker
+# start-up costs more than it saves
+MIN_PARALLEL_FILES = 200
+FILES_PER_SHARD = 64
+
+# Detection rules, compiled once at import. Checks that share a pattern
+# share one rule; each rule is evaluated at most once per file.
+UX_RULES = RuleSet({
+    'has_long_text': (r'<p|<div.*class=.*text|article|<span.*text', re.IGNORECASE),
+    'has_form': (r'<form|<input|password|credit|card|payment', re.IGNORECASE),
+    'complex_elements': (r'<input|<select|<textarea|<option', re.IGNORECASE),
+    'nav_items': (r'<NavLink|<Link|<a\s+href|nav-item', re.IGNORECASE),
+    'small_height_px': (r'height:\s*([0-3]\d)px', 0),
+    'small_height_class': (r'h-[1-9]\b|h-10\b', 0),
+    'form_fields': (r'<input|<select|<textarea', re.IGNORECASE),
+    'has_steps': (r'step|wizard|stage', re.IGNORECASE),
+    'primary_action': (r'primary|bg-primary|Button.*primary|variant=["\']primary', re.IGNORECASE),
+    'nav_content': (r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', re.IGNORECASE),
+    'has_hero': (r'hero|<h1|banner', re.IGNORECASE),
+    'has_gradient': (r'gradient|linear-gradient|radial-gradient', 0),
+    'has_animation': (r'@keyframes|transition:|animate-', 0),
+    'has_background': (r'background:|bg-', 0),
+    'has_feedback': (r'transition|animate|hover:|focus:|disabled|loading|spinner', re.IGNORECASE),
+    'has_state_change': (r'setState|useState|disabled|loading', 0),
+    'has_reflective': (r'about|story|mission|values|why we|our journey|testimonials', re.IGNORECASE),
+    'security_signals': (r'ssl|secure|encrypt|lock|padlock|https', re.IGNORECASE),
+    'checkout': (r'checkout|payment', re.IGNORECASE),
+    'social_proof': (r'review|testimonial|rating|star|trust|trusted by|customer|logo', re.IGNORECASE),
+    'has_footer': (r'footer|<footer', re.IGNORECASE),
+    'authority': (r'certif|award|media|press|featured|as seen in', re.IGNORECASE),
+    'has_progressive': (r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', re.IGNORECASE),
+    'colors': (r'#[0-9a-fA-F]{3,6}|rgb|hsl', 0),
+    'borders': (r'border:|border-', 0),
+    'has_standard_labels': (r'<label|placeholder|aria-label', re.IGNORECASE),
+    'has_defaults': (r'checked|selected|default|value=["\'].*["\']', 0),
+    'radio_inputs': (r'type=["\']radio', re.IGNORECASE),
+    'has_price': (r'price|pricing|cost|\$\d+', re.IGNORECASE),
+    'has_anchor': (r'original|was|strike|del|save \d+%', re.IGNORECASE),
+    'has_social': (r'join|subscriber|member|user', re.IGNORECASE),
+    'has_count': (r'\d+[+kmb]|\d+,\d+', 0),
+    'has_progress': (r'progress|step \d+|complete|%|bar', re.IGNORECASE),
+    'font_faces': (r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', re.IGNORECASE),
+    'google_fonts': (r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', re.IGNORECASE),
+    'font_family_css': (r'font-family:\s*([^;]+)', re.IGNORECASE),
+    'has_max_width': (r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', 0),
+    'text_elements': (r'<p|<span|<div.*text|<h[1-6]', re.IGNORECASE),
+    'has_line_height': (r'leading-|line-height:', 0),
+    'has_headings': (r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', re.IGNORECASE),
+    'line_heights': (r'(?:leading-|line-height:\s*)([\d.]+)', 0),
+    'uppercase': (r'uppercase|text-transform:\s*uppercase', re.IGNORECASE),
+    'tracking': (r'tracking-|letter-spacing:', 0),
+    'has_large_text': (r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', 0),
+    'tracking_tight': (r'tracking-tight|letter-spacing:\s*-[0-9]', 0),
+    'weights': (r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', re.IGNORECASE),
+    'has_font_sizes': (r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', 0),
+    'has_fluid_type': (r'clamp\(|responsive:', 0),
+    'headings': (r'<(h[1-6])', re.IGNORECASE),
+    'font_sizes': (r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', 0),
+    'paragraphs': (r'<p[^>]*>([^<]+)</p>', re.IGNORECASE),
+    'subheadings': (r'<h[2-6]', re.IGNORECASE),
+    'has_translucent_background': (r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', 0),
+    'has_motion': (r'@keyframes|transition:', 0),
+    'layout_props': (r'width|height|top|left|right|bottom|margin|padding', 0),
+    'has_reduced_motion': (r'prefers-reduced-motion', 0),
+    'shadows': (r'box-shadow:\s*([^;]+)', 0),
+    'opacities': (r'rgba?\([^)]+,\s*([\d.]+)\)', 0),
+    'has_any_gradient': (r'gradient|linear-gradient|radial-gradient|conic-gradient', 0),
+    'gradient_mentions': (r'gradient', re.IGNORECASE),
+    'border_declarations': (r'border:', 0),
+    'text_shadows': (r'text-shadow:', 0),
+    'glow_shadows': (r'box-shadow:\s*[^;]*0\s+0\s+', 0),
+    'has_images': (r'<img|background-image:|bg-\[url', 0),
+    'has_overlay': (r'overlay|rgba\(0|gradient.*transparent|::after|::before', 0),
+    'will_change': (r'will-change:', 0),
+    'will_change_props': (r'will-change:\s*([^;]+)', 0),
+    'blur_effects': (r'backdrop-filter|blur\(', 0),
+    'color_hex_count': (r'#[0-9a-fA-F]{3,6}', 0),
+    'hsl_count': (r'hsl\(', 0),
+    'bg_declarations': (r'(?:background|bg-|bg\[)([^;}\s]+)', 0),
+    'text_declarations': (r'(?:color|text-)([^;}\s]+)', 0),
+    'hex6_colors': (r'#[0-9a-fA-F]{6}', 0),
+    'hsl_matches': (r'hsl\((\d+),\s*\d+%,\s*\d+%\)', 0),
+    'pure_black_text': (r'color:\s*#000000|#000\b', 0),
+    'pure_white_background': (r'background:\s*#ffffff|#fff\b', 0),
+    'has_dark_variant': (r'dark:\s*|dark:', 0),
+    'light_bg_light_text': (r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', 0),
+    'dark_bg_dark_text': (r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', 0),
+    'has_blue': (r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', 0),
+    'has_food_context': (r'restaurant|food|cooking|recipe|menu|dish|meal', re.IGNORECASE),
+    'has_color_vars': (r'--color-|color-|primary-|secondary-', 0),
+    'durations': (r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', 0),
+    'ease_in_entry': (r'ease-in\s+.*entry|fade-in.*ease-in', 0),
+    'ease_out_exit': (r'ease-out\s+.*exit|fade-out.*ease-out', 0),
+    'interactive_elements': (r'<button|<a\s+href|onClick|@click', 0),
+    'has_hover_focus': (r'hover:|focus:|:hover|:focus', 0),
+    'has_async': (r'async|await|fetch|axios|loading|isLoading', 0),
+    'has_loading_indicator': (r'skeleton|spinner|progress|loading|<circle.*animate', 0),
+    'has_routing': (r'router|navigate|Link.*to|useHistory', 0),
+    'has_page_transition': (r'AnimatePresence|motion\.|transition.*page|fade.*route', 0),
+    'has_scroll_anim': (r'onScroll|scroll.*trigger|IntersectionObserver', 0),
+    'scroll_layout_animation': (r'onScroll.*[^\w](width|height|top|left)', 0),
+    'has_lottie': (r'lottie|Lottie|@lottie-react', 0),
+    'has_lottie_fallback': (r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', 0),
+    'has_gsap': (r'gsap|ScrollTrigger|from\(.*gsap', 0),
+    'has_gsap_cleanup': (r'kill\(|revert\(|useEffect.*return.*gsap', 0),
+    'svg_animations': (r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', 0),
+    'has_3d_transform': (r'transform3d|perspective\(|rotate3d|translate3d', 0),
+    'has_perspective_parent': (r'perspective:\s*\d+px|perspective\s*\(', 0),
+    'has_particles': (r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', 0),
+    'has_scroll_driven': (r'IntersectionObserver.*animate|scroll.*progress|view-timeline', 0),
+    'has_throttle': (r'throttle|debounce|requestAnimationFrame', 0),
+    'functional_animations': (r'hover:|focus:|disabled|loading|error|success', 0),
+    'img_without_alt': (r'<img(?![^>]*alt=)[^>]*>', 0),
+})
+
 class UXAuditor:
-    def __init__(self):
+    def __init__(self, context: CheckContext = None):
+        self.context = context
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.cache_stats = None
+        # Findings of merged file results (issues/warnings above only hold the
+        # file being audited); streamed to the context's sink as they are merged
+        self.reported_issues = Findings(context, "ux_audit", "issue")
+        self.reported_warnings = Findings(context, "ux_audit", "warning")
     
+    def read_file(self, filepath: str) -> str:
+        if self.context:
+            return self.context.read_text(filepath, errors='replace')
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
     def audit_file(self, filepath: str) -> None:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read_file(filepath)
         except: return
         
         self.files_checked += 1
         filename = os.path.basename(filepath)
+        rules = UX_RULES.scan(content)
 
         # Pre-calculate common flags
-        has_long_text = bool(re.search(r'<p|<div.*class=.*text|article|<span.*text', content, re.IGNORECASE))
-        has_form = bool(re.search(r'<form|<input|password|credit|card|payment', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input|<select|<textarea|<option', content, re.IGNORECASE))
+        has_long_text = rules.search('has_long_text')
+        has_form = rules.search('has_form')
+        complex_elements = len(rules.findall('complex_elements'))
 
         # --- 1. PSYCHOLOGY LAWS ---
         # Hick's Law
-        nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
+        nav_items = len(rules.findall('nav_items'))
         if nav_items > 7:
             self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
         
         # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
+        if rules.search('small_height_px') or rules.search('small_height_class'):
             self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
         
         # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
+        form_fields = len(rules.findall('form_fields'))
+        if form_fields > 7 and not rules.search('has_steps'):
             self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
             
         # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
+        if 'button' in content.lower() and not rules.search('primary_action'):
             self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
 
         # Serial Position Effect - Important items at beginning/end
         if nav_items > 3:
             # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
+            nav_content = rules.findall('nav_content')
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
@@ -147,26 +284,26 @@ class UXAuditor:
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
         # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
+        has_hero = rules.search('has_hero')
         if has_hero:
             # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
+            has_gradient = rules.search('has_gradient')
+            has_animation = rules.search('has_animation')
             has_visual_interest = has_gradient or has_animation
 
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
+            if not has_visual_interest and not rules.search('has_background'):
                 self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
 
         # Behavioral: Instant feedback and usability
         if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
+            has_feedback = rules.search('has_feedback')
+            has_state_change = rules.search('has_state_change')
 
             if not has_feedback and not has_state_change:
                 self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
 
         # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
+        has_reflective = rules.search('has_reflective')
         if has_long_text and not has_reflective:
             self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
 
@@ -174,12 +311,12 @@ class UXAuditor:
 
         # Security signals
         if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
+            security_signals = rules.findall('security_signals')
+            if len(security_signals) == 0 and not rules.search('checkout'):
                 self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
 
         # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
+        social_proof = rules.findall('social_proof')
         if len(social_proof) > 0:
             self.passed_count += 1
         else:
@@ -187,9 +324,9 @@ class UXAuditor:
                 self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
 
         # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
+        has_footer = rules.search('has_footer')
         if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
+            authority = rules.findall('authority')
             if len(authority) == 0:
                 self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
 
@@ -197,19 +334,19 @@ class UXAuditor:
 
         # Progressive disclosure
         if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
+            has_progressive = rules.search('has_progressive')
             if not has_progressive:
                 self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
 
         # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
+        has_many_colors = len(rules.findall('colors')) > 15
+        has_many_borders = len(rules.findall('borders')) > 10
         if has_many_colors and has_many_borders:
             self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
 
         # Familiar patterns
         if has_form:
-            has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
+            has_standard_labels = rules.search('has_standard_labels')
             if not has_standard_labels:
                 self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
 
@@ -217,27 +354,27 @@ class UXAuditor:
 
         # Smart defaults
         if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
+            has_defaults = rules.search('has_defaults')
+            radio_inputs = len(rules.findall('radio_inputs'))
             if radio_inputs > 0 and not has_defaults:
                 self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
 
         # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
+        if rules.search('has_price'):
+            has_anchor = rules.search('has_anchor')
             if not has_anchor:
                 self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
 
         # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
+        has_social = rules.search('has_social')
         if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
+            has_count = bool(rules.findall('has_count'))
             if not has_count:
                 self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
 
         # Progress indicators
         if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
+            has_progress = rules.search('has_progress')
             if complex_elements > 5 and not has_progress:
                 self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
 
@@ -246,9 +383,9 @@ class UXAuditor:
         # 2.1 Font Pairing - Too many font families
         font_families = set()
         # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
+        font_faces = rules.findall('font_faces')
+        google_fonts = rules.findall('google_fonts')
+        font_family_css = rules.findall('font_family_css')
 
         for font in font_faces: font_families.add(font.strip().lower())
         for font in google_fonts:
@@ -265,37 +402,37 @@ class UXAuditor:
             self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
 
         # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
+        if has_long_text and not rules.search('has_max_width'):
             self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
+        text_elements = len(rules.findall('text_elements'))
+        if text_elements > 0 and not rules.search('has_line_height'):
             self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
 
         # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
+        if rules.search('has_headings'):
             # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
+            line_heights = rules.findall('line_heights')
             for lh in line_heights:
                 if float(lh) > 1.5:
                     self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
+        if rules.search('uppercase'):
+            if not rules.search('tracking'):
                 self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
 
         # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
+        if rules.search('has_large_text'):
+            if not rules.search('tracking_tight'):
                 self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
 
         # 2.5 Weight and Emphasis - Contrast levels
         # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
+        weights = rules.findall('weights')
         weight_values = []
         for w in weights:
             val = w[0] or w[1]
@@ -319,12 +456,12 @@ class UXAuditor:
             self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
+        has_font_sizes = rules.search('has_font_sizes')
+        if has_font_sizes and not rules.search('has_fluid_type'):
             self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
 
         # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
+        headings = rules.findall('headings')
         if headings:
             # Check for skipped levels (h1 -> h3)
             for i in range(len(headings) - 1):
@@ -339,7 +476,7 @@ class UXAuditor:
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
+        font_sizes = rules.findall('font_sizes')
         size_values = []
         for size, unit in font_sizes:
             if unit == 'rem' or unit == 'em':
@@ -364,7 +501,7 @@ class UXAuditor:
 
         # 2.9 Readability - Content chunking
         # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
+        paragraphs = rules.findall('paragraphs')
         for p in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
@@ -372,7 +509,7 @@ class UXAuditor:
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
+            subheadings = len(rules.findall('subheadings'))
             if subheadings == 0:
                 self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
 
@@ -380,21 +517,21 @@ class UXAuditor:
         
         # Glassmorphism Check
         if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
+            if not rules.search('has_translucent_background'):
                 self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
         
         # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
+        if rules.search('has_motion'):
+            expensive_props = rules.findall('layout_props')
             if expensive_props:
                 self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
             
             # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
+            if not rules.search('has_reduced_motion'):
                 self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
 
         # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        shadows = rules.findall('shadows')
         for shadow in shadows:
             # Check if natural (Y > X) or multiple layers
             if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
@@ -402,7 +539,7 @@ class UXAuditor:
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
+        neo_shadows = rules.findall('shadows')
         for shadow in neo_shadows:
             # Neomorphism has two shadows: positive offset + negative offset
             if ',' in shadow and '-' in shadow:
@@ -415,7 +552,7 @@ class UXAuditor:
         shadow_count = len(shadows)
         if shadow_count > 0:
             # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
+            opacities = rules.findall('opacities')
             shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
             if shadow_count >= 3 and len(shadow_opacities) > 0:
                 # Check if there's variety in shadow opacities for different elevations
@@ -425,58 +562,58 @@ class UXAuditor:
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
+        has_gradient = rules.search('has_any_gradient')
         if has_gradient:
             # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
+            gradient_count = len(rules.findall('gradient_mentions'))
             if gradient_count > 5:
                 self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
         else:
             # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
+            if has_hero and not rules.search('has_background'):
                 self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
+        has_border = rules.search('borders')
         if has_border:
             # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
+            border_count = len(rules.findall('border_declarations'))
             if border_count > 8:
                 self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
+        text_shadows = rules.findall('text_shadows')
         for ts in text_shadows:
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
                 self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
 
         # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
+        glow_shadows = rules.findall('glow_shadows')
         if len(glow_shadows) > 2:
             self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
+        has_images = rules.search('has_images')
         if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
+            has_overlay = rules.search('has_overlay')
             if not has_overlay:
                 self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
+        if rules.search('will_change'):
+            will_change_props = rules.findall('will_change_props')
             for prop in will_change_props:
                 prop = prop.strip().lower()
                 if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
                     self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
 
         # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
+        will_change_count = len(rules.findall('will_change'))
         if will_change_count > 3:
             self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
 
@@ -485,8 +622,8 @@ class UXAuditor:
         effect_count = (
             (1 if has_gradient else 0) +
             shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
+            len(rules.findall('blur_effects')) +
+            len(rules.findall('text_shadows'))
         )
         if effect_count > 10:
             self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
@@ -509,22 +646,22 @@ class UXAuditor:
 
         # 4.2 60-30-10 Rule check
         # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
+        color_hex_count = len(rules.findall('color_hex_count'))
+        hsl_count = len(rules.findall('hsl_count'))
         total_colors = color_hex_count + hsl_count
         if total_colors > 3:
             # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
+            bg_declarations = rules.findall('bg_declarations')
+            text_declarations = rules.findall('text_declarations')
             if len(bg_declarations) > 0 and len(text_declarations) > 0:
                 # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
+                unique_hexes = set(rules.findall('hex6_colors'))
                 if len(unique_hexes) > 5:
                     self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
+        hsl_matches = rules.findall('hsl_matches')
         if len(hsl_matches) >= 3:
             hues = [int(h) for h in hsl_matches]
             hue_range = max(hues) - min(hues)
@@ -533,36 +670,36 @@ class UXAuditor:
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
+        if rules.search('pure_black_text'):
             self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
+        if rules.search('pure_white_background') and rules.search('has_dark_variant'):
             self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
 
         # 4.5 WCAG Contrast Pattern Check
         # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
+        light_bg_light_text = rules.search('light_bg_light_text')
+        dark_bg_dark_text = rules.search('dark_bg_dark_text')
         if light_bg_light_text or dark_bg_dark_text:
             self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
+        has_blue = rules.search('has_blue')
+        has_food_context = rules.search('has_food_context')
         if has_blue and has_food_context:
             self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
+        has_color_vars = rules.search('has_color_vars')
+        if has_color_vars and not rules.search('hsl_count'):
             self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
         # 5.1 Duration Appropriateness
         # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
+        durations = rules.findall('durations')
         for duration, unit in durations:
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
@@ -572,68 +709,68 @@ class UXAuditor:
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
+        if rules.search('ease_in_entry'):
             self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
+        if rules.search('ease_out_exit'):
             self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
+        interactive_elements = len(rules.findall('interactive_elements'))
+        has_hover_focus = rules.search('has_hover_focus')
         if interactive_elements > 2 and not has_hover_focus:
             self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
+        has_async = rules.search('has_async')
+        has_loading_indicator = rules.search('has_loading_indicator')
         if has_async and not has_loading_indicator:
             self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
+        has_routing = rules.search('has_routing')
+        has_page_transition = rules.search('has_page_transition')
         if has_routing and not has_page_transition:
             self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
+        has_scroll_anim = rules.search('has_scroll_anim')
         if has_scroll_anim:
             # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
+            if rules.search('scroll_layout_animation'):
                 self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
         # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
+        has_lottie = rules.search('has_lottie')
         if has_lottie:
             # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
+            has_lottie_fallback = rules.search('has_lottie_fallback')
             if not has_lottie_fallback:
                 self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
 
         # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
+        has_gsap = rules.search('has_gsap')
         if has_gsap:
             # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
+            has_gsap_cleanup = rules.search('has_gsap_cleanup')
             if not has_gsap_cleanup:
                 self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
 
         # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
+        svg_animations = rules.findall('svg_animations')
         if len(svg_animations) > 3:
             self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
 
         # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
+        has_3d_transform = rules.search('has_3d_transform')
         if has_3d_transform:
             # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
+            has_perspective_parent = rules.search('has_perspective_parent')
             if not has_perspective_parent:
                 self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
 
@@ -642,61 +779,137 @@ class UXAuditor:
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
+        has_particles = rules.search('has_particles')
         if has_particles:
             self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
 
         # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
+        has_scroll_driven = rules.search('has_scroll_driven')
         if has_scroll_driven:
             # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
+            has_throttle = rules.search('has_throttle')
             if not has_throttle:
                 self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
         total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
+            len(rules.findall('has_animation')) +
             (1 if has_lottie else 0) +
             (1 if has_gsap else 0)
         )
         if total_animations > 5:
             # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
+            functional_animations = len(rules.findall('functional_animations'))
             if functional_animations < total_animations / 2:
                 self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
 
         # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
+        if rules.search('img_without_alt'):
             self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, jobs: int = 1) -> None:
+        """
+        Audit all matching files. Files unchanged since the last run replay
+        their cached findings; the rest are audited serially, or sharded
+        across a process pool when jobs > 1. Findings are merged in file
+        order either way, so reports do not depend on jobs.
+        """
+        cache = ResultsCache("ux_audit", source_version(__file__, check_context.__file__, rule_engine.__file__))
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next'}
+        context = self.context or CheckContext(directory)
+        filepaths = [str(p) for p in context.files(skip_dirs=skip_dirs) if p.suffix in extensions]
+
+        results = [cache.get(filepath) for filepath in filepaths]
+        stale = [i for i, result in enumerate(results) if result is None]
+        fresh = self.audit_files([filepaths[i] for i in stale], jobs)
+        for i, result in zip(stale, fresh):
+            results[i] = result
+            cache.put(filepaths[i], result)
+        cache.close()
+        self.cache_stats = cache.stats()
+
+        for result in results:
+            self.merge_result(result)
+
+    def audit_files(self, filepaths: list, jobs: int = 1) -> list:
+        """Per-file results for filepaths, in order."""
+        if jobs <= 1 or len(filepaths) < MIN_PARALLEL_FILES:
+            return [self.audit_file_result(filepath) for filepath in filepaths]
+
+        shards = [filepaths[i:i + FILES_PER_SHARD] for i in range(0, len(filepaths), FILES_PER_SHARD)]
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for shard_results in executor.map(_audit_shard, shards):
+                results.extend(shard_results)
+        return results
+
+    def audit_file_result(self, filepath: str) -> dict:
+        """
+        Audit one file and return its findings (checked, issues, warnings,
+        passed) instead of adding them to this auditor.
+        """
+        issues, warnings = len(self.issues), len(self.warnings)
+        passed, checked = self.passed_count, self.files_checked
+        self.audit_file(filepath)
+        result = {
+            "checked": self.files_checked - checked,
+            "issues": self.issues[issues:],
+            "warnings": self.warnings[warnings:],
+            "passed": self.passed_count - passed
+        }
+        del self.issues[issues:], self.warnings[warnings:]
+        self.passed_count, self.files_checked = passed, checked
+        return result
+
+    def merge_result(self, result: dict) -> None:
+        self.files_checked += result["checked"]
+        self.reported_issues.extend(result["issues"])
+        self.reported_warnings.extend(result["warnings"])
+        self.passed_count += result["passed"]
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
-            "issues": self.issues,
-            "warnings": self.warnings,
+            "issues": self.reported_issues.items,
+            "warnings": self.reported_warnings.items,
             "passed_checks": self.passed_count,
-            "compliant": len(self.issues) == 0
+            "compliant": len(self.reported_issues) == 0,
+            "cache": self.cache_stats
         }
 
+def _audit_shard(filepaths: list) -> list:
+    """Audit a shard of files in a worker process."""
+    auditor = UXAuditor()
+    return [auditor.audit_file_result(filepath) for filepath in filepaths]
+
+def run(context: CheckContext, jobs: int = 1) -> dict:
+    """Audit the project; returns the JSON report (in-process check API)."""
+    auditor = UXAuditor(context)
+    auditor.audit_directory(str(context.project_path), jobs)
+    report = auditor.get_report()
+    report["script"] = "ux_audit"
+    report["passed"] = report["compliant"]
+    return report
+
 def main():
     if len(sys.argv) < 2: sys.exit(1)
     
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    # --jobs N: worker processes for directory audits (0 = all CPUs, default: 1 = serial)
+    jobs = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    if "--ndjson" in sys.argv and os.path.isdir(path):
+        report = stream_report(lambda context: run(context, jobs), CheckContext(path), "ux_audit")
+        sys.exit(0 if report['compliant'] else 1)
     
     auditor = UXAuditor()
-    if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
+    if os.path.isfile(path): auditor.merge_result(auditor.audit_file_result(path))
+    else: auditor.audit_directory(path, jobs)
     
     report = auditor.get_report()
     
@@ -713,6 +926,9 @@ def main():
             print(f"[*] WARNINGS ({len(report['warnings'])}):")
             for w in report['warnings'][:15]: print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+        if report['cache']:
+            cache = report['cache']
+            print(f"[=] CACHE: {cache['hits']}/{cache['hits'] + cache['misses']} files unchanged ({cache['hit_ratio']:.0%})")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
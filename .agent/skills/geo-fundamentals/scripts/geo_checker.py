@@ -14,7 +14,7 @@ WHAT IT CHECKS:
     - NOT markdown files (those are developer docs, not public content)
 
 Usage:
-    python geo_checker.py <project_path>
+    python geo_checker.py <project_path> [--ndjson]
 """
 import sys
 import re
@@ -28,6 +28,13 @@ try:
 except AttributeError:
     pass
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+
 
 # Directories to skip (not public content)
 SKIP_DIRS = {
@@ -78,28 +85,20 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_web_pages(project_path: Path) -> list:
+def find_web_pages(context: CheckContext) -> list:
     """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:30]  # Limit to 30 pages
+    suffixes = ['.html', '.htm', '.jsx', '.tsx']
+    
+    # Check if it's likely a page
+    files = [f for f in context.files(suffixes, SKIP_DIRS) if is_page_file(f)]
+    
+    return files
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, context: CheckContext) -> dict:
     """Check a single web page for GEO elements."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = context.read_text(file_path)
     except Exception as e:
         return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
@@ -219,34 +218,62 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+def run(context: CheckContext) -> dict:
+    """Audit the project's public pages; returns the JSON report (in-process check API)."""
+    pages = find_web_pages(context)
+    
+    if not pages:
+        return {"script": "geo_checker", "pages_found": 0, "passed": True}
+    
+    # Check each page (unchanged files reuse cached results)
+    results = Findings(context, "geo_checker", "page")
+    total_score = 0
+    cache = ResultsCache("geo_checker", source_version(__file__, check_context.__file__))
+    for page in pages:
+        result = cache.cached(page, lambda: check_page(page, context))
+        results.append(result)
+        total_score += result['score']
+    cache.close()
+    
+    # Average score
+    avg_score = total_score / len(results) if len(results) else 0
+    
+    return {
+        "script": "geo_checker",
+        "project": str(context.project_path),
+        "pages_checked": len(results),
+        "average_score": round(avg_score),
+        "passed": avg_score >= 60,
+        "pages": results.items,
+        "cache": cache.stats()
+    }
+
+
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
     target_path = Path(target).resolve()
     
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(target_path), "geo_checker")
+        sys.exit(0 if report["passed"] else 1)
+    
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
     print("=" * 60)
     print(f"Project: {target_path}")
     print("-" * 60)
     
-    # Find web pages only
-    pages = find_web_pages(target_path)
+    report = run(CheckContext(target_path))
     
-    if not pages:
+    if "pages_found" in report:
         print("\n[!] No public web pages found.")
         print("    Looking for: HTML, JSX, TSX files in pages/app directories")
         print("    Skipping: docs, tests, config files, node_modules")
-        output = {"script": "geo_checker", "pages_found": 0, "passed": True}
-        print("\n" + json.dumps(output, indent=2))
+        print("\n" + json.dumps(report, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} public pages to analyze\n")
-    
-    # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
+    results = report.pop("pages")
+    print(f"Found {len(results)} public pages to analyze\n")
     
     # Print results
     for result in results:
@@ -256,8 +283,7 @@ def main():
             for issue in result['issues'][:2]:  # Show max 2 issues
                 print(f"    - {issue}")
     
-    # Average score
-    avg_score = sum(r['score'] for r in results) / len(results) if results else 0
+    avg_score = sum(r['score'] for r in results) / len(results)
     
     print("\n" + "=" * 60)
     print(f"AVERAGE GEO SCORE: {avg_score:.0f}%")
@@ -273,16 +299,9 @@ def main():
         print("[X] Poor - Content needs GEO optimization")
     
     # JSON output
-    output = {
-        "script": "geo_checker",
-        "project": str(target_path),
-        "pages_checked": len(results),
-        "average_score": round(avg_score),
-        "passed": avg_score >= 60
-    }
-    print("\n" + json.dumps(output, indent=2))
+    print("\n" + json.dumps(report, indent=2))
     
-    sys.exit(0 if avg_score >= 60 else 1)
+    sys.exit(0 if report["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+Usage: python i18n_checker.py <project_path> [--ndjson]
 """
 import sys
 import re
@@ -15,6 +17,13 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+
 # Patterns that indicate hardcoded strings (should be translated)
 HARDCODED_PATTERNS = {
     'jsx': [
@@ -50,24 +59,23 @@ I18N_PATTERNS = [
     r'i18n\.',             # Generic i18n
 ]
 
-def find_locale_files(project_path: Path) -> list:
+# Directories holding JSON translation files (at any depth below them)
+LOCALE_DIRS = ['locales', 'translations', 'lang', 'i18n']
+
+def is_locale_file(relative_path: Path) -> bool:
+    """Check whether a project-relative path is a translation file."""
+    if relative_path.suffix == '.po':  # gettext
+        return True
+    if relative_path.suffix != '.json':
+        return False
+    dirs = relative_path.parts[:-1]
+    return any(d in dirs for d in LOCALE_DIRS) or relative_path.parent.name == 'messages'
+
+def find_locale_files(context: CheckContext) -> list:
     """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
-    
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    return [f for f in files if 'node_modules' not in str(f)]
+    return [f for f in context.files() if is_locale_file(context.relative(f))]
 
-def check_locale_completeness(locale_files: list) -> dict:
+def check_locale_completeness(locale_files: list, context: CheckContext) -> dict:
     """Check if all locales have the same keys."""
     issues = []
     passed = []
@@ -81,7 +89,7 @@ def check_locale_completeness(locale_files: list) -> dict:
         if f.suffix == '.json':
             try:
                 lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
+                content = json.loads(context.read_text(f, errors='strict'))
                 if lang not in locales:
                     locales[lang] = {}
                 locales[lang][f.stem] = set(flatten_keys(content))
@@ -128,7 +136,24 @@ def flatten_keys(d, prefix=''):
             keys.add(new_key)
     return keys
 
-def check_hardcoded_strings(project_path: Path) -> dict:
+def check_file_strings(file_path: Path, file_type: str, context: CheckContext) -> dict:
+    """Check one code file for i18n usage and hardcoded strings."""
+    content = context.read_text(file_path)
+    
+    # Check for i18n usage
+    has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
+    
+    # Check for hardcoded strings (first match of each pattern)
+    hardcoded = []
+    if not has_i18n:
+        for pattern in HARDCODED_PATTERNS.get(file_type, []):
+            matches = re.findall(pattern, content)
+            if matches:
+                hardcoded.append(str(matches[0])[:40])
+    
+    return {'has_i18n': has_i18n, 'hardcoded': hardcoded}
+
+def check_hardcoded_strings(context: CheckContext) -> dict:
     """Check for hardcoded strings in code files."""
     issues = []
     passed = []
@@ -140,76 +165,82 @@ def check_hardcoded_strings(project_path: Path) -> dict:
         '.py': 'python'
     }
     
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
-    
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
+    code_files = [f for f in context.files(extensions) if not any(x in str(context.relative(f)) for x in 
                   ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
     
     if not code_files:
         return {'passed': ["[!] No code files found"], 'issues': []}
     
     files_with_i18n = 0
-    files_with_hardcoded = 0
+    hardcoded_files = Findings(context, "i18n_checker", "hardcoded")
     hardcoded_examples = []
+    cache = ResultsCache("i18n_checker", source_version(__file__, check_context.__file__))
     
-    for file_path in code_files[:50]:  # Limit
+    for file_path in code_files:
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
+            file_type = extensions.get(file_path.suffix, 'jsx')
+            result = cache.cached(file_path, lambda: check_file_strings(file_path, file_type, context))
         except:
             continue
+        
+        if result['has_i18n']:
+            files_with_i18n += 1
+        
+        if result['hardcoded']:
+            hardcoded_files.append({"file": str(context.relative(file_path)), "hardcoded": result['hardcoded']})
+            for example in result['hardcoded']:
+                if len(hardcoded_examples) < 5:
+                    hardcoded_examples.append(f"{file_path.name}: {example}...")
+    cache.close()
     
     passed.append(f"[OK] Analyzed {len(code_files)} code files")
     
     if files_with_i18n > 0:
         passed.append(f"[OK] {files_with_i18n} files use i18n")
     
-    if files_with_hardcoded > 0:
-        issues.append(f"[X] {files_with_hardcoded} files may have hardcoded strings")
+    if hardcoded_files.count > 0:
+        issues.append(f"[X] {hardcoded_files.count} files may have hardcoded strings")
         for ex in hardcoded_examples:
             issues.append(f"   → {ex}")
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
     
-    return {'passed': passed, 'issues': issues}
+    return {'passed': passed, 'issues': issues, 'hardcoded_files': hardcoded_files.items}
+
+def run(context: CheckContext) -> dict:
+    """Audit locale files and code strings; returns the JSON report (in-process check API)."""
+    # Check locale files
+    locale_files = find_locale_files(context)
+    locale_result = check_locale_completeness(locale_files, context)
+    
+    # Check hardcoded strings
+    code_result = check_hardcoded_strings(context)
+    
+    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
+    
+    return {
+        "script": "i18n_checker",
+        "project": str(context.project_path),
+        "locale": locale_result,
+        "code": code_result,
+        "critical_issues": critical_issues,
+        "passed": critical_issues == 0
+    }
 
 def main():
     target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(target), "i18n_checker")
+        sys.exit(0 if report["passed"] else 1)
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
     print("=" * 60 + "\n")
     
-    # Check locale files
-    locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
-    
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    report = run(CheckContext(target))
+    locale_result = report['locale']
+    code_result = report['code']
     
     # Print results
     print("[LOCALE FILES]")
@@ -227,14 +258,12 @@ def main():
         print(f"  {item}")
     
     # Summary
-    critical_issues = sum(1 for i in locale_result['issues'] + code_result['issues'] if i.startswith("[X]"))
-    
     print("\n" + "=" * 60)
-    if critical_issues == 0:
+    if report['passed']:
         print("[OK] i18n CHECK: PASSED")
         sys.exit(0)
     else:
-        print(f"[X] i18n CHECK: {critical_issues} issues found")
+        print(f"[X] i18n CHECK: {report['critical_issues']} issues found")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -9,6 +9,10 @@ Usage:
 Supports:
     - Node.js: npm run lint, npx tsc --noEmit
     - Python: ruff check, mypy
+
+Under checklist.py --changed-since (CHECK_SCOPE set), eslint, ruff and mypy
+only lint the changed files; tsc still checks the whole project, but only
+when a TypeScript file changed, and linters with no changed files are skipped.
 """
 
 import subprocess
@@ -25,6 +29,14 @@ try:
 except:
     pass
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_inventory import FileInventory, env_scope
+
+JS_SUFFIXES = ['.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs']
+TS_SUFFIXES = ['.ts', '.tsx']
+PY_SUFFIXES = ['.py']
+
 
 def detect_project_type(project_path: Path) -> dict:
     """Detect project type and available linters."""
@@ -69,6 +81,33 @@ def detect_project_type(project_path: Path) -> dict:
     return result
 
 
+def scope_linters(linters: list, project_path: Path, scope: list) -> list:
+    """
+    Restrict linters to the files in scope: file-level linters get the
+    changed files as arguments, project-level ones run only if a relevant
+    file changed. Linters with nothing to check are dropped.
+    """
+    inventory = FileInventory(project_path, paths=scope)
+    js_files = [str(p) for p in inventory.select(JS_SUFFIXES)]
+    py_files = [str(p) for p in inventory.select(PY_SUFFIXES)]
+    scoped = []
+    for linter in linters:
+        name = linter["name"]
+        if name in ("npm lint", "eslint"):
+            # A lint script's arguments are not known, so lint the files with eslint directly
+            if js_files:
+                scoped.append({"name": "eslint", "cmd": ["npx", "eslint", *js_files]})
+        elif name == "tsc":
+            if inventory.select(TS_SUFFIXES):
+                scoped.append(linter)
+        elif name in ("ruff", "mypy"):
+            if py_files:
+                scoped.append({"name": name, "cmd": linter["cmd"][:-1] + py_files})
+        else:
+            scoped.append(linter)
+    return scoped
+
+
 def run_linter(linter: dict, cwd: Path) -> dict:
     """Run a single linter and return results."""
     result = {
@@ -124,19 +163,28 @@ def main():
     
     # Detect project type
     project_info = detect_project_type(project_path)
+    scope = env_scope()
+    if scope is not None:
+        project_info["linters"] = scope_linters(project_info["linters"], project_path, scope)
+        print(f"Scope: {len(scope)} changed file(s)")
     print(f"Type: {project_info['type']}")
     print(f"Linters: {len(project_info['linters'])}")
     print("-"*60)
     
     if not project_info["linters"]:
-        print("No linters found for this project type.")
+        if scope is not None:
+            message = "No changed files to lint"
+            print(f"{message}.")
+        else:
+            message = "No linters configured"
+            print("No linters found for this project type.")
         output = {
             "script": "lint_runner",
             "project": str(project_path),
             "type": project_info["type"],
             "checks": [],
             "passed": True,
-            "message": "No linters configured"
+            "message": message
         }
         print(json.dumps(output, indent=2))
         sys.exit(0)
@@ -69,28 +69,182 @@ import sys
 import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+import rule_engine
+from rule_engine import RuleSet
+
+# Parallel mode (--jobs): smaller trees are audited serially, since worker
+# start-up costs more than it saves
+MIN_PARALLEL_FILES = 200
+FILES_PER_SHARD = 64
+
+# Detection rules, compiled once at import. Checks that share a pattern
+# share one rule; each rule is evaluated at most once per file.
+MOBILE_RULES = RuleSet({
+    'is_react_native': (r'react-native|@react-navigation|React\.Native', 0),
+    'is_flutter': (r'import \'package:flutter|MaterialApp|Widget\.build', 0),
+    'small_sizes': (r'(?:width|height|size):\s*([0-3]\d)', 0),
+    'small_gaps': (r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', 0),
+    'primary_buttons': (r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', re.IGNORECASE),
+    'has_bottom_placement': (r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end', 0),
+    'has_swipe_gestures': (r'Swipeable|onSwipe|PanGestureHandler|swipe', 0),
+    'has_visible_buttons': (r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable', 0),
+    'has_important_actions': (r'(?:onPress|onSubmit|delete|remove|confirm|purchase)', 0),
+    'has_haptics': (r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager', 0),
+    'has_pressable': (r'Pressable|TouchableOpacity', 0),
+    'has_feedback_state': (r'pressed|style.*opacity|underlay', 0),
+    'has_scrollview': (r'<ScrollView|ScrollView\.', 0),
+    'has_map_in_scrollview': (r'ScrollView.*\.map\(|ScrollView.*\{.*\.map', 0),
+    'has_list': (r'FlatList|FlashList|SectionList', 0),
+    'has_react_memo': (r'React\.memo|memo\(', 0),
+    'has_flatlist': (r'FlatList|FlashList', 0),
+    'has_use_callback': (r'useCallback', 0),
+    'has_flatlist_only': (r'FlatList', 0),
+    'has_key_extractor': (r'keyExtractor', 0),
+    'uses_index_key': (r'key=\{.*index.*\}|key:\s*index', 0),
+    'has_animated': (r'Animated\.', 0),
+    'has_native_driver': (r'useNativeDriver:\s*true', 0),
+    'has_native_driver_false': (r'useNativeDriver:\s*false', 0),
+    'has_effect': (r'useEffect', 0),
+    'has_cleanup': (r'return\s*\(\)\s*=>|return\s+function', 0),
+    'has_subscriptions': (r'addEventListener|subscribe|\.focus\(\)|\.off\(', 0),
+    'console_logs': (r'console\.log|console\.warn|console\.error|console\.debug', 0),
+    'inline_functions': (r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>', 0),
+    'animating_layout': (r'Animated\.timing.*(?:width|height|margin|padding)', 0),
+    'tab_bar_items': (r'Tab\.Screen|createBottomTabNavigator|BottomTab', 0),
+    'has_tab_nav': (r'createBottomTabNavigator|Tab\.Navigator', 0),
+    'has_lazy_false': (r'lazy:\s*false', 0),
+    'has_back_listener': (r'BackHandler|useFocusEffect|navigation\.addListener', 0),
+    'has_custom_back': (r'onBackPress|handleBackPress', 0),
+    'has_linking': (r'Linking\.|Linking\.openURL|deepLink|universalLink', 0),
+    'has_config': (r'apollo-link|react-native-screens|navigation\.link', 0),
+    'has_custom_font': (r"fontFamily:\s*[\"'][^\"']+", 0),
+    'has_system_font': (r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)", 0),
+    'has_font_sizes': (r'fontSize:', 0),
+    'has_scaling': (r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions', 0),
+    'line_heights': (r'lineHeight:\s*([\d.]+)', 0),
+    'font_sizes': (r'fontSize:\s*([\d.]+)', 0),
+    'has_pure_black': (r'#000000|color:\s*black|backgroundColor:\s*["\']?black', 0),
+    'has_color_schemes': (r'useColorScheme|colorScheme|appearance:\s*["\']?dark', 0),
+    'has_dark_mode_style': (r'\\\?.*dark|style:\s*.*dark|isDark', 0),
+    'has_ios_icons': (r'@expo/vector-icons|ionicons', 0),
+    'has_sf_symbols': (r'sf-symbol|SF Symbols', 0),
+    'has_haptic_import': (r'expo-haptics|react-native-haptic-feedback', 0),
+    'has_haptic_types': (r'ImpactFeedback|NotificationFeedback|SelectionFeedback', 0),
+    'has_safe_area': (r'SafeAreaView|useSafeAreaInsets|safeArea', 0),
+    'has_material_icons': (r'@expo/vector-icons|MaterialIcons', 0),
+    'has_ripple': (r'ripple|android_ripple|foregroundRipple', 0),
+    'has_touchable': (r'Pressable|Touchable', 0),
+    'has_back_button': (r'BackHandler|useBackHandler', 0),
+    'has_navigation': (r'@react-navigation', 0),
+    'has_async_storage': (r'AsyncStorage|@react-native-async-storage', 0),
+    'has_secure_storage': (r'SecureStore|Keychain|EncryptedSharedPreferences', 0),
+    'has_token_storage': (r'token|jwt|auth.*storage', re.IGNORECASE),
+    'has_network': (r'fetch|axios|netinfo|@react-native-community/netinfo', 0),
+    'has_offline': (r'offline|isConnected|netInfo|cache.*offline', 0),
+    'has_push': (r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS', 0),
+    'has_push_handler': (r'onNotification|addNotificationListener|notification\.open', 0),
+    'has_large_title': (r'fontSize:\s*34|largeTitle|font-weight:\s*["\']?bold', 0),
+    'has_title_1': (r'fontSize:\s*28', 0),
+    'has_headline': (r'fontSize:\s*17.*semibold|headline', 0),
+    'has_body': (r'fontSize:\s*17.*regular|body', 0),
+    'has_display': (r'fontSize:\s*[456][0-9]|display', 0),
+    'has_headline_material': (r'fontSize:\s*[23][0-9]|headline', 0),
+    'has_title_material': (r'fontSize:\s*2[12][0-9].*medium|title', 0),
+    'has_body_material': (r'fontSize:\s*1[456].*regular|body', 0),
+    'has_label': (r'fontSize:\s*1[1234].*medium|label', 0),
+    'uses_sp': (r'\d+\s*sp\b', 0),
+    'font_size_values': (r'fontSize:\s*(\d+(?:\.\d+)?)', 0),
+    'has_long_text': (r'<Text[^>]*>[^<]{40,}', 0),
+    'has_max_width': (r'maxWidth|max-w-\d+|width:\s*["\']?\d+', 0),
+    'font_weights': (r'fontWeight:\s*["\']?(\d+|normal|bold|medium|light)', 0),
+    'has_near_black': (r'#121212|#1A1A1A|#0D0D0D', 0),
+    'pure_black_background': (r'backgroundColor:\s*["\']?#000000', 0),
+    'hex_background': (r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}', 0),
+    'hex_colors': (r'#([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})', 0),
+    'light_colors': (r'#[0-9A-Fa-f]{6}|rgba?\([^)]+\)', 0),
+    'potential_low_contrast': (r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000', 0),
+    'has_dark_mode': (r'dark:\s*|isDark|useColorScheme|colorScheme:\s*["\']?dark', 0),
+    'has_pure_white_text': (r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white', 0),
+    'has_sf_pro': (r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF', 0),
+    'has_quoted_font_family': (r'fontFamily:\s*["\'][^"\']+', 0),
+    'has_label_color': (r'color:\s*["\']?label|\.label', 0),
+    'has_secondaryLabel': (r'secondaryLabel|\.secondaryLabel', 0),
+    'has_systemBackground': (r'systemBackground|\.systemBackground', 0),
+    'has_hardcoded_gray': (r'#[78]0{4}', 0),
+    'ios_blue': (r'#007AFF|#0A84FF|systemBlue', 0),
+    'ios_green': (r'#34C759|#30D158|systemGreen', 0),
+    'ios_red': (r'#FF3B30|#FF453A|systemRed', 0),
+    'has_custom_primary': (r'primaryColor|theme.*primary|colors\.primary', 0),
+    'has_navigation_bar': (r'navigationOptions|headerStyle|cardStyle', 0),
+    'has_header_title': (r'title:\s*["\']|headerTitle|navigation\.setOptions', 0),
+    'has_alert': (r'Alert\.alert|showAlert', 0),
+    'has_action_sheet': (r'ActionSheet|ActionSheetIOS|showActionSheetWithOptions', 0),
+    'has_activity_indicator': (r'ActivityIndicator|ActivityIndic', 0),
+    'has_roboto': (r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto', 0),
+    'has_material_colors': (r'MD3|MaterialYou|dynamicColor|useColorScheme', 0),
+    'has_theme_provider': (r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider', 0),
+    'has_elevation': (r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation', 0),
+    'has_box_shadow': (r'boxShadow:', 0),
+    'has_card': (r'Card|Paper|elevation.*\d+', 0),
+    'has_fab': (r'FAB|FloatingActionButton|fab', 0),
+    'has_snackbar': (r'Snackbar|showSnackBar|Toast', 0),
+    'has_top_app_bar': (r'TopAppBar|AppBar|CollapsingToolbar', 0),
+    'has_bottom_nav': (r'BottomNavigation|BottomNav', 0),
+    'has_navigation_rail': (r'NavigationRail', 0),
+    'has_rntl': (r'react-native-testing-library|@testing-library', 0),
+    'has_detox': (r'detox|element\(|by\.text|by\.id', 0),
+    'has_maestro': (r'maestro|\.yaml$', 0),
+    'has_jest': (r'jest|describe\(|test\(|it\(', 0),
+    'test_files': (r'\.test\.(tsx|ts|js|jsx)|\.spec\.', 0),
+    'has_touchable_component': (r'Pressable|TouchableOpacity|TouchableHighlight', 0),
+    'has_a11y_label': (r'accessibilityLabel|aria-label|testID', 0),
+    'has_performance': (r'Performance|systrace|profile|Flipper', 0),
+    'has_console_log': (r'console\.(log|warn|error|debug|info)', 0),
+    'has_debugger': (r'debugger|__DEV__|React\.DevTools', 0),
+    'has_error_boundary': (r'ErrorBoundary|componentDidCatch|getDerivedStateFromError', 0),
+})
+
 class MobileAuditor:
-    def __init__(self):
+    def __init__(self, context: CheckContext = None):
+        self.context = context
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.cache_stats = None
+        # Findings of merged file results (issues/warnings above only hold the
+        # file being audited); streamed to the context's sink as they are merged
+        self.reported_issues = Findings(context, "mobile_audit", "issue")
+        self.reported_warnings = Findings(context, "mobile_audit", "warning")
+
+    def read_file(self, filepath: str) -> str:
+        if self.context:
+            return self.context.read_text(filepath, errors='replace')
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
 
     def audit_file(self, filepath: str) -> None:
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read_file(filepath)
         except:
             return
 
         self.files_checked += 1
         filename = os.path.basename(filepath)
+        rules = MOBILE_RULES.scan(content)
 
         # Detect framework
-        is_react_native = bool(re.search(r'react-native|@react-navigation|React\.Native', content))
-        is_flutter = bool(re.search(r'import \'package:flutter|MaterialApp|Widget\.build', content))
+        is_react_native = rules.search('is_react_native')
+        is_flutter = rules.search('is_flutter')
 
         if not (is_react_native or is_flutter):
             return  # Skip non-mobile files
@@ -99,74 +253,74 @@ class MobileAuditor:
 
         # 1.1 Touch Target Size Check
         # Look for small touch targets
-        small_sizes = re.findall(r'(?:width|height|size):\s*([0-3]\d)', content)
+        small_sizes = rules.findall('small_sizes')
         for size in small_sizes:
             if int(size) < 44:
                 self.issues.append(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)")
 
         # 1.2 Touch Target Spacing Check
         # Look for inadequate spacing between touchable elements
-        small_gaps = re.findall(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', content)
+        small_gaps = rules.findall('small_gaps')
         for gap in small_gaps:
             if int(gap) < 8:
                 self.warnings.append(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.")
 
         # 1.3 Thumb Zone Placement Check
         # Primary CTAs should be at bottom (easy thumb reach)
-        primary_buttons = re.findall(r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', content, re.IGNORECASE)
-        has_bottom_placement = bool(re.search(r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end', content))
+        primary_buttons = rules.findall('primary_buttons')
+        has_bottom_placement = rules.search('has_bottom_placement')
         if primary_buttons and not has_bottom_placement:
             self.warnings.append(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.")
 
         # 1.4 Gesture Alternatives Check
         # Swipe actions should have visible button alternatives
-        has_swipe_gestures = bool(re.search(r'Swipeable|onSwipe|PanGestureHandler|swipe', content))
-        has_visible_buttons = bool(re.search(r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable', content))
+        has_swipe_gestures = rules.search('has_swipe_gestures')
+        has_visible_buttons = rules.search('has_visible_buttons')
         if has_swipe_gestures and not has_visible_buttons:
             self.warnings.append(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.")
 
         # 1.5 Haptic Feedback Check
         # Important actions should have haptic feedback
-        has_important_actions = bool(re.search(r'(?:onPress|onSubmit|delete|remove|confirm|purchase)', content))
-        has_haptics = bool(re.search(r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager', content))
+        has_important_actions = rules.search('has_important_actions')
+        has_haptics = rules.search('has_haptics')
         if has_important_actions and not has_haptics:
             self.warnings.append(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.")
 
         # 1.6 Touch Feedback Timing Check
         # Touch feedback should be immediate (<50ms)
         if is_react_native:
-            has_pressable = bool(re.search(r'Pressable|TouchableOpacity', content))
-            has_feedback_state = bool(re.search(r'pressed|style.*opacity|underlay', content))
+            has_pressable = rules.search('has_pressable')
+            has_feedback_state = rules.search('has_feedback_state')
             if has_pressable and not has_feedback_state:
                 self.warnings.append(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.")
 
         # --- 2. MOBILE PERFORMANCE CHECKS ---
 
         # 2.1 CRITICAL: ScrollView vs FlatList
-        has_scrollview = bool(re.search(r'<ScrollView|ScrollView\.', content))
-        has_map_in_scrollview = bool(re.search(r'ScrollView.*\.map\(|ScrollView.*\{.*\.map', content))
+        has_scrollview = rules.search('has_scrollview')
+        has_map_in_scrollview = rules.search('has_map_in_scrollview')
         if has_scrollview and has_map_in_scrollview:
             self.issues.append(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.")
 
         # 2.2 React.memo Check
         if is_react_native:
-            has_list = bool(re.search(r'FlatList|FlashList|SectionList', content))
-            has_react_memo = bool(re.search(r'React\.memo|memo\(', content))
+            has_list = rules.search('has_list')
+            has_react_memo = rules.search('has_react_memo')
             if has_list and not has_react_memo:
                 self.warnings.append(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.")
 
         # 2.3 useCallback Check
         if is_react_native:
-            has_flatlist = bool(re.search(r'FlatList|FlashList', content))
-            has_use_callback = bool(re.search(r'useCallback', content))
+            has_flatlist = rules.search('has_flatlist')
+            has_use_callback = rules.search('has_use_callback')
             if has_flatlist and not has_use_callback:
                 self.warnings.append(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.")
 
         # 2.4 keyExtractor Check (CRITICAL)
         if is_react_native:
-            has_flatlist = bool(re.search(r'FlatList', content))
-            has_key_extractor = bool(re.search(r'keyExtractor', content))
-            uses_index_key = bool(re.search(r'key=\{.*index.*\}|key:\s*index', content))
+            has_flatlist = rules.search('has_flatlist_only')
+            has_key_extractor = rules.search('has_key_extractor')
+            uses_index_key = rules.search('uses_index_key')
             if has_flatlist and not has_key_extractor:
                 self.issues.append(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.")
             if uses_index_key:
@@ -174,9 +328,9 @@ class MobileAuditor:
 
         # 2.5 useNativeDriver Check
         if is_react_native:
-            has_animated = bool(re.search(r'Animated\.', content))
-            has_native_driver = bool(re.search(r'useNativeDriver:\s*true', content))
-            has_native_driver_false = bool(re.search(r'useNativeDriver:\s*false', content))
+            has_animated = rules.search('has_animated')
+            has_native_driver = rules.search('has_native_driver')
+            has_native_driver_false = rules.search('has_native_driver_false')
             if has_animated and has_native_driver_false:
                 self.warnings.append(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).")
             if has_animated and not has_native_driver:
@@ -184,53 +338,53 @@ class MobileAuditor:
 
         # 2.6 Memory Leak Check
         if is_react_native:
-            has_effect = bool(re.search(r'useEffect', content))
-            has_cleanup = bool(re.search(r'return\s*\(\)\s*=>|return\s+function', content))
-            has_subscriptions = bool(re.search(r'addEventListener|subscribe|\.focus\(\)|\.off\(', content))
+            has_effect = rules.search('has_effect')
+            has_cleanup = rules.search('has_cleanup')
+            has_subscriptions = rules.search('has_subscriptions')
             if has_effect and has_subscriptions and not has_cleanup:
                 self.issues.append(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.")
 
         # 2.7 Console.log Detection
-        console_logs = len(re.findall(r'console\.log|console\.warn|console\.error|console\.debug', content))
+        console_logs = len(rules.findall('console_logs'))
         if console_logs > 5:
             self.warnings.append(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).")
 
         # 2.8 Inline Function Detection
         if is_react_native:
-            inline_functions = re.findall(r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>', content)
+            inline_functions = rules.findall('inline_functions')
             if len(inline_functions) > 3:
                 self.warnings.append(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.")
 
         # 2.9 Animation Properties Check
         # Warn if animating expensive properties
-        animating_layout = bool(re.search(r'Animated\.timing.*(?:width|height|margin|padding)', content))
+        animating_layout = rules.search('animating_layout')
         if animating_layout:
             self.issues.append(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.")
 
         # --- 3. MOBILE NAVIGATION CHECKS ---
 
         # 3.1 Tab Bar Max Items Check
-        tab_bar_items = len(re.findall(r'Tab\.Screen|createBottomTabNavigator|BottomTab', content))
+        tab_bar_items = len(rules.findall('tab_bar_items'))
         if tab_bar_items > 5:
             self.warnings.append(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.")
 
         # 3.2 Tab State Preservation Check
-        has_tab_nav = bool(re.search(r'createBottomTabNavigator|Tab\.Navigator', content))
+        has_tab_nav = rules.search('has_tab_nav')
         if has_tab_nav:
             # Look for lazy prop (false preserves state)
-            has_lazy_false = bool(re.search(r'lazy:\s*false', content))
+            has_lazy_false = rules.search('has_lazy_false')
             if not has_lazy_false:
                 self.warnings.append(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.")
 
         # 3.3 Back Handling Check
-        has_back_listener = bool(re.search(r'BackHandler|useFocusEffect|navigation\.addListener', content))
-        has_custom_back = bool(re.search(r'onBackPress|handleBackPress', content))
+        has_back_listener = rules.search('has_back_listener')
+        has_custom_back = rules.search('has_custom_back')
         if has_custom_back and not has_back_listener:
             self.warnings.append(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.")
 
         # 3.4 Deep Link Support Check
-        has_linking = bool(re.search(r'Linking\.|Linking\.openURL|deepLink|universalLink', content))
-        has_config = bool(re.search(r'apollo-link|react-native-screens|navigation\.link', content))
+        has_linking = rules.search('has_linking')
+        has_config = rules.search('has_config')
         if not has_linking and not has_config:
             self.passed_count += 1
         else:
@@ -241,26 +395,26 @@ class MobileAuditor:
 
         # 4.1 System Font Check
         if is_react_native:
-            has_custom_font = bool(re.search(r"fontFamily:\s*[\"'][^\"']+", content))
-            has_system_font = bool(re.search(r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)", content))
+            has_custom_font = rules.search('has_custom_font')
+            has_system_font = rules.search('has_system_font')
             if has_custom_font and not has_system_font:
                 self.warnings.append(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.")
 
         # 4.2 Text Scaling Check (iOS Dynamic Type)
         if is_react_native:
-            has_font_sizes = bool(re.search(r'fontSize:', content))
-            has_scaling = bool(re.search(r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions', content))
+            has_font_sizes = rules.search('has_font_sizes')
+            has_scaling = rules.search('has_scaling')
             if has_font_sizes and not has_scaling:
                 self.warnings.append(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.")
 
         # 4.3 Mobile Line Height Check
-        line_heights = re.findall(r'lineHeight:\s*([\d.]+)', content)
+        line_heights = rules.findall('line_heights')
         for lh in line_heights:
             if float(lh) > 1.8:
                 self.warnings.append(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).")
 
         # 4.4 Font Size Limits
-        font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
+        font_sizes = rules.findall('font_sizes')
         for fs in font_sizes:
             size = float(fs)
             if size < 12:
@@ -271,12 +425,12 @@ class MobileAuditor:
         # --- 5. MOBILE COLOR SYSTEM CHECKS ---
 
         # 5.1 Pure Black Avoidance
-        if re.search(r'#000000|color:\s*black|backgroundColor:\s*["\']?black', content):
+        if rules.search('has_pure_black'):
             self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.")
 
         # 5.2 Dark Mode Support
-        has_color_schemes = bool(re.search(r'useColorScheme|colorScheme|appearance:\s*["\']?dark', content))
-        has_dark_mode_style = bool(re.search(r'\\\?.*dark|style:\s*.*dark|isDark', content))
+        has_color_schemes = rules.search('has_color_schemes')
+        has_dark_mode_style = rules.search('has_dark_mode_style')
         if not has_color_schemes and not has_dark_mode_style:
             self.warnings.append(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.")
 
@@ -284,19 +438,19 @@ class MobileAuditor:
 
         if is_react_native:
             # 6.1 SF Symbols Check
-            has_ios_icons = bool(re.search(r'@expo/vector-icons|ionicons', content))
-            has_sf_symbols = bool(re.search(r'sf-symbol|SF Symbols', content))
+            has_ios_icons = rules.search('has_ios_icons')
+            has_sf_symbols = rules.search('has_sf_symbols')
             if has_ios_icons and not has_sf_symbols:
                 self.passed_count += 1
 
             # 6.2 iOS Haptic Types
-            has_haptic_import = bool(re.search(r'expo-haptics|react-native-haptic-feedback', content))
-            has_haptic_types = bool(re.search(r'ImpactFeedback|NotificationFeedback|SelectionFeedback', content))
+            has_haptic_import = rules.search('has_haptic_import')
+            has_haptic_types = rules.search('has_haptic_types')
             if has_haptic_import and not has_haptic_types:
                 self.warnings.append(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).")
 
             # 6.3 iOS Safe Area
-            has_safe_area = bool(re.search(r'SafeAreaView|useSafeAreaInsets|safeArea', content))
+            has_safe_area = rules.search('has_safe_area')
             if not has_safe_area:
                 self.warnings.append(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.")
 
@@ -304,41 +458,41 @@ class MobileAuditor:
 
         if is_react_native:
             # 7.1 Material Icons Check
-            has_material_icons = bool(re.search(r'@expo/vector-icons|MaterialIcons', content))
+            has_material_icons = rules.search('has_material_icons')
             if has_material_icons:
                 self.passed_count += 1
 
             # 7.2 Ripple Effect
-            has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
-            has_pressable = bool(re.search(r'Pressable|Touchable', content))
+            has_ripple = rules.search('has_ripple')
+            has_pressable = rules.search('has_touchable')
             if has_pressable and not has_ripple:
                 self.warnings.append(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.")
 
             # 7.3 Hardware Back Button
             if is_react_native:
-                has_back_button = bool(re.search(r'BackHandler|useBackHandler', content))
-                has_navigation = bool(re.search(r'@react-navigation', content))
+                has_back_button = rules.search('has_back_button')
+                has_navigation = rules.search('has_navigation')
                 if has_navigation and not has_back_button:
                     self.warnings.append(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.")
 
         # --- 8. MOBILE BACKEND CHECKS ---
 
         # 8.1 Secure Storage Check
-        has_async_storage = bool(re.search(r'AsyncStorage|@react-native-async-storage', content))
-        has_secure_storage = bool(re.search(r'SecureStore|Keychain|EncryptedSharedPreferences', content))
-        has_token_storage = bool(re.search(r'token|jwt|auth.*storage', content, re.IGNORECASE))
+        has_async_storage = rules.search('has_async_storage')
+        has_secure_storage = rules.search('has_secure_storage')
+        has_token_storage = rules.search('has_token_storage')
         if has_token_storage and has_async_storage and not has_secure_storage:
             self.issues.append(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).")
 
         # 8.2 Offline Handling Check
-        has_network = bool(re.search(r'fetch|axios|netinfo|@react-native-community/netinfo', content))
-        has_offline = bool(re.search(r'offline|isConnected|netInfo|cache.*offline', content))
+        has_network = rules.search('has_network')
+        has_offline = rules.search('has_offline')
         if has_network and not has_offline:
             self.warnings.append(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.")
 
         # 8.3 Push Notification Support
-        has_push = bool(re.search(r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS', content))
-        has_push_handler = bool(re.search(r'onNotification|addNotificationListener|notification\.open', content))
+        has_push = rules.search('has_push')
+        has_push_handler = rules.search('has_push_handler')
         if has_push and not has_push_handler:
             self.warnings.append(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.")
 
@@ -347,13 +501,13 @@ class MobileAuditor:
         # 9.1 iOS Type Scale Check
         if is_react_native:
             # Check for iOS text styles that match HIG
-            has_large_title = bool(re.search(r'fontSize:\s*34|largeTitle|font-weight:\s*["\']?bold', content))
-            has_title_1 = bool(re.search(r'fontSize:\s*28', content))
-            has_headline = bool(re.search(r'fontSize:\s*17.*semibold|headline', content))
-            has_body = bool(re.search(r'fontSize:\s*17.*regular|body', content))
+            has_large_title = rules.search('has_large_title')
+            has_title_1 = rules.search('has_title_1')
+            has_headline = rules.search('has_headline')
+            has_body = rules.search('has_body')
 
             # Check if following iOS scale roughly
-            font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
+            font_sizes = rules.findall('font_sizes')
             ios_scale_sizes = [34, 28, 22, 20, 17, 16, 15, 13, 12, 11]
             matching_ios = sum(1 for size in font_sizes if any(abs(float(size) - ios_size) < 1 for ios_size in ios_scale_sizes))
 
@@ -363,21 +517,21 @@ class MobileAuditor:
         # 9.2 Android Material Type Scale Check
         if is_react_native:
             # Check for Material 3 text styles
-            has_display = bool(re.search(r'fontSize:\s*[456][0-9]|display', content))
-            has_headline_material = bool(re.search(r'fontSize:\s*[23][0-9]|headline', content))
-            has_title_material = bool(re.search(r'fontSize:\s*2[12][0-9].*medium|title', content))
-            has_body_material = bool(re.search(r'fontSize:\s*1[456].*regular|body', content))
-            has_label = bool(re.search(r'fontSize:\s*1[1234].*medium|label', content))
+            has_display = rules.search('has_display')
+            has_headline_material = rules.search('has_headline_material')
+            has_title_material = rules.search('has_title_material')
+            has_body_material = rules.search('has_body_material')
+            has_label = rules.search('has_label')
 
             # Check if using sp (scale-independent pixels)
-            uses_sp = bool(re.search(r'\d+\s*sp\b', content))
+            uses_sp = rules.search('uses_sp')
             if has_display or has_headline_material:
                 if not uses_sp:
                     self.warnings.append(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.")
 
         # 9.3 Modular Scale Check
         # Check if font sizes follow modular scale
-        font_sizes = re.findall(r'fontSize:\s*(\d+(?:\.\d+)?)', content)
+        font_sizes = rules.findall('font_size_values')
         if len(font_sizes) > 3:
             sorted_sizes = sorted(set([float(s) for s in font_sizes]))
             ratios = []
@@ -395,15 +549,15 @@ class MobileAuditor:
         # 9.4 Line Length Check (Mobile-specific)
         # Mobile text should be 40-60 characters max
         if is_react_native:
-            has_long_text = bool(re.search(r'<Text[^>]*>[^<]{40,}', content))
-            has_max_width = bool(re.search(r'maxWidth|max-w-\d+|width:\s*["\']?\d+', content))
+            has_long_text = rules.search('has_long_text')
+            has_max_width = rules.search('has_max_width')
             if has_long_text and not has_max_width:
                 self.warnings.append(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.")
 
         # 9.5 Font Weight Pattern Check
         # Check for font weight distribution
         if is_react_native:
-            font_weights = re.findall(r'fontWeight:\s*["\']?(\d+|normal|bold|medium|light)', content)
+            font_weights = rules.findall('font_weights')
             weight_map = {'normal': '400', 'light': '300', 'medium': '500', 'bold': '700'}
             numeric_weights = []
             for w in font_weights:
@@ -423,18 +577,18 @@ class MobileAuditor:
 
         # 10.1 OLED Optimization Check
         # Check for near-black colors instead of pure black
-        if re.search(r'#121212|#1A1A1A|#0D0D0D', content):
+        if rules.search('has_near_black'):
             self.passed_count += 1  # Good OLED optimization
-        elif re.search(r'backgroundColor:\s*["\']?#000000', content):
+        elif rules.search('pure_black_background'):
             # Using pure black for background is OK for OLED
             pass
-        elif re.search(r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}', content):
+        elif rules.search('hex_background'):
             # Check if using light colors in dark mode (bad for OLED)
             self.warnings.append(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.")
 
         # 10.2 Saturated Color Detection (Battery)
         # Highly saturated colors consume more power on OLED
-        hex_colors = re.findall(r'#([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})', content)
+        hex_colors = rules.findall('hex_colors')
         saturated_count = 0
         for r, g, b in hex_colors:
             # Convert to RGB 0-255
@@ -455,17 +609,17 @@ class MobileAuditor:
 
         # 10.3 Outdoor Visibility Check
         # Low contrast combinations fail in outdoor sunlight
-        light_colors = re.findall(r'#[0-9A-Fa-f]{6}|rgba?\([^)]+\)', content)
+        light_colors = rules.findall('light_colors')
         # Check for potential low contrast (light gray on white, dark gray on black)
-        potential_low_contrast = bool(re.search(r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000', content))
+        potential_low_contrast = rules.search('potential_low_contrast')
         if potential_low_contrast:
             self.warnings.append(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.")
 
         # 10.4 Dark Mode Text Color Check
         # In dark mode, text should not be pure white
-        has_dark_mode = bool(re.search(r'dark:\s*|isDark|useColorScheme|colorScheme:\s*["\']?dark', content))
+        has_dark_mode = rules.search('has_dark_mode')
         if has_dark_mode:
-            has_pure_white_text = bool(re.search(r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white', content))
+            has_pure_white_text = rules.search('has_pure_white_text')
             if has_pure_white_text:
                 self.warnings.append(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.")
 
@@ -473,41 +627,41 @@ class MobileAuditor:
 
         if is_react_native:
             # 11.1 SF Pro Font Detection
-            has_sf_pro = bool(re.search(r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF', content))
-            has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
+            has_sf_pro = rules.search('has_sf_pro')
+            has_custom_font = rules.search('has_quoted_font_family')
             if has_custom_font and not has_sf_pro:
                 self.warnings.append(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.")
 
             # 11.2 iOS System Colors Check
             # Check for semantic color usage
-            has_label = bool(re.search(r'color:\s*["\']?label|\.label', content))
-            has_secondaryLabel = bool(re.search(r'secondaryLabel|\.secondaryLabel', content))
-            has_systemBackground = bool(re.search(r'systemBackground|\.systemBackground', content))
+            has_label = rules.search('has_label_color')
+            has_secondaryLabel = rules.search('has_secondaryLabel')
+            has_systemBackground = rules.search('has_systemBackground')
 
-            has_hardcoded_gray = bool(re.search(r'#[78]0{4}', content))
+            has_hardcoded_gray = rules.search('has_hardcoded_gray')
             if has_hardcoded_gray and not (has_label or has_secondaryLabel):
                 self.warnings.append(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.")
 
             # 11.3 iOS Accent Colors Check
-            ios_blue = bool(re.search(r'#007AFF|#0A84FF|systemBlue', content))
-            ios_green = bool(re.search(r'#34C759|#30D158|systemGreen', content))
-            ios_red = bool(re.search(r'#FF3B30|#FF453A|systemRed', content))
+            ios_blue = rules.search('ios_blue')
+            ios_green = rules.search('ios_green')
+            ios_red = rules.search('ios_red')
 
-            has_custom_primary = bool(re.search(r'primaryColor|theme.*primary|colors\.primary', content))
+            has_custom_primary = rules.search('has_custom_primary')
             if has_custom_primary and not (ios_blue or ios_green or ios_red):
                 self.warnings.append(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.")
 
             # 11.4 iOS Navigation Patterns Check
-            has_navigation_bar = bool(re.search(r'navigationOptions|headerStyle|cardStyle', content))
-            has_header_title = bool(re.search(r'title:\s*["\']|headerTitle|navigation\.setOptions', content))
+            has_navigation_bar = rules.search('has_navigation_bar')
+            has_header_title = rules.search('has_header_title')
             if has_navigation_bar and not has_header_title:
                 self.warnings.append(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.")
 
             # 11.5 iOS Component Patterns Check
             # Check for iOS-specific components
-            has_alert = bool(re.search(r'Alert\.alert|showAlert', content))
-            has_action_sheet = bool(re.search(r'ActionSheet|ActionSheetIOS|showActionSheetWithOptions', content))
-            has_activity_indicator = bool(re.search(r'ActivityIndicator|ActivityIndic', content))
+            has_alert = rules.search('has_alert')
+            has_action_sheet = rules.search('has_action_sheet')
+            has_activity_indicator = rules.search('has_activity_indicator')
 
             if has_alert or has_action_sheet or has_activity_indicator:
                 self.passed_count += 1  # Good iOS component usage
@@ -516,39 +670,39 @@ class MobileAuditor:
 
         if is_react_native:
             # 12.1 Roboto Font Detection
-            has_roboto = bool(re.search(r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto', content))
-            has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
+            has_roboto = rules.search('has_roboto')
+            has_custom_font = rules.search('has_quoted_font_family')
             if has_custom_font and not has_roboto:
                 self.warnings.append(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.")
 
             # 12.2 Material 3 Dynamic Color Check
-            has_material_colors = bool(re.search(r'MD3|MaterialYou|dynamicColor|useColorScheme', content))
-            has_theme_provider = bool(re.search(r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider', content))
+            has_material_colors = rules.search('has_material_colors')
+            has_theme_provider = rules.search('has_theme_provider')
             if not has_material_colors and not has_theme_provider:
                 self.warnings.append(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
 
             # 12.3 Material Elevation Check
             # Check for elevation values (Material 3 uses elevation for depth)
-            has_elevation = bool(re.search(r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation', content))
-            has_box_shadow = bool(re.search(r'boxShadow:', content))
+            has_elevation = rules.search('has_elevation')
+            has_box_shadow = rules.search('has_box_shadow')
             if has_box_shadow and not has_elevation:
                 self.warnings.append(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.")
 
             # 12.4 Material Component Patterns Check
             # Check for Material components
-            has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
-            has_card = bool(re.search(r'Card|Paper|elevation.*\d+', content))
-            has_fab = bool(re.search(r'FAB|FloatingActionButton|fab', content))
-            has_snackbar = bool(re.search(r'Snackbar|showSnackBar|Toast', content))
+            has_ripple = rules.search('has_ripple')
+            has_card = rules.search('has_card')
+            has_fab = rules.search('has_fab')
+            has_snackbar = rules.search('has_snackbar')
 
             material_component_count = sum([has_ripple, has_card, has_fab, has_snackbar])
             if material_component_count >= 2:
                 self.passed_count += 1  # Good Material design usage
 
             # 12.5 Android Navigation Patterns Check
-            has_top_app_bar = bool(re.search(r'TopAppBar|AppBar|CollapsingToolbar', content))
-            has_bottom_nav = bool(re.search(r'BottomNavigation|BottomNav', content))
-            has_navigation_rail = bool(re.search(r'NavigationRail', content))
+            has_top_app_bar = rules.search('has_top_app_bar')
+            has_bottom_nav = rules.search('has_bottom_nav')
+            has_navigation_rail = rules.search('has_navigation_rail')
 
             if has_bottom_nav:
                 self.passed_count += 1  # Good Android pattern
@@ -558,10 +712,10 @@ class MobileAuditor:
         # --- 13. MOBILE TESTING CHECKS ---
 
         # 13.1 Testing Tool Detection
-        has_rntl = bool(re.search(r'react-native-testing-library|@testing-library', content))
-        has_detox = bool(re.search(r'detox|element\(|by\.text|by\.id', content))
-        has_maestro = bool(re.search(r'maestro|\.yaml$', content))
-        has_jest = bool(re.search(r'jest|describe\(|test\(|it\(', content))
+        has_rntl = rules.search('has_rntl')
+        has_detox = rules.search('has_detox')
+        has_maestro = rules.search('has_maestro')
+        has_jest = rules.search('has_jest')
 
         testing_tools = []
         if has_jest: testing_tools.append('Jest')
@@ -573,7 +727,7 @@ class MobileAuditor:
             self.warnings.append(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
 
         # 13.2 Test Pyramid Balance Check
-        test_files = len(re.findall(r'\.test\.(tsx|ts|js|jsx)|\.spec\.', content))
+        test_files = len(rules.findall('test_files'))
         e2e_tests = len(re.findall(r'detox|maestro|e2e|spec\.e2e', content.lower()))
 
         if test_files > 0 and e2e_tests == 0:
@@ -581,17 +735,17 @@ class MobileAuditor:
 
         # 13.3 Accessibility Label Check (Mobile-specific)
         if is_react_native:
-            has_pressable = bool(re.search(r'Pressable|TouchableOpacity|TouchableHighlight', content))
-            has_a11y_label = bool(re.search(r'accessibilityLabel|aria-label|testID', content))
+            has_pressable = rules.search('has_touchable_component')
+            has_a11y_label = rules.search('has_a11y_label')
             if has_pressable and not has_a11y_label:
                 self.warnings.append(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.")
 
         # --- 14. MOBILE DEBUGGING CHECKS ---
 
         # 14.1 Performance Profiling Check
-        has_performance = bool(re.search(r'Performance|systrace|profile|Flipper', content))
-        has_console_log = len(re.findall(r'console\.(log|warn|error|debug|info)', content))
-        has_debugger = bool(re.search(r'debugger|__DEV__|React\.DevTools', content))
+        has_performance = rules.search('has_performance')
+        has_console_log = len(rules.findall('has_console_log'))
+        has_debugger = rules.search('has_debugger')
 
         if has_console_log > 10:
             self.warnings.append(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.")
@@ -600,7 +754,7 @@ class MobileAuditor:
             self.passed_count += 1  # Good performance monitoring
 
         # 14.2 Error Boundary Check
-        has_error_boundary = bool(re.search(r'ErrorBoundary|componentDidCatch|getDerivedStateFromError', content))
+        has_error_boundary = rules.search('has_error_boundary')
         if not has_error_boundary and is_react_native:
             self.warnings.append(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
 
@@ -610,37 +764,115 @@ class MobileAuditor:
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
-    def audit_directory(self, directory: str) -> None:
+    def audit_directory(self, directory: str, jobs: int = 1) -> None:
+        """
+        Audit all matching files. Files unchanged since the last run replay
+        their cached findings; the rest are audited serially, or sharded
+        across a process pool when jobs > 1. Findings are merged in file
+        order either way, so reports do not depend on jobs.
+        """
+        cache = ResultsCache("mobile_audit", source_version(__file__, check_context.__file__, rule_engine.__file__))
         extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}
+        context = self.context or CheckContext(directory)
+        filepaths = [str(p) for p in context.files(skip_dirs=skip_dirs) if p.suffix in extensions]
+
+        results = [cache.get(filepath) for filepath in filepaths]
+        stale = [i for i, result in enumerate(results) if result is None]
+        fresh = self.audit_files([filepaths[i] for i in stale], jobs)
+        for i, result in zip(stale, fresh):
+            results[i] = result
+            cache.put(filepaths[i], result)
+        cache.close()
+        self.cache_stats = cache.stats()
+
+        for result in results:
+            self.merge_result(result)
+
+    def audit_files(self, filepaths: list, jobs: int = 1) -> list:
+        """Per-file results for filepaths, in order."""
+        if jobs <= 1 or len(filepaths) < MIN_PARALLEL_FILES:
+            return [self.audit_file_result(filepath) for filepath in filepaths]
+
+        shards = [filepaths[i:i + FILES_PER_SHARD] for i in range(0, len(filepaths), FILES_PER_SHARD)]
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for shard_results in executor.map(_audit_shard, shards):
+                results.extend(shard_results)
+        return results
+
+    def audit_file_result(self, filepath: str) -> dict:
+        """
+        Audit one file and return its findings (checked, issues, warnings,
+        passed) instead of adding them to this auditor.
+        """
+        issues, warnings = len(self.issues), len(self.warnings)
+        passed, checked = self.passed_count, self.files_checked
+        self.audit_file(filepath)
+        result = {
+            "checked": self.files_checked - checked,
+            "issues": self.issues[issues:],
+            "warnings": self.warnings[warnings:],
+            "passed": self.passed_count - passed
+        }
+        del self.issues[issues:], self.warnings[warnings:]
+        self.passed_count, self.files_checked = passed, checked
+        return result
+
+    def merge_result(self, result: dict) -> None:
+        self.files_checked += result["checked"]
+        self.reported_issues.extend(result["issues"])
+        self.reported_warnings.extend(result["warnings"])
+        self.passed_count += result["passed"]
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
-            "issues": self.issues,
-            "warnings": self.warnings,
+            "issues": self.reported_issues.items,
+            "warnings": self.reported_warnings.items,
             "passed_checks": self.passed_count,
-            "compliant": len(self.issues) == 0
+            "compliant": len(self.reported_issues) == 0,
+            "cache": self.cache_stats
         }
 
 
+def _audit_shard(filepaths: list) -> list:
+    """Audit a shard of files in a worker process."""
+    auditor = MobileAuditor()
+    return [auditor.audit_file_result(filepath) for filepath in filepaths]
+
+
+def run(context: CheckContext, jobs: int = 1) -> dict:
+    """Audit the project; returns the JSON report (in-process check API)."""
+    auditor = MobileAuditor(context)
+    auditor.audit_directory(str(context.project_path), jobs)
+    report = auditor.get_report()
+    report["script"] = "mobile_audit"
+    report["passed"] = report["compliant"]
+    return report
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
+        print("Usage: python mobile_audit.py <directory> [--json|--ndjson] [--jobs N]")
         sys.exit(1)
 
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    # --jobs N: worker processes for directory audits (0 = all CPUs, default: 1 = serial)
+    jobs = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    if "--ndjson" in sys.argv and os.path.isdir(path):
+        report = stream_report(lambda context: run(context, jobs), CheckContext(path), "mobile_audit")
+        sys.exit(0 if report['compliant'] else 1)
 
     auditor = MobileAuditor()
     if os.path.isfile(path):
-        auditor.audit_file(path)
+        auditor.merge_result(auditor.audit_file_result(path))
     else:
-        auditor.audit_directory(path)
+        auditor.audit_directory(path, jobs)
 
     report = auditor.get_report()
 
@@ -658,6 +890,9 @@ def main():
             for w in report['warnings'][:15]:
                 print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+        if report['cache']:
+            cache = report['cache']
+            print(f"[=] CACHE: {cache['hits']}/{cache['hits'] + cache['misses']} files unchanged ({cache['hit_ratio']:.0%})")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
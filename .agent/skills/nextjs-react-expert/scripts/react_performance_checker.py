@@ -3,13 +3,144 @@
 React Performance Checker
 Automated performance audit for React/Next.js projects
 Based on Vercel Engineering best practices
+
+Each TS/TSX/JS/JSX file is read and parsed once into an ImportGraphIndex
+(imports, dynamic() usage, useEffect fetches, <img> tags); every check
+queries that index, so a run is linear in the number of files.
 """
 
 import os
 import re
+import sys
 import json
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from file_inventory import FileInventory
+
+SOURCE_SUFFIXES = ['.ts', '.tsx', '.js', '.jsx']
+
+# Files larger than this should probably be loaded with dynamic()
+LARGE_COMPONENT_SIZE = 10000
+
+# Static imports: default and/or named bindings, then the module specifier
+IMPORT_RE = re.compile(
+    r"^\s*import\s+(?:type\s+)?(?:([\w$]+)\s*,?\s*)?(?:\{([^}]*)\}\s*)?(?:\*\s*as\s+[\w$]+\s*)?"
+    r"from\s+['\"]([^'\"]+)['\"]",
+    re.MULTILINE
+)
+SEQUENTIAL_AWAIT_RE = re.compile(r'await\s+\w+.*?\n\s*await\s+\w+')
+BARREL_IMPORT_RES = [
+    re.compile(r"import.*from\s+['\"](@/.*?)/index['\"]"),
+    re.compile(r"import.*from\s+['\"]\.\.?/.*?['\"](?!.*?\.tsx?)"),
+]
+COMPONENT_RE = re.compile(r'(?:export\s+)?(?:const|function)\s+([A-Z]\w+)')
+
+
+class SourceFile:
+    """Facts extracted from one source file in a single read"""
+
+    __slots__ = ('order', 'path', 'rel', 'suffix', 'size', 'imported_names', 'specifiers',
+                 'has_dynamic', 'sequential_awaits', 'barrel_imports', 'effect_fetch',
+                 'has_img', 'has_next_image', 'has_components', 'has_memo', 'has_props')
+
+    def __init__(self, order: int, path: Path, rel: str, content: str):
+        self.order = order
+        self.path = path
+        self.rel = rel
+        self.suffix = path.suffix
+        self.size = len(content)
+
+        self.imported_names = set()
+        self.specifiers = []
+        for default, named, specifier in IMPORT_RE.findall(content):
+            if default:
+                self.imported_names.add(default)
+            for binding in named.split(','):
+                name = binding.split(' as ')[0].strip()
+                if name.startswith('type '):
+                    name = name[5:].strip()
+                if name:
+                    self.imported_names.add(name)
+            self.specifiers.append(specifier)
+
+        self.has_dynamic = 'dynamic(' in content
+        self.sequential_awaits = bool(SEQUENTIAL_AWAIT_RE.search(content))
+        self.barrel_imports = any(regex.search(content) for regex in BARREL_IMPORT_RES)
+
+        # A fetch() anywhere after the first useEffect
+        effect = content.find('useEffect')
+        self.effect_fetch = effect != -1 and content.find('fetch(', effect) != -1
+
+        self.has_img = '<img' in content
+        self.has_next_image = 'next/image' in content
+        self.has_components = bool(COMPONENT_RE.search(content))
+        self.has_memo = 'React.memo' in content or 'memo(' in content
+        self.has_props = 'props:' in content or 'Props>' in content
+
+
+class ImportGraphIndex:
+    """
+    Every TS/TSX/JS/JSX file of the project, parsed once, with a reverse
+    import index (imported name or resolved file -> importing files).
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = project_path.resolve()
+        self.files: List[SourceFile] = []
+        self.by_path: Dict[Path, SourceFile] = {}
+        self.importers_by_name: Dict[str, List[SourceFile]] = {}
+        self.importers_by_path: Dict[Path, List[SourceFile]] = {}
+
+        inventory = FileInventory(self.project_path)
+        for filepath in inventory.select(SOURCE_SUFFIXES, skip_dirs={'node_modules'}):
+            try:
+                content = filepath.read_text(encoding='utf-8')
+            except Exception:
+                continue
+            source = SourceFile(len(self.files), filepath, str(filepath.relative_to(self.project_path)), content)
+            self.files.append(source)
+            self.by_path[filepath] = source
+
+        for source in self.files:
+            for name in source.imported_names:
+                self.importers_by_name.setdefault(name, []).append(source)
+            for specifier in source.specifiers:
+                target = self.resolve(source.path, specifier)
+                if target is not None:
+                    self.importers_by_path.setdefault(target, []).append(source)
+
+    def resolve(self, importer: Path, specifier: str) -> Optional[Path]:
+        """Resolve a relative or @/ specifier to an indexed file"""
+        if specifier.startswith('.'):
+            base = importer.parent / specifier
+        elif specifier.startswith('@/'):
+            base = self.project_path / specifier[2:]
+        else:
+            return None
+        base = Path(os.path.normpath(base))
+        for candidate in [base] + [base.with_name(base.name + s) for s in SOURCE_SUFFIXES] + \
+                         [base / f'index{s}' for s in SOURCE_SUFFIXES]:
+            if candidate in self.by_path:
+                return candidate
+        return None
+
+    def select(self, suffixes: List[str]) -> List[SourceFile]:
+        return [source for source in self.files if source.suffix in suffixes]
+
+    def importers(self, source: SourceFile) -> List[SourceFile]:
+        """Files that statically import source, by resolved path or by its name"""
+        seen = set()
+        result = []
+        for importer in self.importers_by_path.get(source.path, []) + \
+                        self.importers_by_name.get(source.path.stem, []):
+            if importer is not source and importer.path not in seen:
+                seen.add(importer.path)
+                result.append(importer)
+        return sorted(result, key=lambda f: f.order)
+
 
 class PerformanceChecker:
     def __init__(self, project_path: str):
@@ -17,166 +148,110 @@ class PerformanceChecker:
         self.issues = []
         self.warnings = []
         self.passed = []
+        self._index = None
+
+    @property
+    def index(self) -> ImportGraphIndex:
+        """Single-pass source index shared by all checks"""
+        if self._index is None:
+            self._index = ImportGraphIndex(self.project_path)
+        return self._index
 
     def check_waterfalls(self):
         """Check for sequential await patterns (Section 1)"""
         print("\n[*] Checking for waterfalls (sequential awaits)...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: multiple awaits in sequence without Promise.all
-                sequential_awaits = re.findall(r'await\s+\w+.*?\n\s*await\s+\w+', content)
-
-                if sequential_awaits:
-                    self.issues.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'CRITICAL',
-                        'issue': 'Sequential awaits detected (waterfall)',
-                        'fix': 'Use Promise.all() for parallel fetching',
-                        'section': '1-async-eliminating-waterfalls.md'
-                    })
-            except Exception as e:
-                continue
+        for source in self.index.select(['.ts', '.tsx', '.js', '.jsx']):
+            # Pattern: multiple awaits in sequence without Promise.all
+            if source.sequential_awaits:
+                self.issues.append({
+                    'file': source.rel,
+                    'type': 'CRITICAL',
+                    'issue': 'Sequential awaits detected (waterfall)',
+                    'fix': 'Use Promise.all() for parallel fetching',
+                    'section': '1-async-eliminating-waterfalls.md'
+                })
 
     def check_barrel_imports(self):
         """Check for barrel imports (Section 2)"""
         print("[*] Checking for barrel imports...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: import from index files or barrel exports
-                barrel_imports = re.findall(r"import.*from\s+['\"](@/.*?)/index['\"]", content)
-                barrel_imports += re.findall(r"import.*from\s+['\"]\.\.?/.*?['\"](?!.*?\.tsx?)", content)
-
-                if barrel_imports:
-                    self.warnings.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'CRITICAL',
-                        'issue': 'Potential barrel imports detected',
-                        'fix': 'Import directly from specific files',
-                        'section': '2-bundle-bundle-size-optimization.md'
-                    })
-            except Exception as e:
-                continue
+        for source in self.index.select(['.ts', '.tsx', '.js', '.jsx']):
+            # Pattern: import from index files or barrel exports
+            if source.barrel_imports:
+                self.warnings.append({
+                    'file': source.rel,
+                    'type': 'CRITICAL',
+                    'issue': 'Potential barrel imports detected',
+                    'fix': 'Import directly from specific files',
+                    'section': '2-bundle-bundle-size-optimization.md'
+                })
 
     def check_dynamic_imports(self):
         """Check if large components use dynamic imports (Section 2)"""
         print("[*] Checking for missing dynamic imports...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx}'):
-            if 'node_modules' in str(filepath):
+        for source in self.index.select(['.ts', '.tsx']):
+            # Check file size - if > 10KB, should probably use dynamic import
+            if source.size <= LARGE_COMPONENT_SIZE:
                 continue
 
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check file size - if > 10KB, should probably use dynamic import
-                if len(content) > 10000:
-                    # Check if it's imported statically somewhere
-                    filename = filepath.stem
-
-                    # Search for static imports of this component
-                    for check_file in self.project_path.rglob('*.{ts,tsx}'):
-                        if check_file == filepath or 'node_modules' in str(check_file):
-                            continue
-
-                        check_content = check_file.read_text(encoding='utf-8')
-                        if f"import {filename}" in check_content or f"import {{ {filename}" in check_content:
-                            if 'dynamic(' not in check_content:
-                                self.warnings.append({
-                                    'file': str(check_file.relative_to(self.project_path)),
-                                    'type': 'CRITICAL',
-                                    'issue': f'Large component {filename} imported statically',
-                                    'fix': 'Use dynamic() for code splitting',
-                                    'section': '2-bundle-bundle-size-optimization.md'
-                                })
-                                break
-            except Exception as e:
-                continue
+            # Report the first file importing this component statically
+            for importer in self.index.importers(source):
+                if importer.suffix in ('.ts', '.tsx') and not importer.has_dynamic:
+                    self.warnings.append({
+                        'file': importer.rel,
+                        'type': 'CRITICAL',
+                        'issue': f'Large component {source.path.stem} imported statically',
+                        'fix': 'Use dynamic() for code splitting',
+                        'section': '2-bundle-bundle-size-optimization.md'
+                    })
+                    break
 
     def check_useEffect_fetching(self):
         """Check for data fetching in useEffect (Section 4)"""
         print("[*] Checking for useEffect data fetching...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Pattern: fetch or axios in useEffect
-                if 'useEffect' in content:
-                    if re.search(r'useEffect.*?fetch\(', content, re.DOTALL):
-                        self.warnings.append({
-                            'file': str(filepath.relative_to(self.project_path)),
-                            'type': 'MEDIUM-HIGH',
-                            'issue': 'Data fetching in useEffect',
-                            'fix': 'Consider using SWR or React Query for deduplication',
-                            'section': '4-client-client-side-data-fetching.md'
-                        })
-            except Exception as e:
-                continue
+        for source in self.index.select(['.ts', '.tsx']):
+            # Pattern: fetch in useEffect
+            if source.effect_fetch:
+                self.warnings.append({
+                    'file': source.rel,
+                    'type': 'MEDIUM-HIGH',
+                    'issue': 'Data fetching in useEffect',
+                    'fix': 'Consider using SWR or React Query for deduplication',
+                    'section': '4-client-client-side-data-fetching.md'
+                })
 
     def check_missing_memoization(self):
         """Check for missing React.memo, useMemo, useCallback (Section 5)"""
         print("[*] Checking for missing memoization...")
 
-        for filepath in self.project_path.rglob('*.{tsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check for component definitions without memo
-                components = re.findall(r'(?:export\s+)?(?:const|function)\s+([A-Z]\w+)', content)
-
-                if components and 'React.memo' not in content and 'memo(' not in content:
-                    # Check if component receives props
-                    if 'props:' in content or 'Props>' in content:
-                        self.warnings.append({
-                            'file': str(filepath.relative_to(self.project_path)),
-                            'type': 'MEDIUM',
-                            'issue': 'Component with props not memoized',
-                            'fix': 'Consider using React.memo if props are stable',
-                            'section': '5-rerender-re-render-optimization.md'
-                        })
-            except Exception as e:
-                continue
+        for source in self.index.select(['.tsx']):
+            # Component definitions that receive props but are not memoized
+            if source.has_components and not source.has_memo and source.has_props:
+                self.warnings.append({
+                    'file': source.rel,
+                    'type': 'MEDIUM',
+                    'issue': 'Component with props not memoized',
+                    'fix': 'Consider using React.memo if props are stable',
+                    'section': '5-rerender-re-render-optimization.md'
+                })
 
     def check_image_optimization(self):
         """Check for unoptimized images (Section 6)"""
         print("[*] Checking for image optimization...")
 
-        for filepath in self.project_path.rglob('*.{ts,tsx,js,jsx}'):
-            if 'node_modules' in str(filepath):
-                continue
-
-            try:
-                content = filepath.read_text(encoding='utf-8')
-
-                # Check for <img> tags instead of next/image
-                if '<img' in content and 'next/image' not in content:
-                    self.warnings.append({
-                        'file': str(filepath.relative_to(self.project_path)),
-                        'type': 'MEDIUM',
-                        'issue': 'Using <img> instead of next/image',
-                        'fix': 'Use next/image for automatic optimization',
-                        'section': '6-rendering-rendering-performance.md'
-                    })
-            except Exception as e:
-                continue
+        for source in self.index.select(['.ts', '.tsx', '.js', '.jsx']):
+            # Check for <img> tags instead of next/image
+            if source.has_img and not source.has_next_image:
+                self.warnings.append({
+                    'file': source.rel,
+                    'type': 'MEDIUM',
+                    'issue': 'Using <img> instead of next/image',
+                    'fix': 'Use next/image for automatic optimization',
+                    'section': '6-rendering-rendering-performance.md'
+                })
 
     def generate_report(self):
         """Generate final report"""
@@ -232,8 +307,6 @@ class PerformanceChecker:
 
 
 def main():
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python react_performance_checker.py <project_path>")
         sys.exit(1)
@@ -15,7 +15,7 @@ WHAT IT CHECKS:
     - Only files that are likely PUBLIC pages
 
 Usage:
-    python seo_checker.py <project_path>
+    python seo_checker.py <project_path> [--ndjson]
 """
 import sys
 import json
@@ -29,6 +29,13 @@ try:
 except:
     pass
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, stream_report
+
 
 # Directories to skip
 SKIP_DIRS = {
@@ -75,30 +82,22 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_pages(project_path: Path) -> list:
+def find_pages(context: CheckContext) -> list:
     """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
+    suffixes = ['.html', '.htm', '.jsx', '.tsx']
     
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
+    # Check if it's likely a page
+    files = [f for f in context.files(suffixes, SKIP_DIRS) if is_page_file(f)]
     
-    return files[:50]  # Limit to 50 files
+    return files
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, context: CheckContext) -> dict:
     """Check a single page for SEO issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = context.read_text(file_path)
     except Exception as e:
         return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
     
@@ -145,9 +144,45 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+def run(context: CheckContext) -> dict:
+    """Audit the project's pages; returns the JSON report (in-process check API)."""
+    pages = find_pages(context)
+    
+    if not pages:
+        return {"script": "seo_checker", "files_checked": 0, "passed": True}
+    
+    # Check each page (unchanged files reuse cached results)
+    all_issues = Findings(context, "seo_checker", "page")
+    total_issues = 0
+    cache = ResultsCache("seo_checker", source_version(__file__, check_context.__file__))
+    for f in pages:
+        result = cache.cached(f, lambda: check_page(f, context))
+        if result["issues"]:
+            all_issues.append(result)
+            total_issues += len(result["issues"])
+    cache.close()
+    
+    passed = total_issues == 0
+    
+    return {
+        "script": "seo_checker",
+        "project": str(context.project_path),
+        "files_checked": len(pages),
+        "files_with_issues": len(all_issues),
+        "issues_found": total_issues,
+        "passed": passed,
+        "issues": all_issues.items,
+        "cache": cache.stats()
+    }
+
+
 def main():
     project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
     
+    if "--ndjson" in sys.argv:
+        report = stream_report(run, CheckContext(project_path), "seo_checker")
+        sys.exit(0 if report["passed"] else 1)
+    
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
     print(f"{'='*60}")
@@ -155,24 +190,16 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
+    report = run(CheckContext(project_path))
     
-    if not pages:
+    if not report["files_checked"]:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
-        output = {"script": "seo_checker", "files_checked": 0, "passed": True}
-        print("\n" + json.dumps(output, indent=2))
+        print("\n" + json.dumps(report, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} page files to analyze\n")
-    
-    # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    print(f"Found {report['files_checked']} page files to analyze\n")
+    all_issues = report.pop("issues")
     
     # Summary
     print("=" * 60)
@@ -198,21 +225,9 @@ def main():
     else:
         print("\n[OK] No SEO issues found!")
     
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    passed = total_issues == 0
-    
-    output = {
-        "script": "seo_checker",
-        "project": str(project_path),
-        "files_checked": len(pages),
-        "files_with_issues": len(all_issues),
-        "issues_found": total_issues,
-        "passed": passed
-    }
-    
-    print("\n" + json.dumps(output, indent=2))
+    print("\n" + json.dumps(report, indent=2))
     
-    sys.exit(0 if passed else 1)
+    sys.exit(0 if report["passed"] else 1)
 
 
 if __name__ == "__main__":
@@ -3,8 +3,8 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--jobs N] [--ndjson]
+Output: JSON with validation findings (NDJSON stream with --ndjson)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
@@ -18,8 +18,10 @@ import os
 import sys
 import re
 import argparse
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -29,6 +31,16 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+# Shared audit helpers live in .agent/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from audit_cache import ResultsCache, source_version
+import check_context
+from check_context import CheckContext
+from finding_stream import Findings, NdjsonWriter
+from file_inventory import env_scope, get_inventory
+import rule_engine
+from rule_engine import required_literal
+
 
 # ============================================================================
 #  CONFIGURATION
@@ -85,21 +97,362 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+CONFIG_PATTERNS = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILENAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+
+# Parallel mode: trees smaller than this are scanned serially
+MIN_PARALLEL_FILES = 200
+FILES_PER_SHARD = 64
+
+# Pattern families evaluated by the fused scanner, keyed by scan type
+PATTERN_FAMILIES = {
+    "secrets": SECRET_PATTERNS,
+    "patterns": DANGEROUS_PATTERNS,
+    "config": CONFIG_PATTERNS,
+}
+
+
+# ============================================================================
+#  FUSED SCANNING ENGINE
+# ============================================================================
+
+class PatternScanner:
+    """
+    Evaluates several pattern families through one combined, precompiled
+    alternation. Every pattern becomes a named group, so a single pass over
+    the content reports which patterns match where. Patterns whose required
+    literal does not occur in the content are left out of the alternation.
+    """
+
+    def __init__(self, families: List[str]):
+        self.entries = []  # (family, index in family)
+        for family in families:
+            for index in range(len(PATTERN_FAMILIES[family])):
+                self.entries.append((family, index))
+        self.sources = [PATTERN_FAMILIES[f][i][0] for f, i in self.entries]
+        self.literals = [required_literal(source) for source in self.sources]
+        self.single = [re.compile(source, re.IGNORECASE) for source in self.sources]
+        self.combined: Dict[Tuple[int, ...], "re.Pattern"] = {}
+
+    def _combined(self, active: Tuple[int, ...]) -> "re.Pattern":
+        if active not in self.combined:
+            self.combined[active] = re.compile(
+                "|".join(f"(?P<p{entry}>{self.sources[entry]})" for entry in active),
+                re.IGNORECASE
+            )
+        return self.combined[active]
+
+    def scan(self, content: str) -> Iterator[Tuple[str, int, int, int]]:
+        """
+        Yield (family, pattern index, start, end) for every position where a
+        pattern matches. The combined regex reports the first alternative at
+        each position; later alternatives at the same position are checked
+        individually, so overlapping matches of different patterns are kept.
+        """
+        lowered = content.lower()
+        active = tuple(entry for entry, literal in enumerate(self.literals) if literal in lowered)
+        if not active:
+            return
+        combined = self._combined(active)
+
+        pos = 0
+        while True:
+            m = combined.search(content, pos)
+            if m is None:
+                return
+            start = m.start()
+            first = int(m.lastgroup[1:])
+            family, index = self.entries[first]
+            yield family, index, start, m.end()
+            for entry in active[active.index(first) + 1:]:
+                other = self.single[entry].match(content, start)
+                if other:
+                    family, index = self.entries[entry]
+                    yield family, index, start, other.end()
+            pos = start + 1
+
+    def scan_lines(self, content: str, lines: "LineIndex") -> Iterator[Tuple[str, int, int]]:
+        """
+        Yield (family, pattern index, line number) for every line on which a
+        pattern matches. Each line is searched on its own, like re.search on
+        readlines(), so no match or lookahead sees the next line. Only lines
+        holding a required literal of some pattern are searched.
+        """
+        literals = set(self.literals)
+        if '' in literals:
+            candidates = range(1, len(lines.newlines) + 2)
+        else:
+            # lower() keeps every newline, so line numbers carry over
+            lowered = content.lower()
+            lowered_lines = LineIndex(lowered)
+            found = set()
+            for literal in literals:
+                at = lowered.find(literal)
+                while at != -1:
+                    line_num = lowered_lines.line_number(at)
+                    found.add(line_num)
+                    at = lowered.find(literal, lowered_lines.line_bounds(line_num)[1])
+            candidates = sorted(found)
+
+        for line_num in candidates:
+            line_start, line_end = lines.line_bounds(line_num)
+            for family, index, _, _ in self.scan(content[line_start:line_end]):
+                yield family, index, line_num
+
+
+class LineIndex:
+    """Maps character offsets to line numbers using precomputed newline offsets"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.newlines = [m.start() for m in re.finditer("\n", content)]
+
+    def line_number(self, offset: int) -> int:
+        return bisect_left(self.newlines, offset) + 1
+
+    def line_bounds(self, line_num: int) -> Tuple[int, int]:
+        """Start and end offset of a line, the end including its newline"""
+        start = self.newlines[line_num - 2] + 1 if line_num > 1 else 0
+        end = self.newlines[line_num - 1] + 1 if line_num <= len(self.newlines) else len(self.content)
+        return start, end
+
+
+_SCANNERS: Dict[Tuple[str, ...], PatternScanner] = {}
+
+
+def get_scanner(families: Tuple[str, ...]) -> PatternScanner:
+    """Compile (once) the combined scanner for a set of pattern families."""
+    if families not in _SCANNERS:
+        _SCANNERS[families] = PatternScanner(list(families))
+    return _SCANNERS[families]
+
+
+def file_families(filename: str) -> set:
+    """Pattern families that apply to a file, based on its name and extension."""
+    ext = Path(filename).suffix.lower()
+    families = set()
+    if ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS:
+        families.add("secrets")
+    if ext in CODE_EXTENSIONS:
+        families.add("patterns")
+    if ext in CONFIG_EXTENSIONS or filename in CONFIG_FILENAMES:
+        families.add("config")
+    return families
+
+
+def collect_files(project_path: str, context: Optional[CheckContext] = None) -> List[Path]:
+    """Every file of the project inventory that the file-level scans may read."""
+    inventory = context.inventory if context is not None else get_inventory(project_path)
+    return [f for f in inventory.select(skip_dirs=SKIP_DIRS) if file_families(f.name)]
+
+
+def scan_file(filepath: Path, families: Tuple[str, ...],
+              read_text: Optional[Callable[[Path], str]] = None) -> Dict[str, list]:
+    """
+    Read one file and evaluate the requested pattern families: secrets and
+    config in a single pass over the content, dangerous patterns line by line.
+    Returns raw hits per family: (pattern index, count) for secrets and config,
+    (line, pattern index, snippet) for dangerous code patterns.
+    """
+    wanted = tuple(f for f in families if f in file_families(filepath.name))
+    hits: Dict[str, list] = {family: [] for family in wanted}
+    if not wanted:
+        return hits
+
+    if read_text is not None:
+        content = read_text(filepath)
+    else:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+
+    secret_counts: Dict[int, int] = {}
+    secret_ends: Dict[int, int] = {}
+    config_found = set()
+    pattern_lines = set()
+
+    # Secrets and config are matched against the whole file
+    whole_file = tuple(f for f in wanted if f != "patterns")
+    if whole_file:
+        for family, index, start, end in get_scanner(whole_file).scan(content):
+            if family == "secrets":
+                # Count non-overlapping matches per pattern, like re.findall
+                if start >= secret_ends.get(index, 0):
+                    secret_counts[index] = secret_counts.get(index, 0) + 1
+                    secret_ends[index] = end
+            else:
+                config_found.add(index)
+
+    # Dangerous patterns are line-based: each line is searched on its own
+    if "patterns" in wanted:
+        lines = LineIndex(content)
+        for _, index, line_num in get_scanner(("patterns",)).scan_lines(content, lines):
+            pattern_lines.add((line_num, index))
+
+    if "secrets" in hits:
+        hits["secrets"] = sorted(secret_counts.items())
+    if "config" in hits:
+        hits["config"] = sorted(config_found)
+    if "patterns" in hits:
+        for line_num, index in sorted(pattern_lines):
+            line_start, line_end = lines.line_bounds(line_num)
+            hits["patterns"].append((line_num, index, content[line_start:line_end].strip()[:80]))
+    return hits
+
+
+def _scan_shard(filepaths: List[Path], families: Tuple[str, ...],
+                read_text: Optional[Callable[[Path], str]] = None) -> List[Any]:
+    """Scan a shard of files in a worker process; None marks unreadable files."""
+    hits = []
+    for filepath in filepaths:
+        try:
+            hits.append(scan_file(filepath, families, read_text))
+        except Exception:
+            hits.append(None)
+    return hits
+
+
+def scan_all_files(filepaths: List[Path], families: Tuple[str, ...], jobs: int = 1,
+                   read_text: Optional[Callable[[Path], str]] = None) -> List[Any]:
+    """
+    Scan files, reusing cached hits for files unchanged since the last run.
+    Results come back in input order, so merged reports stay deterministic.
+    """
+    cache = ResultsCache(f"security_scan[{','.join(families)}]",
+                         source_version(__file__, check_context.__file__, rule_engine.__file__))
+    hits = [cache.get(filepath) for filepath in filepaths]
+    stale = [i for i, file_hits in enumerate(hits) if file_hits is None]
+    
+    fresh = _scan_files([filepaths[i] for i in stale], families, jobs, read_text)
+    for i, file_hits in zip(stale, fresh):
+        hits[i] = file_hits
+        if file_hits is not None:
+            cache.put(filepaths[i], file_hits)
+    cache.close()
+    return hits
+
+
+def _scan_files(filepaths: List[Path], families: Tuple[str, ...], jobs: int,
+                read_text: Optional[Callable[[Path], str]] = None) -> List[Any]:
+    """
+    Scan files serially, or sharded across a process pool when jobs > 1.
+    read_text (e.g. a shared CheckContext reader) is only used for serial scans.
+    """
+    if jobs <= 1 or len(filepaths) < MIN_PARALLEL_FILES:
+        return _scan_shard(filepaths, families, read_text)
+
+    shards = [filepaths[i:i + FILES_PER_SHARD] for i in range(0, len(filepaths), FILES_PER_SHARD)]
+    hits = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for shard_hits in executor.map(_scan_shard, shards, [families] * len(shards)):
+            hits.extend(shard_hits)
+    return hits
+
+
+def scan_files(project_path: str, families: Tuple[str, ...], jobs: int = 1,
+               context: Optional[CheckContext] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the requested file-level scans ("secrets", "patterns", "config") with
+    one tree walk and one read per file, and build their result dicts.
+    Findings are collected in Findings objects (streamed to the context's
+    sink as they are merged) until run_full_scan or a scan_* wrapper lists them.
+    """
+    results = {
+        "secrets": {
+            "tool": "secret_scanner",
+            "findings": Findings(context, "security_scan", "secrets"),
+            "status": "[OK] No secrets detected",
+            "scanned_files": 0,
+            "by_severity": {"critical": 0, "high": 0, "medium": 0}
+        },
+        "patterns": {
+            "tool": "pattern_scanner",
+            "findings": Findings(context, "security_scan", "patterns"),
+            "status": "[OK] No dangerous patterns",
+            "scanned_files": 0,
+            "by_category": {}
+        },
+        "config": {
+            "tool": "config_scanner",
+            "findings": Findings(context, "security_scan", "config"),
+            "status": "[OK] Configuration secure",
+            "checks": {}
+        },
+    }
+
+    filepaths = [fp for fp in collect_files(project_path, context)
+                 if any(f in file_families(fp.name) for f in families)]
+    read_text = context.read_text if context is not None else None
+    file_hits = scan_all_files(filepaths, families, jobs, read_text)
+
+    for filepath, hits in zip(filepaths, file_hits):
+        applicable = file_families(filepath.name)
+        for family in ("secrets", "patterns"):
+            if family in families and family in applicable:
+                results[family]["scanned_files"] += 1
+        if hits is None:
+            continue
+
+        rel_path = os.path.relpath(filepath, project_path)
+        for index, count in hits.get("secrets", []):
+            _, secret_type, severity = SECRET_PATTERNS[index]
+            results["secrets"]["findings"].append({
+                "file": rel_path,
+                "type": secret_type,
+                "severity": severity,
+                "count": count
+            })
+            results["secrets"]["by_severity"][severity] += count
+        for line_num, index, snippet in hits.get("patterns", []):
+            _, name, severity, category = DANGEROUS_PATTERNS[index]
+            results["patterns"]["findings"].append({
+                "file": rel_path,
+                "line": line_num,
+                "pattern": name,
+                "severity": severity,
+                "category": category,
+                "snippet": snippet
+            })
+            by_category = results["patterns"]["by_category"]
+            by_category[category] = by_category.get(category, 0) + 1
+        for index in hits.get("config", []):
+            _, issue, severity = CONFIG_PATTERNS[index]
+            results["config"]["findings"].append({
+                "file": rel_path,
+                "issue": issue,
+                "severity": severity
+            })
+
+    if "secrets" in families:
+        _finish_secrets(results["secrets"])
+    if "patterns" in families:
+        _finish_patterns(results["patterns"])
+    if "config" in families:
+        _finish_config(results["config"], project_path)
+    return {family: results[family] for family in families}
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def scan_dependencies(project_path: str, context: Optional[CheckContext] = None) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
     Checks: npm audit, lock file presence, dependency age.
     """
-    results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
+    results = {"tool": "dependency_scanner", "findings": Findings(context, "security_scan", "deps"),
+               "status": "[OK] Secure"}
     
     # Check for lock files
     lock_files = {
@@ -109,6 +462,15 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
         "pip": ["requirements.txt", "Pipfile.lock", "poetry.lock"],
     }
     
+    # Scoped to changed files: dependencies only need auditing when a manifest or lock file changed
+    scope = context.scope if context is not None else env_scope()
+    if scope is not None:
+        manifests = {"package.json", "setup.py"}.union(*lock_files.values())
+        if not any(Path(path).name in manifests for path in scope):
+            results["status"] = "[SKIP] No dependency manifest or lock file changed"
+            results["skipped"] = True
+            return results
+    
     found_locks = []
     missing_locks = []
     
@@ -183,54 +545,23 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
     """
-    results = {
-        "tool": "secret_scanner",
-        "findings": [],
-        "status": "[OK] No secrets detected",
-        "scanned_files": 0,
-        "by_severity": {"critical": 0, "high": 0, "medium": 0}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
-    
+    return _listed(scan_files(project_path, ("secrets",))["secrets"])
+
+
+def _listed(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace a scan's Findings collector with the list of kept findings."""
+    results["findings"] = results["findings"].items
+    return results
+
+
+def _finish_secrets(results: Dict[str, Any]) -> None:
+    """Set secret scan status."""
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
     elif results["by_severity"]["high"] > 0:
         results["status"] = "[!] HIGH: Secrets found"
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
-    
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
-    return results
 
 
 def scan_code_patterns(project_path: str) -> Dict[str, Any]:
@@ -238,47 +569,13 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
     """
-    results = {
-        "tool": "pattern_scanner",
-        "findings": [],
-        "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
-        "by_category": {}
-    }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
-    
-    critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
-    high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
+    return _listed(scan_files(project_path, ("patterns",))["patterns"])
+
+
+def _finish_patterns(results: Dict[str, Any]) -> None:
+    """Set pattern scan status."""
+    critical_count = results["findings"].by_severity["critical"]
+    high_count = results["findings"].by_severity["high"]
     
     if critical_count > 0:
         results["status"] = f"[!!] CRITICAL: {critical_count} dangerous patterns"
@@ -286,11 +583,6 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         results["status"] = f"[!] HIGH: {high_count} risky patterns"
     elif results["findings"]:
         results["status"] = "[?] Some patterns need review"
-    
-    # Limit findings
-    results["findings"] = results["findings"][:20]
-    
-    return results
 
 
 def scan_configuration(project_path: str) -> Dict[str, Any]:
@@ -298,48 +590,11 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
     """
-    results = {
-        "tool": "config_scanner",
-        "findings": [],
-        "status": "[OK] Configuration secure",
-        "checks": {}
-    }
-    
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
+    return _listed(scan_files(project_path, ("config",))["config"])
+
+
+def _finish_config(results: Dict[str, Any], project_path: str) -> None:
+    """Check security header configuration and set config scan status."""
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
     for hf in header_files:
@@ -355,22 +610,26 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
             "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
         })
     
-    if any(f["severity"] == "critical" for f in results["findings"]):
+    if results["findings"].by_severity["critical"]:
         results["status"] = "[!!] CRITICAL: Configuration issues"
-    elif any(f["severity"] == "high" for f in results["findings"]):
+    elif results["findings"].by_severity["high"]:
         results["status"] = "[!] HIGH: Configuration review needed"
     elif results["findings"]:
         results["status"] = "[?] Minor configuration issues"
-    
-    return results
 
 
 # ============================================================================
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", jobs: int = 1,
+                  context: Optional[CheckContext] = None) -> Dict[str, Any]:
+    """
+    Execute security validation scans.
+    With jobs > 1, file scans are sharded across processes and the
+    dependency audit subprocess runs concurrently with them. A context
+    supplies the shared file inventory and contents of an in-process run.
+    """
     
     report = {
         "project": project_path,
@@ -385,27 +644,37 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         }
     }
     
-    scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
+    scan_names = {
+        "deps": "dependencies",
+        "secrets": "secrets",
+        "patterns": "code_patterns",
+        "config": "configuration",
     }
-    
-    for key, (name, scanner) in scanners.items():
-        if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
-            report["scans"][name] = result
-            
-            findings_count = len(result.get("findings", []))
-            report["summary"]["total_findings"] += findings_count
-            
-            for finding in result.get("findings", []):
-                sev = finding.get("severity", "low")
-                if sev == "critical":
-                    report["summary"]["critical"] += 1
-                elif sev == "high":
-                    report["summary"]["high"] += 1
+    selected = [key for key in scan_names if scan_type == "all" or scan_type == key]
+    
+    # File-level scans share one tree walk and one read per file
+    file_scans = tuple(key for key in selected if key in PATTERN_FAMILIES)
+    with ThreadPoolExecutor(max_workers=1) as deps_executor:
+        deps_future = None
+        if "deps" in selected and jobs > 1:
+            deps_future = deps_executor.submit(scan_dependencies, project_path, context)
+        
+        scan_results = scan_files(project_path, file_scans, jobs, context) if file_scans else {}
+        
+        if deps_future is not None:
+            scan_results["deps"] = deps_future.result()
+        elif "deps" in selected:
+            scan_results["deps"] = scan_dependencies(project_path, context)
+    
+    for key in selected:
+        result = scan_results[key]
+        report["scans"][scan_names[key]] = result
+        
+        findings = result["findings"]
+        report["summary"]["total_findings"] += len(findings)
+        report["summary"]["critical"] += findings.by_severity["critical"]
+        report["summary"]["high"] += findings.by_severity["high"]
+        _listed(result)
     
     # Determine overall status
     if report["summary"]["critical"] > 0:
@@ -418,6 +687,14 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     return report
 
 
+def run(context: CheckContext) -> Dict[str, Any]:
+    """Run all scans in-process; returns the JSON report (in-process check API)."""
+    report = run_full_scan(str(context.project_path), "all", context=context)
+    # Findings are reported, not enforced, matching the CLI exit code
+    report["passed"] = True
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate security principles from vulnerability-scanner skill"
@@ -425,16 +702,29 @@ def main():
     parser.add_argument("project_path", nargs="?", default=".", help="Project directory to scan")
     parser.add_argument("--scan-type", choices=["all", "deps", "secrets", "patterns", "config"],
                         default="all", help="Type of scan to run")
-    parser.add_argument("--output", choices=["json", "summary"], default="json",
-                        help="Output format")
+    parser.add_argument("--output", choices=["json", "summary", "ndjson"], default="json",
+                        help="Output format (ndjson: findings streamed as found, then the report)")
+    parser.add_argument("--ndjson", action="store_const", const="ndjson", dest="output",
+                        help="Same as --output ndjson")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Parallel scan workers (0 = all CPUs, default: 1 = serial)")
     
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    if args.output == "ndjson":
+        writer = NdjsonWriter()
+        context = CheckContext(args.project_path)
+        context.on_finding = writer.finding
+        context.keep_findings = False
+        writer.report("security_scan", run_full_scan(args.project_path, args.scan_type, jobs, context))
+        return
+    
+    result = run_full_scan(args.project_path, args.scan_type, jobs)
     
     if args.output == "summary":
         print(f"\n{'='*60}")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the fused scanner of security_scan.py.
+
+Usage:
+    python .agent/skills/vulnerability-scanner/scripts/test_security_scan.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import security_scan
+
+
+def pattern_names(source: str, filename: str = "x.py"):
+    """(line, pattern name) of every dangerous-pattern hit in a source file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / filename
+        path.write_text(source, encoding="utf-8")
+        hits = security_scan.scan_file(path, ("secrets", "patterns", "config"))
+    return [(line, security_scan.DANGEROUS_PATTERNS[index][1]) for line, index, _ in hits["patterns"]]
+
+
+class PatternLinesTest(unittest.TestCase):
+
+    def test_lookahead_does_not_see_next_line(self):
+        # Per-line semantics: the Loader on the next line does not make the call safe
+        source = "import yaml\ndata = yaml.load(x)\n, Loader=yaml.SafeLoader\n"
+        self.assertIn((2, "Unsafe YAML load"), pattern_names(source))
+
+    def test_lookahead_on_same_line(self):
+        source = "data = yaml.load(x), Loader=yaml.SafeLoader\n"
+        self.assertNotIn("Unsafe YAML load", [name for _, name in pattern_names(source)])
+
+    def test_match_does_not_span_lines(self):
+        source = "subprocess.call(cmd,\n    shell=True)\n"
+        self.assertEqual(pattern_names(source), [])
+
+    def test_overlapping_patterns_on_one_line(self):
+        source = "a = 1\npickle.loads(eval(x))\n"
+        self.assertEqual(pattern_names(source), [(2, "eval() usage"), (2, "pickle usage")])
+
+    def test_last_line_without_newline(self):
+        self.assertEqual(pattern_names("x = 1\nexec(code)"), [(2, "exec() usage")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,9 @@ Adiciona morph targets clínicos a modelos GLB existentes.
 import numpy as np
 from pygltflib import GLTF2, Accessor, BufferView
 import struct
+from glb_buffers import read_accessor
+from mesh_normals import morph_normal_deltas
+from mesh_segmentation import radial_directions, region_mask, segment_body
 
 def add_morph_targets_to_glb(input_path, output_path, model_name):
     print(f"\n{'='*50}")
@@ -16,20 +19,21 @@ def add_morph_targets_to_glb(input_path, output_path, model_name):
     # Obter dados binários
     binary_blob = gltf.binary_blob()
     
-    # Obter accessor de posições
+    # Extrair vértices, normais e triângulos da primitive
     primitive = gltf.meshes[0].primitives[0]
-    pos_accessor_idx = primitive.attributes.POSITION
-    pos_accessor = gltf.accessors[pos_accessor_idx]
-    pos_buffer_view = gltf.bufferViews[pos_accessor.bufferView]
-    
-    # Extrair vértices
-    start = pos_buffer_view.byteOffset + (pos_accessor.byteOffset or 0)
-    count = pos_accessor.count
-    vertices = np.frombuffer(binary_blob[start:start + count * 12], dtype=np.float32).reshape(-1, 3)
+    vertices = read_accessor(gltf, binary_blob, primitive.attributes.POSITION)
+    normals = None
+    if primitive.attributes.NORMAL is not None:
+        normals = read_accessor(gltf, binary_blob, primitive.attributes.NORMAL)
+    if primitive.indices is not None:
+        faces = read_accessor(gltf, binary_blob, primitive.indices).reshape(-1, 3)
+    else:
+        faces = np.arange(len(vertices)).reshape(-1, 3)
     
     print(f"  Vértices: {len(vertices):,}")
     
-    # Calcular bounds
+    # Segmentação (regiões e coordenadas do corpo), uma vez por modelo
+    segmentation = segment_body(vertices)
     y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
     height = y_max - y_min
     print(f"  Altura: {height:.3f}m")
@@ -39,74 +43,44 @@ def add_morph_targets_to_glb(input_path, output_path, model_name):
     
     # Criar morph targets
     morph_targets = {}
-    n_verts = len(vertices)
+    h = segmentation['height']
+    direction = radial_directions(segmentation)
+    outward = segmentation['radius'] > 0.02
     
     # 1. Weight - expansão geral do corpo
     print("  Criando morph target: Weight")
-    weight = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.1 < y_norm < 0.95:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                norm = np.linalg.norm(direction)
-                if norm > 0:
-                    direction = direction / norm
-                    # Mais efeito no torso
-                    factor = 1.5 if 0.4 < y_norm < 0.8 else 1.0
-                    weight[i] = direction * SCALE * factor
+    # Mais efeito no torso
+    factor = np.where(region_mask(segmentation, 'torso', 0.4, 0.8), 1.5, 1.0)
+    factor *= outward & region_mask(segmentation, h_min=0.1, h_max=0.95)
+    weight = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['Weight'] = weight
     
     # 2. AbdomenGirth - expansão do abdômen
     print("  Criando morph target: AbdomenGirth")
-    abdomen = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.4 < y_norm < 0.75:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                norm = np.linalg.norm(direction)
-                if norm > 0:
-                    direction = direction / norm
-                    # Mais efeito na frente
-                    front_factor = 1.0 + 0.8 * max(0, v[2] / (abs(v[2]) + 0.01))
-                    # Curva gaussiana centrada no umbigo
-                    y_factor = np.exp(-((y_norm - 0.55)**2) / 0.02)
-                    abdomen[i] = direction * SCALE * 2.5 * front_factor * y_factor
+    # Mais efeito na frente; curva gaussiana centrada no umbigo
+    front = segmentation['radius'] * np.cos(segmentation['angle'])
+    front_factor = 1.0 + 0.8 * np.maximum(0, front / (np.abs(front) + 0.01))
+    y_factor = np.exp(-((h - 0.55)**2) / 0.02)
+    factor = 2.5 * front_factor * y_factor * (outward & region_mask(segmentation, 'torso', 0.4, 0.75))
+    abdomen = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['AbdomenGirth'] = abdomen
     
     # 3. MuscleMass - expansão dos músculos
     print("  Criando morph target: MuscleMass")
-    muscle = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        dist = np.sqrt(v[0]**2 + v[2]**2)
-        if dist > 0.02:
-            direction = np.array([v[0], 0, v[2]])
-            norm = np.linalg.norm(direction)
-            if norm > 0:
-                direction = direction / norm
-                # Peito e ombros
-                if 0.70 < y_norm < 0.90:
-                    muscle[i] = direction * SCALE * 1.2
-                # Braços (longe do centro)
-                elif abs(v[0]) > 0.12:
-                    muscle[i] = direction * SCALE * 0.8
-                # Pernas
-                elif 0.05 < y_norm < 0.45:
-                    muscle[i] = direction * SCALE * 0.6
+    # Peito e ombros; braços; pernas
+    factor = np.select([region_mask(segmentation, 'torso', 0.70, 0.90),
+                        region_mask(segmentation, 'arm'),
+                        region_mask(segmentation, 'leg', h_min=0.05)], [1.2, 0.8, 0.6], 0.0)
+    muscle = direction * (SCALE * factor * outward)[:, None].astype(np.float32)
     morph_targets['MuscleMass'] = muscle
     
     # 4. Posture - inclinação para frente
     print("  Criando morph target: Posture")
-    posture = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.5 < y_norm < 1.0:
-            forward_lean = (y_norm - 0.5) * 0.15
-            posture[i] = [0, -forward_lean * SCALE * 0.5, forward_lean * SCALE]
+    posture = np.zeros((len(vertices), 3), dtype=np.float32)
+    upper = region_mask(segmentation, h_min=0.5, h_max=1.0)
+    forward_lean = (h[upper] - 0.5) * 0.15
+    posture[upper, 1] = -forward_lean * SCALE * 0.5
+    posture[upper, 2] = forward_lean * SCALE
     morph_targets['Posture'] = posture
     
     # 5-7. Efeitos de doenças (compostos)
@@ -119,10 +93,18 @@ def add_morph_targets_to_glb(input_path, output_path, model_name):
     target_names = ['Weight', 'AbdomenGirth', 'MuscleMass', 'Posture', 
                     'DiabetesEffect', 'HypertensionEffect', 'HeartDiseaseEffect']
     
-    # Criar bytes dos morph targets
+    # Deltas de normal (só se o modelo tem NORMAL, à qual eles se somam)
+    normal_deltas = None
+    if normals is not None:
+        print("  Calculando deltas de normais...")
+        normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
+    
+    # Criar bytes dos morph targets (posição e, se houver, normal de cada um)
     morph_bytes = b''
     for name in target_names:
         morph_bytes += morph_targets[name].astype(np.float32).tobytes()
+        if normal_deltas is not None:
+            morph_bytes += normal_deltas[name].tobytes()
     
     # Adicionar ao buffer existente
     new_binary = binary_blob + morph_bytes
@@ -132,7 +114,7 @@ def add_morph_targets_to_glb(input_path, output_path, model_name):
     
     # Criar BufferViews e Accessors para cada morph target
     offset = len(binary_blob)
-    morph_target_accessors = []
+    morph_targets_gltf = []
     
     for i, name in enumerate(target_names):
         mt_data = morph_targets[name]
@@ -159,13 +141,30 @@ def add_morph_targets_to_glb(input_path, output_path, model_name):
             min=mt_data.min(axis=0).tolist()
         ))
         
-        morph_target_accessors.append(acc_idx)
+        target = {'POSITION': acc_idx}
         offset += byte_length
+        
+        if normal_deltas is not None:
+            gltf.bufferViews.append(BufferView(
+                buffer=0,
+                byteOffset=offset,
+                byteLength=byte_length,
+                target=34962
+            ))
+            target['NORMAL'] = len(gltf.accessors)
+            gltf.accessors.append(Accessor(
+                bufferView=len(gltf.bufferViews) - 1,
+                byteOffset=0,
+                componentType=5126,
+                count=len(mt_data),
+                type='VEC3'
+            ))
+            offset += byte_length
+        
+        morph_targets_gltf.append(target)
     
     # Adicionar targets à primitive
-    gltf.meshes[0].primitives[0].targets = [
-        {'POSITION': idx} for idx in morph_target_accessors
-    ]
+    gltf.meshes[0].primitives[0].targets = morph_targets_gltf
     
     # Adicionar weights iniciais
     gltf.meshes[0].weights = [0.0] * len(target_names)
@@ -0,0 +1,266 @@
+"""
+Calibração clínica dos pesos dos morph targets por mínimos quadrados limitados.
+
+Os morph targets são lineares, então as circunferências da malha são quase
+afins nos pesos: g(w) ≈ base + J w. A matriz J (medidas x targets) é
+calculada uma vez por asset, cortando a malha base e a malha com cada target
+em peso 1 (secante em [0, 1], o intervalo usado pelo visualizador). As
+medidas ficam como fração da altura do modelo, porque o visualizador escala
+o avatar pela altura do paciente: a cintura do paciente vira waistCm/heightCm.
+
+Por paciente, os pesos livres (FREE_TARGETS) minimizam
+    Σ (base + J w - alvo)²  +  ρ² |w - prior|²,   limites[0] ≤ w ≤ limites[1]
+com os demais targets (doenças, postura) fixos. Com poucos pesos livres o
+problema é resolvido exatamente por enumeração de conjuntos ativos: para
+cada combinação livre/no mínimo/no máximo (3^F), a solução é uma função
+afim do alvo e do prior, pré-calculada. Um lote de pacientes é resolvido
+com alguns einsum: avaliam-se todas as combinações, descartam-se as fora
+dos limites e fica a de menor custo (é o ótimo, pois o problema é
+estritamente convexo). Medidas ausentes (NaN) não entram no custo, assim
+como as que não se localizam na malha do asset (base e Jacobiano em NaN).
+
+Uso:
+    calibration = calibrate_glb('avatar_morphable.glb')
+    weights = solve_weights(calibration, {'waist': waist_cm / height_cm},
+                            fixed={'DiabetesEffect': 0.4})
+    export_lut(calibration, 'avatar_morphable_calibration.json')
+
+    python clinical_calibration.py avatar_morphable.glb [saida.json]
+"""
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+from glb_buffers import load_morphable_glb
+from mesh_measurements import available_planes, girth_model, girths
+
+# Medidas calibradas por padrão (as do prontuário; coxa e braço via names=)
+CALIBRATION_MEASUREMENTS = ('chest', 'waist', 'hip')
+# Pesos ajustados pela calibração; os demais vêm do mapeador (doenças, idade)
+FREE_TARGETS = ('Weight', 'AbdomenGirth', 'MuscleMass')
+# Limites por target (SAFETY_CAP do ClinicalToBodyMapper em Weight e AbdomenGirth)
+TARGET_BOUNDS = {'Weight': (0.0, 0.85), 'AbdomenGirth': (0.0, 0.85)}
+DEFAULT_BOUNDS = (0.0, 1.0)
+# Regularização: desvio de 0.05 do prior custa como 1 cm de erro em 1.75 m
+REGULARIZATION = 0.01 / 1.75 / 0.05
+# Folga numérica no teste de limites
+BOUND_TOLERANCE = 1e-9
+
+# Eixos da tabela para o mapeador TypeScript: cintura/altura x peso do target Weight
+LUT_WAIST_TO_HEIGHT = np.round(np.arange(0.35, 0.8001, 0.01), 2)
+LUT_WEIGHT = np.round(np.arange(0.0, 0.8501, 0.05), 2)
+
+
+def calibrate(vertices, faces, morph_targets, segmentation=None, names=None):
+    """
+    Medidas da malha base e Jacobiano por target, como fração da altura.
+    Retorna um dict com measurements, targets, base (M,), jacobian (M, K),
+    height, planes (alturas dos planos, fração da altura) e missing
+    (medidas que não se localizam na malha: linhas em NaN).
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    names = list(names or CALIBRATION_MEASUREMENTS)
+    planes, missing = available_planes(vertices, faces, segmentation, names)
+    if not planes:
+        raise ValueError(f"Nenhuma medida localizada na malha: {', '.join(names)}")
+    y_min = vertices[:, 1].min()
+    height = vertices[:, 1].max() - y_min
+
+    # Malha base e cada target em peso 1, num só lote
+    model = girth_model(vertices, faces, planes, morph_targets)
+    values = np.full((len(morph_targets) + 1, len(names)), np.nan)
+    values[:, [names.index(name) for name in planes]] = girths(
+        model, np.vstack([np.zeros(len(morph_targets)), np.eye(len(morph_targets))])) / height
+    return {
+        'measurements': names,
+        'targets': list(morph_targets),
+        'base': values[0],
+        'jacobian': (values[1:] - values[0]).T,
+        'height': float(height),
+        'planes': {name: float((origin[1] - y_min) / height) for name, (origin, _, _) in planes.items()},
+        'missing': missing,
+    }
+
+
+def calibrate_glb(path, names=None):
+    """Calibração de um GLB exportado (POSITION, índices e targets da primeira primitive)"""
+    return calibrate(*load_morphable_glb(path), names=names)
+
+
+def _active_set_solutions(calibration, free, measured, bounds):
+    """
+    Para cada combinação livre/mínimo/máximo dos pesos livres, a solução
+    afim w = P_r r + P_p p + c (r: alvo menos a parte fixa, p: prior).
+    Em cache na calibração, por (pesos livres, medidas presentes).
+    """
+    key = (tuple(free), tuple(measured))
+    cache = calibration.setdefault('_solutions', {})
+    if key in cache:
+        return cache[key]
+
+    index = [calibration['targets'].index(name) for name in free]
+    a = np.where(np.asarray(measured)[:, None], calibration['jacobian'][:, index], 0.0)
+    n_free, n_meas = len(free), len(measured)
+    rho2 = REGULARIZATION ** 2
+    patterns = list(itertools.product((0, 1, 2), repeat=n_free))
+    p_r = np.zeros((len(patterns), n_free, n_meas))
+    p_p = np.zeros((len(patterns), n_free, n_free))
+    c = np.zeros((len(patterns), n_free))
+    for q, pattern in enumerate(patterns):
+        pattern = np.array(pattern)
+        loose = np.flatnonzero(pattern == 0)
+        # Pesos presos nos limites
+        c[q, pattern == 1] = bounds[0][pattern == 1]
+        c[q, pattern == 2] = bounds[1][pattern == 2]
+        if len(loose) == 0:
+            continue
+        a_loose = a[:, loose]
+        inverse = np.linalg.inv(a_loose.T @ a_loose + rho2 * np.eye(len(loose)))
+        # w_livre = inv (A_l^T (r - A c) + ρ² p_l)
+        p_r[q, loose] = inverse @ a_loose.T
+        p_p[q, loose, loose[:, None]] = (rho2 * inverse).T
+        c[q, loose] = -(inverse @ a_loose.T @ (a @ c[q]))
+    cache[key] = (a, p_r, p_p, c)
+    return cache[key]
+
+
+def solve_weights(calibration, targets, fixed=None, prior=None, free=FREE_TARGETS):
+    """
+    Pesos dos morph targets que fazem as medidas do avatar baterem com as
+    do paciente. targets: {medida: valor como fração da altura} (escalares
+    ou arrays (N,), NaN = ausente); fixed: {target: peso} dos não livres
+    (ausentes = 0); prior: {target livre: peso} puxado pela regularização
+    (ausentes = 0). Retorna {target: pesos (N,)} de todos os targets.
+    """
+    names = calibration['measurements']
+    all_targets = calibration['targets']
+    fixed = fixed or {}
+    prior = prior or {}
+    values = [np.atleast_1d(np.asarray(v, dtype=np.float64))
+              for v in list(targets.values()) + list(fixed.values()) + list(prior.values())]
+    n = max((len(v) for v in values), default=1)
+
+    def column(mapping, name):
+        return np.broadcast_to(np.asarray(mapping.get(name, np.nan if mapping is targets else 0.0),
+                                          dtype=np.float64), (n,))
+
+    goal = np.stack([column(targets, name) for name in names], axis=1)
+    fixed_names = [name for name in all_targets if name not in free]
+    fixed_w = np.stack([column(fixed, name) for name in fixed_names], axis=1) if fixed_names else np.zeros((n, 0))
+    prior_w = np.stack([column(prior, name) for name in free], axis=1)
+    fixed_index = [all_targets.index(name) for name in fixed_names]
+    bounds = np.array([TARGET_BOUNDS.get(name, DEFAULT_BOUNDS) for name in free]).T
+
+    # Alvo descontado da malha base e dos targets fixos
+    residual = goal - calibration['base'] - fixed_w @ calibration['jacobian'][:, fixed_index].T
+    measured = ~np.isnan(residual)
+    weights = np.empty((n, len(free)))
+    for mask in np.unique(measured, axis=0):
+        rows = np.flatnonzero((measured == mask).all(axis=1))
+        a, p_r, p_p, c = _active_set_solutions(calibration, free, mask, bounds)
+        r = np.where(mask, residual[rows], 0.0)
+        p = prior_w[rows]
+        # Todas as combinações de uma vez: (pacientes, combinações, pesos livres)
+        candidates = np.einsum('qfm,nm->nqf', p_r, r) + np.einsum('qfg,ng->nqf', p_p, p) + c
+        feasible = ((candidates >= bounds[0] - BOUND_TOLERANCE) &
+                    (candidates <= bounds[1] + BOUND_TOLERANCE)).all(axis=2)
+        cost = (((candidates @ a.T) - r[:, None]) ** 2).sum(axis=2)
+        cost += REGULARIZATION ** 2 * ((candidates - p[:, None]) ** 2).sum(axis=2)
+        cost[~feasible] = np.inf
+        weights[rows] = candidates[np.arange(len(rows)), cost.argmin(axis=1)]
+
+    result = {name: weights[:, k] for k, name in enumerate(free)}
+    result.update({name: fixed_w[:, k] for k, name in enumerate(fixed_names)})
+    return {name: result[name] for name in all_targets}
+
+
+def predict(calibration, weights):
+    """Medidas (fração da altura) do avatar com os pesos dados, pelo modelo afim"""
+    w = np.stack([np.atleast_1d(np.asarray(weights.get(name, 0.0), dtype=np.float64))
+                  for name in calibration['targets']], axis=1)
+    values = calibration['base'] + w @ calibration['jacobian'].T
+    return {name: values[:, m] for m, name in enumerate(calibration['measurements'])}
+
+
+def _json_values(values, decimals=6):
+    """Array arredondado como listas, NaN (medida ausente) como null"""
+    return np.where(np.isnan(values), None, np.round(values, decimals)).tolist()
+
+
+def export_lut(calibration, path, waist_to_height=LUT_WAIST_TO_HEIGHT, weight=LUT_WEIGHT):
+    """
+    Tabela para o ClinicalToBodyMapper: AbdomenGirth que faz a cintura do
+    avatar bater com waistCm/heightCm, para cada peso do target Weight
+    (demais targets em 0; interpolação bilinear no TypeScript). Inclui o
+    modelo afim (base e Jacobiano, fração da altura) para quem resolve no cliente.
+    """
+    if 'waist' not in calibration['measurements'] or 'waist' in calibration['missing']:
+        raise ValueError("Tabela do mapeador: cintura não localizada na malha")
+    grid_whtr, grid_weight = np.meshgrid(waist_to_height, weight, indexing='ij')
+    solved = solve_weights(calibration, {'waist': grid_whtr.ravel()},
+                           fixed={'Weight': grid_weight.ravel()}, free=('AbdomenGirth',))
+    lut = {
+        'generator': 'clinical_calibration.py',
+        'measurement': 'waist',
+        'axes': {'waistToHeight': waist_to_height.tolist(), 'Weight': weight.tolist()},
+        'values': {'AbdomenGirth': np.round(solved['AbdomenGirth'].reshape(grid_whtr.shape), 4).tolist()},
+        'model': {
+            'height': round(calibration['height'], 4),
+            'planes': {name: round(value, 4) for name, value in calibration['planes'].items()},
+            'measurements': calibration['measurements'],
+            'targets': calibration['targets'],
+            'missing': calibration['missing'],
+            'base': _json_values(calibration['base']),
+            'jacobian': _json_values(calibration['jacobian']),
+            'bounds': {name: list(TARGET_BOUNDS.get(name, DEFAULT_BOUNDS)) for name in calibration['targets']},
+        },
+    }
+    with open(path, 'w') as f:
+        json.dump(lut, f, indent=2)
+    return lut
+
+
+def main(path, output=None):
+    print(f"Calibrando {path}...")
+    start = time.perf_counter()
+    calibration = calibrate_glb(path)
+    print(f"  Jacobiano ({len(calibration['measurements'])} medidas x {len(calibration['targets'])} targets) "
+          f"em {(time.perf_counter() - start) * 1000:.0f} ms")
+    scale = 175.0  # cm, altura de referência para exibição
+    for m, name in enumerate(calibration['measurements']):
+        if name in calibration['missing']:
+            print(f"  {name}: não localizada na malha")
+            continue
+        slopes = ', '.join(f"{target} {calibration['jacobian'][m, k] * scale:+.1f}"
+                           for k, target in enumerate(calibration['targets']))
+        print(f"  {name}: {calibration['base'][m] * scale:.1f} cm (em 175 cm) | por peso 1: {slopes}")
+
+    # Coorte sintética: cintura, quadril e tórax por paciente
+    rng = np.random.default_rng(0)
+    n = 10000
+    goal = {name: calibration['base'][m] * rng.uniform(0.95, 1.35, n)
+            for m, name in enumerate(calibration['measurements'])}
+    solve_weights(calibration, goal)
+    start = time.perf_counter()
+    weights = solve_weights(calibration, goal)
+    batch = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(100):
+        solve_weights(calibration, {name: values[0] for name, values in goal.items()})
+    single = (time.perf_counter() - start) / 100
+    error = np.concatenate([predict(calibration, weights)[name] - goal[name] for name in goal]) * scale
+    print(f"  Lote de {n}: {batch * 1e6 / n:.1f} µs/paciente; um paciente: {single * 1e6:.0f} µs; "
+          f"erro mediano {np.nanmedian(np.abs(error)):.2f} cm")
+
+    if 'waist' in calibration['missing']:
+        print("  Tabela não gerada: cintura não localizada na malha")
+        return
+    output = output or path.rsplit('.', 1)[0] + '_calibration.json'
+    export_lut(calibration, output)
+    print(f"  Tabela salva: {output}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
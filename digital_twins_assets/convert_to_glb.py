@@ -2,6 +2,8 @@ import trimesh
 import numpy as np
 import json
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
 
 def load_obj_and_create_glb():
     print("Carregando modelo OBJ do Blender...")
@@ -135,6 +137,12 @@ def load_obj_and_create_glb():
     
     print(f"Criados {len(morph_targets)} morph targets")
     
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
     # Criar buffer binário
     print("Criando arquivo GLB...")
     buffer_data = bytearray()
@@ -146,13 +154,19 @@ def load_obj_and_create_glb():
     buffer_data.extend(normals.tobytes())
     
     indices_offset = len(buffer_data)
-    indices_flat = faces.flatten().astype(np.uint32)
-    buffer_data.extend(indices_flat.tobytes())
+    # uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices_flat, index_type = index_buffer(faces)
+    buffer_data.extend(aligned_bytes(indices_flat))
     
+    # Morph targets (deltas de posição e de normal)
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_offsets = {}
+    normal_offsets = {}
     for name, delta in morph_targets.items():
         morph_offsets[name] = len(buffer_data)
         buffer_data.extend(delta.tobytes())
+        normal_offsets[name] = len(buffer_data)
+        buffer_data.extend(normal_deltas[name].tobytes())
     
     # Construir GLTF
     gltf = GLTF2()
@@ -172,10 +186,11 @@ def load_obj_and_create_glb():
     
     # Índices
     buffer_views.append(BufferView(buffer=0, byteOffset=indices_offset, byteLength=indices_flat.nbytes, target=34963))
-    accessors.append(Accessor(bufferView=2, componentType=5125, count=len(indices_flat), type="SCALAR"))
+    accessors.append(Accessor(bufferView=2, componentType=index_type, count=len(indices_flat), type="SCALAR"))
     
     # Morph targets
     morph_accessor_indices = {}
+    normal_accessor_indices = {}
     for name, delta in morph_targets.items():
         bv_idx = len(buffer_views)
         buffer_views.append(BufferView(buffer=0, byteOffset=morph_offsets[name], byteLength=delta.nbytes, target=34962))
@@ -183,6 +198,10 @@ def load_obj_and_create_glb():
         accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3",
                                   max=delta.max(axis=0).tolist(), min=delta.min(axis=0).tolist()))
         morph_accessor_indices[name] = acc_idx
+        bv_idx = len(buffer_views)
+        buffer_views.append(BufferView(buffer=0, byteOffset=normal_offsets[name], byteLength=normal_deltas[name].nbytes, target=34962))
+        normal_accessor_indices[name] = len(accessors)
+        accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3"))
     
     gltf.bufferViews = buffer_views
     gltf.accessors = accessors
@@ -199,7 +218,8 @@ def load_obj_and_create_glb():
     
     # Mesh
     target_names = list(morph_targets.keys())
-    targets = [{"POSITION": morph_accessor_indices[name]} for name in target_names]
+    targets = [{"POSITION": morph_accessor_indices[name], "NORMAL": normal_accessor_indices[name]}
+               for name in target_names]
     
     gltf.meshes = [GLTFMesh(
         primitives=[Primitive(
@@ -5,7 +5,12 @@ Usa approach de "calça" - uma única mesh para as pernas unidas no topo.
 import numpy as np
 import trimesh
 import json
+import sys
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material, PbrMetallicRoughness
+from glb_buffers import add_vertex_attributes
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask, segment_body
 
 def create_full_body_mesh(height=1.75, gender='male'):
     """
@@ -316,64 +321,44 @@ def create_full_body_mesh(height=1.75, gender='male'):
     
     return vertices, faces
 
-def create_morph_targets(vertices, height=1.75):
-    """Cria morph targets para deformações clínicas"""
-    n_verts = len(vertices)
+def create_morph_targets(vertices, height=1.75, segmentation=None):
+    """
+    Cria morph targets para deformações clínicas. segmentation (regiões e
+    coordenadas do corpo, ver mesh_segmentation) é calculada se não vier.
+    """
+    if segmentation is None:
+        segmentation = segment_body(vertices)
     SCALE = 0.05  # 5cm de deslocamento máximo
     
     morph_targets = {}
-    y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+    h = segmentation['height']
+    direction = radial_directions(segmentation)
+    outward = segmentation['radius'] > 0.02
     
     # 1. Weight
-    weight = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.15 < y_norm < 0.92:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                direction = direction / (np.linalg.norm(direction) + 1e-6)
-                factor = 1.0
-                if 0.5 < y_norm < 0.7:
-                    factor = 1.5
-                weight[i] = direction * SCALE * factor
+    factor = np.where(region_mask(segmentation, 'torso', 0.5, 0.7), 1.5, 1.0)
+    factor *= outward & region_mask(segmentation, h_min=0.15, h_max=0.92)
+    weight = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['Weight'] = weight
     
     # 2. AbdomenGirth
-    abdomen = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.5 < y_norm < 0.75:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                direction = direction / (np.linalg.norm(direction) + 1e-6)
-                front_factor = 1.0 + 0.5 * max(0, v[2] / (abs(v[2]) + 0.01))
-                y_factor = np.exp(-((y_norm - 0.62)**2) / 0.01)
-                abdomen[i] = direction * SCALE * 1.5 * front_factor * y_factor
+    front = segmentation['radius'] * np.cos(segmentation['angle'])
+    front_factor = 1.0 + 0.5 * np.maximum(0, front / (np.abs(front) + 0.01))
+    y_factor = np.exp(-((h - 0.62)**2) / 0.01)
+    factor = 1.5 * front_factor * y_factor * (outward & region_mask(segmentation, 'torso', 0.5, 0.75))
+    abdomen = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['AbdomenGirth'] = abdomen
     
     # 3. MuscleMass
-    muscle = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        dist = np.sqrt(v[0]**2 + v[2]**2)
-        if dist > 0.02:
-            direction = np.array([v[0], 0, v[2]])
-            direction = direction / (np.linalg.norm(direction) + 1e-6)
-            if 0.75 < y_norm < 0.90 or abs(v[0]) > 0.18:
-                muscle[i] = direction * SCALE * 0.8
-            elif 0.1 < y_norm < 0.45:
-                muscle[i] = direction * SCALE * 0.6
+    factor = np.select([region_mask(segmentation, 'torso', 0.75, 0.90) | region_mask(segmentation, 'arm'),
+                        region_mask(segmentation, 'leg', h_min=0.1)], [0.8, 0.6], 0.0)
+    muscle = direction * (SCALE * factor * outward)[:, None].astype(np.float32)
     morph_targets['MuscleMass'] = muscle
     
     # 4. Posture
-    posture = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.5 < y_norm < 0.95:
-            forward_lean = (y_norm - 0.5) * 0.1
-            posture[i] = [0, 0, forward_lean * SCALE]
+    posture = np.zeros((len(vertices), 3), dtype=np.float32)
+    upper = region_mask(segmentation, h_min=0.5, h_max=0.95)
+    posture[upper, 2] = (h[upper] - 0.5) * 0.1 * SCALE
     morph_targets['Posture'] = posture
     
     # 5-7. Efeitos de doenças
@@ -383,28 +368,40 @@ def create_morph_targets(vertices, height=1.75):
     
     return morph_targets
 
-def export_to_glb(vertices, faces, morph_targets, output_path):
-    """Exporta para GLB com morph targets"""
+def export_to_glb(vertices, faces, morph_targets, output_path, interleaved=False):
+    """Exporta para GLB com morph targets (interleaved: posição e normal intercaladas, com byteStride)"""
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
     mesh.fix_normals()
     normals = mesh.vertex_normals.astype(np.float32)
     
-    vertices_bytes = vertices.astype(np.float32).tobytes()
-    normals_bytes = normals.astype(np.float32).tobytes()
-    faces_bytes = faces.astype(np.uint32).flatten().tobytes()
-    
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"  - ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
+    # Posição e normal: bufferViews separados ou um só intercalado
+    vertex_views, vertex_accessors = [], []
+    vertex_bytes, attributes = add_vertex_attributes(
+        vertex_views, vertex_accessors, {'POSITION': vertices, 'NORMAL': normals}, 0, interleaved)
+    # Índices uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices, index_type = index_buffer(faces)
+    faces_bytes = aligned_bytes(indices)
+    
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_bytes = b''
     morph_target_list = list(morph_targets.keys())
     for name in morph_target_list:
         morph_bytes += morph_targets[name].astype(np.float32).tobytes()
+        morph_bytes += normal_deltas[name].tobytes()
     
-    total_buffer = vertices_bytes + normals_bytes + faces_bytes + morph_bytes
+    total_buffer = vertex_bytes + faces_bytes + morph_bytes
     
     gltf = GLTF2(
         asset={'version': '2.0', 'generator': 'Digital Twins Avatar Generator v2'},
         buffers=[Buffer(byteLength=len(total_buffer))],
-        bufferViews=[],
-        accessors=[],
+        bufferViews=vertex_views,
+        accessors=vertex_accessors,
         meshes=[],
         nodes=[],
         scenes=[],
@@ -412,43 +409,36 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
         materials=[]
     )
     
-    offset = 0
-    
-    # Vertices
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(vertices_bytes), target=34962))
-    gltf.accessors.append(Accessor(
-        bufferView=0, byteOffset=0, componentType=5126,
-        count=len(vertices), type='VEC3',
-        max=vertices.max(axis=0).tolist(),
-        min=vertices.min(axis=0).tolist()
-    ))
-    offset += len(vertices_bytes)
-    
-    # Normals
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(normals_bytes), target=34962))
-    gltf.accessors.append(Accessor(bufferView=1, byteOffset=0, componentType=5126, count=len(normals), type='VEC3'))
-    offset += len(normals_bytes)
+    offset = len(vertex_bytes)
     
     # Faces
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(faces_bytes), target=34963))
-    gltf.accessors.append(Accessor(bufferView=2, byteOffset=0, componentType=5125, count=len(faces) * 3, type='SCALAR'))
+    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=indices.nbytes, target=34963))
+    indices_accessor = len(gltf.accessors)
+    gltf.accessors.append(Accessor(bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=index_type, count=len(indices), type='SCALAR'))
     offset += len(faces_bytes)
     
     # Morph targets
-    morph_accessor_indices = []
-    for i, name in enumerate(morph_target_list):
-        mt_data = morph_targets[name]
+    targets = []
+    for name in morph_target_list:
+        mt_data = morph_targets[name].astype(np.float32)
         mt_bytes_len = len(mt_data.tobytes())
         
         gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
         gltf.accessors.append(Accessor(
-            bufferView=3 + i, byteOffset=0, componentType=5126,
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
             count=len(mt_data), type='VEC3',
             max=mt_data.max(axis=0).tolist(),
             min=mt_data.min(axis=0).tolist()
         ))
-        morph_accessor_indices.append(3 + i)
         offset += mt_bytes_len
+        
+        gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
+        gltf.accessors.append(Accessor(
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
+            count=len(mt_data), type='VEC3'
+        ))
+        offset += mt_bytes_len
+        targets.append({'POSITION': len(gltf.accessors) - 2, 'NORMAL': len(gltf.accessors) - 1})
     
     # Material
     gltf.materials.append(Material(
@@ -460,12 +450,10 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
         doubleSided=True
     ))
     
-    targets = [{'POSITION': idx} for idx in morph_accessor_indices]
-    
     gltf.meshes.append(GLTFMesh(
         primitives=[Primitive(
-            attributes={'POSITION': 0, 'NORMAL': 1},
-            indices=2,
+            attributes=attributes,
+            indices=indices_accessor,
             material=0,
             targets=targets
         )],
@@ -481,7 +469,7 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
     
     return morph_target_list
 
-def main():
+def main(interleaved=False):
     print("Criando avatar v2 com virilha corrigida...")
     
     HEIGHT = 1.75
@@ -507,11 +495,11 @@ def main():
     print(f"  - Vértices: {len(vertices)}, Faces: {len(faces)}")
     
     print("  - Criando morph targets...")
-    morph_targets = create_morph_targets(vertices, HEIGHT)
+    morph_targets = create_morph_targets(vertices, HEIGHT, body_segmentation(mesh))
     
     print("  - Exportando GLB...")
     output_path = '/home/ubuntu/digital_twins/nextjs_space/public/models/avatar_morphable.glb'
-    target_names = export_to_glb(vertices, faces, morph_targets, output_path)
+    target_names = export_to_glb(vertices, faces, morph_targets, output_path, interleaved)
     
     metadata = {
         'morphTargets': {name: {'index': i, 'range': [0, 1]} for i, name in enumerate(target_names)},
@@ -531,4 +519,4 @@ def main():
     print(f"   - Morph targets: {target_names}")
 
 if __name__ == '__main__':
-    main()
+    main(interleaved='--interleaved' in sys.argv)
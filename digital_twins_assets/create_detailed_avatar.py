@@ -6,6 +6,9 @@ import numpy as np
 import trimesh
 import json
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask
 
 def create_human_body_mesh(height=1.75, weight_factor=0.0, gender='male'):
     """
@@ -277,65 +280,48 @@ def create_high_quality_avatar():
     mesh_final.fix_normals()
     normals = mesh_final.vertex_normals.astype(np.float32)
     
-    # Criar morph targets
+    # Criar morph targets a partir das regiões e coordenadas do corpo
+    # (ver mesh_segmentation; height já é y / altura)
     print("Criando morph targets...")
     morph_targets = {}
+    segmentation = body_segmentation(mesh_final)
+    h = segmentation['height']
+    radius = segmentation['radius']
+    front = radius * np.cos(segmentation['angle'])
+    direction = radial_directions(segmentation)
     
     # Weight
-    weight_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        dx, dz = v[0], v[2]
-        dist = np.sqrt(dx**2 + dz**2)
-        if dist > 0.01:
-            y_norm = v[1] / height_actual
-            # Mais efeito no torso
-            y_factor = np.exp(-((y_norm - 0.65)**2) / 0.1)
-            factor = 0.06 * (0.3 + 0.7 * y_factor)
-            weight_delta[i, 0] = dx/dist * factor
-            weight_delta[i, 2] = dz/dist * factor
-    morph_targets['Weight'] = weight_delta.astype(np.float32)
+    # Mais efeito no torso
+    y_factor = np.exp(-((h - 0.65)**2) / 0.1)
+    factor = 0.06 * (0.3 + 0.7 * y_factor) * (radius > 0.01)
+    weight_delta = direction * factor[:, None].astype(np.float32)
+    morph_targets['Weight'] = weight_delta
     
     # AbdomenGirth
+    y_factor = np.exp(-((h - 0.62)**2) / 0.02)
+    front_factor = np.clip(front / 0.08, 0.0, 1.0)
     abdomen_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height_actual
-        y_factor = np.exp(-((y_norm - 0.62)**2) / 0.02)
-        if v[2] > 0:
-            front_factor = min(v[2] / 0.08, 1.0)
-            abdomen_delta[i, 2] = 0.12 * y_factor * front_factor
-    morph_targets['AbdomenGirth'] = abdomen_delta.astype(np.float32)
+    abdomen_delta[:, 2] = 0.12 * y_factor * front_factor * region_mask(segmentation, 'torso')
+    morph_targets['AbdomenGirth'] = abdomen_delta
     
     # MuscleMass
-    muscle_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height_actual
-        
-        # Braços
-        if abs(v[0]) > 0.12 and 0.5 < y_norm < 0.9:
-            muscle_delta[i, 0] = np.sign(v[0]) * 0.02
-        
-        # Peito
-        if 0.75 < y_norm < 0.88 and v[2] > 0.02:
-            muscle_delta[i, 2] += 0.025
-        
-        # Pernas
-        if y_norm < 0.5:
-            dist_xz = np.sqrt(v[0]**2 + v[2]**2)
-            if dist_xz > 0.03:
-                leg_factor = np.exp(-((y_norm - 0.3)**2) / 0.03)
-                muscle_delta[i, 0] += v[0]/dist_xz * 0.015 * leg_factor
-                muscle_delta[i, 2] += v[2]/dist_xz * 0.015 * leg_factor
-    morph_targets['MuscleMass'] = muscle_delta.astype(np.float32)
+    # Braços
+    factor = 0.02 * region_mask(segmentation, 'arm', 0.5, 0.9)
+    # Pernas
+    leg_factor = np.exp(-((h - 0.3)**2) / 0.03)
+    factor += 0.015 * leg_factor * (region_mask(segmentation, 'leg', h_max=0.5) & (radius > 0.03))
+    muscle_delta = direction * factor[:, None].astype(np.float32)
+    # Peito
+    muscle_delta[:, 2] += 0.025 * (region_mask(segmentation, 'torso', 0.75, 0.88) & (front > 0.02))
+    morph_targets['MuscleMass'] = muscle_delta
     
     # Posture
     posture_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height_actual
-        if y_norm > 0.85:
-            factor = (y_norm - 0.85) / 0.15
-            posture_delta[i, 1] = -0.06 * factor**2
-            posture_delta[i, 2] = 0.07 * factor
-    morph_targets['Posture'] = posture_delta.astype(np.float32)
+    upper = region_mask(segmentation, h_min=0.85)
+    factor = (h[upper] - 0.85) / 0.15
+    posture_delta[upper, 1] = -0.06 * factor**2
+    posture_delta[upper, 2] = 0.07 * factor
+    morph_targets['Posture'] = posture_delta
     
     # Disease effects
     diabetes_delta = weight_delta * 0.3 + abdomen_delta * 0.5
@@ -349,6 +335,12 @@ def create_high_quality_avatar():
     
     print(f"Criados {len(morph_targets)} morph targets")
     
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
     # Criar GLB
     print("Exportando GLB...")
     buffer_data = bytearray()
@@ -360,13 +352,19 @@ def create_high_quality_avatar():
     buffer_data.extend(normals.tobytes())
     
     i_offset = len(buffer_data)
-    indices = faces.flatten().astype(np.uint32)
-    buffer_data.extend(indices.tobytes())
+    # uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices, index_type = index_buffer(faces)
+    buffer_data.extend(aligned_bytes(indices))
     
+    # Deltas de posição e de normal de cada morph target
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_offsets = {}
+    normal_offsets = {}
     for name, delta in morph_targets.items():
         morph_offsets[name] = len(buffer_data)
         buffer_data.extend(delta.tobytes())
+        normal_offsets[name] = len(buffer_data)
+        buffer_data.extend(normal_deltas[name].tobytes())
     
     gltf = GLTF2()
     gltf.buffers = [Buffer(byteLength=len(buffer_data))]
@@ -382,9 +380,10 @@ def create_high_quality_avatar():
     ac.append(Accessor(bufferView=1, componentType=5126, count=len(normals), type="VEC3"))
     
     bv.append(BufferView(buffer=0, byteOffset=i_offset, byteLength=indices.nbytes, target=34963))
-    ac.append(Accessor(bufferView=2, componentType=5125, count=len(indices), type="SCALAR"))
+    ac.append(Accessor(bufferView=2, componentType=index_type, count=len(indices), type="SCALAR"))
     
     morph_acc = {}
+    normal_acc = {}
     for name, delta in morph_targets.items():
         bvi = len(bv)
         bv.append(BufferView(buffer=0, byteOffset=morph_offsets[name], byteLength=delta.nbytes, target=34962))
@@ -392,6 +391,10 @@ def create_high_quality_avatar():
         ac.append(Accessor(bufferView=bvi, componentType=5126, count=len(delta), type="VEC3",
                            max=delta.max(axis=0).tolist(), min=delta.min(axis=0).tolist()))
         morph_acc[name] = aci
+        bvi = len(bv)
+        bv.append(BufferView(buffer=0, byteOffset=normal_offsets[name], byteLength=normal_deltas[name].nbytes, target=34962))
+        normal_acc[name] = len(ac)
+        ac.append(Accessor(bufferView=bvi, componentType=5126, count=len(delta), type="VEC3"))
     
     gltf.bufferViews = bv
     gltf.accessors = ac
@@ -406,7 +409,7 @@ def create_high_quality_avatar():
     )]
     
     target_names = list(morph_targets.keys())
-    targets = [{"POSITION": morph_acc[n]} for n in target_names]
+    targets = [{"POSITION": morph_acc[n], "NORMAL": normal_acc[n]} for n in target_names]
     
     gltf.meshes = [GLTFMesh(
         primitives=[Primitive(
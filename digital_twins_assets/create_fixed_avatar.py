@@ -5,24 +5,25 @@ Resolve o problema de geometria quebrada entre as pernas.
 import numpy as np
 import trimesh
 import json
+import sys
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material, PbrMetallicRoughness
+from mesh_assembly import REGION_ATTRIBUTE, assemble
+from mesh_loft import cap_ring, elliptic_rings, stitch_rings
+from glb_buffers import add_vertex_attributes
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask, segment_body
+from mesh_smoothing import taubin_smooth
 
 def create_cylinder_segment(center, radius_x, radius_z, height, n_radial=24, n_height=4):
     """Cria um segmento cilíndrico elíptico"""
-    vertices = []
-    for h in range(n_height + 1):
-        y = center[1] + (h / n_height - 0.5) * height
-        for r in range(n_radial):
-            angle = 2 * np.pi * r / n_radial
-            x = center[0] + radius_x * np.cos(angle)
-            z = center[2] + radius_z * np.sin(angle)
-            vertices.append([x, y, z])
-    return np.array(vertices)
+    ys = center[1] + (np.arange(n_height + 1) / n_height - 0.5) * height
+    vertices, _, _ = elliptic_rings(ys, radius_x, radius_z, np.full(n_height + 1, n_radial),
+                                    cx=center[0], cz=center[2])
+    return vertices
 
 def create_torso_mesh(height=1.75):
     """Cria o torso (sem pernas)"""
-    vertices = []
-    
     # Perfis do torso - começa na altura da virilha (aumentado para mais detalhes)
     torso_profiles = [
         # (altura_rel, largura_x, profundidade_z, n_pts)
@@ -73,54 +74,27 @@ def create_torso_mesh(height=1.75):
         (1.085, 0.02, 0.03, 12),  # Pico cabeça
     ]
     
-    faces = []
-    current_idx = 0
+    h_rel, width_x, depth_z, counts = np.array(torso_profiles).T
+    counts = counts.astype(np.int64)
     
-    for i, (h_rel, width_x, depth_z, n_pts) in enumerate(torso_profiles):
-        y = h_rel * height
-        
-        for j in range(n_pts):
-            angle = 2 * np.pi * j / n_pts
-            x = width_x * np.cos(angle)
-            z = depth_z * np.sin(angle)
-            
-            # Achatar costas
-            if z < 0 and 0.55 < h_rel < 0.90:
-                z *= 0.85
-            
-            vertices.append([x, y, z])
-        
-        # Conectar com perfil anterior
-        if i > 0:
-            prev_n = torso_profiles[i-1][3]
-            curr_n = n_pts
-            
-            for j in range(max(prev_n, curr_n)):
-                prev_idx = current_idx - prev_n + (j % prev_n)
-                curr_idx_v = current_idx + (j % curr_n)
-                next_prev = current_idx - prev_n + ((j + 1) % prev_n)
-                next_curr = current_idx + ((j + 1) % curr_n)
-                
-                faces.append([prev_idx, curr_idx_v, next_curr])
-                faces.append([prev_idx, next_curr, next_prev])
-        
-        current_idx += n_pts
+    vertices, _, ring = elliptic_rings(h_rel * height, width_x, depth_z, counts)
+    
+    # Achatar costas
+    back = (vertices[:, 2] < 0) & (h_rel[ring] > 0.55) & (h_rel[ring] < 0.90)
+    vertices[back, 2] *= 0.85
     
-    # Fechar topo
-    top_n = torso_profiles[-1][3]
-    top_start = current_idx - top_n
+    # Conectar perfis e fechar topo
     top_center = len(vertices)
-    vertices.append([0, torso_profiles[-1][0] * height + 0.01, 0])
-    for j in range(top_n):
-        faces.append([top_start + j, top_center, top_start + (j + 1) % top_n])
+    vertices = np.vstack([vertices, [[0, torso_profiles[-1][0] * height + 0.01, 0]]])
+    faces = np.vstack([
+        stitch_rings(counts),
+        cap_ring(top_center - counts[-1], counts[-1], top_center, top=True),
+    ])
     
-    return np.array(vertices), np.array(faces)
+    return vertices, faces
 
 def create_leg_mesh(height=1.75, side='left'):
     """Cria uma perna separada"""
-    vertices = []
-    faces = []
-    
     # Offset lateral para a perna
     x_offset = -0.08 if side == 'left' else 0.08
     
@@ -150,56 +124,26 @@ def create_leg_mesh(height=1.75, side='left'):
         (0.48, 0.075, 0.082, 32), # Virilha (mais fino para encaixar)
     ]
     
-    current_idx = 0
+    h_rel, rx, rz, counts = np.array(leg_profiles).T
+    counts = counts.astype(np.int64)
     
-    for i, (h_rel, rx, rz, n_pts) in enumerate(leg_profiles):
-        y = h_rel * height
-        
-        for j in range(n_pts):
-            angle = 2 * np.pi * j / n_pts
-            x = x_offset + rx * np.cos(angle)
-            z = rz * np.sin(angle)
-            
-            # Na virilha, inclinar para dentro
-            if h_rel > 0.40:
-                # Aproximar do centro na parte superior
-                inward_factor = (h_rel - 0.40) / 0.10
-                if side == 'left':
-                    x = x + inward_factor * 0.02  # Mover para direita
-                else:
-                    x = x - inward_factor * 0.02  # Mover para esquerda
-            
-            vertices.append([x, y, z])
-        
-        if i > 0:
-            prev_n = leg_profiles[i-1][3]
-            curr_n = n_pts
-            
-            for j in range(max(prev_n, curr_n)):
-                prev_idx = current_idx - prev_n + (j % prev_n)
-                curr_idx_v = current_idx + (j % curr_n)
-                next_prev = current_idx - prev_n + ((j + 1) % prev_n)
-                next_curr = current_idx + ((j + 1) % curr_n)
-                
-                faces.append([prev_idx, curr_idx_v, next_curr])
-                faces.append([prev_idx, next_curr, next_prev])
-        
-        current_idx += n_pts
+    # Na virilha, inclinar para dentro (aproximar do centro na parte superior)
+    inward = np.where(h_rel > 0.40, (h_rel - 0.40) / 0.10 * 0.02, 0.0)
+    center_x = x_offset + (inward if side == 'left' else -inward)
+    vertices, _, _ = elliptic_rings(h_rel * height, rx, rz, counts, cx=center_x)
     
-    # Fechar sola do pé
-    bottom_n = leg_profiles[0][3]
+    # Conectar perfis e fechar sola do pé
     bottom_center = len(vertices)
-    vertices.append([x_offset, 0, 0.05])
-    for j in range(bottom_n):
-        faces.append([j, (j + 1) % bottom_n, bottom_center])
+    vertices = np.vstack([vertices, [[x_offset, 0, 0.05]]])
+    faces = np.vstack([
+        stitch_rings(counts),
+        cap_ring(0, counts[0], bottom_center, top=False),
+    ])
     
-    return np.array(vertices), np.array(faces)
+    return vertices, faces
 
 def create_arm_mesh(height=1.75, side='left'):
     """Cria um braço"""
-    vertices = []
-    faces = []
-    
     x_sign = -1 if side == 'left' else 1
     
     # Perfis do braço (de cima para baixo - mais detalhados)
@@ -220,42 +164,20 @@ def create_arm_mesh(height=1.75, side='left'):
         (0.36, 0.48, 0.028, 14),  # Mão
     ]
     
-    current_idx = 0
+    dist_x, h_rel, radius, counts = np.array(arm_profiles).T
+    counts = counts.astype(np.int64)
     
-    for i, (dist_x, h_rel, radius, n_pts) in enumerate(arm_profiles):
-        y = h_rel * height
-        x_center = x_sign * dist_x
-        
-        for j in range(n_pts):
-            angle = 2 * np.pi * j / n_pts
-            x = x_center + radius * np.cos(angle)
-            z = radius * np.sin(angle)
-            vertices.append([x, y, z])
-        
-        if i > 0:
-            prev_n = arm_profiles[i-1][3]
-            curr_n = n_pts
-            
-            for j in range(max(prev_n, curr_n)):
-                prev_idx = current_idx - prev_n + (j % prev_n)
-                curr_idx_v = current_idx + (j % curr_n)
-                next_prev = current_idx - prev_n + ((j + 1) % prev_n)
-                next_curr = current_idx + ((j + 1) % curr_n)
-                
-                faces.append([prev_idx, curr_idx_v, next_curr])
-                faces.append([prev_idx, next_curr, next_prev])
-        
-        current_idx += n_pts
+    vertices, _, _ = elliptic_rings(h_rel * height, radius, radius, counts, cx=x_sign * dist_x)
     
-    # Fechar mão
-    hand_n = arm_profiles[-1][3]
-    hand_start = current_idx - hand_n
+    # Conectar perfis e fechar mão
     hand_center = len(vertices)
-    vertices.append([x_sign * arm_profiles[-1][0], arm_profiles[-1][1] * height - 0.02, 0])
-    for j in range(hand_n):
-        faces.append([hand_start + j, hand_center, hand_start + (j + 1) % hand_n])
+    vertices = np.vstack([vertices, [[x_sign * arm_profiles[-1][0], arm_profiles[-1][1] * height - 0.02, 0]]])
+    faces = np.vstack([
+        stitch_rings(counts),
+        cap_ring(hand_center - counts[-1], counts[-1], hand_center, top=True),
+    ])
     
-    return np.array(vertices), np.array(faces)
+    return vertices, faces
 
 def create_crotch_bridge(height=1.75):
     """Cria a ponte entre as pernas (região da virilha)"""
@@ -292,107 +214,63 @@ def create_crotch_bridge(height=1.75):
     return np.array(vertices), np.array(faces)
 
 def merge_meshes(meshes):
-    """Combina múltiplas meshes em uma só"""
-    all_vertices = []
-    all_faces = []
-    vertex_offset = 0
-    
-    for verts, fcs in meshes:
-        all_vertices.extend(verts.tolist())
-        all_faces.extend((fcs + vertex_offset).tolist())
-        vertex_offset += len(verts)
-    
-    return np.array(all_vertices, dtype=np.float32), np.array(all_faces, dtype=np.int32)
+    """
+    Combina múltiplas meshes em uma só. Cada item é (vértices, faces) ou
+    (vértices, faces, região); retorna (vértices, faces, regiões por vértice).
+    """
+    return assemble(meshes)
 
 def smooth_mesh(vertices, faces, iterations=3):
-    """Aplica suavização Laplaciana"""
-    mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-    trimesh.smoothing.filter_laplacian(mesh, iterations=iterations)
-    return mesh.vertices, mesh.faces
+    """Aplica suavização de Taubin (Laplaciano esparso em cache, sem encolher a malha)"""
+    return taubin_smooth(vertices, faces, iterations=iterations), faces
 
-def create_morph_targets(vertices, height=1.75):
-    """Cria morph targets para deformações clínicas"""
-    n_verts = len(vertices)
+def create_morph_targets(vertices, height=1.75, segmentation=None):
+    """
+    Cria morph targets para deformações clínicas. segmentation (regiões e
+    coordenadas do corpo, ver mesh_segmentation) é calculada se não vier.
+    """
+    if segmentation is None:
+        segmentation = segment_body(vertices)
     SCALE = 0.05  # 5cm de deslocamento máximo
     
     morph_targets = {}
     
-    # Calcular centro e bounds
-    y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+    h = segmentation['height']
+    direction = radial_directions(segmentation)
+    outward = segmentation['radius'] > 0.02
     
     # 1. Weight - aumento geral do corpo
-    weight = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        
-        # Mais efeito no torso e pernas
-        if 0.2 < y_norm < 0.9:
-            dist_from_center = np.sqrt(v[0]**2 + v[2]**2)
-            if dist_from_center > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                direction = direction / (np.linalg.norm(direction) + 1e-6)
-                
-                # Fator baseado na altura
-                factor = 1.0
-                if 0.5 < y_norm < 0.7:  # Abdômen
-                    factor = 1.5
-                elif 0.3 < y_norm < 0.5:  # Coxas
-                    factor = 1.2
-                
-                weight[i] = direction * SCALE * factor
+    # Mais efeito no abdômen e nas coxas
+    factor = np.select([region_mask(segmentation, 'torso', 0.5, 0.7),
+                        region_mask(segmentation, 'leg', 0.3, 0.5)], [1.5, 1.2], 1.0)
+    factor *= outward & region_mask(segmentation, h_min=0.2, h_max=0.9)
+    weight = direction * (SCALE * factor)[:, None].astype(np.float32)
     
     morph_targets['Weight'] = weight
     
     # 2. AbdomenGirth - circunferência abdominal
-    abdomen = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        
-        if 0.5 < y_norm < 0.75:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                # Foco no abdômen frontal
-                direction = np.array([v[0], 0, v[2]])
-                direction = direction / (np.linalg.norm(direction) + 1e-6)
-                
-                # Mais efeito na frente
-                front_factor = 1.0 + 0.5 * max(0, v[2] / (abs(v[2]) + 0.01))
-                
-                # Gaussiana centrada no abdômen
-                y_factor = np.exp(-((y_norm - 0.62)**2) / 0.01)
-                
-                abdomen[i] = direction * SCALE * 1.5 * front_factor * y_factor
+    # Foco no abdômen frontal: mais efeito na frente, gaussiana centrada no abdômen
+    front = segmentation['radius'] * np.cos(segmentation['angle'])
+    front_factor = 1.0 + 0.5 * np.maximum(0, front / (np.abs(front) + 0.01))
+    y_factor = np.exp(-((h - 0.62)**2) / 0.01)
+    factor = 1.5 * front_factor * y_factor * (outward & region_mask(segmentation, 'torso', 0.5, 0.75))
+    abdomen = direction * (SCALE * factor)[:, None].astype(np.float32)
     
     morph_targets['AbdomenGirth'] = abdomen
     
     # 3. MuscleMass - massa muscular
-    muscle = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        dist = np.sqrt(v[0]**2 + v[2]**2)
-        
-        if dist > 0.02:
-            direction = np.array([v[0], 0, v[2]])
-            direction = direction / (np.linalg.norm(direction) + 1e-6)
-            
-            # Braços e peito
-            if 0.75 < y_norm < 0.90 or abs(v[0]) > 0.15:
-                muscle[i] = direction * SCALE * 0.8
-            # Pernas
-            elif 0.1 < y_norm < 0.45:
-                muscle[i] = direction * SCALE * 0.6
+    # Braços e peito; pernas
+    factor = np.select([region_mask(segmentation, 'torso', 0.75, 0.90) | region_mask(segmentation, 'arm'),
+                        region_mask(segmentation, 'leg', h_min=0.1)], [0.8, 0.6], 0.0)
+    muscle = direction * (SCALE * factor * outward)[:, None].astype(np.float32)
     
     morph_targets['MuscleMass'] = muscle
     
     # 4. Posture - postura
-    posture = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        
-        if 0.5 < y_norm < 0.95:
-            # Inclinação para frente na parte superior
-            forward_lean = (y_norm - 0.5) * 0.1
-            posture[i] = [0, 0, forward_lean * SCALE]
+    # Inclinação para frente na parte superior
+    posture = np.zeros((len(vertices), 3), dtype=np.float32)
+    upper = region_mask(segmentation, h_min=0.5, h_max=0.95)
+    posture[upper, 2] = (h[upper] - 0.5) * 0.1 * SCALE
     
     morph_targets['Posture'] = posture
     
@@ -403,33 +281,45 @@ def create_morph_targets(vertices, height=1.75):
     
     return morph_targets
 
-def export_to_glb(vertices, faces, morph_targets, output_path):
-    """Exporta para GLB com morph targets"""
+def export_to_glb(vertices, faces, morph_targets, output_path, interleaved=False):
+    """Exporta para GLB com morph targets (interleaved: posição e normal intercaladas, com byteStride)"""
     # Calcular normais
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
     mesh.fix_normals()
     normals = mesh.vertex_normals.astype(np.float32)
     
-    # Criar buffers
-    vertices_bytes = vertices.astype(np.float32).tobytes()
-    normals_bytes = normals.astype(np.float32).tobytes()
-    faces_bytes = faces.astype(np.uint32).flatten().tobytes()
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"  - ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
     
-    # Buffer para morph targets
+    # Criar buffers
+    # Posição e normal: bufferViews separados ou um só intercalado
+    vertex_views, vertex_accessors = [], []
+    vertex_bytes, attributes = add_vertex_attributes(
+        vertex_views, vertex_accessors, {'POSITION': vertices, 'NORMAL': normals}, 0, interleaved)
+    # Índices uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices, index_type = index_buffer(faces)
+    faces_bytes = aligned_bytes(indices)
+    
+    # Buffer para morph targets (deltas de posição e de normal de cada um)
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_bytes = b''
     morph_target_list = list(morph_targets.keys())
     for name in morph_target_list:
         morph_bytes += morph_targets[name].astype(np.float32).tobytes()
+        morph_bytes += normal_deltas[name].tobytes()
     
     # Buffer total
-    total_buffer = vertices_bytes + normals_bytes + faces_bytes + morph_bytes
+    total_buffer = vertex_bytes + faces_bytes + morph_bytes
     
     # Criar GLTF
     gltf = GLTF2(
         asset={'version': '2.0', 'generator': 'Digital Twins Avatar Generator'},
         buffers=[Buffer(byteLength=len(total_buffer))],
-        bufferViews=[],
-        accessors=[],
+        bufferViews=vertex_views,
+        accessors=vertex_accessors,
         meshes=[],
         nodes=[],
         scenes=[],
@@ -438,43 +328,37 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
     )
     
     # Buffer views e accessors
-    offset = 0
-    
-    # Vertices
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(vertices_bytes), target=34962))
-    gltf.accessors.append(Accessor(
-        bufferView=0, byteOffset=0, componentType=5126,
-        count=len(vertices), type='VEC3',
-        max=vertices.max(axis=0).tolist(),
-        min=vertices.min(axis=0).tolist()
-    ))
-    offset += len(vertices_bytes)
-    
-    # Normals
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(normals_bytes), target=34962))
-    gltf.accessors.append(Accessor(bufferView=1, byteOffset=0, componentType=5126, count=len(normals), type='VEC3'))
-    offset += len(normals_bytes)
+    offset = len(vertex_bytes)
     
     # Faces
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(faces_bytes), target=34963))
-    gltf.accessors.append(Accessor(bufferView=2, byteOffset=0, componentType=5125, count=len(faces) * 3, type='SCALAR'))
+    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=indices.nbytes, target=34963))
+    indices_accessor = len(gltf.accessors)
+    gltf.accessors.append(Accessor(bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=index_type, count=len(indices), type='SCALAR'))
     offset += len(faces_bytes)
     
     # Morph targets
-    morph_accessor_indices = []
-    for i, name in enumerate(morph_target_list):
-        mt_data = morph_targets[name]
+    targets = []
+    for name in morph_target_list:
+        mt_data = morph_targets[name].astype(np.float32)
         mt_bytes_len = len(mt_data.tobytes())
         
         gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
         gltf.accessors.append(Accessor(
-            bufferView=3 + i, byteOffset=0, componentType=5126,
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
             count=len(mt_data), type='VEC3',
             max=mt_data.max(axis=0).tolist(),
             min=mt_data.min(axis=0).tolist()
         ))
-        morph_accessor_indices.append(3 + i)
         offset += mt_bytes_len
+        
+        # Delta de normal (iluminação correta com pesos altos)
+        gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
+        gltf.accessors.append(Accessor(
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
+            count=len(mt_data), type='VEC3'
+        ))
+        offset += mt_bytes_len
+        targets.append({'POSITION': len(gltf.accessors) - 2, 'NORMAL': len(gltf.accessors) - 1})
     
     # Material
     gltf.materials.append(Material(
@@ -487,12 +371,10 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
     ))
     
     # Mesh com morph targets
-    targets = [{'POSITION': idx} for idx in morph_accessor_indices]
-    
     gltf.meshes.append(GLTFMesh(
         primitives=[Primitive(
-            attributes={'POSITION': 0, 'NORMAL': 1},
-            indices=2,
+            attributes=attributes,
+            indices=indices_accessor,
             material=0,
             targets=targets
         )],
@@ -510,7 +392,7 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
     
     return morph_target_list
 
-def main():
+def main(interleaved=False):
     print("Criando avatar com geometria corrigida...")
     
     HEIGHT = 1.75  # metros
@@ -536,18 +418,19 @@ def main():
     
     # Combinar todas as partes
     print("  - Combinando meshes...")
-    all_vertices, all_faces = merge_meshes([
-        (torso_v, torso_f),
-        (leg_l_v, leg_l_f),
-        (leg_r_v, leg_r_f),
-        (arm_l_v, arm_l_f),
-        (arm_r_v, arm_r_f),
-        (crotch_v, crotch_f),
+    all_vertices, all_faces, all_regions = merge_meshes([
+        (torso_v, torso_f, 'torso'),
+        (leg_l_v, leg_l_f, 'leg'),
+        (leg_r_v, leg_r_f, 'leg'),
+        (arm_l_v, arm_l_f, 'arm'),
+        (arm_r_v, arm_r_f, 'arm'),
+        (crotch_v, crotch_f, 'torso'),
     ])
     
-    # Criar mesh e aplicar operações
+    # Criar mesh e aplicar operações (os rótulos de região acompanham os vértices)
     print("  - Processando mesh...")
-    mesh = trimesh.Trimesh(vertices=all_vertices, faces=all_faces)
+    mesh = trimesh.Trimesh(vertices=all_vertices, faces=all_faces,
+                           vertex_attributes={REGION_ATTRIBUTE: all_regions})
     
     # Remover duplicatas e corrigir normais
     mesh.merge_vertices()
@@ -557,21 +440,22 @@ def main():
     
     # Suavização
     print("  - Aplicando suavização...")
-    trimesh.smoothing.filter_laplacian(mesh, iterations=2)
+    mesh.vertices, _ = smooth_mesh(mesh.vertices, mesh.faces, iterations=2)
     
     vertices = np.array(mesh.vertices, dtype=np.float32)
     faces = np.array(mesh.faces, dtype=np.int32)
+    segmentation = body_segmentation(mesh)
     
     print(f"  - Vértices: {len(vertices)}, Faces: {len(faces)}")
     
     # Criar morph targets
     print("  - Criando morph targets...")
-    morph_targets = create_morph_targets(vertices, HEIGHT)
+    morph_targets = create_morph_targets(vertices, HEIGHT, segmentation)
     
     # Exportar
     print("  - Exportando GLB...")
     output_path = '/home/ubuntu/digital_twins/nextjs_space/public/models/avatar_morphable.glb'
-    target_names = export_to_glb(vertices, faces, morph_targets, output_path)
+    target_names = export_to_glb(vertices, faces, morph_targets, output_path, interleaved)
     
     # Metadata
     metadata = {
@@ -592,4 +476,4 @@ def main():
     print(f"   - Morph targets: {target_names}")
 
 if __name__ == '__main__':
-    main()
+    main(interleaved='--interleaved' in sys.argv)
@@ -3,6 +3,10 @@ import trimesh
 from scipy.ndimage import gaussian_filter1d
 from scipy.interpolate import interp1d
 import json
+from mesh_loft import cap_ring, elliptic_rings, stitch_rings
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask
 
 def create_realistic_human_body():
     """
@@ -62,67 +66,31 @@ def create_realistic_human_body():
     
     height = 1.75  # metros
     
-    vertices = []
-    
     # Criar seções circulares suaves para cada perfil
     num_segments = 48  # Aumentar para mais suavidade
-    
-    for y_norm, depth, width, x_off, z_off in body_profiles:
-        y = y_norm * height - 0.05  # Ajustar para pés no chão
-        
-        for i in range(num_segments):
-            theta = 2 * np.pi * i / num_segments
-            
-            # Usar elipse para a seção transversal
-            # Com modificação para tornar mais natural
-            cos_t = np.cos(theta)
-            sin_t = np.sin(theta)
-            
-            # Modificador para forma mais natural (não perfeitamente elíptica)
-            shape_mod = 1.0 + 0.05 * np.cos(2 * theta)  # Leve achatamento
-            
-            x = x_off + (width/2) * cos_t * shape_mod
-            z = z_off + (depth/2) * sin_t * shape_mod
-            
-            vertices.append([x, y, z])
-    
-    vertices = np.array(vertices)
-    
-    # Criar faces conectando as seções
-    faces = []
     num_sections = len(body_profiles)
+    counts = np.full(num_sections, num_segments)
+    
+    y_norm, depth, width, x_off, z_off = np.array(body_profiles).T
+    y = y_norm * height - 0.05  # Ajustar para pés no chão
+    
+    # Usar elipse para a seção transversal, com leve achatamento
+    # (forma mais natural, não perfeitamente elíptica)
+    vertices, theta, ring = elliptic_rings(y, width / 2, depth / 2, counts)
+    shape_mod = 1.0 + 0.05 * np.cos(2 * theta)
+    vertices[:, 0] = x_off[ring] + vertices[:, 0] * shape_mod
+    vertices[:, 2] = z_off[ring] + vertices[:, 2] * shape_mod
     
-    for section in range(num_sections - 1):
-        for seg in range(num_segments):
-            # Índices dos vértices
-            i0 = section * num_segments + seg
-            i1 = section * num_segments + (seg + 1) % num_segments
-            i2 = (section + 1) * num_segments + seg
-            i3 = (section + 1) * num_segments + (seg + 1) % num_segments
-            
-            # Dois triângulos por quad
-            faces.append([i0, i2, i1])
-            faces.append([i1, i2, i3])
-    
-    # Fechar topo e base
-    # Base (pés)
+    # Criar faces conectando as seções e fechar topo e base
     center_bottom = len(vertices)
-    vertices = np.vstack([vertices, [0, vertices[0, 1], 0]])
-    for seg in range(num_segments):
-        i0 = seg
-        i1 = (seg + 1) % num_segments
-        faces.append([center_bottom, i1, i0])
-    
-    # Topo (cabeça)
-    center_top = len(vertices)
+    center_top = center_bottom + 1
     top_section_start = (num_sections - 1) * num_segments
-    vertices = np.vstack([vertices, [0, vertices[top_section_start, 1], 0]])
-    for seg in range(num_segments):
-        i0 = top_section_start + seg
-        i1 = top_section_start + (seg + 1) % num_segments
-        faces.append([center_top, i0, i1])
-    
-    faces = np.array(faces)
+    vertices = np.vstack([vertices, [[0, vertices[0, 1], 0], [0, vertices[top_section_start, 1], 0]]])
+    faces = np.vstack([
+        stitch_rings(counts),
+        cap_ring(0, num_segments, center_bottom, top=True),                  # Base (pés)
+        cap_ring(top_section_start, num_segments, center_top, top=False),   # Topo (cabeça)
+    ])
     
     # Criar mesh
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
@@ -154,54 +122,32 @@ def add_arms_to_mesh(body_mesh):
     
     all_meshes = [body_mesh]
     
+    dist, radius = np.array(arm_profiles).T
+    num_segments = 24
+    num_sections = len(arm_profiles)
+    counts = np.full(num_sections, num_segments)
+    # Leve inclinação
+    y = shoulder_height - dist * arm_length * 0.3 - dist * arm_length * 0.8
+    
     for side in [-1, 1]:
-        arm_verts = []
-        num_segments = 24
-        
-        for dist, radius in arm_profiles:
-            y = shoulder_height - dist * arm_length * 0.3  # Leve inclinação
-            x = side * (shoulder_width + dist * arm_length * 0.1)
-            
-            for i in range(num_segments):
-                theta = 2 * np.pi * i / num_segments
-                ax = x + radius * np.cos(theta)
-                ay = y - dist * arm_length * 0.8
-                az = radius * np.sin(theta)
-                arm_verts.append([ax, ay, az])
-        
-        arm_verts = np.array(arm_verts)
-        
-        # Criar faces do braço
-        arm_faces = []
-        num_sections = len(arm_profiles)
+        x = side * (shoulder_width + dist * arm_length * 0.1)
+        arm_verts, _, _ = elliptic_rings(y, radius, radius, counts, cx=x)
         
-        for section in range(num_sections - 1):
-            for seg in range(num_segments):
-                i0 = section * num_segments + seg
-                i1 = section * num_segments + (seg + 1) % num_segments
-                i2 = (section + 1) * num_segments + seg
-                i3 = (section + 1) * num_segments + (seg + 1) % num_segments
-                
-                arm_faces.append([i0, i2, i1])
-                arm_faces.append([i1, i2, i3])
-        
-        # Fechar extremidades
+        # Criar faces do braço e fechar extremidades
         center_top = len(arm_verts)
-        arm_verts = np.vstack([arm_verts, [side * shoulder_width, shoulder_height - 0.02, 0]])
-        for seg in range(num_segments):
-            i0 = seg
-            i1 = (seg + 1) % num_segments
-            arm_faces.append([center_top, i1 if side > 0 else i0, i0 if side > 0 else i1])
-        
-        center_bottom = len(arm_verts)
+        center_bottom = center_top + 1
         bottom_start = (num_sections - 1) * num_segments
-        arm_verts = np.vstack([arm_verts, [side * (shoulder_width + 0.06), shoulder_height - arm_length * 0.8, 0]])
-        for seg in range(num_segments):
-            i0 = bottom_start + seg
-            i1 = bottom_start + (seg + 1) % num_segments
-            arm_faces.append([center_bottom, i0 if side > 0 else i1, i1 if side > 0 else i0])
+        arm_verts = np.vstack([arm_verts, [
+            [side * shoulder_width, shoulder_height - 0.02, 0],
+            [side * (shoulder_width + 0.06), shoulder_height - arm_length * 0.8, 0],
+        ]])
+        arm_faces = np.vstack([
+            stitch_rings(counts),
+            cap_ring(0, num_segments, center_top, top=side > 0),
+            cap_ring(bottom_start, num_segments, center_bottom, top=side < 0),
+        ])
         
-        arm_mesh = trimesh.Trimesh(vertices=arm_verts, faces=np.array(arm_faces))
+        arm_mesh = trimesh.Trimesh(vertices=arm_verts, faces=arm_faces)
         arm_mesh.fix_normals()
         all_meshes.append(arm_mesh)
     
@@ -219,67 +165,51 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
     
     print(f"Mesh final: {len(vertices)} vértices, {len(faces)} faces")
     
-    # Calcular centro e bounds do corpo
-    body_center = vertices.mean(axis=0)
+    # Regiões e coordenadas do corpo (ver mesh_segmentation); as faixas são
+    # frações da altura (y = 1.0 m ≈ 0.57 neste modelo)
+    segmentation = body_segmentation(mesh)
+    h = segmentation['height']
+    radius = segmentation['radius']
+    front = radius * np.cos(segmentation['angle'])
+    direction = radial_directions(segmentation)
     
     # Criar morph targets
     morph_targets = {}
     
-    # 1. Weight - aumento geral de volume
-    weight_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        direction = v - body_center
-        direction[1] = 0  # Não mudar altura
-        dist = np.linalg.norm(direction)
-        if dist > 0.01:
-            # Mais efeito no torso (y entre 0.6 e 1.3)
-            y_factor = np.exp(-((v[1] - 1.0) ** 2) / 0.15)
-            weight_delta[i] = (direction / dist) * 0.03 * (0.5 + y_factor)
-    morph_targets['Weight'] = weight_delta.astype(np.float32)
+    # 1. Weight - aumento geral de volume (horizontal, a partir do eixo do corpo)
+    # Mais efeito no torso
+    y_factor = np.exp(-((h - 0.57) ** 2) / 0.043)
+    factor = 0.03 * (0.5 + y_factor) * (radius > 0.01)
+    morph_targets['Weight'] = direction * factor[:, None].astype(np.float32)
     
     # 2. AbdomenGirth - barriga proeminente
+    # Região abdominal do torso, mais na frente (z positivo)
+    y_factor = np.exp(-((h - 0.59) ** 2) / 0.023)
     abdomen_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        # Região abdominal (y entre 0.8 e 1.2)
-        y_factor = np.exp(-((v[1] - 1.05) ** 2) / 0.08)
-        # Mais na frente (z positivo)
-        if v[2] > 0:
-            z_factor = v[2] / 0.15
-            abdomen_delta[i] = np.array([0, 0, 0.06 * y_factor * z_factor])
-    morph_targets['AbdomenGirth'] = abdomen_delta.astype(np.float32)
+    abdomen_delta[:, 2] = 0.06 * y_factor * np.maximum(front, 0) / 0.15 * region_mask(segmentation, 'torso')
+    morph_targets['AbdomenGirth'] = abdomen_delta
     
     # 3. MuscleMass - aumento muscular (braços, pernas, peito)
-    muscle_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        # Braços (x longe do centro)
-        if abs(v[0]) > 0.15:
-            direction = np.array([np.sign(v[0]), 0, 0])
-            arm_factor = (abs(v[0]) - 0.15) / 0.1
-            muscle_delta[i] += direction * 0.015 * min(arm_factor, 1.0)
-        
-        # Pernas
-        if v[1] < 0.8 and v[1] > 0.1:
-            direction = np.array([v[0], 0, v[2]])
-            norm = np.linalg.norm(direction)
-            if norm > 0.01:
-                leg_factor = 0.5 + 0.5 * np.sin(np.pi * (v[1] - 0.1) / 0.7)
-                muscle_delta[i] += (direction / norm) * 0.01 * leg_factor
-        
-        # Peito
-        if 1.2 < v[1] < 1.5 and v[2] > 0.02:
-            chest_factor = np.exp(-((v[1] - 1.4) ** 2) / 0.02)
-            muscle_delta[i] += np.array([0, 0, 0.015 * chest_factor])
-    
-    morph_targets['MuscleMass'] = muscle_delta.astype(np.float32)
+    # Braços: cresce do ombro para fora
+    side = np.abs(radius * np.sin(segmentation['angle']))
+    arm_factor = np.clip((side - 0.15) / 0.1, 0.0, 1.0) * region_mask(segmentation, 'arm')
+    # Pernas
+    legs = region_mask(segmentation, 'leg', h_min=0.09) & (radius > 0.01)
+    leg_factor = (0.5 + 0.5 * np.sin(np.pi * (h - 0.09) / 0.37)) * legs
+    muscle_delta = direction * (0.015 * arm_factor + 0.01 * leg_factor)[:, None].astype(np.float32)
+    # Peito
+    chest = region_mask(segmentation, 'torso', 0.67, 0.83) & (front > 0.02)
+    muscle_delta[:, 2] += 0.015 * np.exp(-((h - 0.78) ** 2) / 0.0057) * chest
+    morph_targets['MuscleMass'] = muscle_delta
     
     # 4. Posture - curvatura da coluna (envelhecimento)
     posture_delta = np.zeros_like(vertices)
-    for i, v in enumerate(vertices):
-        if v[1] > 1.0:
-            y_factor = (v[1] - 1.0) / 0.7
-            # Curvar para frente e baixo
-            posture_delta[i] = np.array([0, -0.03 * y_factor ** 2, 0.04 * y_factor])
-    morph_targets['Posture'] = posture_delta.astype(np.float32)
+    upper = region_mask(segmentation, h_min=0.57)
+    y_factor = (h[upper] - 0.57) / 0.37
+    # Curvar para frente e baixo
+    posture_delta[upper, 1] = -0.03 * y_factor ** 2
+    posture_delta[upper, 2] = 0.04 * y_factor
+    morph_targets['Posture'] = posture_delta
     
     # Efeitos compostos de doenças
     morph_targets['DiabetesEffect'] = (
@@ -298,6 +228,12 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
         morph_targets['Posture'] * 0.3 / 0.04
     ).astype(np.float32)
     
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
     # Criar buffer binário
     buffer_data = bytearray()
     
@@ -311,14 +247,19 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
     
     # Índices
     indices_offset = len(buffer_data)
-    indices_flat = faces.flatten().astype(np.uint32)
-    buffer_data.extend(indices_flat.tobytes())
+    # uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices_flat, index_type = index_buffer(faces)
+    buffer_data.extend(aligned_bytes(indices_flat))
     
-    # Morph targets
+    # Morph targets (deltas de posição e de normal)
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_offsets = {}
+    normal_offsets = {}
     for name, delta in morph_targets.items():
         morph_offsets[name] = len(buffer_data)
         buffer_data.extend(delta.tobytes())
+        normal_offsets[name] = len(buffer_data)
+        buffer_data.extend(normal_deltas[name].tobytes())
     
     # Construir GLTF
     gltf = GLTF2()
@@ -338,10 +279,11 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
     
     # Índices (2)
     buffer_views.append(BufferView(buffer=0, byteOffset=indices_offset, byteLength=indices_flat.nbytes, target=34963))
-    accessors.append(Accessor(bufferView=2, componentType=5125, count=len(indices_flat), type="SCALAR"))
+    accessors.append(Accessor(bufferView=2, componentType=index_type, count=len(indices_flat), type="SCALAR"))
     
     # Morph targets
     morph_accessor_indices = {}
+    normal_accessor_indices = {}
     for name, delta in morph_targets.items():
         bv_idx = len(buffer_views)
         buffer_views.append(BufferView(buffer=0, byteOffset=morph_offsets[name], byteLength=delta.nbytes, target=34962))
@@ -350,6 +292,11 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
         accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3",
                                   max=delta.max(axis=0).tolist(), min=delta.min(axis=0).tolist()))
         morph_accessor_indices[name] = acc_idx
+        
+        bv_idx = len(buffer_views)
+        buffer_views.append(BufferView(buffer=0, byteOffset=normal_offsets[name], byteLength=normal_deltas[name].nbytes, target=34962))
+        normal_accessor_indices[name] = len(accessors)
+        accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3"))
     
     gltf.bufferViews = buffer_views
     gltf.accessors = accessors
@@ -366,7 +313,8 @@ def create_morphable_glb(mesh, output_prefix="avatar"):
     
     # Mesh com morph targets
     target_names = list(morph_targets.keys())
-    targets = [{"POSITION": morph_accessor_indices[name]} for name in target_names]
+    targets = [{"POSITION": morph_accessor_indices[name], "NORMAL": normal_accessor_indices[name]}
+               for name in target_names]
     
     gltf.meshes = [GLTFMesh(
         primitives=[Primitive(
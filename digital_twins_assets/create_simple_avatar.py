@@ -5,7 +5,12 @@ Abordagem mais robusta que perfis transversais.
 import numpy as np
 import trimesh
 import json
+import sys
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material, PbrMetallicRoughness
+from glb_buffers import add_vertex_attributes
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import radial_directions, region_mask, segment_body
 
 def create_capsule(radius, height, center, sections=32):
     """Cria uma cápsula (cilindro com hemisférios nas pontas)"""
@@ -177,70 +182,44 @@ def create_human_body(height=1.75):
     
     return combined
 
-def create_morph_targets(vertices, height=1.75):
-    """Cria morph targets para deformações clínicas"""
-    n_verts = len(vertices)
+def create_morph_targets(vertices, height=1.75, segmentation=None):
+    """
+    Cria morph targets para deformações clínicas. segmentation (regiões e
+    coordenadas do corpo, ver mesh_segmentation) é calculada se não vier.
+    """
+    if segmentation is None:
+        segmentation = segment_body(vertices)
     SCALE = 0.04
     
     morph_targets = {}
-    y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+    h = segmentation['height']
+    direction = radial_directions(segmentation)
+    outward = segmentation['radius'] > 0.02
     
     # 1. Weight
-    weight = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.15 < y_norm < 0.92:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                norm = np.linalg.norm(direction)
-                if norm > 0:
-                    direction = direction / norm
-                    factor = 1.0
-                    if 0.45 < y_norm < 0.75:
-                        factor = 1.5
-                    weight[i] = direction * SCALE * factor
+    factor = np.where(region_mask(segmentation, 'torso', 0.45, 0.75), 1.5, 1.0)
+    factor *= outward & region_mask(segmentation, h_min=0.15, h_max=0.92)
+    weight = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['Weight'] = weight
     
     # 2. AbdomenGirth
-    abdomen = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.45 < y_norm < 0.75:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                direction = np.array([v[0], 0, v[2]])
-                norm = np.linalg.norm(direction)
-                if norm > 0:
-                    direction = direction / norm
-                    front_factor = 1.0 + 0.6 * max(0, v[2] / (abs(v[2]) + 0.01))
-                    y_factor = np.exp(-((y_norm - 0.58)**2) / 0.015)
-                    abdomen[i] = direction * SCALE * 2.0 * front_factor * y_factor
+    front = segmentation['radius'] * np.cos(segmentation['angle'])
+    front_factor = 1.0 + 0.6 * np.maximum(0, front / (np.abs(front) + 0.01))
+    y_factor = np.exp(-((h - 0.58)**2) / 0.015)
+    factor = 2.0 * front_factor * y_factor * (outward & region_mask(segmentation, 'torso', 0.45, 0.75))
+    abdomen = direction * (SCALE * factor)[:, None].astype(np.float32)
     morph_targets['AbdomenGirth'] = abdomen
     
     # 3. MuscleMass
-    muscle = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        dist = np.sqrt(v[0]**2 + v[2]**2)
-        if dist > 0.02:
-            direction = np.array([v[0], 0, v[2]])
-            norm = np.linalg.norm(direction)
-            if norm > 0:
-                direction = direction / norm
-                if 0.70 < y_norm < 0.88 or abs(v[0]) > 0.15:
-                    muscle[i] = direction * SCALE * 0.8
-                elif 0.08 < y_norm < 0.45:
-                    muscle[i] = direction * SCALE * 0.6
+    factor = np.select([region_mask(segmentation, 'torso', 0.70, 0.88) | region_mask(segmentation, 'arm'),
+                        region_mask(segmentation, 'leg', h_min=0.08)], [0.8, 0.6], 0.0)
+    muscle = direction * (SCALE * factor * outward)[:, None].astype(np.float32)
     morph_targets['MuscleMass'] = muscle
     
     # 4. Posture
-    posture = np.zeros((n_verts, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = (v[1] - y_min) / (y_max - y_min)
-        if 0.5 < y_norm < 0.98:
-            forward_lean = (y_norm - 0.5) * 0.08
-            posture[i] = [0, 0, forward_lean * SCALE]
+    posture = np.zeros((len(vertices), 3), dtype=np.float32)
+    upper = region_mask(segmentation, h_min=0.5, h_max=0.98)
+    posture[upper, 2] = (h[upper] - 0.5) * 0.08 * SCALE
     morph_targets['Posture'] = posture
     
     # 5-7. Efeitos de doenças
@@ -250,28 +229,40 @@ def create_morph_targets(vertices, height=1.75):
     
     return morph_targets
 
-def export_to_glb(vertices, faces, morph_targets, output_path):
-    """Exporta para GLB com morph targets"""
+def export_to_glb(vertices, faces, morph_targets, output_path, interleaved=False):
+    """Exporta para GLB com morph targets (interleaved: posição e normal intercaladas, com byteStride)"""
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
     mesh.fix_normals()
     normals = mesh.vertex_normals.astype(np.float32)
     
-    vertices_bytes = vertices.astype(np.float32).tobytes()
-    normals_bytes = normals.astype(np.float32).tobytes()
-    faces_bytes = faces.astype(np.uint32).flatten().tobytes()
-    
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"  - ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
+    # Posição e normal: bufferViews separados ou um só intercalado
+    vertex_views, vertex_accessors = [], []
+    vertex_bytes, attributes = add_vertex_attributes(
+        vertex_views, vertex_accessors, {'POSITION': vertices, 'NORMAL': normals}, 0, interleaved)
+    # Índices uint16 quando cabem; preenchidos até 4 bytes para alinhar os morph targets
+    indices, index_type = index_buffer(faces)
+    faces_bytes = aligned_bytes(indices)
+    
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_bytes = b''
     morph_target_list = list(morph_targets.keys())
     for name in morph_target_list:
         morph_bytes += morph_targets[name].astype(np.float32).tobytes()
+        morph_bytes += normal_deltas[name].tobytes()
     
-    total_buffer = vertices_bytes + normals_bytes + faces_bytes + morph_bytes
+    total_buffer = vertex_bytes + faces_bytes + morph_bytes
     
     gltf = GLTF2(
         asset={'version': '2.0', 'generator': 'Digital Twins Simple Avatar'},
         buffers=[Buffer(byteLength=len(total_buffer))],
-        bufferViews=[],
-        accessors=[],
+        bufferViews=vertex_views,
+        accessors=vertex_accessors,
         meshes=[],
         nodes=[],
         scenes=[],
@@ -279,43 +270,36 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
         materials=[]
     )
     
-    offset = 0
-    
-    # Vertices
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(vertices_bytes), target=34962))
-    gltf.accessors.append(Accessor(
-        bufferView=0, byteOffset=0, componentType=5126,
-        count=len(vertices), type='VEC3',
-        max=vertices.max(axis=0).tolist(),
-        min=vertices.min(axis=0).tolist()
-    ))
-    offset += len(vertices_bytes)
-    
-    # Normals
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(normals_bytes), target=34962))
-    gltf.accessors.append(Accessor(bufferView=1, byteOffset=0, componentType=5126, count=len(normals), type='VEC3'))
-    offset += len(normals_bytes)
+    offset = len(vertex_bytes)
     
     # Faces
-    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=len(faces_bytes), target=34963))
-    gltf.accessors.append(Accessor(bufferView=2, byteOffset=0, componentType=5125, count=len(faces) * 3, type='SCALAR'))
+    gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=indices.nbytes, target=34963))
+    indices_accessor = len(gltf.accessors)
+    gltf.accessors.append(Accessor(bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=index_type, count=len(indices), type='SCALAR'))
     offset += len(faces_bytes)
     
     # Morph targets
-    morph_accessor_indices = []
-    for i, name in enumerate(morph_target_list):
-        mt_data = morph_targets[name]
+    targets = []
+    for name in morph_target_list:
+        mt_data = morph_targets[name].astype(np.float32)
         mt_bytes_len = len(mt_data.tobytes())
         
         gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
         gltf.accessors.append(Accessor(
-            bufferView=3 + i, byteOffset=0, componentType=5126,
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
             count=len(mt_data), type='VEC3',
             max=mt_data.max(axis=0).tolist(),
             min=mt_data.min(axis=0).tolist()
         ))
-        morph_accessor_indices.append(3 + i)
         offset += mt_bytes_len
+        
+        gltf.bufferViews.append(BufferView(buffer=0, byteOffset=offset, byteLength=mt_bytes_len, target=34962))
+        gltf.accessors.append(Accessor(
+            bufferView=len(gltf.bufferViews) - 1, byteOffset=0, componentType=5126,
+            count=len(mt_data), type='VEC3'
+        ))
+        offset += mt_bytes_len
+        targets.append({'POSITION': len(gltf.accessors) - 2, 'NORMAL': len(gltf.accessors) - 1})
     
     # Material
     gltf.materials.append(Material(
@@ -327,12 +311,10 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
         doubleSided=True
     ))
     
-    targets = [{'POSITION': idx} for idx in morph_accessor_indices]
-    
     gltf.meshes.append(GLTFMesh(
         primitives=[Primitive(
-            attributes={'POSITION': 0, 'NORMAL': 1},
-            indices=2,
+            attributes=attributes,
+            indices=indices_accessor,
             material=0,
             targets=targets
         )],
@@ -348,7 +330,7 @@ def export_to_glb(vertices, faces, morph_targets, output_path):
     
     return morph_target_list
 
-def main():
+def main(interleaved=False):
     print("Criando avatar simples com primitivas...")
     
     HEIGHT = 1.75
@@ -366,7 +348,7 @@ def main():
     
     print("  Exportando GLB...")
     output_path = '/home/ubuntu/digital_twins/nextjs_space/public/models/avatar_morphable.glb'
-    target_names = export_to_glb(vertices, faces, morph_targets, output_path)
+    target_names = export_to_glb(vertices, faces, morph_targets, output_path, interleaved)
     
     # Também criar versão feminina (levemente diferente)
     print("  Criando versão feminina...")
@@ -386,7 +368,7 @@ def main():
     female_morph_targets = create_morph_targets(female_verts, HEIGHT * 0.98)
     
     female_output = '/home/ubuntu/digital_twins/nextjs_space/public/models/avatar_female.glb'
-    export_to_glb(female_verts, female_faces, female_morph_targets, female_output)
+    export_to_glb(female_verts, female_faces, female_morph_targets, female_output, interleaved)
     
     # Metadata
     metadata = {
@@ -408,4 +390,4 @@ def main():
     print(f"   - Morph targets: {target_names}")
 
 if __name__ == '__main__':
-    main()
+    main(interleaved='--interleaved' in sys.argv)
@@ -5,40 +5,37 @@ Baseado em proporções antropométricas e modelos SMPL.
 import numpy as np
 import trimesh
 import json
+import sys
 from pygltflib import GLTF2, Scene, Node, Mesh as GLTFMesh, Primitive, Accessor, BufferView, Buffer, Material
+from mesh_assembly import assemble
+from mesh_loft import cap_ring, elliptic_rings, stitch_rings
+from glb_buffers import add_vertex_attributes
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import radial_directions, region_mask, segment_body
+from mesh_smoothing import taubin_smooth
+
+def shape_profile(x, z, angles, front_flat=0.0, back_flat=0.0, side_bulge=0.0):
+    """Aplica as modificações anatômicas a pontos de perfil (escalares ou arrays por ponto)"""
+    # Achatar costas
+    z = np.where(z < 0, z * (1.0 - back_flat), z)
+    # Achatar frente ligeiramente
+    z = np.where(z > 0, z * (1.0 - front_flat * 0.3), z)
+    # Adicionar volume lateral
+    x = np.where(np.abs(np.cos(angles)) > 0.7, x * (1.0 + side_bulge), x)
+    return x, z
 
 def create_ellipsoid_profile(width_x, depth_z, n_pts, front_flat=0.0, back_flat=0.0, side_bulge=0.0):
     """Cria perfil elíptico com modificações anatômicas"""
     angles = np.linspace(0, 2*np.pi, n_pts, endpoint=False)
-    profile = []
-    
-    for angle in angles:
-        x = width_x * np.cos(angle)
-        z = depth_z * np.sin(angle)
-        
-        # Achatar costas
-        if z < 0:
-            z *= (1.0 - back_flat)
-        
-        # Achatar frente ligeiramente
-        if z > 0:
-            z *= (1.0 - front_flat * 0.3)
-        
-        # Adicionar volume lateral
-        if abs(np.cos(angle)) > 0.7:
-            x *= (1.0 + side_bulge)
-        
-        profile.append([x, z])
-    
-    return np.array(profile)
+    x, z = shape_profile(width_x * np.cos(angles), depth_z * np.sin(angles),
+                         angles, front_flat, back_flat, side_bulge)
+    return np.stack([x, z], axis=1)
 
 def create_detailed_human_body(height=1.75, detail_level=48):
     """
     Cria corpo humano com alta resolução anatômica.
     """
-    vertices = []
-    faces = []
-    
     # Definição anatômica detalhada
     # (y_rel, width_x, depth_z, n_points, front_flat, back_flat, side_bulge)
     anatomy = [
@@ -117,57 +114,29 @@ def create_detailed_human_body(height=1.75, detail_level=48):
         (1.100, 0.020, 0.022, 12, 0.0, 0.0, 0.0),   # Pico
     ]
     
-    current_idx = 0
-    
-    for i, (y_rel, w_x, d_z, n_pts, f_flat, b_flat, s_bulge) in enumerate(anatomy):
-        y = y_rel * height
-        profile = create_ellipsoid_profile(w_x, d_z, n_pts, f_flat, b_flat, s_bulge)
-        
-        for x, z in profile:
-            vertices.append([x, y, z])
-        
-        if i > 0:
-            prev_n = anatomy[i-1][3]
-            curr_n = n_pts
-            prev_start = current_idx - prev_n
-            curr_start = current_idx
-            
-            # Conectar anéis com diferentes números de pontos
-            for j in range(max(prev_n, curr_n)):
-                p_idx = prev_start + (j * prev_n // max(prev_n, curr_n)) % prev_n
-                c_idx = curr_start + (j * curr_n // max(prev_n, curr_n)) % curr_n
-                np_idx = prev_start + ((j + 1) * prev_n // max(prev_n, curr_n)) % prev_n
-                nc_idx = curr_start + ((j + 1) * curr_n // max(prev_n, curr_n)) % curr_n
-                
-                if p_idx != np_idx or c_idx != nc_idx:
-                    faces.append([p_idx, c_idx, nc_idx])
-                    if p_idx != np_idx:
-                        faces.append([p_idx, nc_idx, np_idx])
-        
-        current_idx += n_pts
-    
-    # Fechar topo
-    top_n = anatomy[-1][3]
-    top_start = current_idx - top_n
-    top_center = len(vertices)
-    vertices.append([0, anatomy[-1][0] * height + 0.01, 0])
-    for j in range(top_n):
-        faces.append([top_start + j, top_center, top_start + (j + 1) % top_n])
-    
-    # Fechar fundo
-    bottom_n = anatomy[0][3]
-    bottom_center = len(vertices)
-    vertices.append([0, 0.005, 0.04])
-    for j in range(bottom_n):
-        faces.append([j, (j + 1) % bottom_n, bottom_center])
-    
-    return np.array(vertices, dtype=np.float32), np.array(faces, dtype=np.int32)
+    table = np.array(anatomy, dtype=np.float64)
+    y_rel, w_x, d_z, _, f_flat, b_flat, s_bulge = table.T
+    # detail_level escala a resolução radial (48 = contagens da tabela)
+    counts = np.maximum(3, np.round(table[:, 3] * detail_level / 48)).astype(np.int64)
+    
+    verts, angles, ring = elliptic_rings(y_rel * height, w_x, d_z, counts)
+    verts[:, 0], verts[:, 2] = shape_profile(verts[:, 0], verts[:, 2], angles,
+                                             f_flat[ring], b_flat[ring], s_bulge[ring])
+    
+    # Costurar anéis (com diferentes números de pontos) e fechar topo e fundo
+    n_body = len(verts)
+    top_center, bottom_center = n_body, n_body + 1
+    vertices = np.vstack([verts, [[0, anatomy[-1][0] * height + 0.01, 0], [0, 0.005, 0.04]]])
+    faces = np.vstack([
+        stitch_rings(counts),
+        cap_ring(n_body - counts[-1], counts[-1], top_center, top=True),
+        cap_ring(0, counts[0], bottom_center, top=False),
+    ])
+    
+    return vertices.astype(np.float32), faces.astype(np.int32)
 
 def add_arms(vertices, faces, height=1.75):
     """Adiciona braços detalhados"""
-    arm_verts = list(vertices)
-    arm_faces = list(faces)
-    
     # Braço: (dist_from_center, y_rel, radius_x, radius_z, n_pts)
     arm_segments = [
         (0.195, 0.870, 0.045, 0.040, 20),   # Ombro
@@ -183,126 +152,99 @@ def add_arms(vertices, faces, height=1.75):
         (0.283, 0.450, 0.020, 0.010, 12),   # Dedos
     ]
     
+    segments = np.array(arm_segments, dtype=np.float64)
+    dist, y_rel, rx, rz, _ = segments.T
+    counts = segments[:, 4].astype(np.int64)
+    
+    parts = [(vertices, faces, 'body')]
     for side in [-1, 1]:
-        base_idx = len(arm_verts)
-        
-        for i, (dist, y_rel, rx, rz, n) in enumerate(arm_segments):
-            y = y_rel * height
-            x_center = dist * side
-            
-            for j in range(n):
-                angle = 2 * np.pi * j / n
-                x = x_center + rx * np.cos(angle) * side * 0.8
-                z = rz * np.sin(angle)
-                arm_verts.append([x, y, z])
-            
-            if i > 0:
-                prev_n = arm_segments[i-1][4]
-                curr_n = n
-                prev_start = base_idx + sum(s[4] for s in arm_segments[:i-1])
-                curr_start = base_idx + sum(s[4] for s in arm_segments[:i])
-                
-                for j in range(max(prev_n, curr_n)):
-                    pi = prev_start + (j * prev_n // max(prev_n, curr_n)) % prev_n
-                    ci = curr_start + (j * curr_n // max(prev_n, curr_n)) % curr_n
-                    npi = prev_start + ((j + 1) * prev_n // max(prev_n, curr_n)) % prev_n
-                    nci = curr_start + ((j + 1) * curr_n // max(prev_n, curr_n)) % curr_n
-                    
-                    arm_faces.append([pi, ci, nci])
-                    if pi != npi:
-                        arm_faces.append([pi, nci, npi])
+        # rx * cos(ângulo) * side * 0.8 em torno do centro do segmento
+        verts, _, _ = elliptic_rings(y_rel * height, rx * side * 0.8, rz, counts, cx=dist * side)
         
         # Fechar mão
-        hand_start = base_idx + sum(s[4] for s in arm_segments[:-1])
-        hand_n = arm_segments[-1][4]
-        hand_center = len(arm_verts)
-        arm_verts.append([arm_segments[-1][0] * side, arm_segments[-1][1] * height - 0.01, 0])
-        for j in range(hand_n):
-            arm_faces.append([hand_start + j, hand_center, hand_start + (j + 1) % hand_n])
-    
-    return np.array(arm_verts, dtype=np.float32), np.array(arm_faces, dtype=np.int32)
+        hand_center = len(verts)
+        hand = [arm_segments[-1][0] * side, arm_segments[-1][1] * height - 0.01, 0]
+        parts.append((
+            np.vstack([verts, [hand]]),
+            np.vstack([stitch_rings(counts),
+                       cap_ring(hand_center - counts[-1], counts[-1], hand_center, top=True)]),
+            'arm',
+        ))
+    
+    arm_verts, arm_faces, _ = assemble(parts)
+    return arm_verts, arm_faces
 
-def create_morph_targets(vertices, height):
-    """Cria morph targets realistas"""
+def create_morph_targets(vertices, height, segmentation=None):
+    """
+    Cria morph targets realistas. segmentation (regiões e coordenadas do
+    corpo, ver mesh_segmentation) é calculada se não vier.
+    """
+    if segmentation is None:
+        segmentation = segment_body(vertices)
     morph = {}
     n = len(vertices)
     
+    y_norm = segmentation['height']
+    dist = segmentation['radius']
+    direction = radial_directions(segmentation)
+    # Deslocamentos a partir do eixo do corpo: lateral (x) e frontal (z)
+    side = dist * np.sin(segmentation['angle'])
+    front = dist * np.cos(segmentation['angle'])
+    torso = region_mask(segmentation, 'torso')
+    
     # Weight - aumento de massa corporal
-    weight = np.zeros((n, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height
-        dx, dz = v[0], v[2]
-        dist = np.sqrt(dx**2 + dz**2)
-        
-        if dist > 0.01:
-            # Gradiente suave com mais efeito no torso
-            torso_factor = np.exp(-((y_norm - 0.65)**2) / 0.08)
-            factor = 0.07 * (0.25 + 0.75 * torso_factor)
-            weight[i, 0] = dx / dist * factor
-            weight[i, 2] = dz / dist * factor
+    # Gradiente suave com mais efeito no torso
+    torso_factor = np.exp(-((y_norm - 0.65)**2) / 0.08)
+    factor = 0.07 * (0.25 + 0.75 * torso_factor) * (dist > 0.01)
+    weight = (direction * factor[:, None]).astype(np.float32)
     morph['Weight'] = weight
     
     # AbdomenGirth - barriga proeminente
     abdomen = np.zeros((n, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height
-        # Pico na região abdominal
-        y_factor = np.exp(-((y_norm - 0.60)**2) / 0.015)
-        if v[2] > 0:  # Frente
-            front_factor = min(v[2] / 0.08, 1.0)
-            abdomen[i, 2] = 0.15 * y_factor * front_factor
-            # Também expande lateralmente
-            if abs(v[0]) > 0.05:
-                abdomen[i, 0] = np.sign(v[0]) * 0.03 * y_factor
+    # Pico na região abdominal, só na frente do torso
+    y_factor = np.exp(-((y_norm - 0.60)**2) / 0.015)
+    belly = torso & (front > 0)
+    abdomen[belly, 2] = 0.15 * y_factor[belly] * np.minimum(front[belly] / 0.08, 1.0)
+    # Também expande lateralmente
+    flank = belly & (np.abs(side) > 0.05)
+    abdomen[flank, 0] = np.sign(side[flank]) * 0.03 * y_factor[flank]
     morph['AbdomenGirth'] = abdomen
     
     # MuscleMass - definição muscular
     muscle = np.zeros((n, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height
-        
-        # Peito
-        if 0.75 < y_norm < 0.82 and v[2] > 0.02:
-            chest_factor = np.exp(-((y_norm - 0.79)**2) / 0.003)
-            muscle[i, 2] += 0.03 * chest_factor
-        
-        # Ombros/deltoides
-        if 0.84 < y_norm < 0.89 and abs(v[0]) > 0.12:
-            muscle[i, 0] += np.sign(v[0]) * 0.025
-        
-        # Braços
-        if abs(v[0]) > 0.2 and 0.5 < y_norm < 0.85:
-            muscle[i, 0] += np.sign(v[0]) * 0.02
-        
-        # Coxas
-        if y_norm < 0.48 and y_norm > 0.28:
-            dist_xz = np.sqrt(v[0]**2 + v[2]**2)
-            if dist_xz > 0.04:
-                thigh_factor = np.exp(-((y_norm - 0.40)**2) / 0.01)
-                muscle[i, 0] += v[0] / dist_xz * 0.02 * thigh_factor
-                muscle[i, 2] += v[2] / dist_xz * 0.02 * thigh_factor
+    
+    # Peito
+    chest = region_mask(segmentation, 'torso', 0.75, 0.82) & (front > 0.02)
+    muscle[chest, 2] += 0.03 * np.exp(-((y_norm[chest] - 0.79)**2) / 0.003)
+    
+    # Ombros/deltoides: topo dos braços e laterais do torso
+    shoulders = (region_mask(segmentation, 'arm', 0.84, 0.89)
+                 | (region_mask(segmentation, 'torso', 0.84, 0.89) & (np.abs(side) > 0.12)))
+    muscle[shoulders, 0] += np.sign(side[shoulders]) * 0.025
+    
+    # Braços
+    arms = region_mask(segmentation, 'arm', 0.5, 0.85)
+    muscle[arms, 0] += np.sign(side[arms]) * 0.02
+    
+    # Coxas
+    thighs = region_mask(segmentation, 'leg', 0.28, 0.48) & (dist > 0.04)
+    thigh_factor = np.exp(-((y_norm[thighs] - 0.40)**2) / 0.01)
+    muscle[thighs] += direction[thighs] * (0.02 * thigh_factor)[:, None]
     morph['MuscleMass'] = muscle
     
     # Posture - curvatura espinhal
     posture = np.zeros((n, 3), dtype=np.float32)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height
-        if y_norm > 0.82:
-            factor = (y_norm - 0.82) / 0.18
-            posture[i, 1] = -0.07 * factor**2
-            posture[i, 2] = 0.08 * factor
+    upper = y_norm > 0.82
+    factor = (y_norm[upper] - 0.82) / 0.18
+    posture[upper, 1] = -0.07 * factor**2
+    posture[upper, 2] = 0.08 * factor
     morph['Posture'] = posture
     
     # DiabetesEffect
-    diabetes = weight * 0.35 + abdomen * 0.55 + np.zeros_like(weight)
-    for i, v in enumerate(vertices):
-        y_norm = v[1] / height
-        # Retenção de líquidos nas pernas
-        if y_norm < 0.3:
-            dist = np.sqrt(v[0]**2 + v[2]**2)
-            if dist > 0.02:
-                diabetes[i, 0] += v[0] / dist * 0.015
-                diabetes[i, 2] += v[2] / dist * 0.015
+    diabetes = weight * 0.35 + abdomen * 0.55
+    # Retenção de líquidos nas pernas
+    lower_legs = region_mask(segmentation, 'leg', h_max=0.3) & (dist > 0.02)
+    diabetes[lower_legs] += direction[lower_legs] * 0.015
     morph['DiabetesEffect'] = diabetes.astype(np.float32)
     
     # HypertensionEffect
@@ -315,42 +257,47 @@ def create_morph_targets(vertices, height):
     
     return morph
 
-def export_glb(vertices, faces, normals, morphs, output_name):
-    """Exporta para GLB"""
-    buffer = bytearray()
+def export_glb(vertices, faces, normals, morphs, output_name, interleaved=False):
+    """Exporta para GLB (interleaved: posição e normal intercaladas, com byteStride)"""
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morphs = {name: delta[vertex_order] for name, delta in morphs.items()}
+    print(f"  ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
     
-    v_off = len(buffer)
-    buffer.extend(vertices.tobytes())
+    buffer = bytearray()
+    bv = []
+    ac = []
     
-    n_off = len(buffer)
-    buffer.extend(normals.tobytes())
+    # Posição e normal: bufferViews separados ou um só intercalado
+    vertex_bytes, attributes = add_vertex_attributes(
+        bv, ac, {"POSITION": vertices, "NORMAL": normals}, len(buffer), interleaved)
+    buffer.extend(vertex_bytes)
     
     i_off = len(buffer)
-    indices = faces.flatten().astype(np.uint32)
-    buffer.extend(indices.tobytes())
+    # uint16 quando cabe; preenchido até 4 bytes para alinhar os morph targets
+    indices, index_type = index_buffer(faces)
+    buffer.extend(aligned_bytes(indices))
     
+    # Deltas de posição e de normal de cada morph target
+    normal_deltas = morph_normal_deltas(vertices, faces, morphs, normals)
     m_offs = {}
+    n_offs = {}
     for name, delta in morphs.items():
         m_offs[name] = len(buffer)
         buffer.extend(delta.astype(np.float32).tobytes())
+        n_offs[name] = len(buffer)
+        buffer.extend(normal_deltas[name].tobytes())
     
     gltf = GLTF2()
     gltf.buffers = [Buffer(byteLength=len(buffer))]
     
-    bv = []
-    ac = []
-    
-    bv.append(BufferView(buffer=0, byteOffset=v_off, byteLength=vertices.nbytes, target=34962))
-    ac.append(Accessor(bufferView=0, componentType=5126, count=len(vertices), type="VEC3",
-                       max=vertices.max(axis=0).tolist(), min=vertices.min(axis=0).tolist()))
-    
-    bv.append(BufferView(buffer=0, byteOffset=n_off, byteLength=normals.nbytes, target=34962))
-    ac.append(Accessor(bufferView=1, componentType=5126, count=len(normals), type="VEC3"))
-    
     bv.append(BufferView(buffer=0, byteOffset=i_off, byteLength=indices.nbytes, target=34963))
-    ac.append(Accessor(bufferView=2, componentType=5125, count=len(indices), type="SCALAR"))
+    i_acc = len(ac)
+    ac.append(Accessor(bufferView=len(bv) - 1, componentType=index_type, count=len(indices), type="SCALAR"))
     
     m_acc = {}
+    n_acc = {}
     for name, delta in morphs.items():
         bvi = len(bv)
         bv.append(BufferView(buffer=0, byteOffset=m_offs[name], byteLength=delta.nbytes, target=34962))
@@ -358,6 +305,11 @@ def export_glb(vertices, faces, normals, morphs, output_name):
         ac.append(Accessor(bufferView=bvi, componentType=5126, count=len(delta), type="VEC3",
                            max=delta.max(axis=0).tolist(), min=delta.min(axis=0).tolist()))
         m_acc[name] = aci
+        
+        normal_delta = normal_deltas[name]
+        bv.append(BufferView(buffer=0, byteOffset=n_offs[name], byteLength=normal_delta.nbytes, target=34962))
+        ac.append(Accessor(bufferView=len(bv) - 1, componentType=5126, count=len(normal_delta), type="VEC3"))
+        n_acc[name] = len(ac) - 1
     
     gltf.bufferViews = bv
     gltf.accessors = ac
@@ -372,12 +324,12 @@ def export_glb(vertices, faces, normals, morphs, output_name):
     )]
     
     names = list(morphs.keys())
-    targets = [{"POSITION": m_acc[n]} for n in names]
+    targets = [{"POSITION": m_acc[n], "NORMAL": n_acc[n]} for n in names]
     
     gltf.meshes = [GLTFMesh(
         primitives=[Primitive(
-            attributes={"POSITION": 0, "NORMAL": 1},
-            indices=2,
+            attributes=attributes,
+            indices=i_acc,
             material=0,
             targets=targets
         )],
@@ -394,7 +346,7 @@ def export_glb(vertices, faces, normals, morphs, output_name):
     print(f"✓ {output_name}")
     return gltf, names
 
-def main():
+def main(interleaved=False):
     height = 1.75
     
     print("Criando corpo ultra-detalhado...")
@@ -413,7 +365,7 @@ def main():
     
     # Suavizar
     print("Suavizando...")
-    trimesh.smoothing.filter_laplacian(mesh, lamb=0.5, iterations=8)
+    mesh.vertices = taubin_smooth(mesh.vertices, mesh.faces, iterations=8)
     
     verts = mesh.vertices.astype(np.float32)
     faces = mesh.faces.astype(np.int32)
@@ -439,7 +391,7 @@ def main():
     
     # Exportar
     print("Exportando GLB...")
-    gltf, names = export_glb(verts, faces, normals, morphs, "avatar_morphable.glb")
+    gltf, names = export_glb(verts, faces, normals, morphs, "avatar_morphable.glb", interleaved)
     
     gltf.meshes[0].weights = [0.0] * len(morphs)
     gltf.save("avatar_baseline.glb")
@@ -467,4 +419,4 @@ def main():
     print(f"\n✅ Modelo criado: {len(verts)} vértices, {len(faces)} faces")
 
 if __name__ == "__main__":
-    main()
+    main(interleaved='--interleaved' in sys.argv)
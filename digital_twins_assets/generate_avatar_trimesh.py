@@ -12,7 +12,13 @@ from pygltflib import GLTF2, Buffer, BufferView, Accessor, Mesh, Primitive, Node
 import struct
 import json
 import os
+import sys
 from pathlib import Path
+from glb_buffers import add_vertex_attributes
+from mesh_assembly import REGION_ATTRIBUTE, REGION_IDS
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask, segment_body
 
 def create_capsule(radius, height, segments_around=16, segments_height=8):
     """Create a capsule mesh (cylinder with hemispheres on ends)"""
@@ -37,107 +43,110 @@ def create_humanoid_mesh():
     # === TORSO ===
     torso = create_ellipsoid([0.18, 0.28, 0.12])
     torso.vertices[:, 1] += 1.22  # Move to chest height
-    meshes.append(torso)
+    meshes.append((torso, 'torso'))
     
     # === ABDOMEN/BELLY ===
     abdomen = create_ellipsoid([0.17, 0.18, 0.13])
     abdomen.vertices[:, 1] += 1.02
     abdomen.vertices[:, 2] += 0.02  # Slight forward
-    meshes.append(abdomen)
+    meshes.append((abdomen, 'torso'))
     
     # === HIPS ===
     hips = create_ellipsoid([0.18, 0.12, 0.11])
     hips.vertices[:, 1] += 0.88
-    meshes.append(hips)
+    meshes.append((hips, 'torso'))
     
     # === HEAD ===
     head = create_ellipsoid([0.09, 0.11, 0.09])
     head.vertices[:, 1] += 1.64
-    meshes.append(head)
+    meshes.append((head, 'head'))
     
     # === NECK ===
     neck = trimesh.creation.cylinder(radius=0.05, height=0.1, sections=12)
     neck.vertices[:, 1] += 1.5
-    meshes.append(neck)
+    meshes.append((neck, 'torso'))
     
     # === ARMS ===
     # Left upper arm
     l_upper_arm = create_capsule(0.045, 0.26, 12, 4)
     l_upper_arm.vertices[:, 1] += 1.3
     l_upper_arm.vertices[:, 0] += 0.25
-    meshes.append(l_upper_arm)
+    meshes.append((l_upper_arm, 'arm'))
     
     # Left forearm
     l_forearm = create_capsule(0.035, 0.24, 12, 4)
     l_forearm.vertices[:, 1] += 1.0
     l_forearm.vertices[:, 0] += 0.25
-    meshes.append(l_forearm)
+    meshes.append((l_forearm, 'arm'))
     
     # Left hand
     l_hand = create_ellipsoid([0.04, 0.06, 0.02])
     l_hand.vertices[:, 1] += 0.72
     l_hand.vertices[:, 0] += 0.25
-    meshes.append(l_hand)
+    meshes.append((l_hand, 'arm'))
     
     # Right upper arm
     r_upper_arm = create_capsule(0.045, 0.26, 12, 4)
     r_upper_arm.vertices[:, 1] += 1.3
     r_upper_arm.vertices[:, 0] -= 0.25
-    meshes.append(r_upper_arm)
+    meshes.append((r_upper_arm, 'arm'))
     
     # Right forearm
     r_forearm = create_capsule(0.035, 0.24, 12, 4)
     r_forearm.vertices[:, 1] += 1.0
     r_forearm.vertices[:, 0] -= 0.25
-    meshes.append(r_forearm)
+    meshes.append((r_forearm, 'arm'))
     
     # Right hand
     r_hand = create_ellipsoid([0.04, 0.06, 0.02])
     r_hand.vertices[:, 1] += 0.72
     r_hand.vertices[:, 0] -= 0.25
-    meshes.append(r_hand)
+    meshes.append((r_hand, 'arm'))
     
     # === LEGS ===
     # Left thigh
     l_thigh = create_capsule(0.07, 0.40, 12, 4)
     l_thigh.vertices[:, 1] += 0.58
     l_thigh.vertices[:, 0] += 0.1
-    meshes.append(l_thigh)
+    meshes.append((l_thigh, 'leg'))
     
     # Left calf
     l_calf = create_capsule(0.05, 0.38, 12, 4)
     l_calf.vertices[:, 1] += 0.22
     l_calf.vertices[:, 0] += 0.1
-    meshes.append(l_calf)
+    meshes.append((l_calf, 'leg'))
     
     # Left foot
     l_foot = create_ellipsoid([0.04, 0.03, 0.10])
     l_foot.vertices[:, 1] += 0.03
     l_foot.vertices[:, 0] += 0.1
     l_foot.vertices[:, 2] += 0.05
-    meshes.append(l_foot)
+    meshes.append((l_foot, 'leg'))
     
     # Right thigh
     r_thigh = create_capsule(0.07, 0.40, 12, 4)
     r_thigh.vertices[:, 1] += 0.58
     r_thigh.vertices[:, 0] -= 0.1
-    meshes.append(r_thigh)
+    meshes.append((r_thigh, 'leg'))
     
     # Right calf
     r_calf = create_capsule(0.05, 0.38, 12, 4)
     r_calf.vertices[:, 1] += 0.22
     r_calf.vertices[:, 0] -= 0.1
-    meshes.append(r_calf)
+    meshes.append((r_calf, 'leg'))
     
     # Right foot
     r_foot = create_ellipsoid([0.04, 0.03, 0.10])
     r_foot.vertices[:, 1] += 0.03
     r_foot.vertices[:, 0] -= 0.1
     r_foot.vertices[:, 2] += 0.05
-    meshes.append(r_foot)
+    meshes.append((r_foot, 'leg'))
     
-    # Combine all meshes
-    combined = trimesh.util.concatenate(meshes)
+    # Combine all meshes, keeping each part's region label per vertex
+    combined = trimesh.util.concatenate([part for part, _ in meshes])
+    combined.vertex_attributes[REGION_ATTRIBUTE] = np.repeat(
+        np.array([REGION_IDS[region] for _, region in meshes], dtype=np.uint8),
+        [len(part.vertices) for part, _ in meshes])
     
     # Center the mesh
     combined.vertices[:, 1] -= 0.87  # Center vertically
@@ -145,37 +154,34 @@ def create_humanoid_mesh():
     return combined
 
 
-def create_morph_targets(base_vertices):
+def create_morph_targets(base_vertices, segmentation=None):
     """
     Create morph target displacements for various body parameters.
+    segmentation (regions and body-space coordinates, see mesh_segmentation)
+    is computed from the vertices when not given.
     Returns dict of {name: displacement_array}
     """
+    if segmentation is None:
+        segmentation = segment_body(base_vertices)
     n_verts = len(base_vertices)
     morph_targets = {}
     
-    # Helper to identify body regions
-    def get_region_mask(verts, y_min=-np.inf, y_max=np.inf, x_abs_min=0, x_abs_max=np.inf, z_min=-np.inf):
-        return (
-            (verts[:, 1] >= y_min) & 
-            (verts[:, 1] <= y_max) & 
-            (np.abs(verts[:, 0]) >= x_abs_min) &
-            (np.abs(verts[:, 0]) <= x_abs_max) &
-            (verts[:, 2] >= z_min)
-        )
+    h = segmentation['height']
+    center_dist = segmentation['radius']
+    extent = base_vertices[:, 1].max() - base_vertices[:, 1].min()
+    # Offsets from the body axis: sideways (x) and forward (z)
+    side = center_dist * np.sin(segmentation['angle'])
+    front = center_dist * np.cos(segmentation['angle'])
     
     # === WEIGHT MORPH TARGET ===
     # Overall body mass - scales everything outward from center axis
-    weight_displ = np.zeros_like(base_vertices)
     
     # Torso region (more effect)
-    torso_mask = get_region_mask(base_vertices, y_min=-0.1, y_max=0.7)
-    center_dist = np.sqrt(base_vertices[:, 0]**2 + base_vertices[:, 2]**2)
+    torso_mask = region_mask(segmentation, 'torso')
     
     # Direction from center axis
-    direction = np.zeros_like(base_vertices)
-    nonzero_mask = center_dist > 0.01
-    direction[nonzero_mask, 0] = base_vertices[nonzero_mask, 0] / center_dist[nonzero_mask]
-    direction[nonzero_mask, 2] = base_vertices[nonzero_mask, 2] / center_dist[nonzero_mask]
+    direction = radial_directions(segmentation)
+    direction[center_dist <= 0.01] = 0
     
     # Scale factor based on region
     scale = np.where(torso_mask, 0.15, 0.08)
@@ -185,19 +191,17 @@ def create_morph_targets(base_vertices):
     
     # === ABDOMEN GIRTH MORPH TARGET ===
     # Belly size for metabolic conditions
-    abdomen_displ = np.zeros_like(base_vertices)
     
-    # Belly region: lower torso, front-facing
-    belly_center = np.array([0, 0.15, 0.08])
-    belly_dist = np.linalg.norm(base_vertices - belly_center, axis=1)
+    # Belly region: lower torso, front-facing (58% of the height, 8cm forward)
+    belly_dist = np.sqrt(side**2 + ((h - 0.58) * extent)**2 + (front - 0.08)**2)
     
-    belly_mask = (belly_dist < 0.25) & (base_vertices[:, 2] > -0.05)
+    belly_mask = (belly_dist < 0.25) & (front > -0.05) & torso_mask
     influence = np.zeros(n_verts)
     influence[belly_mask] = (1.0 - belly_dist[belly_mask] / 0.25) ** 0.5
     
     # Push forward and slightly outward
     push_dir = np.zeros_like(base_vertices)
-    push_dir[:, 0] = base_vertices[:, 0] * 0.3
+    push_dir[:, 0] = side * 0.3
     push_dir[:, 2] = 1.0
     push_dir = push_dir / (np.linalg.norm(push_dir, axis=1, keepdims=True) + 0.001)
     
@@ -208,24 +212,12 @@ def create_morph_targets(base_vertices):
     # Arm and leg thickness
     muscle_displ = np.zeros_like(base_vertices)
     
-    # Arms (|x| > 0.15)
-    arm_mask = get_region_mask(base_vertices, y_min=-0.2, y_max=0.6, x_abs_min=0.15)
-    
-    # Legs (|x| < 0.15, y < -0.1)
-    leg_mask = get_region_mask(base_vertices, y_max=-0.1, x_abs_max=0.15)
-    
-    # Chest/shoulders
-    chest_mask = get_region_mask(base_vertices, y_min=0.3, y_max=0.7, x_abs_max=0.2, z_min=0)
+    # Chest/shoulders: upper torso, front-facing
+    chest_mask = region_mask(segmentation, 'torso', 0.67, 0.90) & (front >= 0)
     
     # Expand limbs outward
-    limb_mask = arm_mask | leg_mask
-    limb_direction = np.zeros_like(base_vertices)
-    limb_direction[limb_mask, 0] = base_vertices[limb_mask, 0]
-    limb_direction[limb_mask, 2] = base_vertices[limb_mask, 2]
-    limb_norm = np.linalg.norm(limb_direction, axis=1, keepdims=True) + 0.001
-    limb_direction = limb_direction / limb_norm
-    
-    muscle_displ[limb_mask] = limb_direction[limb_mask] * 0.015
+    limb_mask = region_mask(segmentation, ['arm', 'leg'])
+    muscle_displ[limb_mask] = direction[limb_mask] * 0.015
     muscle_displ[chest_mask, 2] += 0.015
     
     morph_targets['MuscleMass'] = muscle_displ.astype(np.float32)
@@ -234,17 +226,17 @@ def create_morph_targets(base_vertices):
     # Spine curvature for aging effect
     posture_displ = np.zeros_like(base_vertices)
     
-    # Upper body forward lean
-    upper_mask = base_vertices[:, 1] > 0.1
-    height_factor = np.clip((base_vertices[:, 1] - 0.1) / 0.7, 0, 1)
+    # Upper body forward lean (above 55% of the height)
+    upper_mask = h > 0.55
+    height_factor = np.clip((h - 0.55) / 0.4, 0, 1)
     
     # Forward lean
     posture_displ[upper_mask, 2] += height_factor[upper_mask] * 0.05
     
     # Shoulder droop (move down and inward)
-    shoulder_mask = (base_vertices[:, 1] > 0.4) & (np.abs(base_vertices[:, 0]) > 0.15)
+    shoulder_mask = region_mask(segmentation, 'arm', h_min=0.72)
     posture_displ[shoulder_mask, 1] -= 0.02
-    posture_displ[shoulder_mask, 0] -= np.sign(base_vertices[shoulder_mask, 0]) * 0.015
+    posture_displ[shoulder_mask, 0] -= np.sign(side[shoulder_mask]) * 0.015
     
     morph_targets['Posture'] = posture_displ.astype(np.float32)
     
@@ -279,9 +271,10 @@ def create_morph_targets(base_vertices):
     return morph_targets
 
 
-def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None):
+def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None, interleaved=False):
     """
     Export mesh as GLB with morph targets using pygltflib.
+    With interleaved=True, POSITION and NORMAL share one bufferView with byteStride.
     """
     vertices = mesh.vertices.astype(np.float32)
     faces = mesh.faces.astype(np.uint32)
@@ -293,6 +286,12 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
         mesh.fix_normals()
         normals = mesh.vertex_normals.astype(np.float32)
     
+    # Reorder triangles for the post-transform vertex cache and vertices for fetch locality
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    morph_targets = {name: delta[vertex_order] for name, delta in morph_targets.items()}
+    print(f"  ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
     # Apply base morph values if specified
     if base_morph_values:
         for name, value in base_morph_values.items():
@@ -302,23 +301,21 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
     # Build binary buffer
     buffer_data = bytearray()
     
-    # Vertices
-    vertices_blob = vertices.tobytes()
-    vertices_offset = len(buffer_data)
-    buffer_data.extend(vertices_blob)
+    # Vertices and normals: separate bufferViews or one interleaved view
+    vertex_views, vertex_accessors = [], []
+    vertex_blob, attributes = add_vertex_attributes(
+        vertex_views, vertex_accessors, {'POSITION': vertices, 'NORMAL': normals}, len(buffer_data), interleaved)
+    buffer_data.extend(vertex_blob)
     
-    # Normals
-    normals_blob = normals.tobytes()
-    normals_offset = len(buffer_data)
-    buffer_data.extend(normals_blob)
-    
-    # Indices
-    indices_blob = faces.flatten().astype(np.uint32).tobytes()
+    # Indices (uint16 when they fit), padded so the morph targets stay 4-byte aligned
+    indices, index_type = index_buffer(faces)
     indices_offset = len(buffer_data)
-    buffer_data.extend(indices_blob)
+    buffer_data.extend(aligned_bytes(indices))
     
-    # Morph targets (as displacements from base)
+    # Morph targets (as displacements from base), each followed by its normal deltas
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets, normals)
     morph_offsets = {}
+    normal_offsets = {}
     morph_names = list(morph_targets.keys())
     
     for name in morph_names:
@@ -326,10 +323,8 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
         morph_blob = displ.tobytes()
         morph_offsets[name] = len(buffer_data)
         buffer_data.extend(morph_blob)
-    
-    # Calculate bounds
-    v_min = vertices.min(axis=0).tolist()
-    v_max = vertices.max(axis=0).tolist()
+        normal_offsets[name] = len(buffer_data)
+        buffer_data.extend(normal_deltas[name].tobytes())
     
     # Create glTF structure
     gltf = GLTF2(
@@ -338,8 +333,8 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
         scenes=[Scene(nodes=[0])],
         nodes=[Node(mesh=0, name="Avatar")],
         meshes=[],
-        accessors=[],
-        bufferViews=[],
+        accessors=vertex_accessors,
+        bufferViews=vertex_views,
         buffers=[Buffer(byteLength=len(buffer_data))],
         materials=[Material(
             name="SkinMaterial",
@@ -351,33 +346,18 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
         )]
     )
     
-    # Buffer views
-    # 0: Vertices
-    gltf.bufferViews.append(BufferView(
-        buffer=0,
-        byteOffset=vertices_offset,
-        byteLength=len(vertices_blob),
-        target=34962  # ARRAY_BUFFER
-    ))
-    
-    # 1: Normals
-    gltf.bufferViews.append(BufferView(
-        buffer=0,
-        byteOffset=normals_offset,
-        byteLength=len(normals_blob),
-        target=34962
-    ))
-    
-    # 2: Indices
+    # Buffer views (after the vertex attribute views)
+    # Indices
+    indices_bv = len(gltf.bufferViews)
     gltf.bufferViews.append(BufferView(
         buffer=0,
         byteOffset=indices_offset,
-        byteLength=len(indices_blob),
+        byteLength=indices.nbytes,
         target=34963  # ELEMENT_ARRAY_BUFFER
     ))
     
-    # Morph target buffer views
-    morph_bv_start = 3
+    # Morph target buffer views (position, normal) per target
+    morph_bv_start = len(gltf.bufferViews)
     for i, name in enumerate(morph_names):
         gltf.bufferViews.append(BufferView(
             buffer=0,
@@ -385,46 +365,33 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
             byteLength=morph_targets[name].nbytes,
             target=34962
         ))
+        gltf.bufferViews.append(BufferView(
+            buffer=0,
+            byteOffset=normal_offsets[name],
+            byteLength=normal_deltas[name].nbytes,
+            target=34962
+        ))
     
-    # Accessors
-    # 0: Vertices
-    gltf.accessors.append(Accessor(
-        bufferView=0,
-        byteOffset=0,
-        componentType=5126,  # FLOAT
-        count=len(vertices),
-        type="VEC3",
-        max=v_max,
-        min=v_min
-    ))
-    
-    # 1: Normals
-    gltf.accessors.append(Accessor(
-        bufferView=1,
-        byteOffset=0,
-        componentType=5126,
-        count=len(normals),
-        type="VEC3"
-    ))
-    
-    # 2: Indices
+    # Accessors (after the vertex attribute accessors)
+    # Indices
+    indices_accessor = len(gltf.accessors)
     gltf.accessors.append(Accessor(
-        bufferView=2,
+        bufferView=indices_bv,
         byteOffset=0,
-        componentType=5125,  # UNSIGNED_INT
-        count=len(faces.flatten()),
+        componentType=index_type,  # UNSIGNED_SHORT or UNSIGNED_INT
+        count=len(indices),
         type="SCALAR"
     ))
     
     # Morph target accessors
-    morph_accessor_start = 3
+    morph_accessor_start = len(gltf.accessors)
     for i, name in enumerate(morph_names):
         displ = morph_targets[name]
         d_min = displ.min(axis=0).tolist()
         d_max = displ.max(axis=0).tolist()
         
         gltf.accessors.append(Accessor(
-            bufferView=morph_bv_start + i,
+            bufferView=morph_bv_start + 2 * i,
             byteOffset=0,
             componentType=5126,
             count=len(displ),
@@ -432,16 +399,26 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
             max=d_max,
             min=d_min
         ))
+        gltf.accessors.append(Accessor(
+            bufferView=morph_bv_start + 2 * i + 1,
+            byteOffset=0,
+            componentType=5126,
+            count=len(displ),
+            type="VEC3"
+        ))
     
     # Build morph targets for primitive
     morph_target_list = []
     for i in range(len(morph_names)):
-        morph_target_list.append({"POSITION": morph_accessor_start + i})
+        morph_target_list.append({
+            "POSITION": morph_accessor_start + 2 * i,
+            "NORMAL": morph_accessor_start + 2 * i + 1
+        })
     
     # Create mesh with primitive
     primitive = Primitive(
-        attributes={"POSITION": 0, "NORMAL": 1},
-        indices=2,
+        attributes=attributes,
+        indices=indices_accessor,
         material=0,
         targets=morph_target_list
     )
@@ -464,8 +441,8 @@ def export_glb_with_morphs(mesh, morph_targets, filepath, base_morph_values=None
     print(f"  - Morph targets: {morph_names}")
 
 
-def main():
-    """Main execution"""
+def main(interleaved=False):
+    """Main execution (interleaved: write POSITION/NORMAL as one strided bufferView)"""
     print("=" * 60)
     print("Digital Twins Avatar Generator (Trimesh version)")
     print("Hospital Albert Einstein MVP")
@@ -482,7 +459,7 @@ def main():
     
     # Create morph targets
     print("\nCreating morph targets...")
-    morph_targets = create_morph_targets(avatar_mesh.vertices)
+    morph_targets = create_morph_targets(avatar_mesh.vertices, body_segmentation(avatar_mesh))
     print(f"  Created {len(morph_targets)} morph targets:")
     for name in morph_targets:
         print(f"    - {name}")
@@ -495,7 +472,8 @@ def main():
     export_glb_with_morphs(
         avatar_mesh,
         morph_targets,
-        str(output_dir / "avatar_morphable.glb")
+        str(output_dir / "avatar_morphable.glb"),
+        interleaved=interleaved
     )
     
     # Export baseline (healthy) state
@@ -503,7 +481,8 @@ def main():
         avatar_mesh,
         morph_targets,
         str(output_dir / "avatar_baseline.glb"),
-        base_morph_values={'MuscleMass': 0.3}
+        base_morph_values={'MuscleMass': 0.3},
+        interleaved=interleaved
     )
     
     # Export clinical state
@@ -517,7 +496,8 @@ def main():
             'MuscleMass': -0.2,
             'Posture': 0.4,
             'DiabetesEffect': 0.5
-        }
+        },
+        interleaved=interleaved
     )
     
     # Also export as OBJ for reference
@@ -611,4 +591,4 @@ loader.load('avatar_morphable.glb', (gltf) => {
 
 
 if __name__ == "__main__":
-    main()
+    main(interleaved='--interleaved' in sys.argv)
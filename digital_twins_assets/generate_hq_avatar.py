@@ -3,259 +3,211 @@ import trimesh
 from scipy.spatial import Delaunay
 import json
 import struct
+import sys
+import time
+from glb_buffers import add_vertex_attributes
+from mesh_assembly import REGION_ATTRIBUTE, assemble
+from mesh_loft import cap_ring, elliptic_rings, stitch_rings
+from mesh_normals import morph_normal_deltas
+from mesh_reorder import aligned_bytes, index_buffer, reorder_mesh
+from mesh_segmentation import body_segmentation, radial_directions, region_mask
+from mesh_smoothing import taubin_smooth
 
-def create_human_body_mesh(resolution=50):
-    """Cria uma malha humana mais detalhada usando superfícies paramétricas"""
-    
-    # Parâmetros do corpo
-    body_height = 1.75
-    
-    # Criar seções do corpo com mais detalhes
+# Resolução de referência: com ela, cada seção tem os anéis e segmentos originais
+BASE_RESOLUTION = 50
+# Extensão (m) abaixo da qual um anel de ponta é tratado como polo
+POLE_TOLERANCE = 1e-6
+
+
+def _scaled(count, resolution, minimum):
+    """Nº de anéis/segmentos de uma seção na resolução pedida"""
+    return max(minimum, int(round(count * resolution / BASE_RESOLUTION)))
+
+
+def create_body_section(y, radius_x, radius_z, num_segments, center_x=0.0, center_z=0.0):
+    """
+    Seção do corpo: um anel elíptico por valor de y, todos com num_segments
+    pontos (grade estruturada anéis x segmentos). Retorna (vértices, ângulos),
+    com os ângulos para deformações que dependem da posição no anel.
+    """
+    counts = np.full(len(y), num_segments)
+    vertices, angles, _ = elliptic_rings(y, radius_x, radius_z, counts, center_x, center_z)
+    return vertices, angles
+
+
+def create_human_body_sections(resolution=50):
+    """
+    Seções do corpo humano (superfícies paramétricas), cada uma como
+    (vértices, nº de anéis, nº de segmentos, região). resolution escala anéis
+    e segmentos de todas as seções; 50 mantém as contagens originais.
+    """
     sections = []
-    
-    # Função para criar elipsoides com deformações
-    def create_body_section(center_y, radius_x, radius_z, height, num_rings=20, num_segments=32):
-        vertices = []
-        for i in range(num_rings + 1):
-            t = i / num_rings
-            y = center_y - height/2 + t * height
-            
-            # Variação do raio ao longo da altura
-            r_factor = np.sin(t * np.pi) ** 0.3  # Mais cheio no meio
-            rx = radius_x * (0.7 + 0.3 * r_factor)
-            rz = radius_z * (0.7 + 0.3 * r_factor)
-            
-            for j in range(num_segments):
-                theta = 2 * np.pi * j / num_segments
-                x = rx * np.cos(theta)
-                z = rz * np.sin(theta)
-                vertices.append([x, y, z])
-        
-        return np.array(vertices), num_rings + 1, num_segments
-    
-    # Criar corpo completo com proporções humanas realistas
-    all_vertices = []
-    
+
+    def add_section(num_rings, num_segments, build, region, **kwargs):
+        rings = _scaled(num_rings, resolution, 3)
+        segments = _scaled(num_segments, resolution, 6)
+        t = np.linspace(0.0, 1.0, rings)
+        vertices = build(t, segments, **kwargs)
+        # Centralizar na posição correta (pés no chão)
+        vertices[:, 1] += 0.45
+        sections.append((vertices, rings, segments, region))
+
     # Cabeça (esfera mais suave)
-    head_verts = []
-    head_center = 1.65
-    head_radius = 0.11
-    for i in range(25):
-        phi = np.pi * i / 24
-        for j in range(32):
-            theta = 2 * np.pi * j / 32
-            # Modificar para forma de cabeça mais realista
-            r_mod = head_radius * (1.0 - 0.15 * np.sin(phi) ** 2)  # Mais estreito nas laterais
-            x = r_mod * np.sin(phi) * np.cos(theta)
-            y = head_center + head_radius * 0.95 * np.cos(phi)
-            z = r_mod * 0.9 * np.sin(phi) * np.sin(theta)  # Mais achatado frente/trás
-            head_verts.append([x, y, z])
-    all_vertices.extend(head_verts)
-    
+    def head(t, segments):
+        phi = np.pi * t
+        head_center = 1.65
+        head_radius = 0.11
+        # Mais estreito nas laterais e achatado frente/trás
+        r_mod = head_radius * (1.0 - 0.15 * np.sin(phi) ** 2)
+        y = head_center + head_radius * 0.95 * np.cos(phi)
+        vertices, _ = create_body_section(y, r_mod * np.sin(phi), r_mod * 0.9 * np.sin(phi), segments)
+        return vertices
+
     # Pescoço
-    neck_verts = []
-    for i in range(8):
-        y = 1.45 + i * 0.025
-        r = 0.055 + 0.01 * np.sin(i * np.pi / 7)
-        for j in range(24):
-            theta = 2 * np.pi * j / 24
-            x = r * np.cos(theta)
-            z = r * 0.85 * np.sin(theta)
-            neck_verts.append([x, y, z])
-    all_vertices.extend(neck_verts)
-    
-    # Ombros e tronco superior
-    torso_upper_verts = []
-    for i in range(20):
-        t = i / 19
-        y = 1.45 - t * 0.35
-        
-        # Largura aumenta nos ombros
+    def neck(t, segments):
+        r = 0.055 + 0.01 * np.sin(t * np.pi)
+        vertices, _ = create_body_section(1.45 + t * 0.175, r, r * 0.85, segments)
+        return vertices
+
+    # Ombros e tronco superior (largura aumenta nos ombros)
+    def torso_upper(t, segments):
         shoulder_factor = np.sin(t * np.pi) ** 0.5
-        width = 0.12 + 0.12 * shoulder_factor
-        depth = 0.08 + 0.04 * shoulder_factor
-        
-        for j in range(32):
-            theta = 2 * np.pi * j / 32
-            x = width * np.cos(theta)
-            z = depth * np.sin(theta)
-            torso_upper_verts.append([x, y, z])
-    all_vertices.extend(torso_upper_verts)
-    
+        vertices, _ = create_body_section(1.45 - t * 0.35, 0.12 + 0.12 * shoulder_factor,
+                                          0.08 + 0.04 * shoulder_factor, segments)
+        return vertices
+
     # Peito/Tronco médio
-    torso_mid_verts = []
-    for i in range(25):
-        t = i / 24
-        y = 1.10 - t * 0.25
-        
-        # Forma do tronco
-        width = 0.20 - 0.03 * t
-        depth = 0.11 - 0.02 * t
-        
-        for j in range(32):
-            theta = 2 * np.pi * j / 32
-            # Adicionar detalhe do peito na frente
-            chest_bulge = 0.015 * np.exp(-((theta - np.pi) ** 2) / 0.5) if t < 0.3 else 0
-            x = width * np.cos(theta)
-            z = (depth + chest_bulge) * np.sin(theta)
-            torso_mid_verts.append([x, y, z])
-    all_vertices.extend(torso_mid_verts)
-    
+    def torso_mid(t, segments):
+        vertices, angles = create_body_section(1.10 - t * 0.25, 0.20 - 0.03 * t, 0.11 - 0.02 * t, segments)
+        # Detalhe do peito na frente, nos anéis de cima
+        ring = np.repeat(t, segments)
+        chest_bulge = np.where(ring < 0.3, 0.015 * np.exp(-((angles - np.pi) ** 2) / 0.5), 0.0)
+        vertices[:, 2] += chest_bulge * np.sin(angles)
+        return vertices
+
     # Abdômen/Barriga (área principal para morph de peso)
-    abdomen_verts = []
-    for i in range(30):
-        t = i / 29
-        y = 0.85 - t * 0.30
-        
-        # Forma do abdômen - mais proeminente na frente
-        base_width = 0.17 - 0.02 * t
-        base_depth = 0.09
-        
-        for j in range(32):
-            theta = 2 * np.pi * j / 32
-            
-            # Protuberância frontal (barriga)
-            belly_bulge = 0.02 * np.exp(-((theta - np.pi/2) ** 2) / 0.8)
-            
-            x = base_width * np.cos(theta)
-            z = (base_depth + belly_bulge) * np.sin(theta)
-            abdomen_verts.append([x, y, z])
-    all_vertices.extend(abdomen_verts)
-    
+    def abdomen(t, segments):
+        vertices, angles = create_body_section(0.85 - t * 0.30, 0.17 - 0.02 * t, 0.09, segments)
+        # Protuberância frontal (barriga)
+        belly_bulge = 0.02 * np.exp(-((angles - np.pi / 2) ** 2) / 0.8)
+        vertices[:, 2] += belly_bulge * np.sin(angles)
+        return vertices
+
     # Quadril
-    hip_verts = []
-    for i in range(20):
-        t = i / 19
-        y = 0.55 - t * 0.15
-        
-        width = 0.15 + 0.03 * np.sin(t * np.pi)
-        depth = 0.10 + 0.02 * np.sin(t * np.pi)
-        
-        for j in range(32):
-            theta = 2 * np.pi * j / 32
-            x = width * np.cos(theta)
-            z = depth * np.sin(theta)
-            hip_verts.append([x, y, z])
-    all_vertices.extend(hip_verts)
-    
-    # Pernas (coxa)
-    for leg_side in [-1, 1]:
-        thigh_verts = []
-        leg_offset_x = 0.08 * leg_side
-        
-        for i in range(30):
-            t = i / 29
-            y = 0.40 - t * 0.45
-            
-            # Coxa mais grossa em cima, afina embaixo
-            radius = 0.07 * (1 - 0.4 * t)
-            
-            for j in range(24):
-                theta = 2 * np.pi * j / 24
-                x = leg_offset_x + radius * np.cos(theta)
-                z = radius * 0.9 * np.sin(theta)
-                thigh_verts.append([x, y, z])
-        all_vertices.extend(thigh_verts)
-    
-    # Pernas (panturrilha)
-    for leg_side in [-1, 1]:
-        calf_verts = []
-        leg_offset_x = 0.08 * leg_side
-        
-        for i in range(25):
-            t = i / 24
-            y = -0.05 - t * 0.40
-            
-            # Panturrilha com forma característica
-            calf_shape = 1.0 + 0.2 * np.sin(t * np.pi * 0.7)
-            radius = 0.045 * calf_shape * (1 - 0.3 * t)
-            
-            for j in range(20):
-                theta = 2 * np.pi * j / 20
-                x = leg_offset_x + radius * np.cos(theta)
-                z = radius * np.sin(theta)
-                calf_verts.append([x, y, z])
-        all_vertices.extend(calf_verts)
-    
-    # Pés
-    for leg_side in [-1, 1]:
-        foot_verts = []
-        foot_offset_x = 0.08 * leg_side
-        
-        for i in range(15):
-            t = i / 14
-            y = -0.45 - 0.03 * (1 - np.cos(t * np.pi / 2))
-            
-            # Formato do pé
-            foot_length = 0.12 * t
-            foot_width = 0.04 * np.sin(t * np.pi) ** 0.5
-            
-            for j in range(16):
-                theta = 2 * np.pi * j / 16
-                x = foot_offset_x + foot_width * np.cos(theta)
-                z = 0.05 + foot_length * np.sin(theta) if np.sin(theta) > 0 else 0.05 + 0.02 * np.sin(theta)
-                foot_verts.append([x, y, z])
-        all_vertices.extend(foot_verts)
-    
-    # Braços
+    def hips(t, segments):
+        vertices, _ = create_body_section(0.55 - t * 0.15, 0.15 + 0.03 * np.sin(t * np.pi),
+                                          0.10 + 0.02 * np.sin(t * np.pi), segments)
+        return vertices
+
+    # Coxa: mais grossa em cima, afina embaixo
+    def thigh(t, segments, side):
+        radius = 0.07 * (1 - 0.4 * t)
+        vertices, _ = create_body_section(0.40 - t * 0.45, radius, radius * 0.9, segments, 0.08 * side)
+        return vertices
+
+    # Panturrilha com forma característica
+    def calf(t, segments, side):
+        radius = 0.045 * (1.0 + 0.2 * np.sin(t * np.pi * 0.7)) * (1 - 0.3 * t)
+        vertices, _ = create_body_section(-0.05 - t * 0.40, radius, radius, segments, 0.08 * side)
+        return vertices
+
+    # Pé: alongado para a frente, achatado atrás
+    def foot(t, segments, side):
+        y = -0.45 - 0.03 * (1 - np.cos(t * np.pi / 2))
+        vertices, angles = create_body_section(y, 0.04 * np.sin(t * np.pi) ** 0.5, 0.0, segments, 0.08 * side)
+        foot_length = np.repeat(0.12 * t, segments)
+        sin = np.sin(angles)
+        vertices[:, 2] = 0.05 + np.where(sin > 0, foot_length, 0.02) * sin
+        return vertices
+
+    # Braço superior
+    def upper_arm(t, segments, side):
+        vertices, _ = create_body_section(1.35 - t * 0.30, 0.04 * (1 - 0.15 * t), 0.04 * (1 - 0.15 * t),
+                                          segments, 0.22 * side + 0.03 * t * side)
+        return vertices
+
+    # Antebraço
+    def forearm(t, segments, side):
+        vertices, _ = create_body_section(1.05 - t * 0.28, 0.035 * (1 - 0.2 * t), 0.035 * (1 - 0.2 * t),
+                                          segments, 0.27 * side)
+        return vertices
+
+    # Mão (simplificada)
+    def hand(t, segments, side):
+        vertices, _ = create_body_section(0.77 - t * 0.10, 0.03 * (1 - 0.3 * t), 0.015 * (1 - 0.3 * t),
+                                          segments, 0.27 * side)
+        return vertices
+
+    add_section(25, 32, head, 'head')
+    add_section(8, 24, neck, 'torso')
+    add_section(20, 32, torso_upper, 'torso')
+    add_section(25, 32, torso_mid, 'torso')
+    add_section(30, 32, abdomen, 'torso')
+    add_section(20, 32, hips, 'torso')
+    for build, num_rings, num_segments in [(thigh, 30, 24), (calf, 25, 20), (foot, 15, 16)]:
+        for leg_side in [-1, 1]:
+            add_section(num_rings, num_segments, build, 'leg', side=leg_side)
     for arm_side in [-1, 1]:
-        # Braço superior
-        upper_arm_verts = []
-        arm_offset_x = 0.22 * arm_side
-        
-        for i in range(25):
-            t = i / 24
-            y = 1.35 - t * 0.30
-            x_offset = arm_offset_x + 0.03 * t * arm_side
-            
-            radius = 0.04 * (1 - 0.15 * t)
-            
-            for j in range(20):
-                theta = 2 * np.pi * j / 20
-                x = x_offset + radius * np.cos(theta)
-                z = radius * np.sin(theta)
-                upper_arm_verts.append([x, y, z])
-        all_vertices.extend(upper_arm_verts)
-        
-        # Antebraço
-        forearm_verts = []
-        for i in range(25):
-            t = i / 24
-            y = 1.05 - t * 0.28
-            x_offset = arm_offset_x + 0.05 * arm_side
-            
-            radius = 0.035 * (1 - 0.2 * t)
-            
-            for j in range(18):
-                theta = 2 * np.pi * j / 18
-                x = x_offset + radius * np.cos(theta)
-                z = radius * np.sin(theta)
-                forearm_verts.append([x, y, z])
-        all_vertices.extend(forearm_verts)
-        
-        # Mão (simplificada)
-        hand_verts = []
-        for i in range(12):
-            t = i / 11
-            y = 0.77 - t * 0.10
-            x_offset = arm_offset_x + 0.05 * arm_side
-            
-            width = 0.03 * (1 - 0.3 * t)
-            depth = 0.015 * (1 - 0.3 * t)
-            
-            for j in range(12):
-                theta = 2 * np.pi * j / 12
-                x = x_offset + width * np.cos(theta)
-                z = depth * np.sin(theta)
-                hand_verts.append([x, y, z])
-        all_vertices.extend(hand_verts)
-    
-    vertices = np.array(all_vertices)
-    
-    # Centralizar na posição correta
-    vertices[:, 1] += 0.45  # Ajustar altura para pés no chão
-    
-    return vertices
+        add_section(25, 20, upper_arm, 'arm', side=arm_side)
+        add_section(25, 18, forearm, 'arm', side=arm_side)
+        add_section(12, 12, hand, 'arm', side=arm_side)
+
+    return sections
+
+
+def create_human_body_mesh(resolution=50):
+    """Nuvem de pontos de todas as seções do corpo (ver create_human_body_sections)"""
+    return np.vstack([vertices for vertices, _, _, _ in create_human_body_sections(resolution)])
+
+
+def section_faces(vertices, num_rings, num_segments, caps=True):
+    """
+    Triangula uma seção como grade estruturada: dois triângulos por quad
+    entre anéis vizinhos e, com caps, um leque em cada ponta até o centro
+    do anel (vértices acrescentados ao final). Um anel de ponta de raio
+    nulo (polos da cabeça, pontas do pé) vira um único vértice de polo com
+    um leque a partir do anel vizinho, sempre, para a grade não ter quads
+    degenerados. Custo linear no nº de vértices. Retorna (vértices, faces)
+    com as normais para fora.
+    """
+    rings = vertices.reshape(num_rings, num_segments, 3)
+    # A orientação do kernel supõe anéis de baixo para cima
+    flip = rings[-1, 0, 1] < rings[0, 0, 1]
+    # Anel de raio nulo em x ou z: pontos coincidentes ou colineares
+    poles = [np.ptp(ring[:, [0, 2]], axis=0).min() < POLE_TOLERANCE for ring in (rings[0], rings[-1])]
+    rings = rings[int(poles[0]):num_rings - int(poles[1])]
+    grid = rings.reshape(-1, 3)
+    last = (len(rings) - 1) * num_segments
+
+    faces = [stitch_rings(np.full(len(rings), num_segments))]
+    ends = []
+    for pole, end, start, top in ((poles[0], vertices[:num_segments], 0, False),
+                                  (poles[1], vertices[-num_segments:], last, True)):
+        if pole or caps:
+            # Polo: o ponto do anel colapsado; tampa: o centro do anel
+            faces.append(cap_ring(start, num_segments, len(grid) + len(ends), top=top))
+            ends.append(end.mean(axis=0))
+    faces = np.vstack(faces)
+    if flip:
+        faces = faces[:, ::-1]
+    return np.vstack([grid, *ends]) if ends else grid, faces
+
+
+def build_body_mesh(sections):
+    """
+    Malha trimesh a partir das seções, sem envoltória convexa: cada seção é
+    triangulada pela sua grade de anéis (concavidades preservadas) e as
+    partes são montadas com os rótulos de região.
+    """
+    parts = []
+    for vertices, num_rings, num_segments, region in sections:
+        # A cabeça fecha nos polos; as demais seções são tubos tampados
+        section_vertices, faces = section_faces(vertices, num_rings, num_segments, caps=region != 'head')
+        parts.append((section_vertices, faces, region))
+    vertices, faces, regions = assemble(parts)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False,
+                           vertex_attributes={REGION_ATTRIBUTE: regions})
+
 
 def create_mesh_from_vertices(vertices, connect_threshold=0.08):
     """Cria uma malha triangular a partir dos vértices usando ball pivoting ou similar"""
@@ -276,25 +228,15 @@ def create_mesh_from_vertices(vertices, connect_threshold=0.08):
         print(f"Convex hull failed: {e}")
         return None
 
-def create_morphable_human_glb():
+def create_morphable_human_glb(resolution=50, interleaved=False):
     """Cria um modelo humano GLB com morph targets de alta qualidade"""
     
-    print("Gerando malha base do corpo humano...")
-    base_vertices = create_human_body_mesh()
+    print("Gerando seções do corpo humano...")
+    sections = create_human_body_sections(resolution)
     
-    # Criar mesh usando trimesh
+    # Triangular as grades de anéis de cada seção (sem envoltória convexa)
     print("Criando malha triangular...")
-    
-    # Usar convex hull e depois subdivide
-    mesh = trimesh.convex.convex_hull(base_vertices)
-    
-    # Suavizar a malha
-    mesh = trimesh.smoothing.filter_laplacian(mesh, iterations=2)
-    
-    # Subdividir para mais detalhes
-    for _ in range(2):
-        mesh = mesh.subdivide()
-        mesh = trimesh.smoothing.filter_laplacian(mesh, iterations=1)
+    mesh = build_body_mesh(sections)
     
     print(f"Malha criada: {len(mesh.vertices)} vértices, {len(mesh.faces)} faces")
     
@@ -303,12 +245,39 @@ def create_morphable_human_glb():
     print("Modelo de referência salvo: avatar_hq_reference.obj")
     
     # Criar GLB com morph targets (usando pygltflib)
-    create_glb_with_morphs(mesh)
+    create_glb_with_morphs(mesh, interleaved)
     
     return mesh
 
-def create_glb_with_morphs(mesh):
-    """Cria arquivo GLB com morph targets"""
+def benchmark_resolutions(resolutions=(25, 50, 100, 200), repeats=3):
+    """
+    Compara, por resolução, a malha estruturada (build_body_mesh) com o
+    caminho anterior: envoltória convexa + Taubin + 2 subdivisões.
+    """
+    def convex_hull_mesh(points):
+        mesh = trimesh.convex.convex_hull(points)
+        mesh.vertices = taubin_smooth(mesh.vertices, mesh.faces, iterations=2)
+        for _ in range(2):
+            mesh = mesh.subdivide()
+            mesh.vertices = taubin_smooth(mesh.vertices, mesh.faces, iterations=1)
+        return mesh
+    
+    print(f"{'resolução':>10} {'vértices':>9} {'faces':>9} {'grade (ms)':>11} {'µs/vértice':>11} {'hull (ms)':>10}")
+    for resolution in resolutions:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            mesh = build_body_mesh(create_human_body_sections(resolution))
+        grid_ms = (time.perf_counter() - start) / repeats * 1000
+        
+        start = time.perf_counter()
+        convex_hull_mesh(create_human_body_mesh(resolution))
+        hull_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"{resolution:>10} {len(mesh.vertices):>9} {len(mesh.faces):>9} {grid_ms:>11.1f} "
+              f"{grid_ms * 1000 / len(mesh.vertices):>11.2f} {hull_ms:>10.1f}")
+
+def create_glb_with_morphs(mesh, interleaved=False):
+    """Cria arquivo GLB com morph targets (interleaved: posição e normal intercaladas, com byteStride)"""
     from pygltflib import GLTF2, Scene, Node, Mesh, Primitive, Accessor, BufferView, Buffer, Material
     import base64
     
@@ -316,60 +285,51 @@ def create_glb_with_morphs(mesh):
     normals = mesh.vertex_normals.astype(np.float32)
     faces = mesh.faces.astype(np.uint32)
     
-    # Definir morph targets
+    # Regiões e coordenadas do corpo (ver mesh_segmentation), antes da reordenação
+    segmentation = body_segmentation(mesh)
+    
+    # Ordem amigável ao cache da GPU (triângulos) e à leitura dos vértices;
+    # os morph targets abaixo já são calculados na nova ordem
+    faces, vertex_order, (acmr_before, acmr_after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[vertex_order], normals[vertex_order]
+    segmentation = {name: values[vertex_order] for name, values in segmentation.items()}
+    print(f"ACMR: {acmr_before:.3f} -> {acmr_after:.3f}")
+    
+    # Definir morph targets (frações da altura: y = 1.0 m ≈ 0.46 neste modelo)
     morph_targets_data = {}
+    h = segmentation['height']
+    radius = segmentation['radius']
+    direction = radial_directions(segmentation)
     
-    # 1. Weight (aumenta volume geral)
-    weight_delta = vertices.copy()
-    center = vertices.mean(axis=0)
-    for i, v in enumerate(vertices):
-        direction = v - center
-        dist = np.linalg.norm(direction)
-        if dist > 0:
-            # Aumentar mais no torso
-            y_factor = 1.0 + 0.5 * np.exp(-((v[1] - 1.0) ** 2) / 0.3)
-            weight_delta[i] = direction * 0.15 * y_factor
-        else:
-            weight_delta[i] = np.zeros(3)
-    morph_targets_data['Weight'] = weight_delta.astype(np.float32)
+    # 1. Weight (aumenta volume geral, a partir do eixo do corpo)
+    # Aumentar mais no torso
+    y_factor = 1.0 + 0.5 * np.exp(-((h - 0.46) ** 2) / 0.06)
+    morph_targets_data['Weight'] = direction * (0.15 * y_factor * radius)[:, None].astype(np.float32)
     
     # 2. AbdomenGirth (aumenta barriga)
-    abdomen_delta = np.zeros_like(vertices, dtype=np.float32)
-    for i, v in enumerate(vertices):
-        # Foco na região abdominal (y entre 0.8 e 1.2)
-        y_factor = np.exp(-((v[1] - 1.0) ** 2) / 0.1)
-        # Mais na frente (z positivo)
-        z_factor = max(0, v[2]) / (abs(v[2]) + 0.01)
-        
-        direction = np.array([0, 0, v[2]]) if abs(v[2]) > 0.01 else np.array([0, 0, 0.01])
-        direction = direction / (np.linalg.norm(direction) + 0.001)
-        
-        abdomen_delta[i] = direction * 0.08 * y_factor * (0.5 + 0.5 * z_factor)
+    # Foco na região abdominal do torso, mais na frente (z positivo)
+    front = radius * np.cos(segmentation['angle'])
+    y_factor = np.exp(-((h - 0.46) ** 2) / 0.02) * region_mask(segmentation, 'torso')
+    z_factor = np.maximum(0, front) / (np.abs(front) + 0.01)
+    abdomen_delta = np.zeros_like(vertices)
+    abdomen_delta[:, 2] = np.sign(front) * 0.08 * y_factor * (0.5 + 0.5 * z_factor)
     morph_targets_data['AbdomenGirth'] = abdomen_delta
     
     # 3. MuscleMass (aumenta braços e pernas)
-    muscle_delta = np.zeros_like(vertices, dtype=np.float32)
-    for i, v in enumerate(vertices):
-        # Detectar braços (x longe do centro)
-        arm_factor = np.exp(-((abs(v[0]) - 0.15) ** 2) / 0.01) if abs(v[0]) > 0.1 else 0
-        # Detectar pernas
-        leg_factor = np.exp(-((v[1] - 0.5) ** 2) / 0.2) if v[1] < 0.8 else 0
-        
-        direction = np.array([v[0], 0, v[2]])
-        norm = np.linalg.norm(direction)
-        if norm > 0.01:
-            direction = direction / norm
-            muscle_delta[i] = direction * 0.03 * (arm_factor + leg_factor)
-    morph_targets_data['MuscleMass'] = muscle_delta
+    side = np.abs(radius * np.sin(segmentation['angle']))
+    arm_factor = np.exp(-((side - 0.15) ** 2) / 0.01) * region_mask(segmentation, 'arm')
+    leg_factor = np.exp(-((h - 0.24) ** 2) / 0.04) * region_mask(segmentation, 'leg')
+    muscle_factor = 0.03 * (arm_factor + leg_factor) * (radius > 0.01)
+    morph_targets_data['MuscleMass'] = direction * muscle_factor[:, None].astype(np.float32)
     
     # 4. Posture (curvar coluna)
-    posture_delta = np.zeros_like(vertices, dtype=np.float32)
-    for i, v in enumerate(vertices):
-        # Afetar principalmente o tronco superior
-        if 1.0 < v[1] < 1.5:
-            y_factor = (v[1] - 1.0) / 0.5
-            # Curvar para frente
-            posture_delta[i] = np.array([0, -0.02 * y_factor, 0.03 * y_factor])
+    # Afetar principalmente o tronco superior (y entre 1.0 e 1.5 m)
+    posture_delta = np.zeros_like(vertices)
+    upper = region_mask(segmentation, h_min=0.46, h_max=0.69)
+    y_factor = (h[upper] - 0.46) / 0.23
+    # Curvar para frente
+    posture_delta[upper, 1] = -0.02 * y_factor
+    posture_delta[upper, 2] = 0.03 * y_factor
     morph_targets_data['Posture'] = posture_delta
     
     # 5-7. Efeitos de doenças (compostos)
@@ -379,25 +339,29 @@ def create_glb_with_morphs(mesh):
     
     # Criar buffer binário
     buffer_data = bytearray()
+    buffer_views = []
+    accessors = []
     
-    # Adicionar vértices
-    vertices_offset = len(buffer_data)
-    buffer_data.extend(vertices.tobytes())
-    
-    # Adicionar normais
-    normals_offset = len(buffer_data)
-    buffer_data.extend(normals.tobytes())
+    # Adicionar vértices e normais (bufferViews separados ou um só intercalado)
+    vertex_bytes, attributes = add_vertex_attributes(
+        buffer_views, accessors, {"POSITION": vertices, "NORMAL": normals}, len(buffer_data), interleaved)
+    buffer_data.extend(vertex_bytes)
     
     # Adicionar índices
     indices_offset = len(buffer_data)
-    indices_flat = faces.flatten().astype(np.uint32)
-    buffer_data.extend(indices_flat.tobytes())
+    # uint16 quando cabe; preenchido até 4 bytes para alinhar os morph targets
+    indices_flat, index_type = index_buffer(faces)
+    buffer_data.extend(aligned_bytes(indices_flat))
     
-    # Adicionar morph targets
+    # Adicionar morph targets (deltas de posição e de normal)
+    normal_deltas = morph_normal_deltas(vertices, faces, morph_targets_data, normals)
     morph_offsets = {}
+    normal_offsets = {}
     for name, delta in morph_targets_data.items():
         morph_offsets[name] = len(buffer_data)
         buffer_data.extend(delta.tobytes())
+        normal_offsets[name] = len(buffer_data)
+        buffer_data.extend(normal_deltas[name].tobytes())
     
     # Criar GLTF
     gltf = GLTF2()
@@ -405,25 +369,14 @@ def create_glb_with_morphs(mesh):
     # Buffer
     gltf.buffers = [Buffer(byteLength=len(buffer_data))]
     
-    # Buffer Views
-    buffer_views = []
-    accessors = []
-    
-    # Vertices buffer view (0)
-    buffer_views.append(BufferView(buffer=0, byteOffset=vertices_offset, byteLength=vertices.nbytes, target=34962))
-    accessors.append(Accessor(bufferView=0, componentType=5126, count=len(vertices), type="VEC3",
-                              max=vertices.max(axis=0).tolist(), min=vertices.min(axis=0).tolist()))
-    
-    # Normals buffer view (1)
-    buffer_views.append(BufferView(buffer=0, byteOffset=normals_offset, byteLength=normals.nbytes, target=34962))
-    accessors.append(Accessor(bufferView=1, componentType=5126, count=len(normals), type="VEC3"))
-    
-    # Indices buffer view (2)
+    # Indices buffer view (após os atributos de vértice)
     buffer_views.append(BufferView(buffer=0, byteOffset=indices_offset, byteLength=indices_flat.nbytes, target=34963))
-    accessors.append(Accessor(bufferView=2, componentType=5125, count=len(indices_flat), type="SCALAR"))
+    indices_accessor = len(accessors)
+    accessors.append(Accessor(bufferView=len(buffer_views) - 1, componentType=index_type, count=len(indices_flat), type="SCALAR"))
     
     # Morph target buffer views e accessors
     morph_accessor_indices = {}
+    normal_accessor_indices = {}
     for name, delta in morph_targets_data.items():
         bv_idx = len(buffer_views)
         buffer_views.append(BufferView(buffer=0, byteOffset=morph_offsets[name], byteLength=delta.nbytes, target=34962))
@@ -432,6 +385,11 @@ def create_glb_with_morphs(mesh):
         accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3",
                                   max=delta.max(axis=0).tolist(), min=delta.min(axis=0).tolist()))
         morph_accessor_indices[name] = acc_idx
+        
+        bv_idx = len(buffer_views)
+        buffer_views.append(BufferView(buffer=0, byteOffset=normal_offsets[name], byteLength=normal_deltas[name].nbytes, target=34962))
+        normal_accessor_indices[name] = len(accessors)
+        accessors.append(Accessor(bufferView=bv_idx, componentType=5126, count=len(delta), type="VEC3"))
     
     gltf.bufferViews = buffer_views
     gltf.accessors = accessors
@@ -447,12 +405,13 @@ def create_glb_with_morphs(mesh):
     )]
     
     # Mesh com morph targets
-    targets = [{"POSITION": morph_accessor_indices[name]} for name in morph_targets_data.keys()]
+    targets = [{"POSITION": morph_accessor_indices[name], "NORMAL": normal_accessor_indices[name]}
+               for name in morph_targets_data.keys()]
     
     gltf.meshes = [Mesh(
         primitives=[Primitive(
-            attributes={"POSITION": 0, "NORMAL": 1},
-            indices=2,
+            attributes=attributes,
+            indices=indices_accessor,
             material=0,
             targets=targets
         )],
@@ -510,5 +469,8 @@ def create_glb_with_morphs(mesh):
     print("Metadata salvo: avatar_metadata.json")
 
 if __name__ == "__main__":
-    create_morphable_human_glb()
-    print("\n✅ Modelos de alta qualidade gerados com sucesso!")
+    if '--benchmark' in sys.argv:
+        benchmark_resolutions()
+    else:
+        create_morphable_human_glb(interleaved='--interleaved' in sys.argv)
+        print("\n✅ Modelos de alta qualidade gerados com sucesso!")
@@ -0,0 +1,163 @@
+"""
+Layout dos atributos de vértice nos buffers GLB e leitura headless de GLBs.
+
+Por padrão os exportadores gravam POSITION e NORMAL (e TEXCOORD_0, se
+houver) em bufferViews separados e compactos. Com interleaved=True os
+atributos de cada vértice ficam lado a lado em um único bufferView com
+byteStride (posição 12 B + normal 12 B [+ uv 8 B] = 24 [32] B por vértice):
+o carregador cria um só buffer de GPU para todos os atributos e cada
+vértice é lido de uma linha contígua. Os morph targets continuam em
+bufferViews próprios e compactos, como antes.
+
+Alinhamento exigido pelo glTF:
+    - byteOffset de bufferView múltiplo de 4 (add_vertex_attributes exige)
+    - byteStride múltiplo de 4, entre 4 e 252 (só float32: sempre múltiplo)
+    - byteOffset de accessor múltiplo do tamanho do componente (4)
+
+Uso:
+    data, attributes = add_vertex_attributes(gltf.bufferViews, gltf.accessors,
+                                             {'POSITION': vertices, 'NORMAL': normals},
+                                             byte_offset=len(buffer), interleaved=True)
+    buffer.extend(data)
+    Primitive(attributes=attributes, ...)
+
+Benchmark de parse/upload (dois ou mais GLBs do mesmo modelo):
+    python glb_buffers.py avatar_separado.glb avatar_intercalado.glb
+"""
+import sys
+import time
+
+import numpy as np
+from pygltflib import GLTF2, Accessor, BufferView
+
+ARRAY_BUFFER = 34962
+FLOAT = 5126
+ALIGNMENT = 4
+MAX_STRIDE = 252
+
+# componentType do glTF -> dtype; type <-> nº de componentes
+COMPONENT_DTYPES = {5121: np.uint8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}
+TYPE_WIDTHS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}
+WIDTH_TYPES = {width: name for name, width in TYPE_WIDTHS.items()}
+
+
+def add_vertex_attributes(buffer_views, accessors, attributes, byte_offset, interleaved=False):
+    """
+    Cria os bufferViews e accessors dos atributos de vértice ({nome glTF:
+    array (N, k)}, na ordem dada) a partir de byte_offset no buffer 0.
+    Retorna (bytes a gravar em byte_offset, {nome: índice do accessor}).
+    """
+    if byte_offset % ALIGNMENT:
+        raise ValueError(f"byte_offset deve ser múltiplo de {ALIGNMENT}: {byte_offset}")
+    arrays = {name: np.ascontiguousarray(values, dtype=np.float32).reshape(len(values), -1)
+              for name, values in attributes.items()}
+    count = len(next(iter(arrays.values())))
+
+    if interleaved:
+        # Uma linha por vértice: dtype estruturado sem preenchimento (só float32)
+        row = np.dtype([(name, np.float32, (values.shape[1],)) for name, values in arrays.items()])
+        if row.itemsize > MAX_STRIDE:
+            raise ValueError(f"byteStride {row.itemsize} maior que {MAX_STRIDE}")
+        rows = np.empty(count, dtype=row)
+        for name, values in arrays.items():
+            rows[name] = values
+        views = [(rows.tobytes(), row.itemsize)]
+        layout = {name: (0, row.fields[name][1]) for name in arrays}
+    else:
+        views = [(values.tobytes(), None) for values in arrays.values()]
+        layout = {name: (k, 0) for k, name in enumerate(arrays)}
+
+    first_view = len(buffer_views)
+    data = b''
+    for view_bytes, stride in views:
+        buffer_views.append(BufferView(buffer=0, byteOffset=byte_offset + len(data), byteLength=len(view_bytes),
+                                       byteStride=stride, target=ARRAY_BUFFER))
+        data += view_bytes
+
+    indices = {}
+    for name, values in arrays.items():
+        view, offset = layout[name]
+        accessor = Accessor(bufferView=first_view + view, byteOffset=offset, componentType=FLOAT,
+                            count=count, type=WIDTH_TYPES[values.shape[1]])
+        if name == 'POSITION':
+            # Limites obrigatórios para POSITION
+            accessor.max = values.max(axis=0).tolist()
+            accessor.min = values.min(axis=0).tolist()
+        indices[name] = len(accessors)
+        accessors.append(accessor)
+    return data, indices
+
+
+def read_accessor(gltf, binary_blob, accessor_idx):
+    """Dados de um accessor como array (count, largura), respeitando byteStride"""
+    accessor = gltf.accessors[accessor_idx]
+    buffer_view = gltf.bufferViews[accessor.bufferView]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor.componentType])
+    width = TYPE_WIDTHS[accessor.type]
+    start = (buffer_view.byteOffset or 0) + (accessor.byteOffset or 0)
+    stride = buffer_view.byteStride or dtype.itemsize * width
+    if stride == dtype.itemsize * width:
+        data = np.frombuffer(binary_blob, dtype=dtype, count=accessor.count * width, offset=start)
+        return data.reshape(accessor.count, width)
+    # Intercalado: visão com passo de linha byteStride (sem cópia)
+    data = np.frombuffer(binary_blob, dtype=dtype, offset=start,
+                         count=stride * (accessor.count - 1) // dtype.itemsize + width)
+    return np.lib.stride_tricks.as_strided(data, shape=(accessor.count, width),
+                                           strides=(stride, dtype.itemsize), writeable=False)
+
+
+def load_morphable_glb(path):
+    """
+    Malha da primeira primitive de um GLB com morph targets: (vértices,
+    faces, {nome: deltas de posição}), nomes de extras['targetNames'].
+    """
+    gltf = GLTF2().load(path)
+    blob = gltf.binary_blob()
+    mesh = gltf.meshes[0]
+    primitive = mesh.primitives[0]
+    vertices = read_accessor(gltf, blob, primitive.attributes.POSITION)
+    if primitive.indices is not None:
+        faces = read_accessor(gltf, blob, primitive.indices).reshape(-1, 3).astype(np.int64)
+    else:
+        faces = np.arange(len(vertices)).reshape(-1, 3)
+    targets = primitive.targets or []
+    names = (mesh.extras or {}).get('targetNames') or [f'target_{k}' for k in range(len(targets))]
+    morph_targets = {name: read_accessor(gltf, blob, target['POSITION']) for name, target in zip(names, targets)}
+    return vertices, faces, morph_targets
+
+
+def upload_buffers(gltf):
+    """
+    "Envia" cada bufferView de vértices ou índices como um buffer de GPU:
+    uma cópia contígua por bufferView, como um bufferData do WebGL.
+    Retorna {índice do bufferView: buffer}.
+    """
+    blob = gltf.binary_blob()
+    uploads = {}
+    for index, view in enumerate(gltf.bufferViews):
+        if view.target is not None:
+            uploads[index] = np.frombuffer(blob, dtype=np.uint8, count=view.byteLength,
+                                           offset=view.byteOffset or 0).copy()
+    return uploads
+
+
+def benchmark_glb(paths, repeats=20):
+    """Tempo médio de parse e de upload de cada GLB e nº de buffers de GPU criados"""
+    print(f"{'arquivo':<40} {'buffers':>8} {'stride':>7} {'parse (ms)':>11} {'upload (ms)':>12}")
+    for path in paths:
+        parse = upload = 0.0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            gltf = GLTF2().load(path)
+            middle = time.perf_counter()
+            uploads = upload_buffers(gltf)
+            parse += middle - start
+            upload += time.perf_counter() - middle
+        primitive = gltf.meshes[0].primitives[0]
+        stride = gltf.bufferViews[gltf.accessors[primitive.attributes.POSITION].bufferView].byteStride or '-'
+        print(f"{path:<40} {len(uploads):>8} {stride:>7} {parse / repeats * 1000:>11.2f} "
+              f"{upload / repeats * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    benchmark_glb(sys.argv[1:])
@@ -0,0 +1,55 @@
+"""
+Montagem de avatares a partir de várias partes (torso, braços, pernas...).
+
+As partes são copiadas para arrays finais pré-alocados, por atribuição de
+fatias, com o deslocamento acumulado dos índices aplicado no lugar, sem
+passar por listas Python. Cada vértice recebe o rótulo da região da parte
+de origem (uint8), que os geradores de morph targets usam no lugar de
+máscaras recalculadas a partir das coordenadas (ver mesh_segmentation).
+
+Uso:
+    vertices, faces, regions = assemble([
+        (torso_v, torso_f, 'torso'),
+        (arm_v, arm_f, 'arm'),
+    ])
+    mesh = trimesh.Trimesh(vertices, faces, vertex_attributes={REGION_ATTRIBUTE: regions})
+"""
+import numpy as np
+
+# Rótulos de região por vértice
+REGION_IDS = {
+    'body': 0,    # Sem região definida (ex.: corpo lofted inteiro)
+    'torso': 1,
+    'arm': 2,
+    'leg': 3,
+    'head': 4,
+}
+REGION_NAMES = {region_id: name for name, region_id in REGION_IDS.items()}
+
+# Nome do atributo de vértice com os rótulos (trimesh vertex_attributes)
+REGION_ATTRIBUTE = 'region'
+
+
+def assemble(parts, dtype=np.float32, index_dtype=np.int32):
+    """
+    Combina partes (vértices, faces[, região]) em uma única malha.
+    Retorna (vértices, faces, regiões), com regiões em uint8 (ver REGION_IDS).
+    """
+    parts = [part if len(part) == 3 else (part[0], part[1], 'body') for part in parts]
+    n_verts = [len(verts) for verts, _, _ in parts]
+    n_faces = [len(fcs) for _, fcs, _ in parts]
+
+    vertices = np.empty((sum(n_verts), 3), dtype=dtype)
+    faces = np.empty((sum(n_faces), 3), dtype=index_dtype)
+    regions = np.empty(sum(n_verts), dtype=np.uint8)
+
+    v_start = f_start = 0
+    for (verts, fcs, region), nv, nf in zip(parts, n_verts, n_faces):
+        vertices[v_start:v_start + nv] = verts
+        faces[f_start:f_start + nf] = fcs
+        faces[f_start:f_start + nf] += v_start
+        regions[v_start:v_start + nv] = REGION_IDS[region]
+        v_start += nv
+        f_start += nf
+
+    return vertices, faces, regions
@@ -0,0 +1,98 @@
+"""
+Kernel de lofting por seções transversais para as malhas procedurais do avatar.
+
+Uma tabela de perfis (um anel por linha: altura, raios, centro, nº de pontos)
+vira vértices e triângulos com operações vetorizadas do NumPy, sem laços
+por vértice ou por face. Anéis vizinhos com números de pontos diferentes são
+costurados pelo mapeamento proporcional j * n // max(n_ant, n_atual), o mesmo
+usado pelos geradores originais, agora como aritmética de índices.
+
+Uso:
+    counts = [24, 32, 32, 40]
+    verts, angles, ring = elliptic_rings(ys, rx, rz, counts)
+    faces = np.vstack([stitch_rings(counts),
+                       cap_ring(ring_starts(counts)[-1], counts[-1], len(verts), top=True)])
+"""
+import numpy as np
+
+
+def ring_starts(counts):
+    """Índice do primeiro vértice de cada anel (anéis armazenados em sequência)"""
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+
+def ring_angles(counts):
+    """
+    Ângulo de cada vértice (2π j / n do seu anel) e o índice do anel a que
+    pertence, para todos os anéis concatenados.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    ring = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(counts.sum()) - ring_starts(counts)[ring]
+    return 2 * np.pi * local / counts[ring], ring
+
+
+def elliptic_rings(y, rx, rz, counts, cx=0.0, cz=0.0, dtype=np.float64):
+    """
+    Vértices de anéis elípticos: y, rx, rz, cx e cz são escalares ou um valor
+    por anel. Retorna (vértices (N, 3), ângulos (N,), anel de cada vértice (N,)),
+    para que o chamador aplique deformações anatômicas vetorizadas por anel.
+    """
+    angles, ring = ring_angles(counts)
+    n_rings = len(counts)
+
+    def per_ring(value):
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (n_rings,))[ring]
+
+    vertices = np.empty((len(angles), 3), dtype=dtype)
+    vertices[:, 0] = per_ring(cx) + per_ring(rx) * np.cos(angles)
+    vertices[:, 1] = per_ring(y)
+    vertices[:, 2] = per_ring(cz) + per_ring(rz) * np.sin(angles)
+    return vertices, angles, ring
+
+
+def stitch_rings(counts, offset=0):
+    """
+    Faixas de triângulos entre cada par de anéis consecutivos, em uma única
+    passada vetorizada. Para anéis de tamanhos diferentes, o anel menor é
+    percorrido proporcionalmente; triângulos degenerados (lado parado no
+    anel menor) não são emitidos. Orientação: [ant, atual, próx_atual] e
+    [ant, próx_atual, próx_ant], como nos geradores originais.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if len(counts) < 2:
+        return np.empty((0, 3), dtype=np.int64)
+    starts = ring_starts(counts) + offset
+    n_prev, n_curr = counts[:-1], counts[1:]
+    steps = np.maximum(n_prev, n_curr)
+
+    # Um passo j por posição do anel maior de cada par
+    pair = np.repeat(np.arange(len(steps)), steps)
+    j = np.arange(steps.sum()) - np.concatenate(([0], np.cumsum(steps)[:-1]))[pair]
+    m, a, b = steps[pair], n_prev[pair], n_curr[pair]
+    p = starts[:-1][pair] + (j * a // m) % a
+    next_p = starts[:-1][pair] + ((j + 1) * a // m) % a
+    c = starts[1:][pair] + (j * b // m) % b
+    next_c = starts[1:][pair] + ((j + 1) * b // m) % b
+
+    faces = np.empty((len(j), 2, 3), dtype=np.int64)
+    faces[:, 0] = np.stack([p, c, next_c], axis=1)
+    faces[:, 1] = np.stack([p, next_c, next_p], axis=1)
+    keep = np.stack([c != next_c, p != next_p], axis=1)
+    return faces[keep]
+
+
+def cap_ring(start, n, center, top=True):
+    """
+    Leque de triângulos fechando um anel em um vértice central. top=True
+    segue a orientação dos topos ([j, centro, j+1]); top=False a das bases
+    ([j, j+1, centro]).
+    """
+    j = np.arange(n)
+    ring = start + j
+    next_ring = start + (j + 1) % n
+    center = np.full(n, center)
+    if top:
+        return np.stack([ring, center, next_ring], axis=1)
+    return np.stack([ring, next_ring, center], axis=1)
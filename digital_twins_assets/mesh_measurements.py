@@ -0,0 +1,438 @@
+"""
+Medidas clínicas do avatar: circunferências por corte com planos.
+
+Cada medida é o perímetro da seção da malha por um plano, restrito a uma
+parte do corpo para que braços ou a outra perna não entrem na conta:
+    - torso: plano horizontal a uma fração da altura do corpo (0 = pés,
+      1 = topo da cabeça), faces do laço da seção que envolve o eixo do
+      torso (o de fora, se há primitivas sobrepostas), sem as peças e os
+      laços dos braços rotulados como torso (mesh_segmentation);
+    - membros: plano perpendicular ao eixo do membro, a uma fração da sua
+      extensão vertical (0 = ponta de baixo), pois o limite da região varia
+      entre assets (a virilha é onde a silhueta das pernas se separa);
+      faces do laço da seção que envolve o membro daquele lado.
+Os planos são fixados uma vez na malha base: aplicar morph targets não muda
+o lugar da medida.
+
+Com a topologia fixa, girth_model guarda uma vez as faces que cada plano
+pode cortar com pesos no intervalo do visualizador (a distância de cada
+vértice ao plano é afim nos pesos) e as arestas dessas faces. Para um lote
+de vetores de pesos, girths calcula as distâncias dos extremos ao plano e
+os pontos de corte por interpolação nas arestas com produtos de matrizes;
+cada face cortada soma o segmento entre suas duas arestas cortadas. O
+resultado é igual ao corte da malha deformada (trimesh.intersections.mesh_plane)
+restrito às mesmas faces, sem montar a malha para cada vetor de pesos.
+
+Uso:
+    planes = measurement_planes(vertices, faces)
+    planes, missing = available_planes(vertices, faces)   # sem ValueError
+    model = girth_model(vertices, faces, planes, morph_targets)
+    values = girths(model, weights)            # (lote, medidas), em metros
+    measure(vertices, faces, planes)           # {nome: metros}, uma malha
+
+Comparação com o corte do trimesh (precisão e tempo):
+    python mesh_measurements.py avatar_morphable.glb
+"""
+import sys
+import time
+
+import numpy as np
+import trimesh
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from glb_buffers import load_morphable_glb
+from mesh_assembly import REGION_IDS
+from mesh_segmentation import segment_body
+
+# nome: (região, fração da altura, lado); lado None = fração da altura do
+# corpo, 'left'/'right' = fração da extensão do membro daquele lado
+MEASUREMENTS = {
+    'chest': ('torso', 0.72, None),     # Linha mamilar
+    'waist': ('torso', 0.60, None),     # Cintura (altura do umbigo)
+    'hip': ('torso', 0.52, None),       # Quadril (trocânteres)
+    'thigh': ('leg', 0.90, 'left'),     # Coxa, logo abaixo da prega glútea
+    'arm': ('arm', 0.75, 'left'),       # Braço, ponto médio acrômio-olécrano
+}
+# Meia largura da faixa de vértices que define o eixo do membro (fração da extensão)
+LIMB_AXIS_WINDOW = 0.15
+# Raio do tubo do membro em torno do eixo (múltiplo do raio máximo do laço)
+LIMB_TUBE = 1.2
+# Perímetro aceito para a seção do membro, em múltiplos de 2π x raio do membro
+# (elipse 1.3:1 ≈ 1.16; cápsulas deitadas e laços em zigue-zague passam de 2)
+LIMB_LOOP_PERIMETER = (0.9, 1.2)
+# Idem para a seção do torso (elipse 2:1 ≈ 1.54)
+TORSO_LOOP_PERIMETER = (0.9, 1.6)
+# Intervalo dos pesos coberto por girth_model (o do visualizador)
+WEIGHT_RANGE = (0.0, 1.0)
+# Vetores de pesos por bloco em girths: intermediários pequenos ficam no cache
+BATCH_BLOCK = 16
+
+
+def _limb_plane(points, fraction):
+    """Origem e normal do plano perpendicular ao eixo de um membro (centros das faixas abaixo e acima)"""
+    y_min, y_max = points[:, 1].min(), points[:, 1].max()
+    y = y_min + fraction * (y_max - y_min)
+    offset = points[:, 1] - y
+    window = np.abs(offset) <= LIMB_AXIS_WINDOW * (y_max - y_min)
+    below, above = points[window & (offset < 0)], points[window & (offset >= 0)]
+    if len(below) == 0 or len(above) == 0:
+        # Faixa sem vértices de um dos lados: plano horizontal no centro da faixa
+        origin = points[window].mean(axis=0)
+        origin[1] = y
+        return origin, np.array([0.0, 1.0, 0.0])
+    axis = above.mean(axis=0) - below.mean(axis=0)
+    axis /= np.linalg.norm(axis)
+    # Ponto do eixo na altura y
+    center = (above.mean(axis=0) + below.mean(axis=0)) / 2
+    return center + axis * (y - center[1]) / axis[1], axis
+
+
+def _section_radius(segments):
+    """
+    Raio do membro na seção: semieixo menor da elipse com os mesmos
+    momentos de segunda ordem da curva (pontos médios dos segmentos
+    ponderados pelo comprimento; num círculo de raio r a variância em cada
+    direção é r²/2).
+    """
+    lengths = np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1)
+    middle = segments.mean(axis=1)
+    center = (middle * lengths[:, None]).sum(axis=0) / lengths.sum()
+    offset = middle - center
+    covariance = (offset * lengths[:, None]).T @ offset / lengths.sum()
+    # Autovalores: ~0 na normal do plano, depois os dois eixos da seção
+    return np.sqrt(2 * np.linalg.eigvalsh(covariance)[1])
+
+
+def _components(vertices, triangles):
+    """Componente conexa de cada vértice no grafo das arestas dos triângulos"""
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    graph = sparse.coo_matrix((np.ones(len(edges)), (edges[:, 0], edges[:, 1])), shape=(len(vertices),) * 2)
+    return connected_components(graph, directed=False)[1]
+
+
+def _cut_loops(vertices, faces, origin, normal):
+    """Faces cortadas pelo plano e o laço (componente conexa) de cada uma"""
+    above = (vertices - origin) @ normal >= 0
+    side = above[faces]
+    cut = faces[side.any(axis=1) & ~side.all(axis=1)]
+    return cut, _components(vertices, cut)[cut[:, 0]]
+
+
+def _radial(vertices, center, normal):
+    """Distância de cada vértice ao eixo paralelo à normal que passa por center"""
+    offset = vertices - center
+    return np.linalg.norm(offset - np.outer(offset @ normal, normal), axis=1)
+
+
+def _loop_ratio(segments):
+    """Perímetro da seção em múltiplos de 2π x raio (ver _section_radius)"""
+    return np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1).sum() / (2 * np.pi * _section_radius(segments))
+
+
+def _encloses(segments, point, normal):
+    """Se a seção contorna o ponto: paridade dos cruzamentos de um raio no plano"""
+    u = np.cross(normal, [1.0, 0.0, 0.0] if abs(normal[0]) < 0.9 else [0.0, 1.0, 0.0])
+    u /= np.linalg.norm(u)
+    offset = segments - point
+    a, b = offset @ u, offset @ np.cross(normal, u)
+    crosses = (b[:, 0] > 0) != (b[:, 1] > 0)
+    t = np.divide(b[:, 0], b[:, 0] - b[:, 1], out=np.zeros(len(b)), where=crosses)
+    return np.count_nonzero(crosses & (a[:, 0] + t * (a[:, 1] - a[:, 0]) > 0)) % 2 == 1
+
+
+def _limb_loop(vertices, faces, origin, normal, limb_mask):
+    """
+    Máscara de vértices do laço da seção que envolve o membro: entre os
+    laços cortados pelo plano (componentes conexas das faces cortadas), o
+    que tem mais vértices do membro; e um tubo em torno do seu eixo, já que
+    a segmentação pode rotular a face interna do membro como torso. O tubo
+    fica na peça da malha que contém o laço (malhas feitas de primitivas
+    sobrepostas, como cápsulas). Vazia se não há laço ou se o perímetro da
+    seção não é plausível para o raio do membro (ver _section_radius).
+    """
+    cut, loop_labels = _cut_loops(vertices, faces, origin, normal)
+    votes = np.bincount(loop_labels, weights=limb_mask[cut].sum(axis=1))
+    if not votes.any():
+        return np.zeros(len(vertices), dtype=bool)
+    loop = np.unique(cut[loop_labels == votes.argmax()])
+    # Distância ao eixo que passa pelo centro do laço
+    radial = _radial(vertices, vertices[loop].mean(axis=0), normal)
+    piece = _components(vertices, faces)
+    mask = (radial <= LIMB_TUBE * radial[loop].max()) & (piece == piece[loop[0]])
+    # Seção medida: perímetro próximo ao de um círculo do raio do membro
+    ratio = _loop_ratio(_section(vertices, faces[region_faces(faces, mask)], origin, normal))
+    if not LIMB_LOOP_PERIMETER[0] <= ratio <= LIMB_LOOP_PERIMETER[1]:
+        return np.zeros(len(vertices), dtype=bool)
+    return mask
+
+
+def _torso_loop(vertices, faces, origin, normal, torso_mask):
+    """
+    Máscara de vértices da seção do torso: a região do torso com o laço
+    cortado que contorna o eixo do torso (o de maior perímetro, se há
+    primitivas sobrepostas). Saem as peças da malha dos demais laços
+    (braços, primitivas internas) e, na mesma peça, o cilindro de cada laço
+    que não contorna o eixo (braço colado ao tronco). A região continua na
+    máscara porque os morph targets podem levar o corte para a seção
+    vizinha. Vazia se nenhum laço contorna o eixo ou se o perímetro não é
+    plausível (ver _section_radius).
+    """
+    empty = np.zeros(len(vertices), dtype=bool)
+    if not torso_mask.any():
+        return empty
+    cut, loop_labels = _cut_loops(vertices, faces, origin, normal)
+    axis = vertices[torso_mask].mean(axis=0)
+    loops = {label: _section(vertices, cut, origin, normal, loop_labels == label) for label in np.unique(loop_labels)}
+    enclosing = {label: _encloses(segments, axis, normal) for label, segments in loops.items()}
+    perimeters = {label: np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1).sum()
+                  for label, segments in loops.items()
+                  if enclosing[label] and torso_mask[cut[loop_labels == label]].any()}
+    if not perimeters:
+        return empty
+    best = max(perimeters, key=perimeters.get)
+    ratio = _loop_ratio(loops[best])
+    if not TORSO_LOOP_PERIMETER[0] <= ratio <= TORSO_LOOP_PERIMETER[1]:
+        return empty
+
+    loop = np.unique(cut[loop_labels == best])
+    piece = _components(vertices, faces)
+    mask = torso_mask.copy()
+    for label in loops:
+        if label == best:
+            continue
+        other = np.unique(cut[loop_labels == label])
+        if piece[other[0]] != piece[loop[0]]:
+            mask &= piece != piece[other[0]]
+        elif not enclosing[label]:
+            radial = _radial(vertices, vertices[other].mean(axis=0), normal)
+            mask &= radial > radial[other].max()
+    mask[loop] = True
+    return mask
+
+
+def measurement_planes(vertices, faces, segmentation=None, names=None):
+    """
+    Planos das medidas na malha base: {nome: (origem, normal, máscara de
+    vértices)}. A máscara é a seção do torso (ver _torso_loop) ou o laço
+    do membro daquele lado; uma face conta se a maioria dos seus vértices
+    está nela (ver region_faces). ValueError se uma medida não se localiza
+    na malha (ver available_planes).
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    if segmentation is None:
+        segmentation = segment_body(vertices)
+    y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+    planes = {}
+    for name in names or MEASUREMENTS:
+        region, fraction, side = MEASUREMENTS[name]
+        mask = segmentation['region'] == REGION_IDS[region]
+        if side is None:
+            origin, normal = np.array([0.0, y_min + fraction * (y_max - y_min), 0.0]), np.array([0.0, 1.0, 0.0])
+            mask = _torso_loop(vertices, faces, origin, normal, mask)
+            if not mask.any():
+                raise ValueError(f"Medida '{name}': nenhum laço de seção plausível em torno da região '{region}'")
+        else:
+            # Lados como nos geradores: 'left' em x negativo
+            side_mask = (segmentation['angle'] < 0) == (side == 'left')
+            mask &= side_mask
+            if not mask.any():
+                raise ValueError(f"Medida '{name}': nenhum vértice na região '{region}' ({side})")
+            origin, normal = _limb_plane(vertices[mask], fraction)
+            mask = side_mask & _limb_loop(vertices, faces, origin, normal, mask)
+            if not mask.any():
+                raise ValueError(f"Medida '{name}': nenhum laço de seção plausível em torno da região "
+                                 f"'{region}' ({side})")
+        planes[name] = (origin, normal, mask)
+    return planes
+
+
+def available_planes(vertices, faces, segmentation=None, names=None):
+    """
+    Como measurement_planes, pulando as medidas que não se localizam na
+    malha (membros de cápsulas deitadas, modelos fora da pose de
+    referência): (planos, nomes das medidas ausentes).
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if segmentation is None:
+        segmentation = segment_body(vertices)
+    planes, missing = {}, []
+    for name in names or MEASUREMENTS:
+        try:
+            planes.update(measurement_planes(vertices, faces, segmentation, [name]))
+        except ValueError:
+            missing.append(name)
+    return planes, missing
+
+
+def region_faces(faces, vertex_mask):
+    """Faces com pelo menos 2 dos 3 vértices na máscara"""
+    return vertex_mask[faces].sum(axis=1) >= 2
+
+
+def candidate_faces(vertices, faces, origin, normal, deltas=None, weight_range=WEIGHT_RANGE):
+    """
+    Faces que o plano pode cortar com qualquer combinação de pesos em
+    weight_range: a distância com sinal de cada vértice ao plano é afim nos
+    pesos, então seus extremos somam as contribuições mínima e máxima de
+    cada target (deltas (K, V, 3)).
+    """
+    distance = (np.asarray(vertices, dtype=np.float64) - origin) @ normal
+    low = high = distance
+    if deltas is not None and len(deltas):
+        step = np.asarray(deltas, dtype=np.float64) @ normal
+        low = distance + np.minimum(step * weight_range[0], step * weight_range[1]).sum(axis=0)
+        high = distance + np.maximum(step * weight_range[0], step * weight_range[1]).sum(axis=0)
+    faces = np.asarray(faces)
+    return (low[faces].min(axis=1) < 0) & (high[faces].max(axis=1) >= 0)
+
+
+def girth_model(vertices, faces, planes, morph_targets=None, weight_range=WEIGHT_RANGE):
+    """
+    Pré-cálculo das medidas para uma topologia: faces que os planos podem
+    cortar com pesos em weight_range e, para cada aresta dessas faces, as
+    posições dos extremos e suas distâncias com sinal ao plano, ambas afins
+    nos pesos (valor base e deltas por target). Retorna um dict usado por girths.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    morph_targets = morph_targets or {}
+    deltas = np.stack([np.asarray(delta, dtype=np.float64) for delta in morph_targets.values()]) \
+        if morph_targets else np.zeros((0, len(vertices), 3))
+
+    ends, distances, distance_deltas, face_edges, face_planes = [], [], [], [], []
+    n_edges = 0
+    for m, (origin, normal, mask) in enumerate(planes.values()):
+        selected = faces[region_faces(faces, mask) & candidate_faces(vertices, faces, origin, normal,
+                                                                     deltas, weight_range)]
+        # Arestas únicas do plano e as três arestas de cada face
+        pairs = np.sort(np.stack([selected, np.roll(selected, -1, axis=1)], axis=2).reshape(-1, 2), axis=1)
+        edges, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        edges = edges.reshape(-1, 2)
+        ends.append(edges)
+        distances.append((vertices[edges] - origin) @ normal)
+        distance_deltas.append(deltas[:, edges] @ normal)
+        face_edges.append(inverse.reshape(-1, 3) + n_edges)
+        face_planes.append(np.full(len(selected), m))
+        n_edges += len(edges)
+    ends = np.concatenate(ends)
+    face_edges = np.concatenate(face_edges)
+    # Soma dos segmentos por medida como produto de matrizes
+    assignment = np.zeros((len(face_edges), len(planes)))
+    assignment[np.arange(len(face_edges)), np.concatenate(face_planes)] = 1.0
+    # Aresta como origem + t * direção, com layout (coordenada, aresta): cada
+    # bloco de pesos vira um produto de matrizes
+    start, direction = vertices[ends[:, 0]], vertices[ends[:, 1]] - vertices[ends[:, 0]]
+    start_deltas, direction_deltas = deltas[:, ends[:, 0]], deltas[:, ends[:, 1]] - deltas[:, ends[:, 0]]
+    return {
+        'measurements': list(planes),
+        'targets': list(morph_targets),
+        'start': start.T,
+        'direction': direction.T,
+        'start_deltas': start_deltas.transpose(0, 2, 1).reshape(len(deltas), 3 * len(ends)),
+        'direction_deltas': direction_deltas.transpose(0, 2, 1).reshape(len(deltas), 3 * len(ends)),
+        'distances': np.concatenate(distances).T,
+        'distance_deltas': np.concatenate(distance_deltas, axis=1).transpose(0, 2, 1).reshape(len(deltas), 2 * len(ends)),
+        'face_edges': face_edges,
+        'assignment': assignment,
+    }
+
+
+def girths(model, weights=None):
+    """
+    Circunferências (lote, medidas) com os pesos dados: array (lote, targets)
+    na ordem de model['targets'], ou {target: escalar ou array (lote,)}
+    (ausentes = 0). Sem pesos, as da malha base (lote de 1).
+    """
+    if weights is None:
+        weights = np.zeros((1, len(model['targets'])))
+    elif isinstance(weights, dict):
+        columns = [np.atleast_1d(np.asarray(weights.get(name, 0.0), dtype=np.float64)) for name in model['targets']]
+        n = max((len(c) for c in columns), default=1)
+        weights = np.stack([np.broadcast_to(c, (n,)) for c in columns], axis=1).reshape(n, -1)
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+
+    face_edges = model['face_edges']
+    values = np.empty((len(weights), model['assignment'].shape[1]))
+    for start in range(0, len(weights), BATCH_BLOCK):
+        block = weights[start:start + BATCH_BLOCK]
+        # Distâncias dos extremos das arestas ao plano: (bloco, extremo, aresta)
+        distance = model['distances'] + (block @ model['distance_deltas']).reshape(len(block), 2, -1)
+        # Ponto de corte das arestas com extremos em lados opostos
+        cut = (distance[:, 0] >= 0) != (distance[:, 1] >= 0)
+        span = distance[:, 0] - distance[:, 1]
+        t = np.divide(distance[:, 0], span, out=np.zeros_like(span), where=cut)
+        shape = (len(block), *model['start'].shape)
+        crossing = model['start'] + (block @ model['start_deltas']).reshape(shape)
+        crossing += t[:, None] * (model['direction'] + (block @ model['direction_deltas']).reshape(shape))
+        # Face cortada: segmento entre as duas arestas cortadas (0 ou 2 por face)
+        lengths = np.zeros((len(block), len(face_edges)))
+        for i, j in ((0, 1), (1, 2), (2, 0)):
+            a, b = face_edges[:, i], face_edges[:, j]
+            segment = crossing[:, :, a] - crossing[:, :, b]
+            lengths += np.sqrt((segment ** 2).sum(axis=1)) * (cut[:, a] & cut[:, b])
+        values[start:start + len(block)] = lengths @ model['assignment']
+    return values
+
+
+def _section(vertices, faces, origin, normal, face_mask=None):
+    """Segmentos (S, 2, 3) da seção pelo corte do trimesh, só das faces em face_mask"""
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    segments, face_index = trimesh.intersections.mesh_plane(
+        mesh, plane_normal=normal, plane_origin=origin, return_faces=True)
+    if face_mask is not None:
+        segments = segments[face_mask[face_index]]
+    return segments
+
+
+def girth(vertices, faces, origin, normal, face_mask=None):
+    """Perímetro da seção pelo corte do trimesh (referência, uma malha por chamada)"""
+    segments = _section(vertices, faces, origin, normal, face_mask)
+    return float(np.linalg.norm(segments[:, 1] - segments[:, 0], axis=1).sum())
+
+
+def measure(vertices, faces, planes):
+    """Circunferências {nome: valor} de uma malha nos planos dados (ver measurement_planes)"""
+    values = girths(girth_model(vertices, faces, planes))[0]
+    return dict(zip(planes, values.tolist()))
+
+
+def benchmark_girths(path, n_weights=1000, n_reference=50, seed=0):
+    """Lote de pesos aleatórios em [0, 1]: tempo e erro máximo contra o corte do trimesh"""
+    vertices, faces, morph_targets = load_morphable_glb(path)
+    vertices = vertices.astype(np.float64)
+    start = time.perf_counter()
+    planes, missing = available_planes(vertices, faces)
+    model = girth_model(vertices, faces, planes, morph_targets)
+    setup = time.perf_counter() - start
+    base = measure(vertices, faces, planes)
+    weights = np.random.default_rng(seed).uniform(0.0, 1.0, (n_weights, len(morph_targets)))
+
+    start = time.perf_counter()
+    values = girths(model, weights)
+    batch = time.perf_counter() - start
+
+    deltas = np.stack(list(morph_targets.values()))
+    face_masks = {name: region_faces(faces, mask) for name, (_, _, mask) in planes.items()}
+    error = np.zeros(len(planes))
+    start = time.perf_counter()
+    for b in range(n_reference):
+        deformed = vertices + np.einsum('k,kvc->vc', weights[b], deltas)
+        reference = [girth(deformed, faces, origin, normal, face_masks[name])
+                     for name, (origin, normal, _) in planes.items()]
+        error = np.maximum(error, np.abs(values[b] - reference))
+    reference_time = (time.perf_counter() - start) / n_reference
+
+    print(f"{path}: {len(vertices)} vértices, {len(model['face_edges'])} faces candidatas, pré-cálculo {setup * 1000:.0f} ms")
+    print(f"  Lote de {n_weights}: {batch * 1e6 / n_weights:.1f} µs/vetor de pesos; "
+          f"trimesh: {reference_time * 1e6:.0f} µs/vetor ({reference_time * n_weights / batch:.0f}x)")
+    for m, name in enumerate(planes):
+        print(f"  {name:<6} malha base {base[name] * 100:5.1f} cm, lote {values[:, m].min() * 100:6.1f}-"
+              f"{values[:, m].max() * 100:6.1f} cm, erro máximo {error[m] * 1000:.2f} mm")
+    for name in missing:
+        print(f"  {name:<6} não localizada na malha")
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        benchmark_girths(path)
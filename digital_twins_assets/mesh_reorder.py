@@ -0,0 +1,137 @@
+"""
+Reordenação de triângulos e vértices para a GPU antes da exportação GLB.
+
+1. Triângulos: Tipsify (Sander, Nehab e Barczak, 2007) emite os triângulos
+   em leques em torno de vértices que ainda estão no cache pós-transformação
+   (FIFO de VERTEX_CACHE_SIZE entradas), em tempo linear, de modo que cada
+   vértice é transformado poucas vezes (ACMR = falhas de cache / triângulo;
+   ótimo perto de 0.5, ordem arbitrária perto de 3).
+2. Vértices: renumerados na ordem do primeiro uso pelo novo index buffer,
+   para que a leitura dos atributos (posição, normal, deltas dos morph
+   targets) avance pelo buffer em vez de saltar.
+
+O chamador aplica vertex_order a todos os arrays por vértice:
+    faces, order, (before, after) = reorder_mesh(faces, len(vertices))
+    vertices, normals = vertices[order], normals[order]
+    morph_targets = {name: delta[order] for name, delta in morph_targets.items()}
+    indices, component_type = index_buffer(faces)   # uint16 quando cabe
+"""
+import numpy as np
+
+# Entradas do cache pós-transformação simulado (GPUs móveis: 16-32)
+VERTEX_CACHE_SIZE = 16
+# glTF proíbe o valor máximo do tipo nos índices (reinício de primitiva)
+UINT16_LIMIT = 65535
+COMPONENT_TYPES = {np.dtype(np.uint16): 5123, np.dtype(np.uint32): 5125}
+
+
+def acmr(faces, cache_size=VERTEX_CACHE_SIZE):
+    """Falhas médias do cache FIFO por triângulo (average cache miss ratio)"""
+    faces = np.asarray(faces)
+    if len(faces) == 0:
+        return 0.0
+    # Um vértice inserido na falha m sai do FIFO após cache_size falhas
+    stamp = {}
+    misses = 0
+    for v in faces.ravel().tolist():
+        if misses - stamp.get(v, -cache_size - 1) > cache_size:
+            stamp[v] = misses
+            misses += 1
+    return misses / len(faces)
+
+
+def tipsify(faces, n_vertices, cache_size=VERTEX_CACHE_SIZE):
+    """Ordem dos triângulos (índices em faces) otimizada para o cache"""
+    faces = np.asarray(faces, dtype=np.int64)
+    n_faces = len(faces)
+    # Triângulos de cada vértice (CSR: adjacency[start[v]:start[v + 1]])
+    flat = faces.ravel()
+    adjacency = (np.argsort(flat, kind='stable') // 3).tolist()
+    live = np.bincount(flat, minlength=n_vertices)
+    start = np.concatenate(([0], np.cumsum(live))).tolist()
+    live = live.tolist()
+    triangles = faces.tolist()
+
+    timestamp = [0] * n_vertices
+    emitted = [False] * n_faces
+    dead_end = []
+    order = []
+    s = cache_size + 1
+    cursor = 0
+    fanning = 0
+    while fanning >= 0:
+        # Emite todos os triângulos ainda não emitidos em torno do vértice do leque
+        candidates = []
+        for t in adjacency[start[fanning]:start[fanning + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            order.append(t)
+            for v in triangles[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if s - timestamp[v] > cache_size:
+                    timestamp[v] = s
+                    s += 1
+
+        # Próximo leque: vizinho com triângulos pendentes que continua no cache
+        fanning, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if s - timestamp[v] + 2 * live[v] <= cache_size:
+                    priority = s - timestamp[v]
+                if priority > best:
+                    fanning, best = v, priority
+        if fanning < 0:
+            # Beco sem saída: vértice recente com pendências, senão o próximo na ordem
+            while dead_end and fanning < 0:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fanning = v
+            while fanning < 0 and cursor < n_vertices:
+                if live[cursor] > 0:
+                    fanning = cursor
+                cursor += 1
+    return np.asarray(order, dtype=np.int64)
+
+
+def fetch_order(faces, n_vertices):
+    """
+    Ordem dos vértices pelo primeiro uso em faces (vertex_order[novo] = antigo);
+    vértices não referenciados vão para o final, mantendo o número de vértices.
+    """
+    flat = np.asarray(faces, dtype=np.int64).ravel()
+    used, first = np.unique(flat, return_index=True)
+    unused = np.setdiff1d(np.arange(n_vertices), used, assume_unique=True)
+    return np.concatenate([used[np.argsort(first, kind='stable')], unused])
+
+
+def reorder_mesh(faces, n_vertices, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Reordena triângulos (Tipsify) e vértices (primeiro uso). Retorna
+    (faces renumeradas, vertex_order, (ACMR antes, ACMR depois)).
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    before = acmr(faces, cache_size)
+    faces = faces[tipsify(faces, n_vertices, cache_size)]
+    vertex_order = fetch_order(faces, n_vertices)
+    remap = np.empty(n_vertices, dtype=np.int64)
+    remap[vertex_order] = np.arange(n_vertices)
+    faces = remap[faces]
+    return faces, vertex_order, (before, acmr(faces, cache_size))
+
+
+def index_buffer(faces):
+    """Índices achatados em uint16 quando todos cabem, senão uint32; e o componentType glTF"""
+    faces = np.asarray(faces)
+    dtype = np.uint16 if faces.size == 0 or faces.max() < UINT16_LIMIT else np.uint32
+    indices = faces.ravel().astype(dtype)
+    return indices, COMPONENT_TYPES[indices.dtype]
+
+
+def aligned_bytes(array, alignment=4):
+    """Bytes do array com zeros no final até o múltiplo de alignment (bufferViews seguintes alinhados)"""
+    data = np.ascontiguousarray(array).tobytes()
+    return data + b'\x00' * (-len(data) % alignment)
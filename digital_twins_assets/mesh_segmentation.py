@@ -0,0 +1,176 @@
+"""
+Segmentação do avatar em regiões e coordenadas do corpo, uma vez por malha.
+
+Cada vértice recebe um rótulo de região (uint8, ver REGION_IDS) e três
+coordenadas normalizadas do corpo:
+    height  fração da altura (0 = pés, 1 = topo da cabeça)
+    angle   ângulo em torno do eixo vertical do corpo (0 = frente, +z; ±π = costas)
+    radius  distância ao eixo vertical do corpo
+
+Os geradores de morph targets consultam esses arrays (máscaras vetorizadas)
+em vez de recalcular faixas de y e testes como abs(x) > 0.15 a cada target.
+Rótulos vindos da montagem (mesh_assembly.assemble) são mantidos; vértices
+sem região definida ('body') são classificados pela silhueta: em cada faixa
+de altura, o aglomerado central de |x| é torso/pernas e os separados por
+um vão são braços; as pernas ficam abaixo da virilha (última faixa em que o
+aglomerado central não alcança o eixo, ou CROTCH_FRACTION se as pernas se
+tocam) e a cabeça acima do pescoço (faixa
+mais estreita do aglomerado central perto do topo). Assim a segmentação
+acompanha as proporções de cada malha, e não coordenadas fixas.
+
+Para malhas trimesh, body_segmentation guarda o resultado em
+vertex_attributes (acompanha merge_vertices/update_faces) e só recalcula
+quando os vértices mudam.
+
+Uso:
+    seg = body_segmentation(mesh)        # ou segment_body(vertices, regions)
+    arms = seg['region'] == REGION_IDS['arm']
+    chest = region_mask(seg, 'torso', 0.75, 0.90)
+"""
+import numpy as np
+from mesh_assembly import REGION_ATTRIBUTE, REGION_IDS
+
+# Atributos de vértice com as coordenadas do corpo (trimesh vertex_attributes)
+COORD_ATTRIBUTES = {'height': 'body_height', 'angle': 'body_angle', 'radius': 'body_radius'}
+# Chave em mesh.metadata com o hash dos vértices segmentados
+SEGMENTATION_KEY = 'body_segmentation_hash'
+
+# Faixas de altura para a classificação pela silhueta
+N_BINS = 64
+# Vão mínimo em |x| entre aglomerados, como fração da altura
+GAP_FRACTION = 0.03
+# Distância máxima ao eixo de um vértice do aglomerado central, idem
+AXIS_REACH = 0.12
+# Folga entre as pernas para considerá-las separadas no eixo, idem
+LEG_SPLIT = 0.005
+# Faixas em que se procuram a virilha e o pescoço
+CROTCH_RANGE = (0.2, 0.6)
+NECK_RANGE = (0.78, 0.92)
+# Virilha quando as pernas se tocam em toda a altura (proporção média adulta)
+CROTCH_FRACTION = 0.46
+
+
+def _silhouette_regions(vertices, height, cx):
+    """Classifica todos os vértices pela silhueta (ver docstring do módulo)"""
+    extent = vertices[:, 1].max() - vertices[:, 1].min()
+    gap = GAP_FRACTION * extent
+    abs_x = np.abs(vertices[:, 0] - cx)
+    bins = np.minimum((height * N_BINS).astype(np.int64), N_BINS - 1)
+
+    # Aglomerados de |x| em cada faixa: novo aglomerado a cada vão > gap.
+    # Cada faixa inclui também os vértices das vizinhas, para que malhas
+    # com poucos anéis não deixem faixas ralas ou sem o torso
+    n = len(vertices)
+    pooled_bins = np.concatenate([bins - 1, bins, bins + 1])
+    pooled_x = np.tile(abs_x, 3)
+    order = np.lexsort((pooled_x, pooled_bins))
+    sorted_bins, sorted_x = pooled_bins[order], pooled_x[order]
+    bin_start = np.r_[True, sorted_bins[1:] != sorted_bins[:-1]]
+    cluster = np.cumsum(bin_start | np.r_[False, np.diff(sorted_x) > gap])
+    first_of_bin = np.maximum.accumulate(np.where(bin_start, np.arange(len(order)), 0))
+    pooled_central = np.empty(len(order), dtype=bool)
+    pooled_central[order] = cluster == cluster[first_of_bin]
+    central = pooled_central[n:2 * n]
+    # Faixa sem anel do torso: o primeiro aglomerado só é central se vier do eixo
+    central &= abs_x < AXIS_REACH * extent
+
+    # Por faixa: início (mais perto do eixo, com as vizinhas) e largura do aglomerado central
+    inner = np.full(N_BINS, np.inf)
+    width = np.full(N_BINS, np.inf)
+    pooled = pooled_central & np.tile(central, 3) & (pooled_bins >= 0) & (pooled_bins < N_BINS)
+    np.minimum.at(inner, pooled_bins[pooled], pooled_x[pooled])
+    outer = np.zeros(N_BINS)
+    np.maximum.at(outer, bins[central], abs_x[central])
+    filled = outer > 0
+    width[filled] = outer[filled]
+
+    centers = (np.arange(N_BINS) + 0.5) / N_BINS
+    # Virilha: acima da última faixa com as pernas separadas no eixo
+    split = filled & (inner > LEG_SPLIT * extent) & (centers > CROTCH_RANGE[0]) & (centers < CROTCH_RANGE[1])
+    crotch = np.flatnonzero(split).max() + 1 if split.any() else int(CROTCH_FRACTION * N_BINS)
+    # Pescoço: faixa mais estreita do aglomerado central perto do topo
+    neck_range = filled & (centers > NECK_RANGE[0]) & (centers < NECK_RANGE[1])
+    neck = np.flatnonzero(neck_range)[np.argmin(width[neck_range])] if neck_range.any() else N_BINS
+
+    regions = np.full(len(vertices), REGION_IDS['arm'], dtype=np.uint8)
+    regions[central] = REGION_IDS['torso']
+    regions[central & (bins < crotch)] = REGION_IDS['leg']
+    regions[central & (bins > neck)] = REGION_IDS['head']
+    return regions
+
+
+def segment_body(vertices, regions=None):
+    """
+    Rótulos e coordenadas do corpo de uma malha. regions (opcional) são os
+    rótulos da montagem; os vértices 'body' recebem a classificação pela
+    silhueta. Retorna um dict de arrays: region (uint8), height, angle e
+    radius (float32).
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+    height = (vertices[:, 1] - y_min) / max(y_max - y_min, 1e-9)
+
+    # Eixo provisório no meio da caixa em x (corpo simétrico)
+    cx = (vertices[:, 0].min() + vertices[:, 0].max()) / 2
+    if regions is None:
+        regions = _silhouette_regions(vertices, height, cx)
+    else:
+        regions = np.asarray(regions, dtype=np.uint8).copy()
+        unknown = regions == REGION_IDS['body']
+        if unknown.any():
+            regions[unknown] = _silhouette_regions(vertices, height, cx)[unknown]
+
+    # Eixo do corpo: centro do torso no plano xz
+    torso = vertices[regions == REGION_IDS['torso']]
+    if len(torso) == 0:
+        torso = vertices
+    cx = (torso[:, 0].min() + torso[:, 0].max()) / 2
+    cz = (torso[:, 2].min() + torso[:, 2].max()) / 2
+    dx, dz = vertices[:, 0] - cx, vertices[:, 2] - cz
+
+    return {
+        'region': regions,
+        'height': height.astype(np.float32),
+        'angle': np.arctan2(dx, dz).astype(np.float32),
+        'radius': np.hypot(dx, dz).astype(np.float32),
+    }
+
+
+def body_segmentation(mesh):
+    """
+    Segmentação de uma malha trimesh, guardada em mesh.vertex_attributes.
+    Recalcula só se os vértices mudaram; os rótulos já presentes em
+    REGION_ATTRIBUTE são mantidos.
+    """
+    key = hash(mesh.vertices)
+    attributes = mesh.vertex_attributes
+    if mesh.metadata.get(SEGMENTATION_KEY) == key and all(
+            name in attributes for name in COORD_ATTRIBUTES.values()):
+        segmentation = {name: np.asarray(attributes[attr]) for name, attr in COORD_ATTRIBUTES.items()}
+        segmentation['region'] = np.asarray(attributes[REGION_ATTRIBUTE])
+        return segmentation
+
+    segmentation = segment_body(mesh.vertices, attributes.get(REGION_ATTRIBUTE))
+    attributes[REGION_ATTRIBUTE] = segmentation['region']
+    for name, attr in COORD_ATTRIBUTES.items():
+        attributes[attr] = segmentation[name]
+    mesh.metadata[SEGMENTATION_KEY] = key
+    return segmentation
+
+
+def region_mask(segmentation, region=None, h_min=-np.inf, h_max=np.inf):
+    """Vértices de uma região (nome ou lista de nomes) dentro de uma faixa de altura"""
+    mask = (segmentation['height'] > h_min) & (segmentation['height'] < h_max)
+    if region is not None:
+        names = [region] if isinstance(region, str) else region
+        mask &= np.isin(segmentation['region'], [REGION_IDS[name] for name in names])
+    return mask
+
+
+def radial_directions(segmentation):
+    """Direção unitária horizontal a partir do eixo do corpo, (N, 3) float32"""
+    angle = segmentation['angle']
+    directions = np.zeros((len(angle), 3), dtype=np.float32)
+    directions[:, 0] = np.sin(angle)
+    directions[:, 2] = np.cos(angle)
+    return directions